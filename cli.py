@@ -0,0 +1,460 @@
+"""
+Point d'entrée en ligne de commande de Mallia
+Opérations sans interface graphique (export des données, ...)
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Ajouter le dossier du projet au path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from modules.bdd import Database
+
+
+def commande_export(args) -> int:
+    """Exporte toutes les tables en CSV ou JSON Lines"""
+    from modules.export import DonneesExporter
+    
+    with Database() as db:
+        exporter = DonneesExporter(db)
+        resultats = exporter.exporter(
+            args.sortie,
+            format=args.format,
+            compresser=not args.sans_compression
+        )
+    
+    total = sum(resultats.values())
+    print(f"Export terminé : {total} lignes dans {len(resultats)} fichiers")
+    return 0
+
+
+def commande_consolidation(args) -> int:
+    """Affiche le CA et l'atteinte des objectifs de tous les salons"""
+    from modules.salons import ConsolidationSalons
+    
+    synthese = ConsolidationSalons().get_synthese_annuelle(args.annee)
+    
+    if not synthese:
+        print(f"Aucune donnée pour {args.annee}")
+        return 0
+    
+    print(f"{'Salon':<30} {'Mois':>4} {'C.A.':>14} {'Objectif':>14} {'Atteinte':>9}")
+    for ligne in synthese:
+        print(
+            f"{ligne['nom']:<30} {ligne['nb_mois']:>4} "
+            f"{ligne['ca_total'] or 0:>14.2f} {ligne['objectif_ca'] or 0:>14.2f} "
+            f"{ligne['taux_atteinte_ca'] or 0:>8.2f}%"
+        )
+    return 0
+
+
+def commande_sauvegarde(args) -> int:
+    """Sauvegarde la base du salon actif"""
+    from modules.sauvegarde import SauvegardeManager
+    
+    chemin = SauvegardeManager().sauvegarder()
+    return 0 if chemin else 1
+
+
+def commande_benchmark(args) -> int:
+    """Compare la pointe mémoire de fetch_all et fetch_iter sur 1 à 20 ans de données"""
+    from modules.bdd.benchmark import mesurer_memoire
+    
+    resultats = mesurer_memoire(args.annees, args.collaborateurs, args.lot)
+    
+    print(f"{'Années':>6} {'Lignes':>9} {'fetch_all':>12} {'fetch_iter':>12} {'modèles':>12}")
+    for ligne in resultats:
+        print(
+            f"{ligne['annees']:>6} {ligne['lignes']:>9} "
+            f"{ligne['fetch_all'] / 1024:>9.0f} Ko {ligne['fetch_iter'] / 1024:>9.0f} Ko "
+            f"{ligne['fetch_iter_modele'] / 1024:>9.0f} Ko"
+        )
+    return 0
+
+
+def commande_caisse(args) -> int:
+    """Importe des exports de caisse et recalcule les périodes touchées"""
+    from modules.caisse import ImportCaisse
+    
+    importeur = ImportCaisse()
+    code_retour = 0
+    for fichier in args.fichiers:
+        resultat = importeur.importer(fichier, forcer=args.forcer)
+        if resultat is None:
+            code_retour = 1
+        elif not resultat.get('deja_importe'):
+            print(
+                f"{Path(fichier).name} : {resultat['nb_tickets']} tickets, "
+                f"{resultat['nb_lignes']} lignes, {len(resultat['periodes'])} périodes recalculées"
+            )
+            for cle, libelle in (('noms_inconnus', "inconnus"), ('noms_ambigus', "ambigus")):
+                if resultat.get(cle):
+                    print(f"   Collaborateurs {libelle} (comptés pour le salon seul) : {', '.join(resultat[cle])}")
+            if args.statistiques:
+                pointe = resultat['pointe_memoire']
+                print(
+                    f"   {resultat['lignes_par_seconde'] or 0:,.0f} lignes/s, mémoire de pointe "
+                    f"{f'{pointe / 1024 / 1024:.0f} Mo' if pointe else 'non mesurée'}".replace(",", " ")
+                )
+    return code_retour
+
+
+def commande_surveillance(args) -> int:
+    """Surveille le dossier de dépôt des exports de caisse"""
+    from modules.caisse import SurveillanceCaisse
+    
+    surveillance = SurveillanceCaisse(dossier=args.dossier)
+    if not surveillance.active:
+        print("Aucun dossier à surveiller (section [Caisse], dossier_surveille, ou --dossier)")
+        return 1
+    
+    if args.une_fois:
+        resultats = surveillance.analyser()
+        return 1 if any(r['resultat'] is None for r in resultats) else 0
+    
+    print(f"Surveillance de {surveillance.dossier} (Ctrl+C pour arrêter)")
+    try:
+        while True:
+            surveillance.analyser()
+            time.sleep(surveillance.intervalle_secondes or 300)
+    except KeyboardInterrupt:
+        return 0
+
+
+def commande_calendrier(args) -> int:
+    """Affiche les jours fériés et les jours d'ouverture de chaque mois d'une année"""
+    from modules.calendrier import CalendrierDB
+    from modules.suivis_manager.utils import bornes_mois
+    
+    calendrier = CalendrierDB()
+    print(f"Jours fériés {args.annee} :")
+    for jour, libelle in calendrier.get_feries(args.annee).items():
+        print(f"  {jour.strftime('%d/%m/%Y')}  {libelle}")
+    
+    print(f"Jours d'ouverture {args.annee} :")
+    nb_jours = calendrier.compter_jours_ouvres_periodes(
+        [bornes_mois(mois, args.annee) for mois in range(1, 13)]
+    )
+    for mois, nb in enumerate(nb_jours, start=1):
+        print(f"  {mois:02d}/{args.annee}  {nb:>3}")
+    print(f"  Total    {sum(nb_jours):>3}")
+    return 0
+
+
+def commande_ca_jour(args) -> int:
+    """Recalcule le C.A. /jour des suivis d'un intervalle à partir du calendrier"""
+    from modules.suivis_manager.database import SuivisManagerDB
+    from modules.suivis_collaborateurs.database import SuivisCollaborateursDB
+    
+    manager = SuivisManagerDB().deriver_ca_par_jour(args.debut, args.fin)
+    collaborateurs = SuivisCollaborateursDB().deriver_ca_par_jour(args.debut, args.fin)
+    if manager is None or collaborateurs is None:
+        return 1
+    
+    print(f"C.A. /jour recalculé : {manager} périodes manager, "
+          f"{collaborateurs} périodes collaborateurs")
+    return 0
+
+
+def commande_objectifs(args) -> int:
+    """Calcule (et enregistre) les objectifs Manager d'une année à partir de l'historique"""
+    from modules.objectifs.saisonnalite import GenerateurObjectifs
+    
+    generateur = GenerateurObjectifs()
+    resultat = generateur.generer(
+        args.annee, croissance=args.croissance / 100, nb_annees=args.historique,
+        ca_reference=args.ca_reference
+    )
+    
+    if resultat['saisonnalite'] == 'historique':
+        print(f"Saisonnalité : {', '.join(map(str, resultat['annees_historique']))} "
+              f"(référence {resultat['annee_reference']})")
+    else:
+        print("Aucune année complète : mois pondérés par leurs jours d'ouverture")
+    print(f"{'Mois':>7} {'C.A.':>10} {'C.A./j':>8} {'Clients':>8}")
+    for objectif in resultat['objectifs']:
+        print(f"{objectif['mois']:02d}/{args.annee} "
+              f"{objectif['ca_total'] or '':>10} {objectif['ca_jour'] or '':>8} "
+              f"{objectif['nb_clients'] or '':>8}")
+    
+    if not args.enregistrer:
+        print("Aperçu seulement (--enregistrer pour écrire les objectifs)")
+        return 0
+    if not generateur.enregistrer(args.annee, resultat['objectifs']):
+        return 1
+    print(f"Objectifs Manager {args.annee} enregistrés")
+    return 0
+
+
+def commande_classement(args) -> int:
+    """Classe les collaborateurs sur l'atteinte de leurs objectifs du mois"""
+    from modules.objectifs.atteinte import AtteinteObjectifs
+    
+    atteinte = AtteinteObjectifs()
+    part_mois = atteinte.part_ecoulee(args.mois, args.annee)
+    classement = atteinte.get_classement(args.mois, args.annee, part_mois)
+    
+    if part_mois < 1:
+        print(f"Mois en cours : C.A. et visites comparés à {part_mois * 100:.0f} % de l'objectif")
+    print(f"{'Rang':>4}  {'Collaborateur':<25} {'Score':>7} {'C.A.':>7} {'C.A./j':>7} {'Visites':>7}")
+    for collab in classement:
+        atteintes = [
+            f"{collab[f'atteinte_{cle}']:.0f}%" if collab[f'atteinte_{cle}'] is not None else "-"
+            for cle in ("ca_prestation", "ca_jour", "nb_visites")
+        ]
+        score = f"{collab['score']:.1f}%" if collab['score'] is not None else "-"
+        print(f"{collab['rang'] or '-':>4}  {collab['prenom'] + ' ' + collab['nom']:<25} {score:>7} "
+              + " ".join(f"{atteinte:>7}" for atteinte in atteintes))
+    return 0
+
+
+def commande_rapprochement(args) -> int:
+    """Rapproche les Suivis Collaborateurs du Suivi Manager et liste les écarts"""
+    from modules.suivis_manager.rapprochement import RapprochementSuivis, decrire_ecarts
+    
+    rapprochement = RapprochementSuivis()
+    if args.mois:
+        lignes = rapprochement.rapprocher([(args.mois, args.annee)])
+    else:
+        lignes = rapprochement.rapprocher_annee(args.annee)
+    
+    nb_ecarts = 0
+    for ligne in lignes:
+        ecarts = decrire_ecarts(ligne)
+        if not ecarts:
+            continue
+        nb_ecarts += 1
+        print(f"{ligne['mois']:02d}/{ligne['annee']} période {ligne['numero_periode']} "
+              f"({ligne['date_debut']} - {ligne['date_fin']})")
+        for ecart in ecarts:
+            print(f"    {ecart}")
+    
+    print(f"{len(lignes)} période(s) rapprochée(s), {nb_ecarts} avec écart")
+    return 0
+
+
+def commande_anomalies(args) -> int:
+    """Signale les valeurs d'une année qui s'écartent de l'historique (fautes de frappe)"""
+    from modules.collaborateurs.database import CollaborateursDB
+    from modules.suivis_manager.anomalies import DetecteurAnomalies
+    
+    detecteur = DetecteurAnomalies()
+    sources = ['manager', 'collaborateurs'] if args.source == "tous" else [args.source]
+    noms = {
+        collab['id']: f"{collab['prenom']} {collab['nom']}"
+        for collab in CollaborateursDB().get_tous_collaborateurs()
+    }
+    
+    nb_anomalies = 0
+    for source in sources:
+        for anomalie in detecteur.verifier_annee(source, args.annee):
+            nb_anomalies += 1
+            serie = "Salon" if source == 'manager' else noms.get(anomalie['serie'], anomalie['serie'])
+            print(f"{anomalie['mois']:02d}/{anomalie['annee']} période {anomalie['numero_periode']} "
+                  f"{serie} - {anomalie['indicateur']} = {anomalie['valeur']:.2f}")
+            print(f"    {anomalie['message']}")
+    
+    print(f"{nb_anomalies} valeur(s) signalée(s)")
+    return 0
+
+
+def creer_parser() -> argparse.ArgumentParser:
+    """Construit l'analyseur des arguments de la ligne de commande"""
+    parser = argparse.ArgumentParser(
+        prog="mallia",
+        description="Mallia - opérations en ligne de commande"
+    )
+    sous_parsers = parser.add_subparsers(dest="commande", required=True)
+    
+    # Export
+    export_parser = sous_parsers.add_parser(
+        "export", help="Exporte toutes les données en CSV ou JSON Lines"
+    )
+    export_parser.add_argument(
+        "--format", choices=["csv", "jsonl"], default="csv",
+        help="Format des fichiers exportés (défaut : csv)"
+    )
+    export_parser.add_argument(
+        "--sortie", default="export",
+        help="Dossier de destination (défaut : export)"
+    )
+    export_parser.add_argument(
+        "--sans-compression", action="store_true",
+        help="N'applique pas la compression gzip"
+    )
+    export_parser.set_defaults(fonction=commande_export)
+    
+    # Consolidation multi-salons
+    consolidation_parser = sous_parsers.add_parser(
+        "consolidation", help="Synthèse annuelle de tous les salons"
+    )
+    consolidation_parser.add_argument(
+        "--annee", type=int, default=datetime.now().year,
+        help="Année à consolider (défaut : année courante)"
+    )
+    consolidation_parser.set_defaults(fonction=commande_consolidation)
+    
+    # Sauvegarde
+    sauvegarde_parser = sous_parsers.add_parser(
+        "sauvegarde", help="Sauvegarde la base de données du salon actif"
+    )
+    sauvegarde_parser.set_defaults(fonction=commande_sauvegarde)
+    
+    # Mesure mémoire des lectures
+    benchmark_parser = sous_parsers.add_parser(
+        "benchmark", help="Mesure la mémoire de pointe de fetch_all et fetch_iter"
+    )
+    benchmark_parser.add_argument(
+        "--annees", type=int, nargs="+", default=[1, 5, 10, 20],
+        help="Nombres d'années de données fictives (défaut : 1 5 10 20)"
+    )
+    benchmark_parser.add_argument(
+        "--collaborateurs", type=int, default=100,
+        help="Nombre de collaborateurs fictifs (défaut : 100)"
+    )
+    benchmark_parser.add_argument(
+        "--lot", type=int, default=1000,
+        help="Taille des lots de fetch_iter (défaut : 1000)"
+    )
+    benchmark_parser.set_defaults(fonction=commande_benchmark)
+    
+    # Import des exports de caisse
+    caisse_parser = sous_parsers.add_parser(
+        "caisse", help="Importe des exports de caisse et met à jour les suivis"
+    )
+    caisse_parser.add_argument(
+        "fichiers", nargs="+",
+        help="Fichiers CSV exportés du logiciel de caisse"
+    )
+    caisse_parser.add_argument(
+        "--forcer", action="store_true",
+        help="Réimporte les fichiers déjà importés"
+    )
+    caisse_parser.add_argument(
+        "--statistiques", action="store_true",
+        help="Affiche le débit (lignes/s) et la mémoire de pointe"
+    )
+    caisse_parser.set_defaults(fonction=commande_caisse)
+    
+    # Surveillance du dossier de dépôt de la caisse
+    surveillance_parser = sous_parsers.add_parser(
+        "surveillance", help="Importe automatiquement les exports déposés dans un dossier"
+    )
+    surveillance_parser.add_argument(
+        "--dossier",
+        help="Dossier à surveiller (défaut : dossier_surveille de la section [Caisse])"
+    )
+    surveillance_parser.add_argument(
+        "--une-fois", action="store_true",
+        help="Traite les fichiers présents puis s'arrête (tâche planifiée)"
+    )
+    surveillance_parser.set_defaults(fonction=commande_surveillance)
+    
+    # Calendrier d'ouverture
+    calendrier_parser = sous_parsers.add_parser(
+        "calendrier", help="Affiche les jours fériés et les jours d'ouverture d'une année"
+    )
+    calendrier_parser.add_argument(
+        "--annee", type=int, default=datetime.now().year,
+        help="Année à afficher (défaut : année courante)"
+    )
+    calendrier_parser.set_defaults(fonction=commande_calendrier)
+    
+    # C.A. /jour calculé à partir du calendrier
+    ca_jour_parser = sous_parsers.add_parser(
+        "ca-jour", help="Recalcule le C.A. /jour des suivis à partir des jours d'ouverture"
+    )
+    ca_jour_parser.add_argument(
+        "--debut", default=f"{datetime.now().year}-01-01",
+        help="Premier jour YYYY-MM-DD (défaut : 1er janvier de l'année courante)"
+    )
+    ca_jour_parser.add_argument(
+        "--fin", default=f"{datetime.now().year}-12-31",
+        help="Dernier jour YYYY-MM-DD (défaut : 31 décembre de l'année courante)"
+    )
+    ca_jour_parser.set_defaults(fonction=commande_ca_jour)
+    
+    # Objectifs saisonniers
+    objectifs_parser = sous_parsers.add_parser(
+        "objectifs", help="Calcule les objectifs Manager d'une année à partir de l'historique"
+    )
+    objectifs_parser.add_argument(
+        "--annee", type=int, default=datetime.now().year + 1,
+        help="Année des objectifs (défaut : année suivante)"
+    )
+    objectifs_parser.add_argument(
+        "--croissance", type=float, default=0.0,
+        help="Croissance par an en %% (défaut : 0)"
+    )
+    objectifs_parser.add_argument(
+        "--historique", type=int, default=3,
+        help="Années d'historique pour la saisonnalité (défaut : 3)"
+    )
+    objectifs_parser.add_argument(
+        "--ca-reference", type=float,
+        help="C.A. annuel de référence (défaut : réalisé de la dernière année complète)"
+    )
+    objectifs_parser.add_argument(
+        "--enregistrer", action="store_true",
+        help="Enregistre les objectifs (sinon aperçu seulement)"
+    )
+    objectifs_parser.set_defaults(fonction=commande_objectifs)
+    
+    # Classement des collaborateurs
+    classement_parser = sous_parsers.add_parser(
+        "classement", help="Classe les collaborateurs sur l'atteinte de leurs objectifs du mois"
+    )
+    classement_parser.add_argument(
+        "--mois", type=int, default=datetime.now().month,
+        help="Mois 1-12 (défaut : mois courant)"
+    )
+    classement_parser.add_argument(
+        "--annee", type=int, default=datetime.now().year,
+        help="Année (défaut : année courante)"
+    )
+    classement_parser.set_defaults(fonction=commande_classement)
+    
+    # Rapprochement équipe / salon
+    rapprochement_parser = sous_parsers.add_parser(
+        "rapprochement", help="Compare la somme des Suivis Collaborateurs au Suivi Manager"
+    )
+    rapprochement_parser.add_argument(
+        "--annee", type=int, default=datetime.now().year,
+        help="Année (défaut : année courante)"
+    )
+    rapprochement_parser.add_argument(
+        "--mois", type=int,
+        help="Mois 1-12 (défaut : toute l'année)"
+    )
+    rapprochement_parser.set_defaults(fonction=commande_rapprochement)
+    
+    # Valeurs inhabituelles
+    anomalies_parser = sous_parsers.add_parser(
+        "anomalies", help="Signale les valeurs saisies ou importées qui s'écartent de l'historique"
+    )
+    anomalies_parser.add_argument(
+        "--annee", type=int, default=datetime.now().year,
+        help="Année (défaut : année courante)"
+    )
+    anomalies_parser.add_argument(
+        "--source", choices=["tous", "manager", "collaborateurs"], default="tous",
+        help="Suivis contrôlés (défaut : tous)"
+    )
+    anomalies_parser.set_defaults(fonction=commande_anomalies)
+    
+    return parser
+
+
+def main(argv=None) -> int:
+    """Fonction principale"""
+    parser = creer_parser()
+    args = parser.parse_args(argv)
+    return args.fonction(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,7 @@ Fenêtre principale de l'application Mallia
 """
 
 from PySide6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QVBoxLayout
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QIcon
 import configparser
 from pathlib import Path
@@ -15,11 +15,17 @@ from modules.parametres import ParametresWidget
 from modules.collaborateurs import CollaborateursWidget
 from modules.objectifs import ObjectifsWidget
 from modules.suivis_collaborateurs import SuivisCollaborateursWidget
+from modules.sauvegarde import SauvegardeManager
+from modules.caisse import SurveillanceCaisse
+from modules.bdd.executeur import get_executeur
 
 
 class MainWindow(QMainWindow):
     """Fenêtre principale sans barre de titre système"""
     
+    # Émis depuis le thread de surveillance quand des exports de caisse ont été importés
+    import_caisse_termine = Signal(object)
+    
     def __init__(self):
         super().__init__()
         
@@ -43,6 +49,16 @@ class MainWindow(QMainWindow):
         
         # Vérifier si c'est le premier lancement
         self._verifier_configuration_initiale()
+        
+        # Sauvegardes planifiées de la base de données
+        self.sauvegardes = SauvegardeManager()
+        self.sauvegardes.demarrer_planification()
+        
+        # Import automatique des exports de caisse (si un dossier est configuré) ;
+        # les imports passent par l'exécuteur, comme les écritures des écrans
+        self.surveillance_caisse = SurveillanceCaisse(executeur=get_executeur())
+        self.import_caisse_termine.connect(self._on_import_caisse_termine)
+        self.surveillance_caisse.demarrer(rappel=self.import_caisse_termine.emit)
     
     def _load_config(self) -> configparser.ConfigParser:
         """Charge le fichier de configuration"""
@@ -127,10 +143,12 @@ class MainWindow(QMainWindow):
         # Ajouter le module Paramètres
         self.parametres_widget = ParametresWidget()
         self.parametres_widget.parametres_enregistres.connect(self._on_parametres_enregistres)
+        self.parametres_widget.calendrier_modifie.connect(self._on_calendrier_modifie)
         self.content_area.add_module("Paramètres", self.parametres_widget)
         
         # Ajouter le module Gestion Collaborateurs
         self.collaborateurs_widget = CollaborateursWidget()
+        self.collaborateurs_widget.collaborateurs_modifies.connect(self._on_collaborateurs_modifies)
         self.content_area.add_module("Gestion Collaborateurs", self.collaborateurs_widget)
         
         # Ajouter le module Objectifs Annuels
@@ -146,6 +164,14 @@ class MainWindow(QMainWindow):
         self.suivis_collaborateurs_widget = SuivisCollaborateursWidget()
         self.content_area.add_module("Suivis Collaborateurs", self.suivis_collaborateurs_widget)
         
+        # Rapprochement équipe / salon : chaque écran refait celui de l'autre
+        self.suivis_manager_widget.suivis_enregistres.connect(
+            self.suivis_collaborateurs_widget.actualiser_rapprochement
+        )
+        self.suivis_collaborateurs_widget.suivis_enregistres.connect(
+            self.suivis_manager_widget.actualiser_rapprochement
+        )
+        
         main_layout.addLayout(content_layout)
     
     def _connect_signals(self):
@@ -210,6 +236,32 @@ class MainWindow(QMainWindow):
         # Recharger les objectifs dans le widget Suivis Manager
         if hasattr(self, 'suivis_manager_widget'):
             self.suivis_manager_widget.recharger_objectifs()
+        # Les objectifs des collaborateurs sont conservés avec les données en cache
+        if hasattr(self, 'suivis_collaborateurs_widget'):
+            self.suivis_collaborateurs_widget.invalider_cache()
+    
+    def _on_calendrier_modifie(self):
+        """Appelé quand le calendrier d'ouverture est modifié"""
+        # Les objectifs des périodes sont répartis selon les jours d'ouverture
+        if hasattr(self, 'suivis_manager_widget'):
+            self.suivis_manager_widget.recharger_objectifs()
+        if hasattr(self, 'suivis_collaborateurs_widget'):
+            self.suivis_collaborateurs_widget.invalider_cache()
+    
+    def _on_collaborateurs_modifies(self):
+        """Appelé quand la liste des collaborateurs est modifiée"""
+        # Les listes de collaborateurs en cache dans Suivis Collaborateurs sont périmées
+        if hasattr(self, 'suivis_collaborateurs_widget'):
+            self.suivis_collaborateurs_widget.invalider_cache()
+        # Collaborateurs actifs et ancienneté des objectifs individuels
+        if hasattr(self, 'objectifs_widget'):
+            self.objectifs_widget.recharger_objectifs_individuels()
+    
+    def _on_import_caisse_termine(self, resultats: list):
+        """Appelé quand la surveillance a importé des exports de caisse"""
+        # Les périodes des mois importés ont changé : les données en cache sont périmées
+        self.suivis_manager_widget.invalider_cache()
+        self.suivis_collaborateurs_widget.invalider_cache()
     
     def _toggle_maximize(self):
         """Bascule entre fenêtre maximisée et normale"""
@@ -283,4 +335,13 @@ class MainWindow(QMainWindow):
         with open('config.ini', 'w', encoding='utf-8') as f:
             config.write(f)
         
+        self.surveillance_caisse.arreter()
+        
+        # Les saisies en attente des suivis doivent être écrites avant la sauvegarde de sortie
+        self.suivis_manager_widget.fermer()
+        self.suivis_collaborateurs_widget.fermer()
+        
+        # Sauvegarde de sortie (thread non démon : la fenêtre se ferme sans attendre)
+        self.sauvegardes.arreter()
+        
         event.accept()
\ No newline at end of file
@@ -2,6 +2,14 @@
 Module de gestion de la base de données
 """
 
-from .database import Database
+from .database import Database, ecriture_atomique
+from .cache import CacheLRU
+from .journal import JournalModifications
+from .models import (
+    ModeleLigne, Collaborateur, Suivi, Periode, Objectif, ObjectifCollaborateur
+)
 
-__all__ = ['Database']
\ No newline at end of file
+__all__ = [
+    'Database', 'ecriture_atomique', 'CacheLRU', 'JournalModifications', 'ModeleLigne',
+    'Collaborateur', 'Suivi', 'Periode', 'Objectif', 'ObjectifCollaborateur'
+]
\ No newline at end of file
@@ -0,0 +1,174 @@
+"""
+Sauvegarde automatique différée des écrans de saisie
+
+Les modifications d'un tableau sont regroupées : la sauvegarde part quand
+l'utilisateur n'a rien saisi pendant le délai configuré (section
+[Autosauvegarde] de config.ini), ou immédiatement quand l'écran change de
+données ou se ferme. Une saisie rapide sur toute une ligne donne ainsi une
+seule écriture (un seul lot, donc une seule transaction).
+
+En attendant, les cellules modifiées sont recopiées dans le fichier de
+récupération (voir recuperation.py).
+
+Module séparé pour que modules.bdd reste utilisable sans PySide6.
+"""
+
+import configparser
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from .recuperation import FichierRecuperation
+
+
+DELAI_PAR_DEFAUT_MS = 1500
+
+# États de la sauvegarde, affichés par les écrans
+ETAT_MODIFIE = "✏️ Modifications en attente"
+ETAT_EN_COURS = "⏳ Enregistrement..."
+ETAT_ENREGISTRE = "✓ Enregistré"
+ETAT_ERREUR = "⚠️ Échec de l'enregistrement"
+
+
+class PlanificateurSauvegarde(QObject):
+    """Regroupe les modifications d'un écran et les enregistre après un temps calme"""
+    
+    etat_change = Signal(str)  # Libellé de l'état (ETAT_*)
+    
+    def __init__(self, nom: str, sauvegarder: Callable[[Optional[Callable[[], None]]], None],
+                 parent: Optional[QObject] = None, config_path: str = "config.ini"):
+        """
+        Initialise le planificateur
+        
+        Args:
+            nom: Nom de l'écran (nom du fichier de récupération)
+            sauvegarder: Méthode de sauvegarde de l'écran, appelée avec la
+                         fonction à exécuter une fois l'écriture faite ; elle
+                         doit ensuite appeler sauvegarde_terminee() ou
+                         sauvegarde_echouee()
+            parent: Écran propriétaire
+            config_path: Chemin du fichier de configuration
+        """
+        super().__init__(parent)
+        config = configparser.ConfigParser()
+        if Path(config_path).exists():
+            config.read(config_path, encoding='utf-8')
+        self.delai_ms = config.getint('Autosauvegarde', 'delai_ms', fallback=DELAI_PAR_DEFAUT_MS)
+        
+        self._sauvegarder = sauvegarder
+        self.recuperation = FichierRecuperation(nom)
+        self.contexte: Optional[list] = None  # Données affichées (ex: [mois, annee])
+        self._cellules: Dict[Tuple[int, int], str] = {}  # Saisies pas encore envoyées
+        self._envoyees: Dict[Tuple[int, int], str] = {}  # Saisies envoyées, non confirmées
+        self._envois = 0  # Sauvegardes en cours sur le thread de la base
+        
+        self._minuterie = QTimer(self)
+        self._minuterie.setSingleShot(True)
+        self._minuterie.timeout.connect(self.vider)
+    
+    def definir_contexte(self, contexte: Optional[tuple]):
+        """
+        Indique les données affichées par l'écran
+        
+        Args:
+            contexte: Identifiant des données (ex: (mois, annee)), None si rien
+        """
+        self.contexte = list(contexte) if contexte is not None else None
+    
+    def en_attente(self) -> bool:
+        """Indique s'il reste des modifications à enregistrer"""
+        return bool(self._cellules)
+    
+    def signaler_modification(self, ligne: int, colonne: int, texte: str):
+        """
+        Enregistre une cellule modifiée et relance le délai
+        
+        Args:
+            ligne: Ligne de la cellule
+            colonne: Colonne de la cellule
+            texte: Nouveau texte de la cellule
+        """
+        self.signaler_modifications({(ligne, colonne): texte})
+    
+    def signaler_modifications(self, cellules: Dict[Tuple[int, int], str]):
+        """
+        Enregistre plusieurs cellules modifiées d'un coup (collage, effacement...)
+        
+        Le fichier de récupération n'est écrit qu'une fois pour toutes les cellules.
+        
+        Args:
+            cellules: Nouveau texte par cellule {(ligne, colonne): texte}
+        """
+        if self.contexte is None or not cellules:
+            return
+        
+        self._cellules.update(cellules)
+        self.recuperation.ecrire(self.contexte, {**self._envoyees, **self._cellules})
+        self._minuterie.start(self.delai_ms)
+        self.etat_change.emit(ETAT_MODIFIE)
+    
+    def vider(self, forcer: bool = False, apres: Optional[Callable[[], None]] = None):
+        """
+        Lance tout de suite la sauvegarde des modifications en attente
+        
+        Appelé à l'expiration du délai, avant un changement de données et à
+        la fermeture de l'écran.
+        
+        Args:
+            forcer: Sauvegarder même sans modification (bouton Sauvegarder)
+            apres: Fonction appelée une fois la sauvegarde écrite
+        """
+        self._minuterie.stop()
+        if not self._cellules and not forcer:
+            return
+        
+        self._envoyees.update(self._cellules)
+        self._cellules = {}
+        self._envois += 1
+        self.etat_change.emit(ETAT_EN_COURS)
+        self._sauvegarder(apres)
+    
+    def sauvegarde_terminee(self):
+        """À appeler par l'écran quand une sauvegarde est écrite"""
+        self._envois = max(self._envois - 1, 0)
+        if self._envois:
+            return
+        
+        self._envoyees = {}
+        if self._cellules:
+            # Saisies faites pendant l'écriture : seules elles restent à récupérer
+            self.recuperation.ecrire(self.contexte, self._cellules)
+        else:
+            self.recuperation.effacer()
+            self.etat_change.emit(ETAT_ENREGISTRE)
+    
+    def sauvegarde_echouee(self):
+        """À appeler par l'écran quand une sauvegarde a échoué"""
+        self._envois = max(self._envois - 1, 0)
+        if not self._envois:
+            # Les saisies restent dans le fichier de récupération et
+            # repartiront avec la prochaine sauvegarde
+            self._cellules = {**self._envoyees, **self._cellules}
+            self._envoyees = {}
+        self.etat_change.emit(ETAT_ERREUR)
+    
+    def recuperer(self) -> Optional[Dict[Tuple[int, int], str]]:
+        """
+        Renvoie les saisies conservées pour les données affichées
+        
+        Returns:
+            Texte par cellule {(ligne, colonne): texte}, ou None si le fichier
+            est absent ou concerne d'autres données
+        """
+        if self.contexte is None:
+            return None
+        
+        donnees = self.recuperation.lire()
+        if not donnees or donnees['contexte'] != self.contexte:
+            return None
+        return donnees['cellules']
+    
+    def abandonner_recuperation(self):
+        """Supprime les saisies conservées (refusées par l'utilisateur)"""
+        self.recuperation.effacer()
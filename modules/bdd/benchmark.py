@@ -0,0 +1,104 @@
+"""
+Mesure de la mémoire de pointe des lectures : fetch_all contre fetch_iter
+
+Une base temporaire est remplie de périodes collaborateurs fictives, sur
+un nombre d'années croissant ; chaque méthode de lecture parcourt toute la
+table et la pointe mémoire est relevée avec tracemalloc. Avec fetch_iter,
+la pointe doit rester stable quand le nombre d'années augmente.
+"""
+
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+from .database import Database
+from .models import Periode
+
+
+# Périodes par mois dans les données fictives (semaines)
+PERIODES_PAR_MOIS = 5
+
+REQUETE_PERIODES = "SELECT * FROM suivis_collaborateurs_periodes ORDER BY id"
+
+
+def _remplir(db: Database, annees: int, collaborateurs: int):
+    """Crée la table des périodes et la remplit pour le nombre d'années demandé"""
+    db.execute_query("DROP TABLE IF EXISTS suivis_collaborateurs_periodes")
+    db.execute_query("""
+        CREATE TABLE suivis_collaborateurs_periodes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            suivi_id INTEGER NOT NULL,
+            numero_periode INTEGER NOT NULL,
+            date_debut TEXT NOT NULL,
+            date_fin TEXT NOT NULL,
+            ca_prestation REAL,
+            ca_par_jour REAL,
+            nombre_visites INTEGER,
+            pourcentage_ventes REAL,
+            pourcentage_couleurs REAL,
+            pourcentage_soins REAL
+        )
+    """)
+    db.execute_query(
+        """
+        WITH RECURSIVE n(i) AS (
+            SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i + 1 < ?
+        )
+        INSERT INTO suivis_collaborateurs_periodes
+        (suivi_id, numero_periode, date_debut, date_fin, ca_prestation, ca_par_jour,
+         nombre_visites, pourcentage_ventes, pourcentage_couleurs, pourcentage_soins)
+        SELECT i / ?, i % ? + 1, '2000-01-01', '2000-01-07',
+               1500.0 + i % 700, 250.0 + i % 90, 40 + i % 25, 12.5, 30.0, 8.75
+        FROM n
+        """,
+        (annees * collaborateurs * 12 * PERIODES_PAR_MOIS, PERIODES_PAR_MOIS, PERIODES_PAR_MOIS)
+    )
+
+
+def _pointe(parcours: Callable[[], Iterable]) -> int:
+    """Consomme un parcours et renvoie la pointe mémoire (octets) pendant sa durée"""
+    tracemalloc.start()
+    try:
+        total = 0.0
+        for ligne in parcours():
+            total += ligne['ca_prestation'] or 0
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def mesurer_memoire(annees: Iterable[int] = (1, 5, 10, 20), collaborateurs: int = 100,
+                    batch_size: int = 1000) -> List[Dict[str, int]]:
+    """
+    Mesure la pointe mémoire des lectures pour chaque nombre d'années
+    
+    Args:
+        annees: Nombres d'années de données à tester
+        collaborateurs: Nombre de collaborateurs fictifs
+        batch_size: Taille des lots de fetch_iter
+    
+    Returns:
+        Liste de {'annees', 'lignes', 'fetch_all', 'fetch_iter', 'fetch_iter_modele'}
+        (pointes en octets)
+    """
+    resultats = []
+    with tempfile.TemporaryDirectory() as dossier:
+        db = Database(str(Path(dossier) / "benchmark.db"))
+        try:
+            for nb_annees in annees:
+                _remplir(db, nb_annees, collaborateurs)
+                lignes = db.fetch_one("SELECT COUNT(*) AS n FROM suivis_collaborateurs_periodes")['n']
+                
+                resultats.append({
+                    'annees': nb_annees,
+                    'lignes': lignes,
+                    'fetch_all': _pointe(lambda: db.fetch_all(REQUETE_PERIODES)),
+                    'fetch_iter': _pointe(lambda: db.fetch_iter(REQUETE_PERIODES, batch_size=batch_size)),
+                    'fetch_iter_modele': _pointe(lambda: db.fetch_iter(
+                        REQUETE_PERIODES, batch_size=batch_size, modele=Periode
+                    )),
+                })
+        finally:
+            db.disconnect()
+    return resultats
@@ -0,0 +1,80 @@
+"""
+Cache LRU des données lues par les écrans
+
+Chaque écran garde les derniers jeux de données affichés (un mois, un
+collaborateur pour un mois...) : revenir sur des données déjà lues ne
+relit plus la base. Les écrans invalident les entrées qu'ils modifient.
+
+Le cache n'est utilisé que depuis le thread de l'interface (les lectures
+faites par l'exécuteur y sont rangées dans les rappels).
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class CacheLRU:
+    """Cache de capacité fixe, l'entrée la moins récemment utilisée sort en premier"""
+    
+    def __init__(self, capacite: int = 16):
+        """
+        Initialise le cache
+        
+        Args:
+            capacite: Nombre maximal d'entrées conservées
+        """
+        self.capacite = capacite
+        self._entrees: "OrderedDict[Hashable, Any]" = OrderedDict()
+    
+    def __contains__(self, cle: Hashable) -> bool:
+        return cle in self._entrees
+    
+    def __len__(self) -> int:
+        return len(self._entrees)
+    
+    def get(self, cle: Hashable, defaut: Any = None) -> Any:
+        """
+        Renvoie une entrée et la marque comme la plus récente
+        
+        Args:
+            cle: Clé de l'entrée (ex: (mois, annee))
+            defaut: Valeur renvoyée si la clé est absente
+        
+        Returns:
+            Valeur en cache ou defaut
+        """
+        if cle not in self._entrees:
+            return defaut
+        self._entrees.move_to_end(cle)
+        return self._entrees[cle]
+    
+    def mettre(self, cle: Hashable, valeur: Any):
+        """
+        Ajoute ou remplace une entrée, en retirant la plus ancienne si le cache est plein
+        
+        Args:
+            cle: Clé de l'entrée
+            valeur: Données à conserver
+        """
+        self._entrees[cle] = valeur
+        self._entrees.move_to_end(cle)
+        while len(self._entrees) > self.capacite:
+            self._entrees.popitem(last=False)
+    
+    def invalider(self, cle: Hashable):
+        """Retire une entrée (données modifiées)"""
+        self._entrees.pop(cle, None)
+    
+    def invalider_si(self, condition: Callable[[Hashable], bool]):
+        """
+        Retire les entrées dont la clé vérifie une condition
+        
+        Args:
+            condition: Fonction appelée avec chaque clé (ex: toutes les clés d'un mois)
+        """
+        for cle in [c for c in self._entrees if condition(c)]:
+            del self._entrees[cle]
+    
+    def vider(self):
+        """Retire toutes les entrées"""
+        self._entrees.clear()
@@ -2,24 +2,68 @@
 Gestionnaire de base de données SQLite pour Mallia
 """
 
+import functools
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Type, TypeVar, Callable
+
+from .models import ModeleLigne
+
+
+M = TypeVar('M', bound=ModeleLigne)
+
+
+def ecriture_atomique(echec: Any = None):
+    """
+    Décore une méthode de classe DB dont les écritures forment une transaction
+    
+    Une erreur SQLite levée dans la transaction l'annule entièrement. Appelée
+    hors de toute transaction, la méthode affiche alors l'erreur et renvoie
+    `echec` ; appelée dans une transaction (depuis un lot plus large), elle
+    laisse l'erreur remonter pour que tout le lot soit annulé.
+    
+    Args:
+        echec: Valeur renvoyée en cas d'erreur (False, None...)
+    """
+    def decorateur(methode):
+        @functools.wraps(methode)
+        def enveloppe(self, *args, **kwargs):
+            if self.db.en_transaction():
+                return methode(self, *args, **kwargs)
+            try:
+                return methode(self, *args, **kwargs)
+            except sqlite3.Error as e:
+                print(f"Écriture annulée ({methode.__qualname__}): {e}")
+                return echec
+        return enveloppe
+    return decorateur
 
 
 class Database:
     """Classe pour gérer la connexion et les opérations sur la base de données"""
     
-    def __init__(self, db_path: str = "data/mallia.db"):
+    def __init__(self, db_path: Optional[str] = None):
         """
         Initialise la connexion à la base de données
         
         Args:
             db_path: Chemin vers le fichier de base de données
+                     (par défaut : base du salon actif)
         """
+        if db_path is None:
+            from modules.salons.registre import chemin_base_courante
+            db_path = chemin_base_courante()
+        
         self.db_path = Path(db_path)
         self.connection: Optional[sqlite3.Connection] = None
         self.cursor: Optional[sqlite3.Cursor] = None
+        self._profondeur_transaction = 0  # > 0 : commit différé à la fin de la transaction
+        self._thread_transaction: Optional[int] = None  # Thread de la transaction ouverte
+        # La connexion peut servir au thread de l'interface et à l'exécuteur :
+        # chaque requête (ou transaction) la réserve le temps de son exécution
+        self._verrou = threading.RLock()
         
         # Créer le dossier data s'il n'existe pas
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -30,7 +74,7 @@ class Database:
     def connect(self):
         """Établit la connexion à la base de données"""
         try:
-            self.connection = sqlite3.connect(str(self.db_path))
+            self.connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
             self.connection.row_factory = sqlite3.Row  # Pour accéder aux colonnes par nom
             self.cursor = self.connection.cursor()
             print(f"Connexion établie à la base de données: {self.db_path}")
@@ -54,14 +98,23 @@ class Database:
             
         Returns:
             Curseur avec les résultats ou None en cas d'erreur
+        
+        Raises:
+            sqlite3.Error: Dans une transaction, pour qu'elle soit annulée
         """
         try:
-            self.cursor.execute(query, params)
-            self.connection.commit()
-            return self.cursor
+            # Un curseur par requête : lastrowid et rowcount ne peuvent pas être
+            # écrasés par une requête d'un autre thread
+            with self._verrou:
+                cursor = self.connection.execute(query, params)
+                if self._profondeur_transaction == 0:
+                    self.connection.commit()
+            return cursor
         except sqlite3.Error as e:
             print(f"Erreur lors de l'exécution de la requête: {e}")
             print(f"Requête: {query}")
+            if self.en_transaction():
+                raise
             return None
     
     def execute_many(self, query: str, params_list: List[tuple]) -> bool:
@@ -74,15 +127,59 @@ class Database:
             
         Returns:
             True si succès, False sinon
+        
+        Raises:
+            sqlite3.Error: Dans une transaction, pour qu'elle soit annulée
         """
         try:
-            self.cursor.executemany(query, params_list)
-            self.connection.commit()
+            with self._verrou:
+                self.connection.executemany(query, params_list)
+                if self._profondeur_transaction == 0:
+                    self.connection.commit()
             return True
         except sqlite3.Error as e:
             print(f"Erreur lors de l'exécution multiple: {e}")
+            if self.en_transaction():
+                raise
             return False
     
+    @contextmanager
+    def transaction(self):
+        """
+        Regroupe plusieurs écritures dans une seule transaction
+        
+        Les transactions peuvent être imbriquées : seule la plus externe
+        valide (commit) à sa sortie, ou annule tout (rollback) si une
+        exception la traverse. Une requête qui échoue dans la transaction
+        lève son erreur SQLite : aucune écriture partielle n'est validée.
+        La connexion reste réservée au thread de la transaction jusqu'à sa fin.
+        
+        Usage:
+            with db.transaction():
+                db.execute_query(...)
+                db.execute_query(...)
+        """
+        with self._verrou:
+            self._profondeur_transaction += 1
+            self._thread_transaction = threading.get_ident()
+            try:
+                yield self
+            except Exception:
+                self._profondeur_transaction -= 1
+                if self._profondeur_transaction == 0:
+                    self._thread_transaction = None
+                    self.connection.rollback()
+                raise
+            else:
+                self._profondeur_transaction -= 1
+                if self._profondeur_transaction == 0:
+                    self._thread_transaction = None
+                    self.connection.commit()
+    
+    def en_transaction(self) -> bool:
+        """Indique si le thread appelant est dans une transaction ouverte"""
+        return self._profondeur_transaction > 0 and self._thread_transaction == threading.get_ident()
+    
     def fetch_one(self, query: str, params: tuple = ()) -> Optional[Dict[str, Any]]:
         """
         Récupère un seul enregistrement
@@ -94,11 +191,12 @@ class Database:
         Returns:
             Dictionnaire avec les données ou None
         """
-        cursor = self.execute_query(query, params)
-        if cursor:
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        return None
+        with self._verrou:
+            cursor = self.execute_query(query, params)
+            if cursor:
+                row = cursor.fetchone()
+                return dict(row) if row else None
+            return None
     
     def fetch_all(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         """
@@ -111,11 +209,129 @@ class Database:
         Returns:
             Liste de dictionnaires avec les données
         """
-        cursor = self.execute_query(query, params)
-        if cursor:
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        return []
+        with self._verrou:
+            cursor = self.execute_query(query, params)
+            if cursor:
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
+            return []
+    
+    def fetch_model(self, modele: Type[M], query: str, params: tuple = ()) -> Optional[M]:
+        """
+        Récupère un seul enregistrement sous forme de modèle
+        
+        Args:
+            modele: Classe du modèle (sous-classe de ModeleLigne)
+            query: Requête SQL SELECT
+            params: Paramètres de la requête
+            
+        Returns:
+            Instance du modèle ou None
+        """
+        resultats = self.fetch_models(modele, query, params)
+        return resultats[0] if resultats else None
+    
+    def fetch_models(self, modele: Type[M], query: str, params: tuple = ()) -> List[M]:
+        """
+        Récupère tous les enregistrements sous forme de modèles
+        
+        Les lignes sont lues en tuples bruts (sans sqlite3.Row ni dictionnaire
+        intermédiaire) et construites directement en instances à __slots__.
+        
+        Args:
+            modele: Classe du modèle (sous-classe de ModeleLigne)
+            query: Requête SQL SELECT
+            params: Paramètres de la requête
+            
+        Returns:
+            Liste d'instances du modèle
+        """
+        cursor = self.connection.cursor()
+        cursor.row_factory = None
+        try:
+            with self._verrou:
+                cursor.execute(query, params)
+                lignes = cursor.fetchall()
+            construire = modele.fabrique([colonne[0] for colonne in cursor.description])
+            return [construire(ligne) for ligne in lignes]
+        except sqlite3.Error as e:
+            print(f"Erreur lors de l'exécution de la requête: {e}")
+            print(f"Requête: {query}")
+            return []
+        finally:
+            cursor.close()
+    
+    def fetch_iter(self, query: str, params: tuple = (), batch_size: int = 1000,
+                   modele: Optional[Type[M]] = None) -> Iterator[Any]:
+        """
+        Parcourt les résultats d'une requête sans les charger en mémoire
+        
+        Les lignes sont lues par lots (fetchmany) sur un curseur dédié : la
+        mémoire utilisée reste bornée à un lot, quelle que soit la taille du
+        résultat. Le curseur est fermé à la fin du parcours, ou dès que le
+        générateur est abandonné.
+        
+        Args:
+            query: Requête SQL SELECT
+            params: Paramètres de la requête
+            batch_size: Nombre de lignes lues à chaque appel à fetchmany
+            modele: Classe de modèle (ModeleLigne) à construire ; par défaut
+                    chaque ligne est renvoyée sous forme de dictionnaire
+            
+        Yields:
+            Dictionnaires, ou instances du modèle
+        """
+        def construire(colonnes):
+            if modele is not None:
+                return modele.fabrique(colonnes)
+            return lambda ligne: dict(zip(colonnes, ligne))
+        
+        yield from self._parcourir(query, params, batch_size, construire)
+    
+    def iter_rows(self, query: str, params: tuple = (), batch_size: int = 1000) -> Iterator[tuple]:
+        """
+        Parcourt les résultats d'une requête sous forme de tuples bruts
+        
+        Même lecture par lots que fetch_iter, sans construire de dictionnaire :
+        la variante la plus rapide quand l'ordre des colonnes est connu.
+        
+        Args:
+            query: Requête SQL SELECT
+            params: Paramètres de la requête
+            batch_size: Nombre de lignes lues à chaque appel à fetchmany
+            
+        Yields:
+            Tuples de valeurs, dans l'ordre des colonnes de la requête
+        """
+        yield from self._parcourir(query, params, batch_size, None)
+    
+    def _parcourir(self, query: str, params: tuple, batch_size: int,
+                   construire: Optional[Callable[[List[str]], Callable[[tuple], Any]]]) -> Iterator[Any]:
+        """Lit une requête par lots sur un curseur dédié (tuples bruts si construire est None)"""
+        cursor = self.connection.cursor()
+        cursor.row_factory = None
+        try:
+            with self._verrou:
+                cursor.execute(query, params)
+            convertir = None
+            if construire is not None:
+                convertir = construire([colonne[0] for colonne in cursor.description])
+            
+            while True:
+                # Verrou pris par lot : les autres threads passent entre deux lots
+                with self._verrou:
+                    rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                if convertir is None:
+                    yield from rows
+                else:
+                    yield from map(convertir, rows)
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la lecture de la requête: {e}")
+            print(f"Requête: {query}")
+        finally:
+            cursor.close()
     
     def create_table(self, table_name: str, columns: Dict[str, str]) -> bool:
         """
@@ -0,0 +1,122 @@
+"""
+Exécuteur des appels à la base de données sur un thread dédié
+
+Les écrans soumettent leurs lectures et leurs écritures à un thread unique :
+l'interface ne se bloque plus pendant un accès disque lent (disque réseau,
+sauvegarde en cours...), et les écritures sont exécutées une par une, dans
+l'ordre où elles ont été soumises.
+
+Les demandes d'un même canal (ex: "chargement") se remplacent : une demande
+encore en attente est annulée par la suivante, et le résultat d'une demande
+dépassée n'est jamais livré.
+"""
+
+import concurrent.futures
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class ExecuteurBDD:
+    """File d'exécution des appels base de données, sur un seul thread"""
+    
+    def __init__(self):
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mallia-bdd")
+        self._verrou = threading.Lock()
+        self._derniers: Dict[Hashable, Future] = {}  # Dernière demande de chaque canal
+    
+    def soumettre(self, fonction: Callable[..., Any], *args,
+                  canal: Optional[Hashable] = None, **kwargs) -> Future:
+        """
+        Ajoute un appel à la file
+        
+        Args:
+            fonction: Fonction à exécuter sur le thread de la base
+            *args, **kwargs: Arguments de la fonction
+            canal: Canal de la demande (ex: "chargement", ou (écran, "chargement")
+                   pour un canal propre à un écran) ; une nouvelle demande sur
+                   le même canal annule la précédente si elle n'a pas encore commencé
+        
+        Returns:
+            Future du résultat
+        """
+        with self._verrou:
+            future = self._pool.submit(fonction, *args, **kwargs)
+            if canal is not None:
+                precedent = self._derniers.get(canal)
+                if precedent is not None:
+                    precedent.cancel()
+                self._derniers[canal] = future
+                future.canal = canal
+        return future
+    
+    def est_perime(self, future: Future) -> bool:
+        """
+        Indique si une demande a été remplacée par une plus récente de son canal
+        
+        Args:
+            future: Future renvoyée par soumettre()
+        
+        Returns:
+            True si le résultat ne doit plus être utilisé
+        """
+        if future.cancelled():
+            return True
+        canal = getattr(future, 'canal', None)
+        if canal is None:
+            return False
+        with self._verrou:
+            return self._derniers.get(canal) is not future
+    
+    def annuler(self, canal: Hashable):
+        """
+        Rend périmée la dernière demande d'un canal (données déjà disponibles)
+        
+        Args:
+            canal: Canal de la demande
+        """
+        with self._verrou:
+            precedent = self._derniers.pop(canal, None)
+        if precedent is not None:
+            precedent.cancel()
+    
+    def attendre(self, delai: Optional[float] = None) -> bool:
+        """
+        Attend que toutes les demandes déjà soumises soient exécutées
+        
+        Args:
+            delai: Délai maximal en secondes (None : sans limite)
+        
+        Returns:
+            True si la file a été vidée dans le délai
+        """
+        try:
+            self._pool.submit(lambda: None).result(timeout=delai)
+            return True
+        except concurrent.futures.TimeoutError:
+            return False
+    
+    def arreter(self):
+        """Termine les demandes en cours puis arrête le thread"""
+        self._pool.shutdown(wait=True)
+
+
+_executeur: Optional[ExecuteurBDD] = None
+_executeur_verrou = threading.Lock()
+
+
+def get_executeur() -> ExecuteurBDD:
+    """
+    Renvoie l'exécuteur partagé par tous les écrans
+    
+    Un seul thread pour toute l'application : les écritures des différents
+    modules sont sérialisées entre elles.
+    
+    Returns:
+        Exécuteur partagé
+    """
+    global _executeur
+    with _executeur_verrou:
+        if _executeur is None:
+            _executeur = ExecuteurBDD()
+        return _executeur
@@ -0,0 +1,81 @@
+"""
+Livraison des résultats de l'exécuteur base de données au thread de l'interface
+
+Module séparé de executeur.py pour que modules.bdd reste utilisable sans
+PySide6 (ligne de commande).
+"""
+
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+from .executeur import ExecuteurBDD, get_executeur
+
+
+class ExecuteurQt(QObject):
+    """Soumet des appels à l'exécuteur et rappelle l'écran sur le thread Qt"""
+    
+    # Émis depuis le thread de la base, reçu (connexion en file) sur le thread Qt
+    _termine = Signal(object, object)  # Future, (rappel, erreur)
+    
+    def __init__(self, parent: Optional[QObject] = None, executeur: Optional[ExecuteurBDD] = None):
+        super().__init__(parent)
+        self.executeur = executeur or get_executeur()
+        self._termine.connect(self._livrer)
+    
+    def executer(self, fonction: Callable[..., Any], *args,
+                 rappel: Optional[Callable[[Any], None]] = None,
+                 erreur: Optional[Callable[[BaseException], None]] = None,
+                 canal: Optional[str] = None, **kwargs) -> Future:
+        """
+        Exécute une fonction sur le thread de la base
+        
+        Args:
+            fonction: Fonction à exécuter (lectures / écritures en base)
+            *args, **kwargs: Arguments de la fonction
+            rappel: Appelé sur le thread Qt avec le résultat
+            erreur: Appelé sur le thread Qt avec l'exception levée
+            canal: Canal de la demande (une demande plus récente du même
+                   canal de cet écran annule celle-ci, et son résultat n'est pas livré)
+        
+        Returns:
+            Future du résultat
+        """
+        future = self.executeur.soumettre(fonction, *args, canal=self._canal(canal), **kwargs)
+        future.add_done_callback(lambda f: self._termine.emit(f, (rappel, erreur)))
+        return future
+    
+    def annuler(self, canal: str):
+        """Abandonne la demande en cours d'un canal : son résultat ne sera pas livré"""
+        self.executeur.annuler(self._canal(canal))
+    
+    def _canal(self, canal: Optional[str]) -> Optional[tuple]:
+        """
+        Canal propre à cet écran dans l'exécuteur partagé
+        
+        Tous les écrans partagent le même exécuteur : sans cette portée, le
+        chargement d'un écran annulerait celui d'un autre écran.
+        """
+        return None if canal is None else (id(self), canal)
+    
+    def attendre(self, delai: Optional[float] = None) -> bool:
+        """Attend la fin des demandes soumises (fermeture de l'écran)"""
+        return self.executeur.attendre(delai)
+    
+    def _livrer(self, future: Future, rappels: tuple):
+        """Transmet le résultat à l'écran, sauf si la demande est dépassée"""
+        if self.executeur.est_perime(future):
+            return
+        
+        rappel, erreur = rappels
+        exception = future.exception()
+        if exception is not None:
+            if erreur:
+                erreur(exception)
+            else:
+                print(f"Erreur lors de l'accès à la base de données: {exception}")
+            return
+        
+        if rappel:
+            rappel(future.result())
@@ -0,0 +1,458 @@
+"""
+Journal des modifications de la base de données (annuler / rétablir)
+
+Chaque écriture faite par les classes DB à travers le journal enregistre,
+colonne par colonne, l'ancienne et la nouvelle valeur. Les écritures d'une
+même action utilisateur forment un lot, écrit dans une seule transaction.
+Annuler un lot rejoue ses modifications à l'envers ; rétablir les rejoue
+dans l'ordre. Seuls les derniers lots sont conservés (section [Journal] de
+config.ini).
+"""
+
+import configparser
+import threading
+from contextlib import contextmanager
+from itertools import groupby
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from .database import Database, ecriture_atomique
+
+
+# Nombre de lots conservés par module (0 = illimité)
+LOTS_MAX_DEFAUT = 200
+
+
+class JournalModifications:
+    """Journal des modifications d'un module, avec piles annuler/rétablir"""
+    
+    def __init__(self, db: Database, portee: str, config_path: str = "config.ini"):
+        """
+        Initialise le journal
+        
+        Args:
+            db: Connexion utilisée pour les écritures journalisées
+            portee: Nom du module propriétaire (chaque module a sa propre pile)
+            config_path: Chemin du fichier de configuration (lots_max)
+        """
+        config = configparser.ConfigParser()
+        if Path(config_path).exists():
+            config.read(config_path, encoding='utf-8')
+        
+        self.db = db
+        self.portee = portee
+        self.lots_max = config.getint('Journal', 'lots_max', fallback=LOTS_MAX_DEFAUT)
+        # Lot en cours propre à chaque thread (interface et exécuteur écrivent tous deux)
+        self._local = threading.local()
+        self._create_tables()
+    
+    def _create_tables(self):
+        """Crée les tables du journal"""
+        
+        # Un lot = une action utilisateur (une saisie, une réinitialisation...)
+        lots_table = {
+            "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+            "portee": "TEXT NOT NULL",
+            "libelle": "TEXT",
+            "etat": "TEXT NOT NULL DEFAULT 'actif'",  # actif, annule (abandonne : anciennes bases)
+            "ordre_annulation": "INTEGER",  # Position dans la pile rétablir
+            "horodatage": "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
+        }
+        
+        # Les valeurs sont en BLOB (aucune affinité) pour conserver leur type d'origine
+        modifications_table = {
+            "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+            "lot_id": "INTEGER NOT NULL",
+            "operation": "TEXT NOT NULL",  # INSERT, UPDATE, DELETE
+            "table_nom": "TEXT NOT NULL",
+            "ligne_id": "INTEGER NOT NULL",
+            "colonne": "TEXT NOT NULL",
+            "ancienne": "BLOB",
+            "nouvelle": "BLOB",
+            "FOREIGN KEY (lot_id)": "REFERENCES journal_lots(id)"
+        }
+        
+        if not self.db.table_exists("journal_lots"):
+            self.db.create_table("journal_lots", lots_table)
+            self.db.execute_query(
+                "CREATE INDEX IF NOT EXISTS idx_journal_lots_portee ON journal_lots (portee, etat)"
+            )
+            print("Table 'journal_lots' créée avec succès")
+        
+        if not self.db.table_exists("journal_modifications"):
+            self.db.create_table("journal_modifications", modifications_table)
+            self.db.execute_query(
+                "CREATE INDEX IF NOT EXISTS idx_journal_modifications_lot ON journal_modifications (lot_id)"
+            )
+            print("Table 'journal_modifications' créée avec succès")
+    
+    # ========== LOTS ==========
+    
+    @contextmanager
+    def lot(self, libelle: str = ""):
+        """
+        Regroupe les écritures suivantes en une seule action annulable
+        
+        Le lot est écrit dans une transaction ; il n'est créé dans le journal
+        qu'à la première modification effective. Un lot ouvert dans un autre
+        lot du même thread s'y fond ; un lot ouvert par un autre thread attend
+        la fin de la transaction en cours.
+        
+        Args:
+            libelle: Description de l'action (ex: "Saisie", "Réinitialisation")
+        """
+        etat = self._local
+        if getattr(etat, 'dans_lot', False):
+            yield
+            return
+        
+        etat.dans_lot = True
+        etat.libelle = libelle
+        etat.lot_id = None
+        try:
+            with self.db.transaction():
+                yield
+        finally:
+            etat.dans_lot = False
+            etat.lot_id = None
+    
+    def _lot_courant(self) -> int:
+        """Crée le lot courant à la première modification"""
+        etat = self._local
+        if etat.lot_id is None:
+            # Une nouvelle action vide la pile rétablir
+            self._supprimer_lots(
+                "SELECT id FROM journal_lots WHERE portee = ? AND etat IN ('annule', 'abandonne')",
+                (self.portee,)
+            )
+            cursor = self.db.execute_query(
+                "INSERT INTO journal_lots (portee, libelle) VALUES (?, ?)",
+                (self.portee, etat.libelle)
+            )
+            etat.lot_id = cursor.lastrowid
+            
+            # Seuls les lots_max derniers lots restent annulables
+            if self.lots_max > 0:
+                self._supprimer_lots(
+                    "SELECT id FROM journal_lots WHERE portee = ? ORDER BY id DESC LIMIT -1 OFFSET ?",
+                    (self.portee, self.lots_max)
+                )
+        return etat.lot_id
+    
+    def _supprimer_lots(self, selection: str, params: tuple):
+        """Supprime du journal les lots sélectionnés et leurs modifications"""
+        self.db.execute_query(
+            f"DELETE FROM journal_modifications WHERE lot_id IN ({selection})", params
+        )
+        self.db.execute_query(f"DELETE FROM journal_lots WHERE id IN ({selection})", params)
+    
+    def _enregistrer(self, operation: str, table: str, ligne_id: int,
+                     anciennes: Dict[str, Any], nouvelles: Dict[str, Any]):
+        """Enregistre une modification, une entrée par colonne"""
+        colonnes = list(anciennes) if operation == "DELETE" else list(nouvelles)
+        if not colonnes:
+            return
+        
+        lot_id = self._lot_courant()
+        self.db.execute_many(
+            """
+            INSERT INTO journal_modifications
+            (lot_id, operation, table_nom, ligne_id, colonne, ancienne, nouvelle)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [(lot_id, operation, table, ligne_id, colonne,
+              anciennes.get(colonne), nouvelles.get(colonne)) for colonne in colonnes]
+        )
+    
+    # ========== ÉCRITURES JOURNALISÉES ==========
+    
+    def _get_ligne(self, table: str, ligne_id: int) -> Optional[Dict[str, Any]]:
+        """Récupère une ligne complète par son id"""
+        return self.db.fetch_one(f"SELECT * FROM {table} WHERE id = ?", (ligne_id,))
+    
+    @ecriture_atomique(None)
+    def inserer(self, table: str, valeurs: Dict[str, Any]) -> Optional[int]:
+        """
+        Insère une ligne et la journalise
+        
+        Args:
+            table: Nom de la table
+            valeurs: Dictionnaire {colonne: valeur}
+        
+        Returns:
+            ID de la ligne créée ou None si erreur
+        """
+        with self.lot():
+            colonnes = ", ".join(valeurs)
+            marqueurs = ", ".join("?" for _ in valeurs)
+            cursor = self.db.execute_query(
+                f"INSERT INTO {table} ({colonnes}) VALUES ({marqueurs})",
+                tuple(valeurs.values())
+            )
+            if not cursor:
+                return None
+            
+            ligne_id = cursor.lastrowid
+            ligne = self._get_ligne(table, ligne_id) or {}
+            self._enregistrer("INSERT", table, ligne_id, {},
+                              {k: v for k, v in ligne.items() if v is not None})
+            return ligne_id
+    
+    @ecriture_atomique(None)
+    def mettre_a_jour(self, table: str, ligne_id: int, valeurs: Dict[str, Any]) -> Optional[int]:
+        """
+        Met à jour une ligne en n'écrivant que les colonnes qui changent
+        
+        Args:
+            table: Nom de la table
+            ligne_id: ID de la ligne
+            valeurs: Dictionnaire {colonne: nouvelle valeur}
+        
+        Returns:
+            Nombre de colonnes modifiées (0 si rien ne change) ou None si erreur
+        """
+        with self.lot():
+            ligne = self._get_ligne(table, ligne_id)
+            if ligne is None:
+                return None
+            
+            modifiees = {k: v for k, v in valeurs.items() if ligne.get(k) != v}
+            if not modifiees:
+                return 0
+            
+            affectations = ", ".join(f"{colonne} = ?" for colonne in modifiees)
+            cursor = self.db.execute_query(
+                f"UPDATE {table} SET {affectations} WHERE id = ?",
+                tuple(modifiees.values()) + (ligne_id,)
+            )
+            if not cursor:
+                return None
+            
+            self._enregistrer("UPDATE", table, ligne_id,
+                              {k: ligne[k] for k in modifiees}, modifiees)
+            return len(modifiees)
+    
+    @ecriture_atomique(None)
+    def inserer_ou_mettre_a_jour(self, table: str, colonnes_cle: List[str],
+                                 lignes: List[Dict[str, Any]],
+                                 colonne_horodatage: Optional[str] = None) -> Optional[int]:
+        """
+        Insère ou met à jour plusieurs lignes en une seule requête et les journalise
+        
+        Les lignes existantes (même clé) sont lues en une requête avant et
+        après l'écriture ; seules les colonnes qui changent sont journalisées.
+        
+        Args:
+            table: Nom de la table
+            colonnes_cle: Colonnes d'une contrainte UNIQUE de la table (ex: ["annee", "mois"])
+            lignes: Lignes {colonne: valeur}, toutes avec les mêmes colonnes (clé comprise)
+            colonne_horodatage: Colonne mise à CURRENT_TIMESTAMP sur les lignes modifiées
+        
+        Returns:
+            Nombre de lignes insérées ou modifiées ou None si erreur
+        """
+        if not lignes:
+            return 0
+        
+        colonnes = list(lignes[0])
+        autres = [colonne for colonne in colonnes if colonne not in colonnes_cle]
+        cle = ", ".join(colonnes_cle)
+        valeurs_cle = "({})".format(", ".join("?" for _ in colonnes_cle))
+        query_lignes = (
+            f"SELECT * FROM {table} WHERE ({cle}) IN (VALUES {', '.join([valeurs_cle] * len(lignes))})"
+        )
+        params_cle = tuple(ligne[colonne] for ligne in lignes for colonne in colonnes_cle)
+        
+        def lire() -> Dict[tuple, Dict[str, Any]]:
+            return {
+                tuple(ligne[colonne] for colonne in colonnes_cle): ligne
+                for ligne in self.db.fetch_all(query_lignes, params_cle)
+            }
+        
+        # Seules les lignes qui changent sont réécrites (et horodatées)
+        affectations = [f"{colonne} = excluded.{colonne}" for colonne in autres]
+        if colonne_horodatage:
+            affectations.append(f"{colonne_horodatage} = CURRENT_TIMESTAMP")
+        if autres:
+            liste = ", ".join(autres)
+            liste_exclue = ", ".join(f"excluded.{colonne}" for colonne in autres)
+            conflit = (f"DO UPDATE SET {', '.join(affectations)} "
+                       f"WHERE ({liste}) IS NOT ({liste_exclue})")
+        else:
+            conflit = "DO NOTHING"
+        marqueurs = "({})".format(", ".join("?" for _ in colonnes))
+        query = f"""
+            INSERT INTO {table} ({', '.join(colonnes)})
+            VALUES {', '.join([marqueurs] * len(lignes))}
+            ON CONFLICT ({cle}) {conflit}
+        """
+        
+        with self.lot():
+            avant = lire()
+            cursor = self.db.execute_query(
+                query, tuple(ligne[colonne] for ligne in lignes for colonne in colonnes)
+            )
+            if not cursor:
+                return None
+            
+            nb_ecrites = 0
+            for cle_ligne, ligne in lire().items():
+                ancienne = avant.get(cle_ligne)
+                if ancienne is None:
+                    self._enregistrer("INSERT", table, ligne['id'], {},
+                                      {k: v for k, v in ligne.items() if v is not None})
+                    nb_ecrites += 1
+                    continue
+                
+                modifiees = {k: ligne[k] for k in autres if ancienne.get(k) != ligne[k]}
+                if modifiees:
+                    self._enregistrer("UPDATE", table, ligne['id'],
+                                      {k: ancienne[k] for k in modifiees}, modifiees)
+                    nb_ecrites += 1
+            return nb_ecrites
+    
+    @ecriture_atomique(False)
+    def supprimer(self, table: str, condition: str, params: tuple = ()) -> bool:
+        """
+        Supprime des lignes en journalisant leur contenu
+        
+        Args:
+            table: Nom de la table
+            condition: Clause WHERE (sans le mot-clé)
+            params: Paramètres de la condition
+        
+        Returns:
+            True si succès, False sinon
+        """
+        with self.lot():
+            lignes = self.db.fetch_iter(f"SELECT * FROM {table} WHERE {condition}", params)
+            for ligne in lignes:
+                self._enregistrer("DELETE", table, ligne['id'],
+                                  {k: v for k, v in ligne.items() if v is not None}, {})
+            
+            cursor = self.db.execute_query(f"DELETE FROM {table} WHERE {condition}", params)
+            return cursor is not None
+    
+    # ========== ANNULER / RÉTABLIR ==========
+    
+    def peut_annuler(self) -> bool:
+        """Indique s'il existe une action à annuler"""
+        return self.db.fetch_one(
+            "SELECT 1 FROM journal_lots WHERE portee = ? AND etat = 'actif' LIMIT 1",
+            (self.portee,)
+        ) is not None
+    
+    def peut_retablir(self) -> bool:
+        """Indique s'il existe une action annulée à rétablir"""
+        return self.db.fetch_one(
+            "SELECT 1 FROM journal_lots WHERE portee = ? AND etat = 'annule' LIMIT 1",
+            (self.portee,)
+        ) is not None
+    
+    @ecriture_atomique([])
+    def annuler(self) -> List[Dict[str, Any]]:
+        """
+        Annule la dernière action du module
+        
+        Returns:
+            Lignes touchées : liste de {'table', 'id', 'avant', 'apres'} où
+            'avant' et 'apres' sont la ligne complète (None si absente)
+        """
+        lot = self.db.fetch_one(
+            """
+            SELECT * FROM journal_lots
+            WHERE portee = ? AND etat = 'actif'
+            ORDER BY id DESC LIMIT 1
+            """,
+            (self.portee,)
+        )
+        if not lot:
+            return []
+        
+        with self.db.transaction():
+            lignes = self._rejouer(lot['id'], inverse=True)
+            self.db.execute_query(
+                """
+                UPDATE journal_lots
+                SET etat = 'annule',
+                    ordre_annulation = (SELECT COALESCE(MAX(ordre_annulation), 0) + 1
+                                        FROM journal_lots WHERE portee = ?)
+                WHERE id = ?
+                """,
+                (self.portee, lot['id'])
+            )
+        return lignes
+    
+    @ecriture_atomique([])
+    def retablir(self) -> List[Dict[str, Any]]:
+        """
+        Rétablit la dernière action annulée du module
+        
+        Returns:
+            Lignes touchées, au même format que annuler()
+        """
+        lot = self.db.fetch_one(
+            """
+            SELECT * FROM journal_lots
+            WHERE portee = ? AND etat = 'annule'
+            ORDER BY ordre_annulation DESC LIMIT 1
+            """,
+            (self.portee,)
+        )
+        if not lot:
+            return []
+        
+        with self.db.transaction():
+            lignes = self._rejouer(lot['id'], inverse=False)
+            self.db.execute_query(
+                "UPDATE journal_lots SET etat = 'actif', ordre_annulation = NULL WHERE id = ?",
+                (lot['id'],)
+            )
+        return lignes
+    
+    def _rejouer(self, lot_id: int, inverse: bool) -> List[Dict[str, Any]]:
+        """Rejoue les modifications d'un lot, à l'endroit ou à l'envers"""
+        modifications = self.db.fetch_all(
+            "SELECT * FROM journal_modifications WHERE lot_id = ? ORDER BY id",
+            (lot_id,)
+        )
+        
+        # Une écriture = les entrées consécutives d'une même ligne
+        ecritures = [
+            (cle, list(entrees)) for cle, entrees in groupby(
+                modifications, key=lambda m: (m['operation'], m['table_nom'], m['ligne_id'])
+            )
+        ]
+        if inverse:
+            ecritures.reverse()
+        
+        touchees: Dict[tuple, Dict[str, Any]] = {}
+        for (operation, table, ligne_id), entrees in ecritures:
+            cle = (table, ligne_id)
+            if cle not in touchees:
+                touchees[cle] = {'table': table, 'id': ligne_id,
+                                 'avant': self._get_ligne(table, ligne_id)}
+            
+            valeurs = {e['colonne']: e['ancienne' if inverse else 'nouvelle'] for e in entrees}
+            
+            if operation == ("INSERT" if inverse else "DELETE"):
+                # Annuler une insertion ou rétablir une suppression
+                self.db.execute_query(f"DELETE FROM {table} WHERE id = ?", (ligne_id,))
+            elif operation == "UPDATE":
+                affectations = ", ".join(f"{colonne} = ?" for colonne in valeurs)
+                self.db.execute_query(
+                    f"UPDATE {table} SET {affectations} WHERE id = ?",
+                    tuple(valeurs.values()) + (ligne_id,)
+                )
+            else:
+                # Annuler une suppression ou rétablir une insertion
+                colonnes = ", ".join(valeurs)
+                marqueurs = ", ".join("?" for _ in valeurs)
+                self.db.execute_query(
+                    f"INSERT INTO {table} ({colonnes}) VALUES ({marqueurs})",
+                    tuple(valeurs.values())
+                )
+        
+        for ligne in touchees.values():
+            ligne['apres'] = self._get_ligne(ligne['table'], ligne['id'])
+        return list(touchees.values())
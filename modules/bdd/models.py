@@ -3,7 +3,8 @@ Modèles de données pour la base de données
 Ce fichier sera enrichi au fur et à mesure du développement des modules
 """
 
-from typing import Dict, Any, Optional
+from operator import itemgetter
+from typing import Dict, Any, Optional, Callable, Sequence, Tuple
 from datetime import datetime
 
 
@@ -58,5 +59,188 @@ class ConfigModel(BaseModel):
         return f"ConfigModel(id={self.id}, key='{self.key}', value='{self.value}')"
 
 
-# Les autres modèles seront ajoutés ici au fur et à mesure
-# du développement des modules (Utilisateurs, Collaborateurs, Planning, etc.)
\ No newline at end of file
+class ModeleLigne:
+    """
+    Classe de base des modèles compacts construits depuis les lignes SQLite
+    
+    Les attributs sont déclarés dans __slots__ (pas de __dict__ par instance) :
+    une ligne occupe nettement moins de mémoire qu'un dictionnaire. Les
+    modèles restent lisibles comme un dictionnaire (ligne['ca_total'],
+    ligne.get('ca_total')) pour le code existant.
+    """
+    
+    __slots__ = ()
+    
+    def __getitem__(self, cle: str) -> Any:
+        try:
+            return getattr(self, cle)
+        except AttributeError:
+            raise KeyError(cle) from None
+    
+    def get(self, cle: str, defaut: Any = None) -> Any:
+        """Renvoie la valeur d'un champ, ou defaut si le champ n'existe pas"""
+        return getattr(self, cle, defaut)
+    
+    def __contains__(self, cle: str) -> bool:
+        return cle in self.__slots__
+    
+    def keys(self) -> Tuple[str, ...]:
+        """Noms des champs, dans l'ordre de déclaration"""
+        return self.__slots__
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convertit le modèle en dictionnaire
+        
+        Returns:
+            Dictionnaire {champ: valeur}
+        """
+        return {champ: getattr(self, champ) for champ in self.__slots__}
+    
+    def __eq__(self, autre: Any) -> bool:
+        if type(autre) is not type(self):
+            return NotImplemented
+        return all(getattr(self, c) == getattr(autre, c) for c in self.__slots__)
+    
+    def __repr__(self):
+        champs = ", ".join(f"{c}={getattr(self, c)!r}" for c in self.__slots__)
+        return f"{type(self).__name__}({champs})"
+    
+    @classmethod
+    def fabrique(cls, colonnes: Sequence[str]) -> Callable[[tuple], "ModeleLigne"]:
+        """
+        Prépare la construction d'instances depuis des tuples de résultat
+        
+        La correspondance colonne -> champ est calculée une seule fois par
+        requête ; chaque ligne est ensuite construite par un itemgetter et un
+        appel positionnel. Les champs absents de la requête valent None et les
+        colonnes en trop sont ignorées.
+        
+        Args:
+            colonnes: Noms des colonnes de la requête (cursor.description)
+            
+        Returns:
+            Fonction tuple -> instance du modèle
+        """
+        positions = {nom: index for index, nom in enumerate(colonnes)}
+        
+        if all(champ in positions for champ in cls.__slots__):
+            extraire = itemgetter(*(positions[champ] for champ in cls.__slots__))
+            return lambda ligne: cls(*extraire(ligne))
+        
+        # Champs manquants : ils pointent sur un None ajouté en fin de ligne
+        absent = len(colonnes)
+        extraire = itemgetter(*(positions.get(champ, absent) for champ in cls.__slots__))
+        return lambda ligne: cls(*extraire(ligne + (None,)))
+
+
+class Collaborateur(ModeleLigne):
+    """Modèle pour la table collaborateurs"""
+    
+    __slots__ = ('id', 'nom', 'prenom', 'etat', 'ordre', 'date_entree',
+                 'date_inactivation', 'date_creation', 'date_modification')
+    
+    def __init__(self, id: Optional[int] = None, nom: str = "", prenom: str = "",
+                 etat: str = "Actif", ordre: int = 0, date_entree: Optional[str] = None,
+                 date_inactivation: Optional[str] = None, date_creation: Optional[str] = None,
+                 date_modification: Optional[str] = None):
+        self.id = id
+        self.nom = nom
+        self.prenom = prenom
+        self.etat = etat
+        self.ordre = ordre
+        self.date_entree = date_entree
+        self.date_inactivation = date_inactivation
+        self.date_creation = date_creation
+        self.date_modification = date_modification
+
+
+class Suivi(ModeleLigne):
+    """Modèle pour les tables suivis_manager et suivis_collaborateurs"""
+    
+    __slots__ = ('id', 'collaborateur_id', 'mois', 'annee', 'created_at', 'updated_at')
+    
+    def __init__(self, id: Optional[int] = None, collaborateur_id: Optional[int] = None,
+                 mois: int = 1, annee: int = 0, created_at: Optional[str] = None,
+                 updated_at: Optional[str] = None):
+        self.id = id
+        self.collaborateur_id = collaborateur_id  # None pour un suivi Manager
+        self.mois = mois
+        self.annee = annee
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+
+class Periode(ModeleLigne):
+    """Modèle pour les tables suivis_manager_periodes et suivis_collaborateurs_periodes"""
+    
+    __slots__ = ('id', 'suivi_id', 'numero_periode', 'date_debut', 'date_fin',
+                 'ca_total', 'ca_prestation', 'ca_par_jour', 'nombre_visites',
+                 'pourcentage_ventes', 'pourcentage_couleurs', 'pourcentage_soins')
+    
+    def __init__(self, id: Optional[int] = None, suivi_id: Optional[int] = None,
+                 numero_periode: int = 1, date_debut: str = "", date_fin: str = "",
+                 ca_total: Optional[float] = None, ca_prestation: Optional[float] = None,
+                 ca_par_jour: Optional[float] = None, nombre_visites: Optional[int] = None,
+                 pourcentage_ventes: Optional[float] = None,
+                 pourcentage_couleurs: Optional[float] = None,
+                 pourcentage_soins: Optional[float] = None):
+        self.id = id
+        self.suivi_id = suivi_id
+        self.numero_periode = numero_periode
+        self.date_debut = date_debut
+        self.date_fin = date_fin
+        self.ca_total = ca_total  # Périodes Manager
+        self.ca_prestation = ca_prestation  # Périodes Collaborateurs
+        self.ca_par_jour = ca_par_jour
+        self.nombre_visites = nombre_visites
+        self.pourcentage_ventes = pourcentage_ventes
+        self.pourcentage_couleurs = pourcentage_couleurs
+        self.pourcentage_soins = pourcentage_soins
+
+
+class Objectif(ModeleLigne):
+    """Modèle pour la table objectifs_mensuels"""
+    
+    __slots__ = ('id', 'annee', 'mois', 'ca_total', 'ca_jour', 'nb_clients',
+                 'pct_ventes', 'pct_couleurs', 'pct_soins', 'created_at', 'updated_at')
+    
+    def __init__(self, id: Optional[int] = None, annee: int = 0, mois: int = 1,
+                 ca_total: Optional[float] = None, ca_jour: Optional[float] = None,
+                 nb_clients: Optional[int] = None, pct_ventes: Optional[float] = None,
+                 pct_couleurs: Optional[float] = None, pct_soins: Optional[float] = None,
+                 created_at: Optional[str] = None, updated_at: Optional[str] = None):
+        self.id = id
+        self.annee = annee
+        self.mois = mois
+        self.ca_total = ca_total
+        self.ca_jour = ca_jour
+        self.nb_clients = nb_clients
+        self.pct_ventes = pct_ventes
+        self.pct_couleurs = pct_couleurs
+        self.pct_soins = pct_soins
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+
+class ObjectifCollaborateur(ModeleLigne):
+    """Modèle pour la table objectifs_collaborateurs"""
+    
+    __slots__ = ('id', 'annee', 'ca_prestation', 'ca_jour', 'nb_visites',
+                 'pct_ventes', 'pct_couleurs', 'pct_soins', 'created_at', 'updated_at')
+    
+    def __init__(self, id: Optional[int] = None, annee: int = 0,
+                 ca_prestation: Optional[float] = None, ca_jour: Optional[float] = None,
+                 nb_visites: Optional[float] = None, pct_ventes: Optional[float] = None,
+                 pct_couleurs: Optional[float] = None, pct_soins: Optional[float] = None,
+                 created_at: Optional[str] = None, updated_at: Optional[str] = None):
+        self.id = id
+        self.annee = annee
+        self.ca_prestation = ca_prestation
+        self.ca_jour = ca_jour
+        self.nb_visites = nb_visites
+        self.pct_ventes = pct_ventes
+        self.pct_couleurs = pct_couleurs
+        self.pct_soins = pct_soins
+        self.created_at = created_at
+        self.updated_at = updated_at
@@ -0,0 +1,87 @@
+"""
+Fichier de récupération des saisies pas encore enregistrées
+
+Entre une modification et sa sauvegarde automatique, les cellules modifiées
+d'un écran sont recopiées dans un petit fichier JSON à côté de la base du
+salon. Si l'application s'arrête brutalement, l'écran retrouve ces saisies
+au prochain chargement. Le fichier est supprimé dès que tout est enregistré.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+class FichierRecuperation:
+    """Saisies en attente d'un écran, conservées sur le disque"""
+    
+    def __init__(self, nom: str, db_path: Optional[str] = None):
+        """
+        Initialise le fichier de récupération
+        
+        Args:
+            nom: Nom de l'écran (ex: "suivis_manager")
+            db_path: Base de données concernée (par défaut : base du salon actif)
+        """
+        if db_path is None:
+            from modules.salons.registre import chemin_base_courante
+            db_path = chemin_base_courante()
+        
+        base = Path(db_path)
+        self.chemin = base.with_name(f"{base.stem}.recuperation_{nom}.json")
+    
+    def ecrire(self, contexte: list, cellules: Dict[Tuple[int, int], str]):
+        """
+        Remplace le contenu du fichier
+        
+        Args:
+            contexte: Données affichées (ex: [mois, annee])
+            cellules: Texte saisi par cellule {(ligne, colonne): texte}
+        """
+        donnees = {
+            'contexte': contexte,
+            'horodatage': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'cellules': [[ligne, colonne, texte] for (ligne, colonne), texte in cellules.items()]
+        }
+        
+        # Écriture dans un fichier temporaire puis renommage : un arrêt
+        # pendant l'écriture ne laisse jamais un fichier tronqué
+        temporaire = self.chemin.with_suffix(".tmp")
+        try:
+            self.chemin.parent.mkdir(parents=True, exist_ok=True)
+            with open(temporaire, 'w', encoding='utf-8') as f:
+                json.dump(donnees, f, ensure_ascii=False)
+            os.replace(temporaire, self.chemin)
+        except OSError as e:
+            print(f"Erreur lors de l'écriture du fichier de récupération: {e}")
+    
+    def lire(self) -> Optional[dict]:
+        """
+        Lit les saisies conservées
+        
+        Returns:
+            {'contexte', 'horodatage', 'cellules': {(ligne, colonne): texte}}
+            ou None s'il n'y a rien à récupérer
+        """
+        if not self.chemin.exists():
+            return None
+        
+        try:
+            with open(self.chemin, 'r', encoding='utf-8') as f:
+                donnees = json.load(f)
+            donnees['cellules'] = {
+                (ligne, colonne): texte for ligne, colonne, texte in donnees['cellules']
+            }
+            return donnees
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Fichier de récupération illisible ({self.chemin}): {e}")
+            return None
+    
+    def effacer(self):
+        """Supprime le fichier (tout est enregistré)"""
+        try:
+            self.chemin.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"Impossible de supprimer {self.chemin}: {e}")
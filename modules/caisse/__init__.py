@@ -0,0 +1,11 @@
+"""
+Module Caisse - Import des tickets de caisse et calcul des suivis
+"""
+
+from .database import CaisseDB, CATEGORIES
+from .agregation import AgregationCaisse
+from .importeur import ImportCaisse, lire_export_caisse, empreinte_fichier
+from .surveillance import SurveillanceCaisse
+
+__all__ = ['CaisseDB', 'AgregationCaisse', 'ImportCaisse', 'lire_export_caisse',
+           'empreinte_fichier', 'SurveillanceCaisse', 'CATEGORIES']
@@ -0,0 +1,104 @@
+"""
+Calcul des suivis à partir des tickets de caisse
+
+Seuls les jours présents dans un import sont recalculés : un import
+quotidien ne relit que les tickets de la journée, quelle que soit la
+taille de l'historique. Les valeurs sont écrites jour par jour à travers
+les classes des écrans de suivi, qui recalculent les périodes concernées
+(et journalisent le tout) : un import s'annule depuis chaque écran comme
+une saisie.
+"""
+
+import sqlite3
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from modules.suivis_manager.database import SuivisManagerDB
+from modules.suivis_manager.utils import grouper_dates_par_periode
+from modules.suivis_collaborateurs.database import SuivisCollaborateursDB
+
+from .database import CaisseDB
+
+
+def pourcentage(nombre: int, total: int):
+    """Part de nombre dans total, en %, arrondie au centième (None si total nul)"""
+    return round(nombre * 100 / total, 2) if total else None
+
+
+def valeurs_jour(agregat: Dict[str, Any]) -> Dict[str, Any]:
+    """Visites et pourcentages de tickets par catégorie d'un agrégat journalier"""
+    visites = agregat['nombre_visites']
+    return {
+        'date': agregat['date'],
+        'nombre_visites': visites,
+        'pourcentage_ventes': pourcentage(agregat['tickets_vente'], visites),
+        'pourcentage_couleurs': pourcentage(agregat['tickets_couleur'], visites),
+        'pourcentage_soins': pourcentage(agregat['tickets_soin'], visites),
+    }
+
+
+class AgregationCaisse:
+    """Met à jour les jours (et donc les périodes) des suivis depuis la caisse"""
+    
+    def __init__(self, caisse_db: CaisseDB = None):
+        self.caisse_db = caisse_db or CaisseDB()
+        self.manager_db = SuivisManagerDB()
+        self.collaborateurs_db = SuivisCollaborateursDB()
+    
+    def recalculer(self, dates: Iterable[str]) -> Optional[List[Tuple[int, int, int]]]:
+        """
+        Recalcule les jours donnés puis les périodes qui les contiennent
+        
+        Chaque écran est écrit dans sa propre transaction : en cas d'échec,
+        le recalcul peut être refait en entier sans risque.
+        
+        Args:
+            dates: Dates touchées par un import (format YYYY-MM-DD)
+        
+        Returns:
+            Liste des périodes recalculées (mois, annee, numero_periode)
+            ou None en cas d'erreur
+        """
+        dates = sorted(set(dates))
+        jours_salon = []
+        jours_collaborateurs = []
+        
+        # Une lecture par mois (plage de l'index sur la date), limitée aux jours importés
+        for _, dates_mois in groupby(dates, key=lambda date: date[:7]):
+            dates_mois = set(dates_mois)
+            debut, fin = min(dates_mois), max(dates_mois)
+            
+            for agregat in self.caisse_db.get_agregats_jours_salon(debut, fin):
+                if agregat['date'] in dates_mois:
+                    jour = valeurs_jour(agregat)
+                    jour['ca_total'] = round(agregat['ca_total'], 2)
+                    jours_salon.append(jour)
+            
+            for agregat in self.caisse_db.get_agregats_jours_collaborateurs(debut, fin):
+                if agregat['date'] in dates_mois:
+                    jour = valeurs_jour(agregat)
+                    jour['collaborateur_id'] = agregat['collaborateur_id']
+                    jour['ca_prestation'] = round(agregat['ca_prestation'], 2)
+                    jours_collaborateurs.append(jour)
+        
+        # Une seule action annulable par écran
+        try:
+            with self.manager_db.journal.lot("Import caisse"):
+                salon_ok = self.manager_db.sauvegarder_jours(jours_salon, source="caisse")
+            with self.collaborateurs_db.journal.lot("Import caisse"):
+                # Les jours importés remplacent ceux de tous les collaborateurs
+                collaborateurs_ok = self.collaborateurs_db.remplacer_jours(
+                    dates, jours_collaborateurs, source="caisse"
+                )
+        except sqlite3.Error as e:
+            print(f"Erreur lors du recalcul des suivis depuis la caisse: {e}")
+            return None
+        if not (salon_ok and collaborateurs_ok):
+            return None
+        
+        return [
+            (mois, annee, numero)
+            for (mois, annee), numeros in sorted(grouper_dates_par_periode(dates).items(),
+                                                 key=lambda e: (e[0][1], e[0][0]))
+            for numero in sorted(numeros)
+        ]
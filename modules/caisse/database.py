@@ -0,0 +1,386 @@
+"""
+Gestion de la base de données des tickets de caisse
+
+Les exports du logiciel de caisse sont stockés au niveau du ticket et de la
+ligne de ticket. Un import passe par une table temporaire puis est fusionné
+en quelques requêtes ensemblistes (pas une requête par ligne) : des
+millions de lignes s'importent dans une seule transaction, à mémoire
+constante.
+"""
+
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from modules.bdd import Database
+
+
+# Catégories des lignes de ticket (toutes sauf 'vente' sont des prestations)
+CATEGORIES = ["prestation", "couleur", "soin", "vente"]
+
+
+def cle_nom(nom: str) -> str:
+    """Forme comparable d'un nom (espaces réduits, casse ignorée, accents compris)"""
+    return " ".join(nom.split()).casefold()
+
+
+class CaisseDB:
+    """Classe pour gérer les tickets et lignes de ticket importés de la caisse"""
+    
+    def __init__(self):
+        self.db = Database()
+        self._create_tables()
+        self._migrate_database()
+    
+    def _create_tables(self):
+        """Crée les tables nécessaires pour le module Caisse"""
+        
+        # Historique des fichiers importés (un même contenu n'est importé qu'une fois)
+        imports_table = {
+            "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+            "fichier": "TEXT NOT NULL",
+            "empreinte": "TEXT NOT NULL",  # SHA-256 du contenu
+            "nb_tickets": "INTEGER",
+            "nb_lignes": "INTEGER",
+            "date_min": "TEXT",  # Format YYYY-MM-DD
+            "date_max": "TEXT",
+            "importe_le": "TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+            "agrege_le": "TIMESTAMP"  # None tant que les suivis n'ont pas été recalculés
+        }
+        
+        # Un ticket = un passage en caisse (une visite)
+        tickets_table = {
+            "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+            "numero": "TEXT NOT NULL",  # Numéro du ticket dans la caisse
+            "date": "TEXT NOT NULL",  # Format YYYY-MM-DD
+            "heure": "TEXT",  # Format HH:MM
+            "import_id": "INTEGER",
+            "FOREIGN KEY (import_id)": "REFERENCES caisse_imports(id)"
+        }
+        
+        # Lignes du ticket (prestations et produits vendus)
+        lignes_table = {
+            "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+            "ticket_id": "INTEGER NOT NULL",
+            "collaborateur_id": "INTEGER",  # None si le nom de la caisse est inconnu
+            "categorie": "TEXT NOT NULL",  # prestation, couleur, soin, vente
+            "libelle": "TEXT",
+            "quantite": "REAL",
+            "montant": "REAL NOT NULL",  # Montant TTC de la ligne
+            "FOREIGN KEY (ticket_id)": "REFERENCES caisse_tickets(id) ON DELETE CASCADE",
+            "FOREIGN KEY (collaborateur_id)": "REFERENCES collaborateurs(id)"
+        }
+        
+        if not self.db.table_exists("caisse_imports"):
+            self.db.create_table("caisse_imports", imports_table)
+            print("Table 'caisse_imports' créée avec succès")
+        
+        if not self.db.table_exists("caisse_tickets"):
+            self.db.create_table("caisse_tickets", tickets_table)
+            print("Table 'caisse_tickets' créée avec succès")
+        
+        if not self.db.table_exists("caisse_lignes"):
+            self.db.create_table("caisse_lignes", lignes_table)
+            print("Table 'caisse_lignes' créée avec succès")
+        
+        # Un ticket est identifié par son numéro et sa date ; les agrégats
+        # parcourent les tickets par date puis leurs lignes (index couvrant)
+        self.db.execute_query(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_caisse_tickets_numero "
+            "ON caisse_tickets (date, numero)"
+        )
+        self.db.execute_query(
+            "CREATE INDEX IF NOT EXISTS idx_caisse_imports_empreinte "
+            "ON caisse_imports (empreinte)"
+        )
+        self.db.execute_query(
+            "CREATE INDEX IF NOT EXISTS idx_caisse_lignes_ticket "
+            "ON caisse_lignes (ticket_id, collaborateur_id, categorie, montant)"
+        )
+    
+    def _migrate_database(self):
+        """Migre la base de données pour ajouter les colonnes manquantes"""
+        colonnes = [col['name'] for col in self.db.get_table_info("caisse_imports")]
+        
+        # Ajouter la colonne agrege_le si elle n'existe pas
+        if 'agrege_le' not in colonnes:
+            self.db.execute_query("ALTER TABLE caisse_imports ADD COLUMN agrege_le TIMESTAMP")
+            # Les imports antérieurs ont été agrégés à leur import
+            self.db.execute_query("UPDATE caisse_imports SET agrege_le = importe_le")
+            print("Colonne 'agrege_le' ajoutée avec succès")
+    
+    def import_existe(self, empreinte: str) -> bool:
+        """
+        Indique si un fichier a déjà été importé et ses suivis recalculés
+        
+        Args:
+            empreinte: SHA-256 du contenu du fichier
+        
+        Returns:
+            True si un import agrégé porte cette empreinte
+        """
+        query = "SELECT 1 FROM caisse_imports WHERE empreinte = ? AND agrege_le IS NOT NULL"
+        return self.db.fetch_one(query, (empreinte,)) is not None
+    
+    def get_import_non_agrege(self, empreinte: str) -> Optional[Dict[str, Any]]:
+        """
+        Récupère un import enregistré dont les suivis n'ont pas été recalculés
+        
+        Args:
+            empreinte: SHA-256 du contenu du fichier
+        
+        Returns:
+            {'import_id', 'nb_tickets', 'nb_lignes', 'dates': [dates des tickets]}
+            (dernier import non agrégé portant cette empreinte) ou None
+        """
+        query = """
+            SELECT id AS import_id, nb_tickets, nb_lignes FROM caisse_imports
+            WHERE empreinte = ? AND agrege_le IS NULL
+            ORDER BY id DESC LIMIT 1
+        """
+        resultat = self.db.fetch_one(query, (empreinte,))
+        if resultat is None:
+            return None
+        
+        query = "SELECT DISTINCT date FROM caisse_tickets WHERE import_id = ? ORDER BY date"
+        resultat['dates'] = [ligne['date'] for ligne in self.db.fetch_all(query, (resultat['import_id'],))]
+        return resultat
+    
+    def marquer_agrege(self, import_id: int) -> bool:
+        """
+        Note que les suivis d'un import ont été recalculés
+        
+        Args:
+            import_id: ID de l'import
+        
+        Returns:
+            True si succès, False sinon
+        """
+        query = "UPDATE caisse_imports SET agrege_le = CURRENT_TIMESTAMP WHERE id = ?"
+        return self.db.execute_query(query, (import_id,)) is not None
+    
+    def enregistrer_import(self, fichier: str, empreinte: str,
+                           lignes: Iterable[tuple]) -> Optional[Dict[str, Any]]:
+        """
+        Importe les lignes d'un export de caisse en une seule transaction
+        
+        Les lignes sont d'abord copiées dans une table temporaire (en flux),
+        puis fusionnées : tickets créés s'ils n'existent pas, lignes des
+        tickets déjà connus remplacées (réimport d'une journée corrigée),
+        collaborateurs retrouvés par leur nom. Un nom inconnu, ou porté par
+        plusieurs collaborateurs, n'est rattaché à personne (ses lignes
+        comptent pour le salon seul) et est signalé.
+        
+        Args:
+            fichier: Nom du fichier importé
+            empreinte: SHA-256 du contenu du fichier
+            lignes: Tuples (numero, date, heure, collaborateur, categorie,
+                    libelle, quantite, montant), date au format YYYY-MM-DD
+        
+        Returns:
+            {'import_id', 'nb_tickets', 'nb_lignes', 'dates': [dates touchées],
+            'noms_inconnus', 'noms_ambigus': [noms de la caisse non rattachés]}
+            ou None en cas d'erreur (rien n'est importé)
+        """
+        try:
+            with self.db.transaction():
+                connexion = self.db.connection
+                connexion.execute("DROP TABLE IF EXISTS temp.caisse_import")
+                connexion.execute("""
+                    CREATE TEMP TABLE caisse_import (
+                        numero TEXT, date TEXT, heure TEXT, collaborateur TEXT,
+                        categorie TEXT, libelle TEXT, quantite REAL, montant REAL
+                    )
+                """)
+                connexion.executemany(
+                    "INSERT INTO temp.caisse_import VALUES (?, ?, ?, ?, ?, ?, ?, ?)", lignes
+                )
+                
+                resume = connexion.execute("""
+                    SELECT COUNT(*) AS nb_lignes, MIN(date) AS date_min, MAX(date) AS date_max
+                    FROM temp.caisse_import
+                """).fetchone()
+                
+                import_id = connexion.execute(
+                    "INSERT INTO caisse_imports (fichier, empreinte, nb_lignes, date_min, date_max) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (fichier, empreinte, resume['nb_lignes'], resume['date_min'], resume['date_max'])
+                ).lastrowid
+                
+                # Tickets : création des nouveaux, rattachement des connus à cet import
+                connexion.execute("""
+                    INSERT INTO caisse_tickets (numero, date, heure, import_id)
+                    SELECT numero, date, MIN(heure), ?
+                    FROM temp.caisse_import
+                    WHERE true
+                    GROUP BY date, numero
+                    ON CONFLICT (date, numero) DO UPDATE SET import_id = excluded.import_id
+                """, (import_id,))
+                
+                # Lignes : celles des tickets de l'import sont remplacées
+                connexion.execute(
+                    "DELETE FROM caisse_lignes WHERE ticket_id IN "
+                    "(SELECT id FROM caisse_tickets WHERE import_id = ?)",
+                    (import_id,)
+                )
+                noms, noms_inconnus, noms_ambigus = self._rattacher_noms(connexion)
+                connexion.execute("DROP TABLE IF EXISTS temp.caisse_noms")
+                connexion.execute(
+                    "CREATE TEMP TABLE caisse_noms (nom TEXT PRIMARY KEY, collaborateur_id INTEGER)"
+                )
+                connexion.executemany("INSERT INTO temp.caisse_noms VALUES (?, ?)", noms.items())
+                connexion.execute("""
+                    INSERT INTO caisse_lignes
+                        (ticket_id, collaborateur_id, categorie, libelle, quantite, montant)
+                    SELECT t.id, n.collaborateur_id, i.categorie, i.libelle, i.quantite, i.montant
+                    FROM temp.caisse_import i
+                    JOIN caisse_tickets t ON t.date = i.date AND t.numero = i.numero
+                    LEFT JOIN temp.caisse_noms n ON n.nom = i.collaborateur
+                """)
+                
+                nb_tickets = connexion.execute(
+                    "SELECT COUNT(*) FROM caisse_tickets WHERE import_id = ?", (import_id,)
+                ).fetchone()[0]
+                connexion.execute(
+                    "UPDATE caisse_imports SET nb_tickets = ? WHERE id = ?", (nb_tickets, import_id)
+                )
+                
+                dates = [
+                    ligne['date'] for ligne in connexion.execute(
+                        "SELECT DISTINCT date FROM temp.caisse_import ORDER BY date"
+                    )
+                ]
+                connexion.execute("DROP TABLE temp.caisse_import")
+                connexion.execute("DROP TABLE temp.caisse_noms")
+            
+            return {
+                'import_id': import_id,
+                'nb_tickets': nb_tickets,
+                'nb_lignes': resume['nb_lignes'],
+                'dates': dates,
+                'noms_inconnus': noms_inconnus,
+                'noms_ambigus': noms_ambigus
+            }
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Erreur lors de l'import du fichier de caisse {fichier}: {e}")
+            return None
+    
+    def _rattacher_noms(self, connexion) -> Tuple[Dict[str, Optional[int]], List[str], List[str]]:
+        """
+        Associe chaque nom de collaborateur de l'import en cours à un seul collaborateur
+        
+        La comparaison se fait en Python (casefold) : LOWER de SQLite ignore
+        les lettres accentuées.
+        
+        Args:
+            connexion: Connexion de la transaction d'import (table temp.caisse_import)
+        
+        Returns:
+            ({nom de la caisse: collaborateur_id ou None}, noms inconnus, noms ambigus)
+        """
+        collaborateurs: Dict[str, List[int]] = {}
+        for ligne in connexion.execute("SELECT id, prenom, nom FROM collaborateurs"):
+            cle = cle_nom(f"{ligne['prenom']} {ligne['nom']}")
+            collaborateurs.setdefault(cle, []).append(ligne['id'])
+        
+        noms: Dict[str, Optional[int]] = {}
+        noms_inconnus, noms_ambigus = [], []
+        for (nom,) in connexion.execute(
+                "SELECT DISTINCT collaborateur FROM temp.caisse_import WHERE collaborateur IS NOT NULL"):
+            ids = collaborateurs.get(cle_nom(nom), [])
+            noms[nom] = ids[0] if len(ids) == 1 else None
+            if not ids and nom.strip():
+                noms_inconnus.append(nom.strip())
+            elif len(ids) > 1:
+                noms_ambigus.append(nom.strip())
+        
+        if noms_inconnus:
+            print(f"Collaborateurs inconnus (lignes comptées pour le salon seul) : {', '.join(noms_inconnus)}")
+        if noms_ambigus:
+            print(f"Noms portés par plusieurs collaborateurs (lignes comptées pour le salon seul) : "
+                  f"{', '.join(noms_ambigus)}")
+        return noms, noms_inconnus, noms_ambigus
+    
+    def get_agregats_jours_salon(self, date_debut: str, date_fin: str) -> List[Dict[str, Any]]:
+        """
+        Calcule les indicateurs du salon jour par jour, en une requête
+        
+        Args:
+            date_debut: Premier jour (YYYY-MM-DD, inclus)
+            date_fin: Dernier jour (YYYY-MM-DD, inclus)
+        
+        Returns:
+            Liste de {'date', 'ca_total', 'nombre_visites', 'tickets_vente',
+            'tickets_couleur', 'tickets_soin'}, une entrée par jour ayant des tickets
+        """
+        query = """
+            WITH tickets AS (
+                SELECT t.date, t.id,
+                       SUM(l.montant) AS montant,
+                       MAX(l.categorie = 'vente') AS avec_vente,
+                       MAX(l.categorie = 'couleur') AS avec_couleur,
+                       MAX(l.categorie = 'soin') AS avec_soin
+                FROM caisse_tickets t
+                JOIN caisse_lignes l ON l.ticket_id = t.id
+                WHERE t.date BETWEEN ? AND ?
+                GROUP BY t.id
+            )
+            SELECT date,
+                   SUM(montant) AS ca_total,
+                   COUNT(*) AS nombre_visites,
+                   SUM(avec_vente) AS tickets_vente,
+                   SUM(avec_couleur) AS tickets_couleur,
+                   SUM(avec_soin) AS tickets_soin
+            FROM tickets
+            GROUP BY date
+            ORDER BY date
+        """
+        return self.db.fetch_all(query, (date_debut, date_fin))
+    
+    def get_agregats_jours_collaborateurs(self, date_debut: str, date_fin: str) -> List[Dict[str, Any]]:
+        """
+        Calcule les indicateurs de chaque collaborateur jour par jour, en une requête
+        
+        Une visite est comptée pour chaque collaborateur ayant au moins une
+        ligne sur le ticket ; le C.A. prestation exclut les ventes de produits.
+        
+        Args:
+            date_debut: Premier jour (YYYY-MM-DD, inclus)
+            date_fin: Dernier jour (YYYY-MM-DD, inclus)
+        
+        Returns:
+            Liste de {'collaborateur_id', 'date', 'ca_prestation', 'nombre_visites',
+            'tickets_vente', 'tickets_couleur', 'tickets_soin'}
+        """
+        query = """
+            WITH passages AS (
+                SELECT l.collaborateur_id, t.date, t.id,
+                       SUM(CASE WHEN l.categorie != 'vente' THEN l.montant ELSE 0 END) AS ca_prestation,
+                       MAX(l.categorie = 'vente') AS avec_vente,
+                       MAX(l.categorie = 'couleur') AS avec_couleur,
+                       MAX(l.categorie = 'soin') AS avec_soin
+                FROM caisse_tickets t
+                JOIN caisse_lignes l ON l.ticket_id = t.id
+                WHERE t.date BETWEEN ? AND ? AND l.collaborateur_id IS NOT NULL
+                GROUP BY l.collaborateur_id, t.id
+            )
+            SELECT collaborateur_id, date,
+                   SUM(ca_prestation) AS ca_prestation,
+                   COUNT(*) AS nombre_visites,
+                   SUM(avec_vente) AS tickets_vente,
+                   SUM(avec_couleur) AS tickets_couleur,
+                   SUM(avec_soin) AS tickets_soin
+            FROM passages
+            GROUP BY collaborateur_id, date
+            ORDER BY collaborateur_id, date
+        """
+        return self.db.fetch_all(query, (date_debut, date_fin))
+    
+    def get_imports(self) -> List[Dict[str, Any]]:
+        """
+        Récupère l'historique des imports
+        
+        Returns:
+            Liste des imports, du plus récent au plus ancien
+        """
+        query = "SELECT * FROM caisse_imports ORDER BY importe_le DESC, id DESC"
+        return self.db.fetch_all(query)
@@ -0,0 +1,266 @@
+"""
+Lecture et import des exports du logiciel de caisse
+
+Format attendu : CSV séparé par des points-virgules, une ligne par ligne de
+ticket, avec l'en-tête
+    ticket;date;heure;collaborateur;categorie;libelle;quantite;montant
+
+- date : JJ/MM/AAAA ou AAAA-MM-JJ
+- collaborateur : "Prénom Nom", tel que saisi dans Mallia
+- categorie : prestation, couleur, soin ou vente
+- montant : montant TTC de la ligne, virgule ou point décimal
+
+Le fichier est lu en flux (jamais chargé en entier en mémoire).
+"""
+
+import configparser
+import csv
+import hashlib
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .database import CaisseDB, CATEGORIES
+from .agregation import AgregationCaisse
+
+
+# Colonnes obligatoires de l'export
+COLONNES_EXPORT = ["ticket", "date", "heure", "collaborateur", "categorie", "libelle", "quantite", "montant"]
+
+# Intitulés de catégorie rencontrés dans les caisses -> catégorie Mallia
+ALIAS_CATEGORIES = {
+    "produit": "vente",
+    "produits": "vente",
+    "revente": "vente",
+    "coloration": "couleur",
+    "technique": "couleur",
+    "soins": "soin",
+    "service": "prestation",
+    "coupe": "prestation",
+}
+
+
+def parser_date_caisse(texte: str) -> str:
+    """
+    Convertit une date de l'export au format YYYY-MM-DD
+    
+    Args:
+        texte: Date au format JJ/MM/AAAA ou AAAA-MM-JJ
+    
+    Returns:
+        Date au format YYYY-MM-DD
+    
+    Raises:
+        ValueError: si la date n'est pas reconnue
+    """
+    texte = texte.strip()
+    if "/" in texte:
+        return datetime.strptime(texte, "%d/%m/%Y").strftime("%Y-%m-%d")
+    return datetime.strptime(texte[:10], "%Y-%m-%d").strftime("%Y-%m-%d")
+
+
+def parser_nombre_caisse(texte: str) -> float:
+    """
+    Convertit un nombre de l'export (virgule ou point décimal, espaces de milliers)
+    
+    Args:
+        texte: Nombre à convertir
+    
+    Returns:
+        Valeur (0 si la cellule est vide)
+    """
+    texte = texte.replace(" ", "").replace(" ", "").replace("€", "").replace(",", ".")
+    return float(texte) if texte else 0.0
+
+
+def lire_entete(chemin: str) -> Tuple[List[int], int]:
+    """
+    Lit l'en-tête d'un export de caisse
+    
+    Args:
+        chemin: Chemin du fichier CSV
+    
+    Returns:
+        (position de chaque colonne de COLONNES_EXPORT dans le fichier,
+        position en octets de la première ligne de données)
+    
+    Raises:
+        ValueError: si une colonne manque
+    """
+    with open(chemin, "rb") as fichier:
+        premiere_ligne = fichier.readline()
+    
+    colonnes = next(csv.reader([premiere_ligne.decode("utf-8-sig")], delimiter=";"), [])
+    entete = [colonne.strip().lower() for colonne in colonnes]
+    manquantes = [c for c in COLONNES_EXPORT if c not in entete]
+    if manquantes:
+        raise ValueError(f"Colonnes manquantes dans {chemin}: {', '.join(manquantes)}")
+    
+    return [entete.index(c) for c in COLONNES_EXPORT], len(premiere_ligne)
+
+
+def convertir_ligne(ligne: List[str], index: List[int], dates: Dict[str, str]) -> tuple:
+    """
+    Convertit une ligne de l'export en tuple prêt pour CaisseDB.enregistrer_import()
+    
+    Args:
+        ligne: Cellules de la ligne CSV
+        index: Position des colonnes (voir lire_entete())
+        dates: Dates déjà converties {texte: YYYY-MM-DD}, complété au passage
+               (un export couvre quelques jours pour des milliers de lignes :
+               chaque date n'est convertie qu'une fois)
+    
+    Returns:
+        (numero, date, heure, collaborateur, categorie, libelle, quantite, montant)
+    
+    Raises:
+        ValueError, IndexError: si la ligne est invalide
+    """
+    i_ticket, i_date, i_heure, i_collaborateur, i_categorie, i_libelle, i_quantite, i_montant = index
+    
+    date = dates.get(ligne[i_date])
+    if date is None:
+        date = dates[ligne[i_date]] = parser_date_caisse(ligne[i_date])
+    
+    categorie = ligne[i_categorie].strip().lower()
+    categorie = ALIAS_CATEGORIES.get(categorie, categorie)
+    if categorie not in CATEGORIES:
+        raise ValueError(f"catégorie inconnue '{ligne[i_categorie]}'")
+    
+    return (
+        ligne[i_ticket].strip(),
+        date,
+        ligne[i_heure].strip()[:5] or None,
+        ligne[i_collaborateur].strip(),
+        categorie,
+        ligne[i_libelle].strip(),
+        parser_nombre_caisse(ligne[i_quantite]) or 1.0,
+        parser_nombre_caisse(ligne[i_montant]),
+    )
+
+
+def lire_export_caisse(chemin: str) -> Iterator[tuple]:
+    """
+    Lit un export de caisse ligne par ligne
+    
+    Args:
+        chemin: Chemin du fichier CSV
+    
+    Yields:
+        Tuples (numero, date, heure, collaborateur, categorie, libelle,
+        quantite, montant) prêts pour CaisseDB.enregistrer_import()
+    
+    Raises:
+        ValueError: si une colonne manque ou si une ligne est invalide
+                    (numéro de ligne dans le message)
+    """
+    index, _ = lire_entete(chemin)
+    dates: Dict[str, str] = {}
+    
+    with open(chemin, newline="", encoding="utf-8-sig") as fichier:
+        lecteur = csv.reader(fichier, delimiter=";")
+        next(lecteur, None)
+        
+        for ligne in lecteur:
+            if not ligne:
+                continue
+            try:
+                yield convertir_ligne(ligne, index, dates)
+            except (ValueError, IndexError) as e:
+                raise ValueError(f"{chemin}, ligne {lecteur.line_num}: {e}") from e
+
+
+def empreinte_fichier(chemin: str) -> str:
+    """
+    Calcule l'empreinte SHA-256 d'un fichier (lecture par blocs)
+    
+    Args:
+        chemin: Chemin du fichier
+    
+    Returns:
+        Empreinte hexadécimale
+    """
+    empreinte = hashlib.sha256()
+    with open(chemin, "rb") as fichier:
+        for bloc in iter(lambda: fichier.read(1024 * 1024), b""):
+            empreinte.update(bloc)
+    return empreinte.hexdigest()
+
+
+class ImportCaisse:
+    """Importe les exports de caisse puis recalcule les périodes touchées"""
+    
+    def __init__(self, config_path: str = "config.ini"):
+        """
+        Initialise l'import depuis la section [Caisse] de config.ini
+        
+        Args:
+            config_path: Chemin du fichier de configuration
+        """
+        config = configparser.ConfigParser()
+        if Path(config_path).exists():
+            config.read(config_path, encoding='utf-8')
+        
+        # Au-delà du seuil, le fichier est lu par un pool de processus
+        self.seuil_parallele = config.getint('Caisse', 'seuil_parallele_mo', fallback=32) * 1024 * 1024
+        self.taille_morceau = config.getint('Caisse', 'taille_morceau_mo', fallback=4) * 1024 * 1024
+        self.processus = config.getint('Caisse', 'processus', fallback=0)  # 0 : un par cœur
+        
+        self.caisse_db = CaisseDB()
+        self.agregation = AgregationCaisse(self.caisse_db)
+    
+    def importer(self, chemin: str, forcer: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Importe un fichier et met à jour les suivis des périodes concernées
+        
+        L'import n'est marqué comme agrégé qu'une fois les suivis recalculés :
+        si le recalcul échoue, le même fichier le reprend au prochain import
+        (sans réenregistrer ses tickets).
+        
+        Args:
+            chemin: Chemin du fichier CSV
+            forcer: Réimporte un fichier déjà importé (même contenu)
+        
+        Returns:
+            Résumé de l'import {'import_id', 'nb_tickets', 'nb_lignes', 'dates',
+            'periodes': [(mois, annee, numero_periode)], 'lignes_par_seconde',
+            'pointe_memoire' (octets, None si non mesurable)}, {'deja_importe': True}
+            si le fichier est ignoré, ou None en cas d'erreur
+        """
+        from .parallele import lire_export_parallele, pointe_memoire
+        
+        chemin = Path(chemin)
+        empreinte = empreinte_fichier(chemin)
+        resultat = None
+        if not forcer:
+            if self.caisse_db.import_existe(empreinte):
+                print(f"Fichier déjà importé : {chemin.name}")
+                return {'deja_importe': True}
+            resultat = self.caisse_db.get_import_non_agrege(empreinte)
+        
+        if resultat is None:
+            processus = self.processus or os.cpu_count() or 1
+            if chemin.stat().st_size > self.seuil_parallele and processus > 1:
+                lignes = lire_export_parallele(chemin, processus, self.taille_morceau)
+            else:
+                lignes = lire_export_caisse(chemin)
+            
+            # Les erreurs de lecture annulent tout l'import (une seule transaction)
+            debut = time.perf_counter()
+            resultat = self.caisse_db.enregistrer_import(chemin.name, empreinte, lignes)
+            if resultat is None:
+                return None
+            duree = time.perf_counter() - debut
+            resultat['lignes_par_seconde'] = resultat['nb_lignes'] / duree if duree else None
+        else:
+            print(f"Recalcul des suivis repris pour un import interrompu : {chemin.name}")
+            resultat['lignes_par_seconde'] = None
+        
+        resultat['pointe_memoire'] = pointe_memoire()
+        resultat['periodes'] = self.agregation.recalculer(resultat['dates'])
+        if resultat['periodes'] is None or not self.caisse_db.marquer_agrege(resultat['import_id']):
+            print(f"Erreur lors du recalcul des suivis de {chemin.name} (repris au prochain import)")
+            return None
+        return resultat
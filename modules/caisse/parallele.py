@@ -0,0 +1,143 @@
+"""
+Lecture parallèle des gros exports de caisse
+
+Le fichier est découpé en plages d'octets alignées sur les fins de ligne ;
+chaque plage est lue et convertie par un processus du pool, et les lignes
+sont renvoyées dans l'ordre du fichier au processus principal, seul à
+écrire dans la base (une transaction par fichier). Le nombre de plages en
+cours est borné : la mémoire ne dépend que de la taille des plages et du
+nombre de processus, pas de celle du fichier.
+
+Les cellules ne doivent pas contenir de retour à la ligne (cas des exports
+de caisse) : une plage commence toujours au début d'une ligne.
+"""
+
+import csv
+import io
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .importeur import convertir_ligne, lire_entete
+
+
+def decouper_fichier(chemin: str, debut: int, taille_morceau: int) -> List[Tuple[int, int]]:
+    """
+    Découpe un fichier en plages d'octets terminées par une fin de ligne
+    
+    Args:
+        chemin: Chemin du fichier
+        debut: Position de la première ligne de données (après l'en-tête)
+        taille_morceau: Taille visée de chaque plage, en octets
+    
+    Returns:
+        Liste des plages (debut, fin), fin exclue
+    """
+    taille = os.path.getsize(chemin)
+    plages = []
+    with open(chemin, "rb") as fichier:
+        while debut < taille:
+            fichier.seek(min(debut + taille_morceau, taille))
+            fichier.readline()  # Aller jusqu'à la fin de la ligne entamée
+            fin = min(fichier.tell(), taille)
+            plages.append((debut, fin))
+            debut = fin
+    return plages
+
+
+def _analyser_plage(chemin: str, debut: int, fin: int,
+                    index: List[int]) -> Tuple[List[tuple], int, Optional[Tuple[int, str]]]:
+    """
+    Convertit les lignes d'une plage (exécuté dans un processus du pool)
+    
+    Returns:
+        (lignes converties, nombre de lignes de la plage,
+        (numéro de ligne dans la plage, message) de la première erreur ou None)
+    """
+    with open(chemin, "rb") as fichier:
+        fichier.seek(debut)
+        donnees = fichier.read(fin - debut)
+    
+    lignes = []
+    dates: Dict[str, str] = {}
+    lecteur = csv.reader(io.StringIO(donnees.decode("utf-8"), newline=""), delimiter=";")
+    for ligne in lecteur:
+        if not ligne:
+            continue
+        try:
+            lignes.append(convertir_ligne(ligne, index, dates))
+        except (ValueError, IndexError) as e:
+            return lignes, 0, (lecteur.line_num, str(e))
+    return lignes, donnees.count(b"\n"), None
+
+
+def lire_export_parallele(chemin: str, processus: int = 0,
+                          taille_morceau: int = 4 * 1024 * 1024) -> Iterator[tuple]:
+    """
+    Lit un export de caisse avec un pool de processus
+    
+    Args:
+        chemin: Chemin du fichier CSV
+        processus: Nombre de processus (0 : un par cœur)
+        taille_morceau: Taille des plages lues par chaque processus, en octets
+    
+    Yields:
+        Mêmes tuples que lire_export_caisse(), dans l'ordre du fichier
+    
+    Raises:
+        ValueError: si une colonne manque ou si une ligne est invalide
+                    (numéro de ligne dans le message)
+    """
+    index, debut = lire_entete(chemin)
+    plages = iter(decouper_fichier(chemin, debut, taille_morceau))
+    processus = processus or os.cpu_count() or 1
+    
+    # Deux plages en attente par processus : les processus ne chôment pas
+    # pendant l'écriture, sans que les résultats s'accumulent en mémoire
+    with ProcessPoolExecutor(max_workers=processus) as pool:
+        en_cours = deque()
+        numero_ligne = 1  # En-tête
+        
+        def soumettre():
+            plage = next(plages, None)
+            if plage is not None:
+                en_cours.append(pool.submit(_analyser_plage, chemin, *plage, index))
+        
+        for _ in range(2 * processus):
+            soumettre()
+        
+        try:
+            while en_cours:
+                lignes, nb_lignes, erreur = en_cours.popleft().result()
+                soumettre()
+                yield from lignes
+                if erreur is not None:
+                    raise ValueError(f"{chemin}, ligne {numero_ligne + erreur[0]}: {erreur[1]}")
+                numero_ligne += nb_lignes
+        finally:
+            for future in en_cours:
+                future.cancel()
+
+
+def pointe_memoire() -> Optional[int]:
+    """
+    Renvoie la mémoire résidente de pointe du processus et de ses processus terminés
+    
+    Returns:
+        Pointe en octets (la plus haute des deux), None si la mesure
+        n'est pas disponible (Windows)
+    """
+    if resource is None:
+        return None
+    
+    pointe = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                 resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Kilo-octets sous Linux, octets sous macOS
+    return pointe if sys.platform == "darwin" else pointe * 1024
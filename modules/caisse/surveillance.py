@@ -0,0 +1,171 @@
+"""
+Surveillance d'un dossier de dépôt des exports de caisse
+
+La caisse dépose ses exports chaque soir dans un dossier partagé. Le
+dossier est relu à intervalle régulier : chaque nouveau fichier (ou fichier
+modifié, reconnu à son empreinte) est importé, les suivis des périodes
+touchées sont recalculés, puis le fichier est déplacé dans le dossier
+d'archive et le résultat ajouté au journal des imports.
+"""
+
+import configparser
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .importeur import ImportCaisse, empreinte_fichier
+
+
+# Un fichier modifié depuis moins longtemps est peut-être encore en cours de copie
+DELAI_STABILITE_S = 10
+
+NOM_JOURNAL = "imports_caisse.log"
+
+
+class SurveillanceCaisse:
+    """Importe automatiquement les exports déposés dans un dossier"""
+    
+    def __init__(self, config_path: str = "config.ini", executeur=None, dossier: Optional[str] = None):
+        """
+        Initialise la surveillance depuis la section [Caisse] de config.ini
+        
+        Args:
+            config_path: Chemin du fichier de configuration
+            executeur: ExecuteurBDD partagé de l'application ; les imports y
+                       sont soumis pour être sérialisés avec les écritures des
+                       écrans (None : import sur le thread de la surveillance)
+            dossier: Dossier à surveiller (par défaut : dossier_surveille)
+        """
+        config = configparser.ConfigParser()
+        if Path(config_path).exists():
+            config.read(config_path, encoding='utf-8')
+        
+        dossier = dossier or config.get('Caisse', 'dossier_surveille', fallback='').strip()
+        self.dossier = Path(dossier) if dossier else None
+        archive = config.get('Caisse', 'dossier_archive', fallback='').strip()
+        self.archive = Path(archive) if archive else (self.dossier / "archives" if self.dossier else None)
+        self.intervalle_secondes = config.getint('Caisse', 'intervalle_surveillance_s', fallback=300)
+        
+        self.config_path = config_path
+        self.executeur = executeur
+        self._importeur: Optional[ImportCaisse] = None
+        self._echecs: Dict[Path, str] = {}  # Fichier en échec -> empreinte (réessayé s'il change)
+        self._arret = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def active(self) -> bool:
+        """Indique si un dossier est configuré"""
+        return self.dossier is not None
+    
+    def analyser(self) -> List[Dict[str, Any]]:
+        """
+        Importe les fichiers présents dans le dossier surveillé
+        
+        Returns:
+            Liste des résultats {'fichier', 'resultat'} (resultat : résumé
+            renvoyé par ImportCaisse.importer(), None en cas d'erreur)
+        """
+        if not self.active or not self.dossier.is_dir():
+            return []
+        
+        resultats = []
+        limite = time.time() - DELAI_STABILITE_S
+        for chemin in sorted(self.dossier.glob("*.csv")):
+            if not chemin.is_file() or chemin.stat().st_mtime > limite:
+                continue
+            
+            empreinte = empreinte_fichier(chemin)
+            if self._echecs.get(chemin) == empreinte:
+                continue
+            
+            resultat = self._importer(chemin)
+            if resultat is None:
+                self._echecs[chemin] = empreinte
+                self._journaliser(chemin, "ÉCHEC (fichier laissé dans le dossier)")
+            else:
+                self._echecs.pop(chemin, None)
+                self._journaliser(chemin, self._decrire(resultat))
+                self._archiver(chemin)
+            resultats.append({'fichier': chemin.name, 'resultat': resultat})
+        return resultats
+    
+    def _importer(self, chemin: Path) -> Optional[Dict[str, Any]]:
+        """Importe un fichier, à travers l'exécuteur partagé s'il y en a un"""
+        if self._importeur is None:
+            self._importeur = ImportCaisse(self.config_path)
+        
+        if self.executeur is None:
+            return self._importeur.importer(chemin)
+        return self.executeur.soumettre(self._importeur.importer, chemin).result()
+    
+    def _decrire(self, resultat: Dict[str, Any]) -> str:
+        """Résumé d'un import pour le journal"""
+        if resultat.get('deja_importe'):
+            return "déjà importé"
+        description = (f"{resultat['nb_tickets']} tickets, {resultat['nb_lignes']} lignes, "
+                       f"{len(resultat['periodes'])} périodes recalculées")
+        non_rattaches = resultat.get('noms_inconnus', []) + resultat.get('noms_ambigus', [])
+        if non_rattaches:
+            description += f", noms non rattachés : {', '.join(non_rattaches)}"
+        return description
+    
+    def _archiver(self, chemin: Path):
+        """Déplace un fichier traité dans le dossier d'archive (sans écraser)"""
+        self.archive.mkdir(parents=True, exist_ok=True)
+        destination = self.archive / chemin.name
+        if destination.exists():
+            horodatage = datetime.now().strftime("%Y%m%d_%H%M%S")
+            destination = self.archive / f"{chemin.stem}_{horodatage}{chemin.suffix}"
+        
+        try:
+            shutil.move(str(chemin), str(destination))
+        except OSError as e:
+            print(f"Erreur lors de l'archivage de {chemin.name}: {e}")
+    
+    def _journaliser(self, chemin: Path, message: str):
+        """Ajoute une ligne au journal des imports (dossier d'archive) et l'affiche"""
+        ligne = f"{datetime.now():%Y-%m-%d %H:%M:%S} | {chemin.name} | {message}"
+        print(f"Import caisse : {ligne}")
+        try:
+            self.archive.mkdir(parents=True, exist_ok=True)
+            with open(self.archive / NOM_JOURNAL, "a", encoding="utf-8") as journal:
+                journal.write(ligne + "\n")
+        except OSError as e:
+            print(f"Erreur lors de l'écriture du journal des imports: {e}")
+    
+    def demarrer(self, rappel: Optional[Callable[[List[Dict[str, Any]]], None]] = None):
+        """
+        Démarre la surveillance sur un thread (sans effet si aucun dossier n'est configuré)
+        
+        Args:
+            rappel: Appelé (depuis le thread) avec les résultats d'un passage
+                    ayant importé au moins un fichier
+        """
+        if not self.active or self.intervalle_secondes <= 0 or self._thread:
+            return
+        
+        def boucle():
+            while True:
+                try:
+                    resultats = self.analyser()
+                except OSError as e:
+                    print(f"Erreur lors de la surveillance de {self.dossier}: {e}")
+                    resultats = []
+                if rappel and any(r['resultat'] and not r['resultat'].get('deja_importe') for r in resultats):
+                    rappel(resultats)
+                if self._arret.wait(self.intervalle_secondes):
+                    break
+        
+        self._arret.clear()
+        self._thread = threading.Thread(target=boucle, name="mallia-surveillance-caisse", daemon=True)
+        self._thread.start()
+        print(f"Surveillance de {self.dossier} toutes les {self.intervalle_secondes} secondes")
+    
+    def arreter(self):
+        """Arrête la surveillance (l'import en cours se termine)"""
+        self._arret.set()
+        self._thread = None
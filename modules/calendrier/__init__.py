@@ -0,0 +1,10 @@
+"""
+Module Calendrier - Jours fériés, jours d'ouverture et jours ouvrés du salon
+"""
+
+from .feries import date_paques, jours_feries, est_ferie
+from .database import CalendrierDB, JOURS_OUVERTURE_DEFAUT
+from .derivation import appliquer_ca_par_jour_ouvre, deriver_ca_par_jour_periodes
+
+__all__ = ['CalendrierDB', 'JOURS_OUVERTURE_DEFAUT', 'appliquer_ca_par_jour_ouvre',
+           'deriver_ca_par_jour_periodes', 'date_paques', 'jours_feries', 'est_ferie']
@@ -0,0 +1,294 @@
+"""
+Gestion du calendrier d'ouverture du salon
+
+Le salon est ouvert certains jours de la semaine (par défaut du lundi au
+samedi), fermé les jours fériés, et peut déclarer des exceptions :
+fermeture exceptionnelle (congés, travaux...) ou ouverture d'un jour
+normalement fermé. Le nombre de jours ouvrés d'une période sert au calcul
+du C.A. /jour ; il est mis en cache jusqu'à la prochaine modification du
+calendrier.
+"""
+
+import configparser
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from modules.bdd import Database, ecriture_atomique
+
+from .feries import jours_feries
+
+
+# Jours d'ouverture par défaut (0 = lundi ... 6 = dimanche)
+JOURS_OUVERTURE_DEFAUT = [0, 1, 2, 3, 4, 5]
+
+# Jours ouvrés déjà comptés : (base, alsace_moselle, date_debut, date_fin) -> nombre.
+# Partagé par toutes les instances : une modification faite depuis un écran
+# invalide les comptes utilisés par les autres.
+_cache_jours_ouvres: Dict[Tuple[str, bool, str, str], int] = {}
+_verrou_cache = threading.Lock()
+
+
+def _vers_date(valeur) -> date:
+    """Convertit une date (date, datetime ou texte YYYY-MM-DD) en date"""
+    if isinstance(valeur, datetime):
+        return valeur.date()
+    if isinstance(valeur, date):
+        return valeur
+    return datetime.strptime(valeur[:10], "%Y-%m-%d").date()
+
+
+class CalendrierDB:
+    """Classe pour gérer les jours d'ouverture et les fermetures exceptionnelles"""
+    
+    def __init__(self, config_path: str = "config.ini"):
+        """
+        Initialise le calendrier
+        
+        Args:
+            config_path: Chemin du fichier de configuration (section [Calendrier])
+        """
+        self.db = Database()
+        self._create_tables()
+        
+        config = configparser.ConfigParser()
+        if Path(config_path).exists():
+            config.read(config_path, encoding='utf-8')
+        self.alsace_moselle = config.getboolean('Calendrier', 'alsace_moselle', fallback=False)
+    
+    def _create_tables(self):
+        """Crée les tables nécessaires pour le module Calendrier"""
+        
+        # Ouverture par jour de la semaine
+        ouverture_table = {
+            "jour_semaine": "INTEGER PRIMARY KEY",  # 0 = lundi ... 6 = dimanche
+            "ouvert": "INTEGER NOT NULL DEFAULT 1"
+        }
+        
+        # Exceptions datées (fermetures exceptionnelles, ouvertures un jour fermé)
+        exceptions_table = {
+            "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+            "date": "TEXT NOT NULL UNIQUE",  # Format YYYY-MM-DD
+            "ouvert": "INTEGER NOT NULL DEFAULT 0",
+            "motif": "TEXT"
+        }
+        
+        if not self.db.table_exists("calendrier_ouverture"):
+            self.db.create_table("calendrier_ouverture", ouverture_table)
+            for jour in range(7):
+                self.db.execute_query(
+                    "INSERT INTO calendrier_ouverture (jour_semaine, ouvert) VALUES (?, ?)",
+                    (jour, int(jour in JOURS_OUVERTURE_DEFAUT))
+                )
+            print("Table 'calendrier_ouverture' créée avec succès")
+        
+        if not self.db.table_exists("calendrier_exceptions"):
+            self.db.create_table("calendrier_exceptions", exceptions_table)
+            print("Table 'calendrier_exceptions' créée avec succès")
+    
+    def _invalider_cache(self):
+        """Oublie les jours ouvrés comptés pour cette base"""
+        base = str(self.db.db_path)
+        with _verrou_cache:
+            for cle in [cle for cle in _cache_jours_ouvres if cle[0] == base]:
+                del _cache_jours_ouvres[cle]
+    
+    def get_jours_ouverture(self) -> List[int]:
+        """
+        Récupère les jours de la semaine où le salon est ouvert
+        
+        Returns:
+            Liste des jours ouverts (0 = lundi ... 6 = dimanche)
+        """
+        query = "SELECT jour_semaine FROM calendrier_ouverture WHERE ouvert = 1 ORDER BY jour_semaine"
+        return [ligne['jour_semaine'] for ligne in self.db.fetch_all(query)]
+    
+    @ecriture_atomique(False)
+    def definir_jours_ouverture(self, jours: Iterable[int]) -> bool:
+        """
+        Définit les jours de la semaine où le salon est ouvert
+        
+        Args:
+            jours: Jours ouverts (0 = lundi ... 6 = dimanche)
+        
+        Returns:
+            True si succès, False sinon
+        """
+        jours = set(jours)
+        with self.db.transaction():
+            for jour in range(7):
+                resultat = self.db.execute_query(
+                    "UPDATE calendrier_ouverture SET ouvert = ? WHERE jour_semaine = ?",
+                    (int(jour in jours), jour)
+                )
+                if resultat is None:
+                    return False
+        self._invalider_cache()
+        return True
+    
+    def get_exceptions(self, date_debut: Optional[str] = None,
+                       date_fin: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Récupère les fermetures et ouvertures exceptionnelles
+        
+        Args:
+            date_debut: Premier jour (YYYY-MM-DD, inclus), None pour toutes
+            date_fin: Dernier jour (YYYY-MM-DD, inclus), None pour toutes
+        
+        Returns:
+            Liste des exceptions {'date', 'ouvert', 'motif'}, par date
+        """
+        query = """
+            SELECT date, ouvert, motif FROM calendrier_exceptions
+            WHERE date BETWEEN ? AND ?
+            ORDER BY date
+        """
+        return self.db.fetch_all(query, (date_debut or "0001-01-01", date_fin or "9999-12-31"))
+    
+    def ajouter_exception(self, date_exception: str, ouvert: bool = False, motif: str = "") -> bool:
+        """
+        Déclare une fermeture (ou une ouverture) exceptionnelle
+        
+        Args:
+            date_exception: Date concernée (YYYY-MM-DD) ; remplace une exception existante
+            ouvert: True pour ouvrir un jour normalement fermé (férié, dimanche...)
+            motif: Motif affiché (congés, inventaire...)
+        
+        Returns:
+            True si succès, False sinon
+        """
+        query = """
+            INSERT INTO calendrier_exceptions (date, ouvert, motif) VALUES (?, ?, ?)
+            ON CONFLICT (date) DO UPDATE SET ouvert = excluded.ouvert, motif = excluded.motif
+        """
+        resultat = self.db.execute_query(query, (date_exception, int(ouvert), motif))
+        self._invalider_cache()
+        return resultat is not None
+    
+    def supprimer_exception(self, date_exception: str) -> bool:
+        """
+        Supprime l'exception d'une date (le jour suit de nouveau le calendrier habituel)
+        
+        Args:
+            date_exception: Date concernée (YYYY-MM-DD)
+        
+        Returns:
+            True si succès, False sinon
+        """
+        resultat = self.db.execute_query(
+            "DELETE FROM calendrier_exceptions WHERE date = ?", (date_exception,)
+        )
+        self._invalider_cache()
+        return resultat is not None
+    
+    def get_feries(self, annee: int) -> Dict[date, str]:
+        """
+        Liste les jours fériés d'une année (Alsace-Moselle selon config.ini)
+        
+        Args:
+            annee: Année (ex: 2025)
+        
+        Returns:
+            {date: libellé}, par date
+        """
+        return jours_feries(annee, self.alsace_moselle)
+    
+    def jours_ouvres(self, date_debut, date_fin) -> List[date]:
+        """
+        Liste les jours d'ouverture d'un intervalle
+        
+        Un jour est ouvert si c'est un jour d'ouverture de la semaine et
+        qu'il n'est pas férié, sauf exception déclarée pour cette date.
+        
+        Args:
+            date_debut: Premier jour (date ou YYYY-MM-DD, inclus)
+            date_fin: Dernier jour (date ou YYYY-MM-DD, inclus)
+        
+        Returns:
+            Jours ouverts, par date
+        """
+        debut, fin = _vers_date(date_debut), _vers_date(date_fin)
+        if fin < debut:
+            return []
+        
+        ouverture = set(self.get_jours_ouverture())
+        exceptions = {
+            _vers_date(e['date']): bool(e['ouvert'])
+            for e in self.get_exceptions(debut.isoformat(), fin.isoformat())
+        }
+        feries = {}
+        for annee in range(debut.year, fin.year + 1):
+            feries.update(self.get_feries(annee))
+        
+        jours = []
+        jour = debut
+        while jour <= fin:
+            ouvert = jour.weekday() in ouverture and jour not in feries
+            if exceptions.get(jour, ouvert):
+                jours.append(jour)
+            jour += timedelta(days=1)
+        return jours
+    
+    def compter_jours_ouvres(self, date_debut, date_fin) -> int:
+        """
+        Compte les jours d'ouverture d'un intervalle (mis en cache)
+        
+        Args:
+            date_debut: Premier jour (date ou YYYY-MM-DD, inclus)
+            date_fin: Dernier jour (date ou YYYY-MM-DD, inclus)
+        
+        Returns:
+            Nombre de jours ouverts
+        """
+        return self.compter_jours_ouvres_periodes([(date_debut, date_fin)])[0]
+    
+    def compter_jours_ouvres_periodes(self, periodes: List[Tuple[Any, Any]]) -> List[int]:
+        """
+        Compte les jours d'ouverture de plusieurs intervalles
+        
+        Le calendrier n'est lu qu'une fois pour tous les intervalles absents
+        du cache.
+        
+        Args:
+            periodes: Intervalles (date_debut, date_fin), dates ou YYYY-MM-DD (incluses)
+        
+        Returns:
+            Nombre de jours ouverts de chaque intervalle, dans l'ordre
+        """
+        base = str(self.db.db_path)
+        cles = [
+            (base, self.alsace_moselle, _vers_date(debut).isoformat(), _vers_date(fin).isoformat())
+            for debut, fin in periodes
+        ]
+        with _verrou_cache:
+            manquantes = [cle for cle in cles if cle not in _cache_jours_ouvres]
+        
+        if manquantes:
+            jours = self.jours_ouvres(min(cle[2] for cle in manquantes),
+                                      max(cle[3] for cle in manquantes))
+            with _verrou_cache:
+                for cle in manquantes:
+                    _cache_jours_ouvres[cle] = (bisect_right(jours, _vers_date(cle[3]))
+                                                - bisect_left(jours, _vers_date(cle[2])))
+        
+        with _verrou_cache:
+            return [_cache_jours_ouvres.get(cle, 0) for cle in cles]
+    
+    def moyennes_par_jour_ouvre(self, montants: List[Tuple[Optional[float], Any, Any]]) -> List[Optional[float]]:
+        """
+        Rapporte des montants aux jours d'ouverture de leur intervalle
+        
+        Args:
+            montants: Tuples (montant, date_debut, date_fin), dates ou YYYY-MM-DD (incluses)
+        
+        Returns:
+            Montant par jour ouvré arrondi au centième, dans l'ordre (None si le
+            montant est vide ou si l'intervalle ne contient aucun jour ouvré)
+        """
+        nb_jours = self.compter_jours_ouvres_periodes([(debut, fin) for _, debut, fin in montants])
+        return [
+            round(montant / nb, 2) if montant is not None and nb else None
+            for (montant, _, _), nb in zip(montants, nb_jours)
+        ]
@@ -0,0 +1,73 @@
+"""
+C.A. /jour des suivis calculé à partir du calendrier d'ouverture
+
+Partagé par le Suivi Manager et les Suivis Collaborateurs : seules la table
+des périodes et la colonne du C.A. (ca_total, ca_prestation) changent.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from modules.bdd import JournalModifications
+
+from .database import CalendrierDB
+
+
+def appliquer_ca_par_jour_ouvre(calendrier: CalendrierDB, lignes: List[Dict[str, Any]], colonne_ca: str):
+    """
+    Remplace le C.A. /jour d'agrégats de jours par le C.A. par jour d'ouverture
+    
+    Args:
+        calendrier: Calendrier d'ouverture du salon
+        lignes: Agrégats {colonne_ca, 'date_debut', 'dernier_jour', 'ca_par_jour'},
+                modifiés sur place (C.A. /jour inchangé si aucun jour n'est ouvert)
+        colonne_ca: Colonne du C.A. de l'agrégat
+    """
+    moyennes = calendrier.moyennes_par_jour_ouvre(
+        [(ligne[colonne_ca], ligne['date_debut'], ligne['dernier_jour']) for ligne in lignes]
+    )
+    for ligne, moyenne in zip(lignes, moyennes):
+        if moyenne is not None:
+            ligne['ca_par_jour'] = moyenne
+
+
+def deriver_ca_par_jour_periodes(journal: JournalModifications, calendrier: CalendrierDB,
+                                 table: str, colonne_ca: str, date_debut: str, date_fin: str) -> Optional[int]:
+    """
+    Recalcule le C.A. /jour des périodes d'un intervalle à partir du calendrier
+    
+    Le C.A. de chaque période est rapporté à ses jours d'ouverture (jusqu'à
+    aujourd'hui pour la période en cours). Toutes les périodes sont
+    modifiées en une seule action annulable.
+    
+    Args:
+        journal: Journal du module propriétaire de la table
+        calendrier: Calendrier d'ouverture du salon
+        table: Table des périodes (suivis_manager_periodes, suivis_collaborateurs_periodes)
+        colonne_ca: Colonne du C.A. de la période
+        date_debut: Premier jour (YYYY-MM-DD, inclus)
+        date_fin: Dernier jour (YYYY-MM-DD, inclus)
+    
+    Returns:
+        Nombre de périodes modifiées ou None en cas d'erreur
+    """
+    query = f"""
+        SELECT id, date_debut, date_fin, {colonne_ca}, ca_par_jour FROM {table}
+        WHERE {colonne_ca} IS NOT NULL AND date_debut <= ? AND date_fin >= ?
+    """
+    periodes = journal.db.fetch_all(query, (date_fin, date_debut))
+    aujourd_hui = datetime.now().strftime("%Y-%m-%d")
+    moyennes = calendrier.moyennes_par_jour_ouvre([
+        (periode[colonne_ca], periode['date_debut'], min(periode['date_fin'], aujourd_hui))
+        for periode in periodes
+    ])
+    
+    nb_modifiees = 0
+    with journal.lot("Calcul C.A. /jour"):
+        for periode, moyenne in zip(periodes, moyennes):
+            if moyenne is None or moyenne == periode['ca_par_jour']:
+                continue
+            if journal.mettre_a_jour(table, periode['id'], {"ca_par_jour": moyenne}) is None:
+                return None
+            nb_modifiees += 1
+    return nb_modifiees
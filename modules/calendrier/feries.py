@@ -0,0 +1,101 @@
+"""
+Jours fériés français
+
+Les fêtes fixes et les fêtes mobiles (calculées à partir de la date de
+Pâques, algorithme de Meeus/Jones/Butcher) sont calculées pour n'importe
+quelle année, sans table à tenir à jour.
+"""
+
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, Tuple
+
+
+# Fêtes à date fixe : (mois, jour) -> libellé
+FERIES_FIXES = {
+    (1, 1): "Jour de l'an",
+    (5, 1): "Fête du Travail",
+    (5, 8): "Victoire 1945",
+    (7, 14): "Fête nationale",
+    (8, 15): "Assomption",
+    (11, 1): "Toussaint",
+    (11, 11): "Armistice 1918",
+    (12, 25): "Noël",
+}
+
+# Fêtes mobiles : écart en jours avec le dimanche de Pâques -> libellé
+FERIES_PAQUES = {
+    1: "Lundi de Pâques",
+    39: "Ascension",
+    50: "Lundi de Pentecôte",
+}
+
+# Jours fériés supplémentaires d'Alsace-Moselle
+FERIES_ALSACE_MOSELLE_FIXES = {(12, 26): "Saint-Étienne"}
+FERIES_ALSACE_MOSELLE_PAQUES = {-2: "Vendredi saint"}
+
+
+def date_paques(annee: int) -> date:
+    """
+    Calcule la date du dimanche de Pâques (calendrier grégorien)
+    
+    Args:
+        annee: Année (ex: 2025)
+    
+    Returns:
+        Date du dimanche de Pâques
+    """
+    a = annee % 19
+    b, c = divmod(annee, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mois, jour = divmod(h + l - 7 * m + 114, 31)
+    return date(annee, mois, jour + 1)
+
+
+@lru_cache(maxsize=64)
+def _feries_annee(annee: int, alsace_moselle: bool) -> Tuple[Tuple[date, str], ...]:
+    """Jours fériés d'une année, triés (calculés une fois par année)"""
+    fixes = dict(FERIES_FIXES)
+    mobiles = dict(FERIES_PAQUES)
+    if alsace_moselle:
+        fixes.update(FERIES_ALSACE_MOSELLE_FIXES)
+        mobiles.update(FERIES_ALSACE_MOSELLE_PAQUES)
+    
+    paques = date_paques(annee)
+    feries = {date(annee, mois, jour): libelle for (mois, jour), libelle in fixes.items()}
+    feries.update({paques + timedelta(days=ecart): libelle for ecart, libelle in mobiles.items()})
+    return tuple(sorted(feries.items()))
+
+
+def jours_feries(annee: int, alsace_moselle: bool = False) -> Dict[date, str]:
+    """
+    Liste les jours fériés d'une année
+    
+    Args:
+        annee: Année (ex: 2025)
+        alsace_moselle: Ajoute le Vendredi saint et la Saint-Étienne
+    
+    Returns:
+        {date: libellé}, par date
+    """
+    return dict(_feries_annee(annee, alsace_moselle))
+
+
+def est_ferie(jour: date, alsace_moselle: bool = False) -> bool:
+    """
+    Indique si une date est un jour férié
+    
+    Args:
+        jour: Date à tester
+        alsace_moselle: Jours fériés d'Alsace-Moselle inclus
+    
+    Returns:
+        True si la date est fériée
+    """
+    return any(ferie == jour for ferie, _ in _feries_annee(jour.year, alsace_moselle))
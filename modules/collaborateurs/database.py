@@ -2,11 +2,21 @@
 Gestion de la base de données pour le module Collaborateurs
 """
 
-from modules.bdd import Database
+from modules.bdd import Database, ecriture_atomique, Collaborateur
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 
+# Écart entre deux clés d'ordre consécutives : un déplacement prend la valeur
+# médiane entre ses nouveaux voisins sans renuméroter les autres lignes
+ECART_ORDRE = 1024
+
+# Bornes des périodes d'emploi : date d'entrée inconnue, période en cours.
+# Des dates plutôt que NULL pour que les recherches par intervalle utilisent l'index
+DEBUT_INCONNU = "0001-01-01"
+FIN_OUVERTE = "9999-12-31"
+
+
 class CollaborateursDB:
     """Classe pour gérer les données des collaborateurs"""
     
@@ -31,9 +41,31 @@ class CollaborateursDB:
             "date_modification": "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
         }
         
+        # Table des périodes d'emploi (une ligne par passage dans le salon)
+        periodes_table = {
+            "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+            "collaborateur_id": "INTEGER NOT NULL",
+            "date_debut": f"DATE NOT NULL DEFAULT '{DEBUT_INCONNU}'",
+            "date_fin": f"DATE NOT NULL DEFAULT '{FIN_OUVERTE}'",
+            "FOREIGN KEY (collaborateur_id)": "REFERENCES collaborateurs(id) ON DELETE CASCADE"
+        }
+        
         if not self.db.table_exists("collaborateurs"):
             self.db.create_table("collaborateurs", collaborateurs_table)
             print("Table 'collaborateurs' créée avec succès")
+        
+        if not self.db.table_exists("collaborateurs_periodes_emploi"):
+            self.db.create_table("collaborateurs_periodes_emploi", periodes_table)
+            # Recherche "actif entre D1 et D2" : parcours de l'index à partir de date_fin >= D1
+            self.db.execute_query(
+                "CREATE INDEX IF NOT EXISTS idx_periodes_emploi_intervalle "
+                "ON collaborateurs_periodes_emploi (date_fin, date_debut, collaborateur_id)"
+            )
+            self.db.execute_query(
+                "CREATE INDEX IF NOT EXISTS idx_periodes_emploi_collaborateur "
+                "ON collaborateurs_periodes_emploi (collaborateur_id, date_debut)"
+            )
+            print("Table 'collaborateurs_periodes_emploi' créée avec succès")
     
     def _migrate_database(self):
         """Migre la base de données pour ajouter les colonnes manquantes"""
@@ -63,6 +95,18 @@ class CollaborateursDB:
                 alter_query = "ALTER TABLE collaborateurs ADD COLUMN date_entree DATE"
                 self.db.execute_query(alter_query)
                 print("Colonne 'date_entree' ajoutée avec succès")
+            
+            # Index sur l'ordre d'affichage (tri et recherche des voisins)
+            self.db.execute_query(
+                "CREATE INDEX IF NOT EXISTS idx_collaborateurs_ordre ON collaborateurs (ordre)"
+            )
+            
+            # Anciennes bases : ordres consécutifs (0, 1, 2...) à espacer
+            if self._ordres_a_reequilibrer():
+                self._reequilibrer_ordres()
+            
+            # Périodes d'emploi déduites des colonnes date_entree / date_inactivation
+            self._initialiser_periodes_emploi()
                 
         except Exception as e:
             print(f"Erreur lors de la migration: {e}")
@@ -70,19 +114,63 @@ class CollaborateursDB:
     def _initialiser_ordre(self):
         """Initialise l'ordre pour les collaborateurs existants"""
         try:
-            # Récupérer tous les collaborateurs sans ordre défini
-            query = "SELECT id FROM collaborateurs ORDER BY id"
-            collaborateurs = self.db.fetch_all(query)
-            
-            # Attribuer un ordre séquentiel
-            for index, collab in enumerate(collaborateurs):
-                update_query = "UPDATE collaborateurs SET ordre = ? WHERE id = ?"
-                self.db.execute_query(update_query, (index, collab['id']))
-            
-            print(f"Ordre initialisé pour {len(collaborateurs)} collaborateurs")
+            self._reequilibrer_ordres()
+            print(f"Ordre initialisé pour {self.compter_collaborateurs()} collaborateurs")
         except Exception as e:
             print(f"Erreur lors de l'initialisation de l'ordre: {e}")
     
+    def _ordres_a_reequilibrer(self) -> bool:
+        """
+        Vérifie s'il manque de place entre deux clés d'ordre voisines
+        
+        Returns:
+            True si deux collaborateurs consécutifs ont un écart inférieur à 2
+        """
+        query = """
+            SELECT 1 FROM (
+                SELECT ordre - LAG(ordre) OVER (ORDER BY ordre, id) AS ecart
+                FROM collaborateurs
+            )
+            WHERE ecart IS NOT NULL AND ecart < 2
+            LIMIT 1
+        """
+        return self.db.fetch_one(query) is not None
+    
+    def _reequilibrer_ordres(self):
+        """Réattribue des clés d'ordre espacées de ECART_ORDRE, en une requête"""
+        query = """
+            UPDATE collaborateurs
+            SET ordre = (
+                SELECT rang * ? FROM (
+                    SELECT id, ROW_NUMBER() OVER (ORDER BY ordre, id) AS rang
+                    FROM collaborateurs
+                ) AS classement
+                WHERE classement.id = collaborateurs.id
+            )
+        """
+        self.db.execute_query(query, (ECART_ORDRE,))
+        print("Ordre des collaborateurs rééquilibré")
+    
+    def _initialiser_periodes_emploi(self):
+        """Crée une période d'emploi pour chaque collaborateur qui n'en a aucune"""
+        query = """
+            INSERT INTO collaborateurs_periodes_emploi (collaborateur_id, date_debut, date_fin)
+            SELECT c.id,
+                   COALESCE(c.date_entree, ?),
+                   CASE WHEN c.etat = 'Inactif'
+                        THEN COALESCE(date(c.date_inactivation), date(c.date_modification), date('now'))
+                        ELSE ?
+                   END
+            FROM collaborateurs c
+            WHERE NOT EXISTS (
+                SELECT 1 FROM collaborateurs_periodes_emploi p WHERE p.collaborateur_id = c.id
+            )
+        """
+        cursor = self.db.execute_query(query, (DEBUT_INCONNU, FIN_OUVERTE))
+        if cursor and cursor.rowcount > 0:
+            print(f"Périodes d'emploi initialisées pour {cursor.rowcount} collaborateurs")
+    
+    @ecriture_atomique(None)
     def ajouter_collaborateur(self, nom: str, prenom: str, etat: str = "Actif", 
                             date_entree: str = None) -> Optional[int]:
         """
@@ -97,29 +185,40 @@ class CollaborateursDB:
         Returns:
             ID du collaborateur créé ou None si erreur
         """
-        # Récupérer le prochain ordre
+        # Placer le nouveau collaborateur après le dernier
         max_ordre_query = "SELECT MAX(ordre) as max_ordre FROM collaborateurs"
         result = self.db.fetch_one(max_ordre_query)
-        nouvel_ordre = (result['max_ordre'] or -1) + 1
+        nouvel_ordre = (result['max_ordre'] or 0) + ECART_ORDRE
         
-        # Si le collaborateur est créé directement en Inactif, enregistrer la date
-        if etat == "Inactif":
-            query = """
-                INSERT INTO collaborateurs (nom, prenom, etat, ordre, date_entree, date_inactivation)
-                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            """
-            cursor = self.db.execute_query(query, (nom.strip(), prenom.strip(), etat, nouvel_ordre, date_entree))
-        else:
-            query = """
-                INSERT INTO collaborateurs (nom, prenom, etat, ordre, date_entree)
-                VALUES (?, ?, ?, ?, ?)
-            """
-            cursor = self.db.execute_query(query, (nom.strip(), prenom.strip(), etat, nouvel_ordre, date_entree))
-        
-        if cursor:
-            return cursor.lastrowid
-        return None
+        with self.db.transaction():
+            # Si le collaborateur est créé directement en Inactif, enregistrer la date
+            if etat == "Inactif":
+                query = """
+                    INSERT INTO collaborateurs (nom, prenom, etat, ordre, date_entree, date_inactivation)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """
+                cursor = self.db.execute_query(query, (nom.strip(), prenom.strip(), etat, nouvel_ordre, date_entree))
+            else:
+                query = """
+                    INSERT INTO collaborateurs (nom, prenom, etat, ordre, date_entree)
+                    VALUES (?, ?, ?, ?, ?)
+                """
+                cursor = self.db.execute_query(query, (nom.strip(), prenom.strip(), etat, nouvel_ordre, date_entree))
+            
+            if not cursor:
+                return None
+            
+            collaborateur_id = cursor.lastrowid
+            self.db.execute_query(
+                """
+                INSERT INTO collaborateurs_periodes_emploi (collaborateur_id, date_debut, date_fin)
+                VALUES (?, ?, CASE WHEN ? = 'Inactif' THEN date('now') ELSE ? END)
+                """,
+                (collaborateur_id, date_entree or DEBUT_INCONNU, etat, FIN_OUVERTE)
+            )
+            return collaborateur_id
     
+    @ecriture_atomique(False)
     def modifier_collaborateur(self, collaborateur_id: int, nom: str, prenom: str, 
                               etat: str, date_entree: str = None) -> bool:
         """
@@ -137,9 +236,11 @@ class CollaborateursDB:
         """
         # Récupère l'état actuel
         current = self.get_collaborateur(collaborateur_id)
+        if current is None:
+            return False
         
         # Si le collaborateur passe de 'Actif' à 'Inactif', enregistre la date
-        if current and current['etat'] == 'Actif' and etat == 'Inactif':
+        if current['etat'] == 'Actif' and etat == 'Inactif':
             query = """
                 UPDATE collaborateurs 
                 SET nom = ?, prenom = ?, etat = ?, date_entree = ?,
@@ -148,7 +249,7 @@ class CollaborateursDB:
                 WHERE id = ?
             """
         # Si le collaborateur passe de 'Inactif' à 'Actif', supprime la date d'inactivation
-        elif current and current['etat'] == 'Inactif' and etat == 'Actif':
+        elif current['etat'] == 'Inactif' and etat == 'Actif':
             query = """
                 UPDATE collaborateurs 
                 SET nom = ?, prenom = ?, etat = ?, date_entree = ?,
@@ -165,12 +266,62 @@ class CollaborateursDB:
                 WHERE id = ?
             """
         
-        cursor = self.db.execute_query(query, (nom.strip(), prenom.strip(), etat, date_entree, collaborateur_id))
-        return cursor is not None
+        with self.db.transaction():
+            cursor = self.db.execute_query(query, (nom.strip(), prenom.strip(), etat, date_entree, collaborateur_id))
+            if not cursor:
+                return False
+            
+            if current['etat'] != etat:
+                self._changer_periode_emploi(collaborateur_id, etat)
+            if (current['date_entree'] or None) != (date_entree or None):
+                self._corriger_date_entree(collaborateur_id, date_entree)
+            return True
+    
+    def _changer_periode_emploi(self, collaborateur_id: int, etat: str):
+        """Clôt la période en cours (départ) ou en ouvre une nouvelle (retour)"""
+        if etat == 'Inactif':
+            self.db.execute_query(
+                """
+                UPDATE collaborateurs_periodes_emploi SET date_fin = date('now')
+                WHERE collaborateur_id = ? AND date_fin = ?
+                """,
+                (collaborateur_id, FIN_OUVERTE)
+            )
+        else:
+            # Un départ et un retour le même jour prolongent la même période
+            cursor = self.db.execute_query(
+                """
+                UPDATE collaborateurs_periodes_emploi SET date_fin = ?
+                WHERE collaborateur_id = ? AND date_fin = date('now')
+                """,
+                (FIN_OUVERTE, collaborateur_id)
+            )
+            if cursor and cursor.rowcount == 0:
+                self.db.execute_query(
+                    """
+                    INSERT INTO collaborateurs_periodes_emploi (collaborateur_id, date_debut, date_fin)
+                    VALUES (?, date('now'), ?)
+                    """,
+                    (collaborateur_id, FIN_OUVERTE)
+                )
+    
+    def _corriger_date_entree(self, collaborateur_id: int, date_entree: Optional[str]):
+        """Reporte une date d'entrée modifiée sur la première période d'emploi"""
+        self.db.execute_query(
+            """
+            UPDATE collaborateurs_periodes_emploi SET date_debut = ?
+            WHERE id = (
+                SELECT id FROM collaborateurs_periodes_emploi
+                WHERE collaborateur_id = ?
+                ORDER BY date_debut LIMIT 1
+            )
+            """,
+            (date_entree or DEBUT_INCONNU, collaborateur_id)
+        )
     
     def deplacer_collaborateur_haut(self, collaborateur_id: int) -> bool:
         """
-        Déplace un collaborateur vers le haut (ordre - 1)
+        Déplace un collaborateur d'un rang vers le haut
         
         Args:
             collaborateur_id: ID du collaborateur à déplacer
@@ -178,65 +329,97 @@ class CollaborateursDB:
         Returns:
             True si succès, False sinon
         """
-        # Récupérer le collaborateur actuel
-        current = self.get_collaborateur(collaborateur_id)
-        if not current:
-            return False
+        return self._deplacer(collaborateur_id, vers_le_haut=True)
+    
+    def deplacer_collaborateur_bas(self, collaborateur_id: int) -> bool:
+        """
+        Déplace un collaborateur d'un rang vers le bas
+        
+        Args:
+            collaborateur_id: ID du collaborateur à déplacer
+            
+        Returns:
+            True si succès, False sinon
+        """
+        return self._deplacer(collaborateur_id, vers_le_haut=False)
+    
+    def _deplacer(self, collaborateur_id: int, vers_le_haut: bool) -> bool:
+        """
+        Fait passer un collaborateur de l'autre côté de son voisin
         
-        ordre_actuel = current.get('ordre', 0)
+        Le collaborateur reçoit la valeur médiane entre son voisin et le
+        suivant : une seule ligne est modifiée. S'il n'y a plus de place entre
+        les deux, les ordres sont rééquilibrés puis le déplacement est refait.
+        """
+        comparaison, tri = ("<", "DESC") if vers_le_haut else (">", "ASC")
+        query = f"""
+            SELECT ordre FROM collaborateurs
+            WHERE ordre {comparaison} (SELECT ordre FROM collaborateurs WHERE id = ?)
+            ORDER BY ordre {tri}
+            LIMIT 2
+        """
+        voisins = [row['ordre'] for row in self.db.fetch_all(query, (collaborateur_id,))]
         
-        # Si déjà en premier, ne rien faire
-        if ordre_actuel == 0:
+        # Déjà en première (ou dernière) position
+        if not voisins:
             return False
         
-        # Trouver le collaborateur juste au-dessus
-        query = "SELECT id, ordre FROM collaborateurs WHERE ordre = ? LIMIT 1"
-        au_dessus = self.db.fetch_one(query, (ordre_actuel - 1,))
+        voisin = voisins[0]
+        if len(voisins) > 1:
+            borne = voisins[1]
+        else:
+            borne = voisin - ECART_ORDRE if vers_le_haut else voisin + ECART_ORDRE
         
-        if au_dessus:
-            # Échanger les ordres
-            self.db.execute_query("UPDATE collaborateurs SET ordre = ? WHERE id = ?", 
-                                (ordre_actuel, au_dessus['id']))
-            self.db.execute_query("UPDATE collaborateurs SET ordre = ? WHERE id = ?", 
-                                (ordre_actuel - 1, collaborateur_id))
-            return True
+        nouvel_ordre = (voisin + borne) // 2
+        if nouvel_ordre in (voisin, borne):
+            self._reequilibrer_ordres()
+            return self._deplacer(collaborateur_id, vers_le_haut)
         
-        return False
+        cursor = self.db.execute_query(
+            "UPDATE collaborateurs SET ordre = ? WHERE id = ?",
+            (nouvel_ordre, collaborateur_id)
+        )
+        return cursor is not None
     
-    def deplacer_collaborateur_bas(self, collaborateur_id: int) -> bool:
+    @ecriture_atomique(False)
+    def reordonner(self, ids: List[int]) -> bool:
         """
-        Déplace un collaborateur vers le bas (ordre + 1)
+        Applique un nouvel ordre d'affichage en une seule transaction
+        
+        Les collaborateurs listés se répartissent les clés d'ordre qu'ils
+        occupaient déjà : une liste partielle (vue filtrée) ne déplace pas les
+        collaborateurs absents de la liste.
         
         Args:
-            collaborateur_id: ID du collaborateur à déplacer
+            ids: IDs des collaborateurs dans le nouvel ordre
             
         Returns:
             True si succès, False sinon
         """
-        # Récupérer le collaborateur actuel
-        current = self.get_collaborateur(collaborateur_id)
-        if not current:
-            return False
-        
-        ordre_actuel = current.get('ordre', 0)
+        if not ids:
+            return True
         
-        # Trouver le collaborateur juste en dessous
-        query = "SELECT id, ordre FROM collaborateurs WHERE ordre = ? LIMIT 1"
-        en_dessous = self.db.fetch_one(query, (ordre_actuel + 1,))
+        marqueurs = ", ".join("?" for _ in ids)
+        query = f"SELECT id, ordre FROM collaborateurs WHERE id IN ({marqueurs})"
+        ordres_actuels = {row['id']: row['ordre'] for row in self.db.fetch_all(query, tuple(ids))}
         
-        if en_dessous:
-            # Échanger les ordres
-            self.db.execute_query("UPDATE collaborateurs SET ordre = ? WHERE id = ?", 
-                                (ordre_actuel, en_dessous['id']))
-            self.db.execute_query("UPDATE collaborateurs SET ordre = ? WHERE id = ?", 
-                                (ordre_actuel + 1, collaborateur_id))
-            return True
+        ids = [collaborateur_id for collaborateur_id in ids if collaborateur_id in ordres_actuels]
+        places = sorted(ordres_actuels.values())
         
-        return False
+        with self.db.transaction():
+            return self.db.execute_many(
+                "UPDATE collaborateurs SET ordre = ? WHERE id = ?",
+                [(ordre, collaborateur_id) for ordre, collaborateur_id in zip(places, ids)
+                 if ordres_actuels[collaborateur_id] != ordre]
+            )
     
+    @ecriture_atomique(False)
     def supprimer_collaborateur(self, collaborateur_id: int) -> bool:
         """
-        Supprime un collaborateur et réorganise les ordres
+        Supprime un collaborateur
+        
+        Les ordres étant espacés, les collaborateurs suivants ne sont pas
+        renumérotés.
         
         Args:
             collaborateur_id: ID du collaborateur à supprimer
@@ -244,26 +427,16 @@ class CollaborateursDB:
         Returns:
             True si succès, False sinon
         """
-        # Récupérer l'ordre du collaborateur à supprimer
-        current = self.get_collaborateur(collaborateur_id)
-        if not current:
-            return False
-        
-        ordre_supprime = current.get('ordre', 0)
-        
-        # Supprimer le collaborateur
-        query = "DELETE FROM collaborateurs WHERE id = ?"
-        cursor = self.db.execute_query(query, (collaborateur_id,))
-        
-        if cursor:
-            # Décaler tous les collaborateurs après celui supprimé
-            update_query = "UPDATE collaborateurs SET ordre = ordre - 1 WHERE ordre > ?"
-            self.db.execute_query(update_query, (ordre_supprime,))
-            return True
-        
-        return False
+        with self.db.transaction():
+            self.db.execute_query(
+                "DELETE FROM collaborateurs_periodes_emploi WHERE collaborateur_id = ?",
+                (collaborateur_id,)
+            )
+            query = "DELETE FROM collaborateurs WHERE id = ?"
+            cursor = self.db.execute_query(query, (collaborateur_id,))
+            return cursor is not None and cursor.rowcount > 0
     
-    def get_collaborateur(self, collaborateur_id: int) -> Optional[Dict[str, Any]]:
+    def get_collaborateur(self, collaborateur_id: int) -> Optional[Collaborateur]:
         """
         Récupère un collaborateur par son ID
         
@@ -271,12 +444,12 @@ class CollaborateursDB:
             collaborateur_id: ID du collaborateur
             
         Returns:
-            Dictionnaire avec les données du collaborateur ou None
+            Collaborateur ou None
         """
         query = "SELECT * FROM collaborateurs WHERE id = ?"
-        return self.db.fetch_one(query, (collaborateur_id,))
+        return self.db.fetch_model(Collaborateur, query, (collaborateur_id,))
     
-    def get_tous_collaborateurs(self) -> List[Dict[str, Any]]:
+    def get_tous_collaborateurs(self) -> List[Collaborateur]:
         """
         Récupère tous les collaborateurs triés par ordre
         
@@ -284,9 +457,9 @@ class CollaborateursDB:
             Liste des collaborateurs
         """
         query = "SELECT * FROM collaborateurs ORDER BY ordre"
-        return self.db.fetch_all(query)
+        return self.db.fetch_models(Collaborateur, query)
     
-    def get_collaborateurs_actifs(self) -> List[Dict[str, Any]]:
+    def get_collaborateurs_actifs(self) -> List[Collaborateur]:
         """
         Récupère uniquement les collaborateurs actifs triés par ordre
         
@@ -294,7 +467,80 @@ class CollaborateursDB:
             Liste des collaborateurs actifs
         """
         query = "SELECT * FROM collaborateurs WHERE etat = 'Actif' ORDER BY ordre"
-        return self.db.fetch_all(query)
+        return self.db.fetch_models(Collaborateur, query)
+    
+    def get_periodes_emploi(self, collaborateur_id: int) -> List[Dict[str, Any]]:
+        """
+        Récupère les périodes d'emploi d'un collaborateur
+        
+        Args:
+            collaborateur_id: ID du collaborateur
+            
+        Returns:
+            Liste des périodes (date_debut, date_fin) par date de début ;
+            DEBUT_INCONNU et FIN_OUVERTE marquent les bornes non renseignées
+        """
+        query = """
+            SELECT * FROM collaborateurs_periodes_emploi
+            WHERE collaborateur_id = ?
+            ORDER BY date_debut
+        """
+        return self.db.fetch_all(query, (collaborateur_id,))
+    
+    def get_collaborateurs_actifs_entre(self, date_debut: str, date_fin: str) -> List[Collaborateur]:
+        """
+        Récupère les collaborateurs employés au moins un jour entre deux dates
+        
+        Args:
+            date_debut: Première date incluse (format YYYY-MM-DD)
+            date_fin: Dernière date incluse (format YYYY-MM-DD)
+            
+        Returns:
+            Liste des collaborateurs triés par ordre
+        """
+        query = """
+            SELECT * FROM collaborateurs
+            WHERE id IN (
+                SELECT collaborateur_id FROM collaborateurs_periodes_emploi
+                WHERE date_fin >= ? AND date_debut <= ?
+            )
+            ORDER BY ordre
+        """
+        return self.db.fetch_models(Collaborateur, query, (date_debut, date_fin))
+    
+    def get_actifs_par_mois(self, annee_debut: int, annee_fin: int) -> Dict[tuple, List[int]]:
+        """
+        Récupère en une requête les collaborateurs actifs de chaque mois d'une plage d'années
+        
+        Args:
+            annee_debut: Première année
+            annee_fin: Dernière année (incluse)
+            
+        Returns:
+            Dictionnaire {(annee, mois): [ids des collaborateurs triés par ordre]}
+        """
+        query = """
+            WITH RECURSIVE mois(debut) AS (
+                SELECT date(printf('%04d-01-01', ?))
+                UNION ALL
+                SELECT date(debut, '+1 month') FROM mois
+                WHERE debut < date(printf('%04d-12-01', ?))
+            )
+            SELECT CAST(strftime('%Y', m.debut) AS INTEGER) AS annee,
+                   CAST(strftime('%m', m.debut) AS INTEGER) AS mois,
+                   c.id
+            FROM mois m
+            JOIN collaborateurs_periodes_emploi p
+              ON p.date_fin >= m.debut
+             AND p.date_debut <= date(m.debut, '+1 month', '-1 day')
+            JOIN collaborateurs c ON c.id = p.collaborateur_id
+            GROUP BY m.debut, c.id
+            ORDER BY m.debut, c.ordre
+        """
+        actifs: Dict[tuple, List[int]] = {}
+        for row in self.db.fetch_iter(query, (annee_debut, annee_fin)):
+            actifs.setdefault((row['annee'], row['mois']), []).append(row['id'])
+        return actifs
     
     def compter_collaborateurs(self) -> int:
         """
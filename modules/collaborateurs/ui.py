@@ -6,13 +6,15 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox,
     QDialog, QFormLayout, QLineEdit, QComboBox, QDialogButtonBox,
-    QDateEdit
+    QDateEdit, QAbstractItemView
 )
 from PySide6.QtCore import Qt, Signal, QDate
 from PySide6.QtGui import QFont
 from datetime import datetime
+from typing import Optional
 
 from .database import CollaborateursDB
+from modules.bdd.executeur_qt import ExecuteurQt
 
 
 class AjouterCollaborateurDialog(QDialog):
@@ -111,12 +113,57 @@ class AjouterCollaborateurDialog(QDialog):
         super().accept()
 
 
+class TableauReordonnable(QTableWidget):
+    """Tableau dont les lignes se réordonnent par glisser-déposer"""
+    
+    ligne_deplacee = Signal(int, int)  # Ligne d'origine, nouvelle position
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setDragEnabled(True)
+        self.setAcceptDrops(True)
+        self.viewport().setAcceptDrops(True)
+        self.setDragDropMode(QAbstractItemView.InternalMove)
+        self.setDragDropOverwriteMode(False)
+        self.setDropIndicatorShown(True)
+    
+    def dropEvent(self, event):
+        """Calcule la nouvelle position au lieu de laisser Qt déplacer les cellules"""
+        if event.source() is not self:
+            event.ignore()
+            return
+        
+        source = self.currentRow()
+        ligne = self.rowAt(event.position().toPoint().y())
+        indicateur = self.dropIndicatorPosition()
+        
+        # Position d'insertion dans la liste d'origine
+        if ligne < 0 or indicateur == QAbstractItemView.OnViewport:
+            insertion = self.rowCount()
+        elif indicateur == QAbstractItemView.BelowItem:
+            insertion = ligne + 1
+        else:
+            insertion = ligne
+        
+        cible = insertion - 1 if insertion > source else insertion
+        
+        # Le contenu est rechargé depuis la base : Qt ne doit rien déplacer
+        event.setDropAction(Qt.IgnoreAction)
+        event.accept()
+        
+        if source >= 0 and cible != source:
+            self.ligne_deplacee.emit(source, cible)
+
+
 class CollaborateursWidget(QWidget):
     """Widget principal pour le module Gestion Collaborateurs"""
     
+    collaborateurs_modifies = Signal()  # Signal émis après un ajout, une modification, une suppression...
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.db = CollaborateursDB()
+        self.executeur = ExecuteurQt(self)  # Accès à la base hors du thread de l'interface
         
         self._init_ui()
         self._charger_donnees()
@@ -179,7 +226,7 @@ class CollaborateursWidget(QWidget):
         buttons_layout.addWidget(QLabel("Afficher :"))
         self.filtre_combo = QComboBox()
         self.filtre_combo.addItems(["Tous", "Actifs uniquement", "Inactifs uniquement"])
-        self.filtre_combo.currentIndexChanged.connect(self._charger_donnees)
+        self.filtre_combo.currentIndexChanged.connect(lambda: self._charger_donnees())
         buttons_layout.addWidget(self.filtre_combo)
         
         layout.addLayout(buttons_layout)
@@ -190,7 +237,7 @@ class CollaborateursWidget(QWidget):
     
     def _creer_tableau(self):
         """Crée le tableau des collaborateurs"""
-        self.table = QTableWidget()
+        self.table = TableauReordonnable()
         self.table.setColumnCount(6)
         self.table.setHorizontalHeaderLabels(["ID", "Nom", "Prénom", "Date d'entrée", "État", "Date d'inactivation"])
         
@@ -234,6 +281,7 @@ class CollaborateursWidget(QWidget):
         # Connecter les signaux
         self.table.itemSelectionChanged.connect(self._on_selection_changed)
         self.table.itemDoubleClicked.connect(self._modifier_collaborateur)
+        self.table.ligne_deplacee.connect(self._on_ligne_deplacee)
     
     def _formater_date(self, date_str):
         """Formate une date au format français DD/MM/YYYY HH:MM"""
@@ -264,11 +312,24 @@ class CollaborateursWidget(QWidget):
         except:
             return date_str
     
-    def _charger_donnees(self):
-        """Charge les collaborateurs depuis la base de données"""
-        # Récupérer le filtre
-        filtre = self.filtre_combo.currentText()
-        
+    def _charger_donnees(self, selection: Optional[int] = None):
+        """
+        Charge les collaborateurs depuis la base de données
+        
+        La lecture est faite sur le thread de la base ; un nouveau chargement
+        (changement de filtre) remplace celui qui n'est pas encore livré.
+        
+        Args:
+            selection: Ligne à sélectionner une fois le tableau rempli
+        """
+        self.executeur.executer(
+            self._lire_collaborateurs, self.filtre_combo.currentText(),
+            rappel=lambda donnees: self._afficher_collaborateurs(donnees, selection),
+            canal="chargement"
+        )
+    
+    def _lire_collaborateurs(self, filtre: str) -> dict:
+        """Lit les collaborateurs du filtre et les statistiques (thread de la base)"""
         if filtre == "Actifs uniquement":
             collaborateurs = self.db.get_collaborateurs_actifs()
         elif filtre == "Inactifs uniquement":
@@ -277,6 +338,16 @@ class CollaborateursWidget(QWidget):
         else:
             collaborateurs = self.db.get_tous_collaborateurs()
         
+        return {
+            'collaborateurs': collaborateurs,
+            'total': self.db.compter_collaborateurs(),
+            'actifs': self.db.compter_collaborateurs_actifs()
+        }
+    
+    def _afficher_collaborateurs(self, donnees: dict, selection: Optional[int] = None):
+        """Remplit le tableau avec les collaborateurs lus par _lire_collaborateurs"""
+        collaborateurs = donnees['collaborateurs']
+        
         # Remplir le tableau
         self.table.setRowCount(len(collaborateurs))
         
@@ -334,13 +405,10 @@ class CollaborateursWidget(QWidget):
             self.table.setItem(i, 5, date_item)
         
         # Mettre à jour les statistiques
-        self._update_stats()
-    
-    def _update_stats(self):
-        """Met à jour les statistiques affichées"""
-        total = self.db.compter_collaborateurs()
-        actifs = self.db.compter_collaborateurs_actifs()
-        self.stats_label.setText(f"Total: {total} | Actifs: {actifs}")
+        self.stats_label.setText(f"Total: {donnees['total']} | Actifs: {donnees['actifs']}")
+        
+        if selection is not None:
+            self.table.selectRow(selection)
     
     def _on_selection_changed(self):
         """Appelé quand la sélection change"""
@@ -357,24 +425,39 @@ class CollaborateursWidget(QWidget):
         if dialog.exec() == QDialog.Accepted:
             data = dialog.get_data()
             
-            collaborateur_id = self.db.ajouter_collaborateur(
+            self._enregistrer(
+                self.db.ajouter_collaborateur,
                 data['nom'],
                 data['prenom'],
                 data['etat'],
-                data['date_entree']
+                data['date_entree'],
+                succes=("Collaborateur ajouté",
+                        f"{data['prenom']} {data['nom']} a été ajouté avec succès."),
+                echec="Une erreur est survenue lors de l'ajout du collaborateur."
             )
-            
-            if collaborateur_id:
-                QMessageBox.information(
-                    self, "Collaborateur ajouté",
-                    f"{data['prenom']} {data['nom']} a été ajouté avec succès."
-                )
-                self._charger_donnees()
-            else:
-                QMessageBox.critical(
-                    self, "Erreur",
-                    "Une erreur est survenue lors de l'ajout du collaborateur."
-                )
+    
+    def _enregistrer(self, fonction, *args, succes: Optional[tuple] = None,
+                     echec: Optional[str] = None, selection: Optional[int] = None):
+        """
+        Écrit en base sur le thread de la base puis recharge le tableau
+        
+        Args:
+            fonction: Méthode d'écriture de CollaborateursDB
+            *args: Arguments de la méthode
+            succes: (titre, message) affiché si l'écriture réussit
+            echec: Message d'erreur affiché si l'écriture échoue
+            selection: Ligne à sélectionner après le rechargement
+        """
+        def ecriture_terminee(resultat):
+            if resultat:
+                self.collaborateurs_modifies.emit()
+                if succes:
+                    QMessageBox.information(self, *succes)
+                self._charger_donnees(selection)
+            elif echec:
+                QMessageBox.critical(self, "Erreur", echec)
+        
+        self.executeur.executer(fonction, *args, rappel=ecriture_terminee)
     
     def _modifier_collaborateur(self):
         """Modifie le collaborateur sélectionné"""
@@ -385,8 +468,13 @@ class CollaborateursWidget(QWidget):
         collaborateur_id = int(self.table.item(row, 0).text())
         
         # Récupérer les données du collaborateur
-        collaborateur_data = self.db.get_collaborateur(collaborateur_id)
-        
+        self.executeur.executer(
+            self.db.get_collaborateur, collaborateur_id,
+            rappel=lambda data: self._ouvrir_modification(collaborateur_id, data)
+        )
+    
+    def _ouvrir_modification(self, collaborateur_id: int, collaborateur_data):
+        """Ouvre le dialogue de modification avec les données lues"""
         if not collaborateur_data:
             QMessageBox.warning(self, "Erreur", "Collaborateur introuvable.")
             return
@@ -396,23 +484,17 @@ class CollaborateursWidget(QWidget):
         if dialog.exec() == QDialog.Accepted:
             data = dialog.get_data()
             
-            if self.db.modifier_collaborateur(
+            self._enregistrer(
+                self.db.modifier_collaborateur,
                 collaborateur_id,
                 data['nom'],
                 data['prenom'],
                 data['etat'],
-                data['date_entree']
-            ):
-                QMessageBox.information(
-                    self, "Collaborateur modifié",
-                    f"{data['prenom']} {data['nom']} a été modifié avec succès."
-                )
-                self._charger_donnees()
-            else:
-                QMessageBox.critical(
-                    self, "Erreur",
-                    "Une erreur est survenue lors de la modification."
-                )
+                data['date_entree'],
+                succes=("Collaborateur modifié",
+                        f"{data['prenom']} {data['nom']} a été modifié avec succès."),
+                echec="Une erreur est survenue lors de la modification."
+            )
     
     def _monter_collaborateur(self):
         """Monte le collaborateur sélectionné dans la liste"""
@@ -429,10 +511,8 @@ class CollaborateursWidget(QWidget):
         
         collaborateur_id = int(self.table.item(row, 0).text())
         
-        if self.db.deplacer_collaborateur_haut(collaborateur_id):
-            self._charger_donnees()
-            # Sélectionner la nouvelle position
-            self.table.selectRow(row - 1)
+        # Sélectionner la nouvelle position après le rechargement
+        self._enregistrer(self.db.deplacer_collaborateur_haut, collaborateur_id, selection=row - 1)
     
     def _descendre_collaborateur(self):
         """Descend le collaborateur sélectionné dans la liste"""
@@ -449,10 +529,15 @@ class CollaborateursWidget(QWidget):
         
         collaborateur_id = int(self.table.item(row, 0).text())
         
-        if self.db.deplacer_collaborateur_bas(collaborateur_id):
-            self._charger_donnees()
-            # Sélectionner la nouvelle position
-            self.table.selectRow(row + 1)
+        # Sélectionner la nouvelle position après le rechargement
+        self._enregistrer(self.db.deplacer_collaborateur_bas, collaborateur_id, selection=row + 1)
+    
+    def _on_ligne_deplacee(self, source: int, cible: int):
+        """Enregistre l'ordre obtenu par glisser-déposer"""
+        ids = [int(self.table.item(i, 0).text()) for i in range(self.table.rowCount())]
+        ids.insert(cible, ids.pop(source))
+        
+        self._enregistrer(self.db.reordonner, ids, selection=cible)
     
     def _supprimer_collaborateur(self):
         """Supprime le collaborateur sélectionné"""
@@ -472,17 +557,11 @@ class CollaborateursWidget(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            if self.db.supprimer_collaborateur(collaborateur_id):
-                QMessageBox.information(
-                    self, "Collaborateur supprimé",
-                    f"{prenom} {nom} a été supprimé."
-                )
-                self._charger_donnees()
-            else:
-                QMessageBox.critical(
-                    self, "Erreur",
-                    "Une erreur est survenue lors de la suppression."
-                )
+            self._enregistrer(
+                self.db.supprimer_collaborateur, collaborateur_id,
+                succes=("Collaborateur supprimé", f"{prenom} {nom} a été supprimé."),
+                echec="Une erreur est survenue lors de la suppression."
+            )
     
     def a_des_collaborateurs(self) -> bool:
         """Vérifie s'il y a au moins un collaborateur"""
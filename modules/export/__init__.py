@@ -0,0 +1,7 @@
+"""
+Module Export - Export complet des données (CSV / JSON Lines)
+"""
+
+from .exporter import DonneesExporter, TABLES_EXPORT, FORMATS_EXPORT
+
+__all__ = ['DonneesExporter', 'TABLES_EXPORT', 'FORMATS_EXPORT']
@@ -0,0 +1,123 @@
+"""
+Export complet des données de Mallia au format CSV ou JSON Lines
+"""
+
+import csv
+import gzip
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO
+
+from modules.bdd import Database
+
+
+# Tables exportées, dans l'ordre des dépendances
+TABLES_EXPORT = [
+    "collaborateurs",
+    "collaborateurs_periodes_emploi",
+    "suivis_manager",
+    "suivis_manager_periodes",
+    "suivis_manager_jours",
+    "suivis_collaborateurs",
+    "suivis_collaborateurs_periodes",
+    "suivis_collaborateurs_jours",
+    "objectifs_mensuels",
+    "objectifs_collaborateurs",
+    "objectifs_collaborateurs_individuels",
+    "caisse_imports",
+    "caisse_tickets",
+    "caisse_lignes",
+    "calendrier_ouverture",
+    "calendrier_exceptions",
+]
+
+FORMATS_EXPORT = ["csv", "jsonl"]
+
+
+class DonneesExporter:
+    """Classe pour exporter toutes les tables en flux, sans tout charger en mémoire"""
+    
+    def __init__(self, db: Optional[Database] = None):
+        self.db = db or Database()
+    
+    def exporter(self, dossier: str, format: str = "csv", compresser: bool = True,
+                 tables: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Exporte les tables dans un dossier, un fichier par table
+        
+        Args:
+            dossier: Dossier de destination (créé s'il n'existe pas)
+            format: 'csv' ou 'jsonl'
+            compresser: Compresse les fichiers à la volée avec gzip
+            tables: Tables à exporter (par défaut : TABLES_EXPORT)
+        
+        Returns:
+            Dictionnaire {nom_table: nombre de lignes exportées}
+        """
+        if format not in FORMATS_EXPORT:
+            raise ValueError(f"Format d'export inconnu : {format}")
+        
+        dossier_export = Path(dossier)
+        dossier_export.mkdir(parents=True, exist_ok=True)
+        
+        resultats = {}
+        for table in tables or TABLES_EXPORT:
+            if not self.db.table_exists(table):
+                print(f"Table '{table}' absente, ignorée")
+                continue
+            
+            extension = f".{format}.gz" if compresser else f".{format}"
+            chemin = dossier_export / f"{table}{extension}"
+            resultats[table] = self.exporter_table(table, chemin, format, compresser)
+            print(f"Table '{table}' exportée : {resultats[table]} lignes -> {chemin}")
+        
+        return resultats
+    
+    def exporter_table(self, table: str, chemin: Path, format: str = "csv",
+                       compresser: bool = True) -> int:
+        """
+        Exporte une table vers un fichier en parcourant ses lignes par lots
+        
+        Args:
+            table: Nom de la table
+            chemin: Fichier de destination
+            format: 'csv' ou 'jsonl'
+            compresser: Compresse le fichier avec gzip
+        
+        Returns:
+            Nombre de lignes exportées
+        """
+        colonnes = [col['name'] for col in self.db.get_table_info(table)]
+        colonnes_sql = ", ".join(colonnes)
+        query = f"SELECT {colonnes_sql} FROM {table} ORDER BY rowid"
+        
+        with self._ouvrir(chemin, compresser) as fichier:
+            if format == "csv":
+                return self._ecrire_csv(fichier, colonnes, query)
+            return self._ecrire_jsonl(fichier, query)
+    
+    def _ouvrir(self, chemin: Path, compresser: bool) -> TextIO:
+        """Ouvre le fichier de destination, compressé ou non"""
+        if compresser:
+            return gzip.open(chemin, "wt", encoding="utf-8", newline="")
+        return open(chemin, "w", encoding="utf-8", newline="")
+    
+    def _ecrire_csv(self, fichier: TextIO, colonnes: List[str], query: str) -> int:
+        """Écrit les lignes d'une requête au format CSV (séparateur ;)"""
+        writer = csv.writer(fichier, delimiter=";")
+        writer.writerow(colonnes)
+        
+        nb_lignes = 0
+        for row in self.db.iter_rows(query):
+            writer.writerow(row)
+            nb_lignes += 1
+        return nb_lignes
+    
+    def _ecrire_jsonl(self, fichier: TextIO, query: str) -> int:
+        """Écrit les lignes d'une requête au format JSON Lines"""
+        nb_lignes = 0
+        for row in self.db.fetch_iter(query):
+            fichier.write(json.dumps(row, ensure_ascii=False))
+            fichier.write("\n")
+            nb_lignes += 1
+        return nb_lignes
@@ -2,7 +2,10 @@
 Module Objectifs - Gestion des objectifs mensuels
 """
 
+from .atteinte import AtteinteObjectifs
 from .database import ObjectifsDB
+from .prorata import ObjectifsPeriodes
+from .saisonnalite import GenerateurObjectifs
 from .ui import ObjectifsWidget
 
-__all__ = ['ObjectifsDB', 'ObjectifsWidget']
\ No newline at end of file
+__all__ = ['ObjectifsDB', 'ObjectifsPeriodes', 'GenerateurObjectifs', 'AtteinteObjectifs', 'ObjectifsWidget']
\ No newline at end of file
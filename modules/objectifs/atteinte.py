@@ -0,0 +1,217 @@
+"""
+Objectifs de chaque collaborateur et atteinte de ces objectifs
+
+L'objectif d'un collaborateur pour un mois est pris, indicateur par
+indicateur, dans cet ordre : son objectif du mois, son objectif de
+l'année, puis l'objectif d'équipe (objectifs_collaborateurs) dont les
+indicateurs de volume (C.A. prestation, C.A. /jour, visites) sont
+pondérés selon son ancienneté (paliers de config.ini). Les pourcentages
+d'équipe s'appliquent tels quels.
+
+Objectifs et atteinte de toute l'équipe sont calculés par une seule
+requête (index du mois des suivis et des objectifs individuels) : le
+classement d'un mois ne dépend pas du nombre de collaborateurs en Python.
+"""
+
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from modules.calendrier import CalendrierDB
+from modules.suivis_manager.utils import bornes_mois
+
+from .database import ObjectifsDB, COLONNES_OBJECTIFS_COLLAB, TOUTE_ANNEE, lire_paliers_anciennete
+
+
+# Indicateurs de volume pondérés par l'ancienneté
+OBJECTIFS_ANCIENNETE = ["ca_prestation", "ca_jour", "nb_visites"]
+
+# Indicateurs cumulés sur le mois, comparés à la part écoulée de l'objectif
+OBJECTIFS_CUMULES = ["ca_prestation", "nb_visites"]
+
+
+class AtteinteObjectifs:
+    """Objectifs individuels résolus et classement de l'équipe sur un mois"""
+    
+    def __init__(self, objectifs_db: Optional[ObjectifsDB] = None,
+                 calendrier: Optional[CalendrierDB] = None, config_path: str = "config.ini"):
+        self.objectifs_db = objectifs_db or ObjectifsDB()
+        self.db = self.objectifs_db.db
+        self.calendrier = calendrier or CalendrierDB()
+        self.paliers = lire_paliers_anciennete(config_path)
+    
+    def _requete_objectifs(self) -> str:
+        """
+        Requête des objectifs résolus des collaborateurs actifs d'un mois
+        
+        Paramètres : paliers (ancienneté, %)..., annee, annee * 12 + mois,
+        premier et dernier jour du mois, annee, mois, annee, collaborateur_id (ou None)
+        """
+        paliers = ", ".join(["(?, ?)"] * len(self.paliers))
+        objectifs = ",\n".join(
+            f"COALESCE(m.{colonne}, a.{colonne}, e.{colonne}"
+            + (" * ac.coefficient / 100.0" if colonne in OBJECTIFS_ANCIENNETE else "")
+            + f") AS {colonne}"
+            for colonne in COLONNES_OBJECTIFS_COLLAB
+        )
+        return f"""
+            WITH paliers (anciennete_min, coefficient) AS (VALUES {paliers}),
+            equipe AS (SELECT * FROM objectifs_collaborateurs WHERE annee = ?),
+            anciennete AS (
+                SELECT c.id, c.nom, c.prenom, c.ordre,
+                       MAX(? - (CAST(strftime('%Y', c.date_entree) AS INTEGER) * 12
+                                + CAST(strftime('%m', c.date_entree) AS INTEGER)), 0) AS anciennete_mois
+                FROM collaborateurs c
+                WHERE c.id IN (
+                    SELECT collaborateur_id FROM collaborateurs_periodes_emploi
+                    WHERE date_fin >= ? AND date_debut <= ?
+                )
+            ),
+            anciennete_coef AS (
+                SELECT an.*,
+                       COALESCE((SELECT p.coefficient FROM paliers p
+                                 WHERE p.anciennete_min <= an.anciennete_mois
+                                 ORDER BY p.anciennete_min DESC LIMIT 1), 100) AS coefficient
+                FROM anciennete an
+            )
+            SELECT ac.id AS collaborateur_id, ac.nom, ac.prenom, ac.ordre,
+                   ac.anciennete_mois, ac.coefficient,
+                   {objectifs}
+            FROM anciennete_coef ac
+            LEFT JOIN objectifs_collaborateurs_individuels m
+                   ON m.annee = ? AND m.mois = ? AND m.collaborateur_id = ac.id
+            LEFT JOIN objectifs_collaborateurs_individuels a
+                   ON a.annee = ? AND a.mois = {TOUTE_ANNEE} AND a.collaborateur_id = ac.id
+            LEFT JOIN equipe e
+            WHERE ? IS NULL OR ac.id = ?
+        """
+    
+    def _parametres(self, mois: int, annee: int, collaborateur_id: Optional[int]) -> tuple:
+        """Paramètres de _requete_objectifs"""
+        debut, fin = bornes_mois(mois, annee)
+        return (
+            tuple(valeur for palier in self.paliers for valeur in palier)
+            + (annee, annee * 12 + mois, debut, fin, annee, mois, annee, collaborateur_id, collaborateur_id)
+        )
+    
+    def get_objectifs_mois(self, mois: int, annee: int,
+                           collaborateur_id: Optional[int] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Résout les objectifs du mois des collaborateurs actifs
+        
+        Args:
+            mois: Mois (1-12)
+            annee: Année
+            collaborateur_id: Limiter à un collaborateur (None pour toute l'équipe)
+        
+        Returns:
+            {collaborateur_id: {'nom', 'prenom', 'anciennete_mois', 'coefficient',
+            'ca_prestation', 'ca_jour', 'nb_visites', 'pct_ventes', 'pct_couleurs',
+            'pct_soins'}} (valeurs None sans objectif)
+        """
+        lignes = self.db.fetch_all(self._requete_objectifs(), self._parametres(mois, annee, collaborateur_id))
+        return {ligne['collaborateur_id']: ligne for ligne in lignes}
+    
+    def part_ecoulee(self, mois: int, annee: int, aujourd_hui: Optional[date] = None) -> float:
+        """
+        Part du mois écoulée, en jours d'ouverture (1 pour un mois terminé)
+        
+        Args:
+            mois: Mois (1-12)
+            annee: Année
+            aujourd_hui: Date du jour (par défaut : aujourd'hui)
+        
+        Returns:
+            Fraction entre 0 et 1 des jours d'ouverture du mois déjà passés
+        """
+        debut, fin = bornes_mois(mois, annee)
+        aujourd_hui = (aujourd_hui or date.today()).isoformat()
+        if aujourd_hui >= fin:
+            return 1.0
+        if aujourd_hui < debut:
+            return 0.0
+        ecoules, total = self.calendrier.compter_jours_ouvres_periodes([(debut, aujourd_hui), (debut, fin)])
+        return ecoules / total if total else 1.0
+    
+    def get_classement(self, mois: int, annee: int,
+                       part_mois: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Classe l'équipe sur l'atteinte de ses objectifs du mois
+        
+        L'atteinte d'un indicateur est le réalisé divisé par l'objectif (les
+        indicateurs cumulés sont comparés à la part écoulée de l'objectif du
+        mois). Le score est la moyenne des atteintes disponibles, chacune
+        plafonnée à 150 % pour qu'un seul indicateur ne fasse pas le classement.
+        
+        Args:
+            mois: Mois (1-12)
+            annee: Année
+            part_mois: Part du mois écoulée (par défaut : part_ecoulee)
+        
+        Returns:
+            Collaborateurs actifs par rang : {'collaborateur_id', 'nom', 'prenom',
+            'anciennete_mois', 'coefficient', 'rang', 'score', puis pour chaque
+            indicateur : '<indicateur>' (réalisé), 'objectif_<indicateur>',
+            'atteinte_<indicateur>' (en %, None sans objectif ou sans réalisé)}
+        """
+        if part_mois is None:
+            part_mois = self.part_ecoulee(mois, annee)
+        
+        realise = {
+            "ca_prestation": "SUM(p.ca_prestation)",
+            "ca_jour": "AVG(p.ca_par_jour)",
+            "nb_visites": "SUM(p.nombre_visites)",
+        }
+        for colonne, source in [("pct_ventes", "pourcentage_ventes"),
+                                ("pct_couleurs", "pourcentage_couleurs"),
+                                ("pct_soins", "pourcentage_soins")]:
+            realise[colonne] = (
+                f"SUM(p.{source} * p.nombre_visites) "
+                f"/ SUM(CASE WHEN p.{source} IS NOT NULL THEN p.nombre_visites END)"
+            )
+        
+        atteintes = []
+        for colonne in COLONNES_OBJECTIFS_COLLAB:
+            cible = f"o.{colonne} * :part" if colonne in OBJECTIFS_CUMULES else f"o.{colonne}"
+            atteintes.append(
+                f"ROUND(r.{colonne} * 100.0 / NULLIF({cible}, 0), 1) AS atteinte_{colonne}"
+            )
+        plafonnees = [f"MIN(atteinte_{colonne}, 150)" for colonne in COLONNES_OBJECTIFS_COLLAB]
+        nb_atteintes = " + ".join(f"(atteinte_{colonne} IS NOT NULL)" for colonne in COLONNES_OBJECTIFS_COLLAB)
+        somme_atteintes = " + ".join(f"COALESCE({plafonnee}, 0)" for plafonnee in plafonnees)
+        
+        # Paramètres nommés : la requête des objectifs est reprise telle quelle
+        requete_objectifs = self._requete_objectifs()
+        parametres = self._parametres(mois, annee, None)
+        noms = [f"o{i}" for i in range(len(parametres))]
+        for nom in noms:
+            requete_objectifs = requete_objectifs.replace("?", f":{nom}", 1)
+        
+        query = f"""
+            WITH objectifs AS ({requete_objectifs}),
+            realise AS (
+                SELECT s.collaborateur_id,
+                       {', '.join(f'{expression} AS {colonne}' for colonne, expression in realise.items())}
+                FROM suivis_collaborateurs s
+                JOIN suivis_collaborateurs_periodes p ON p.suivi_id = s.id
+                WHERE s.mois = :mois AND s.annee = :annee
+                GROUP BY s.collaborateur_id
+            ),
+            atteintes AS (
+                SELECT o.collaborateur_id, o.nom, o.prenom, o.ordre, o.anciennete_mois, o.coefficient,
+                       {', '.join(f'r.{c} AS {c}, o.{c} AS objectif_{c}' for c in COLONNES_OBJECTIFS_COLLAB)},
+                       {', '.join(atteintes)}
+                FROM objectifs o
+                LEFT JOIN realise r ON r.collaborateur_id = o.collaborateur_id
+            ),
+            scores AS (
+                SELECT *, ROUND(({somme_atteintes}) / NULLIF({nb_atteintes}, 0), 1) AS score
+                FROM atteintes
+            )
+            SELECT *, CASE WHEN score IS NOT NULL
+                           THEN RANK() OVER (ORDER BY score IS NULL, score DESC) END AS rang
+            FROM scores
+            ORDER BY score IS NULL, score DESC, ordre
+        """
+        params = dict(zip(noms, parametres))
+        params.update({"mois": mois, "annee": annee, "part": part_mois})
+        return self.db.fetch_all(query, params)
@@ -2,8 +2,57 @@
 Gestion de la base de données pour le module Objectifs
 """
 
-from modules.bdd import Database
-from typing import List, Dict, Any, Optional
+import configparser
+from pathlib import Path
+
+from modules.bdd import Database, JournalModifications, ecriture_atomique, Objectif, ObjectifCollaborateur
+from typing import List, Dict, Any, Optional, Tuple
+
+
+# Colonnes des objectifs Manager d'un mois
+COLONNES_OBJECTIFS = ["ca_total", "ca_jour", "nb_clients", "pct_ventes", "pct_couleurs", "pct_soins"]
+
+# Colonnes des objectifs Collaborateurs (équipe et individuels)
+COLONNES_OBJECTIFS_COLLAB = ["ca_prestation", "ca_jour", "nb_visites", "pct_ventes", "pct_couleurs", "pct_soins"]
+
+# Mois des objectifs individuels valables toute l'année.
+# 0 plutôt que NULL : la contrainte UNIQUE (et l'upsert) s'applique aussi à ces lignes
+TOUTE_ANNEE = 0
+
+# Part (en %) des objectifs d'équipe de volume attendue selon l'ancienneté en
+# mois : (ancienneté minimale, pourcentage), par ancienneté croissante
+PALIERS_ANCIENNETE_DEFAUT = [(0, 60), (6, 80), (12, 100)]
+
+
+def lire_paliers_anciennete(config_path: str = "config.ini") -> List[Tuple[int, float]]:
+    """
+    Lit les paliers d'ancienneté (section [Objectifs_Collaborateurs] de config.ini)
+    
+    Format : paliers_anciennete = 0:60, 6:80, 12:100 (mois d'ancienneté : % de
+    l'objectif d'équipe)
+    
+    Args:
+        config_path: Chemin du fichier de configuration
+    
+    Returns:
+        Paliers (ancienneté minimale en mois, pourcentage), par ancienneté croissante
+    """
+    config = configparser.ConfigParser()
+    if Path(config_path).exists():
+        config.read(config_path, encoding='utf-8')
+    texte = config.get('Objectifs_Collaborateurs', 'paliers_anciennete', fallback='')
+    if not texte.strip():
+        return list(PALIERS_ANCIENNETE_DEFAUT)
+    
+    try:
+        paliers = []
+        for palier in texte.split(','):
+            mois, pourcentage = palier.split(':')
+            paliers.append((int(mois), float(pourcentage.replace('%', ''))))
+        return sorted(paliers)
+    except ValueError:
+        print(f"Paliers d'ancienneté invalides dans {config_path} : {texte}")
+        return list(PALIERS_ANCIENNETE_DEFAUT)
 
 
 class ObjectifsDB:
@@ -12,6 +61,7 @@ class ObjectifsDB:
     def __init__(self):
         self.db = Database()
         self._create_tables()
+        self.journal = JournalModifications(self.db, "objectifs")
     
     def _create_tables(self):
         """Crée les tables nécessaires pour le module Objectifs"""
@@ -46,6 +96,26 @@ class ObjectifsDB:
             "updated_at": "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
         }
         
+        # Objectifs propres à un collaborateur : une ligne pour toute l'année
+        # (mois = TOUTE_ANNEE) et éventuellement une par mois ; les valeurs
+        # vides reprennent l'objectif d'équipe pondéré par l'ancienneté
+        objectifs_individuels_table = {
+            "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+            "collaborateur_id": "INTEGER NOT NULL",
+            "annee": "INTEGER NOT NULL",
+            "mois": f"INTEGER NOT NULL DEFAULT {TOUTE_ANNEE}",  # 0 = toute l'année, 1-12
+            "ca_prestation": "REAL",
+            "ca_jour": "REAL",
+            "nb_visites": "REAL",
+            "pct_ventes": "REAL",
+            "pct_couleurs": "REAL",
+            "pct_soins": "REAL",
+            "created_at": "TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+            "updated_at": "TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+            "UNIQUE": "(collaborateur_id, annee, mois)",
+            "FOREIGN KEY (collaborateur_id)": "REFERENCES collaborateurs(id) ON DELETE CASCADE"
+        }
+        
         if not self.db.table_exists("objectifs_mensuels"):
             self.db.create_table("objectifs_mensuels", objectifs_table)
             print("Table 'objectifs_mensuels' créée avec succès")
@@ -53,9 +123,19 @@ class ObjectifsDB:
         if not self.db.table_exists("objectifs_collaborateurs"):
             self.db.create_table("objectifs_collaborateurs", objectifs_collab_table)
             print("Table 'objectifs_collaborateurs' créée avec succès")
+        
+        if not self.db.table_exists("objectifs_collaborateurs_individuels"):
+            self.db.create_table("objectifs_collaborateurs_individuels", objectifs_individuels_table)
+            # Classement du mois : les objectifs de tous les collaborateurs d'une année
+            self.db.execute_query(
+                "CREATE INDEX IF NOT EXISTS idx_objectifs_individuels_annee "
+                "ON objectifs_collaborateurs_individuels (annee, mois, collaborateur_id)"
+            )
+            print("Table 'objectifs_collaborateurs_individuels' créée avec succès")
     
     # ========== OBJECTIFS MANAGER ==========
     
+    @ecriture_atomique(False)
     def sauvegarder_objectif(self, annee: int, mois: int, 
                             ca_total: Optional[float] = None,
                             ca_jour: Optional[float] = None,
@@ -79,37 +159,56 @@ class ObjectifsDB:
         Returns:
             True si succès, False sinon
         """
+        valeurs = {
+            "ca_total": ca_total, "ca_jour": ca_jour, "nb_clients": nb_clients,
+            "pct_ventes": pct_ventes, "pct_couleurs": pct_couleurs, "pct_soins": pct_soins
+        }
+        
         query_check = "SELECT id FROM objectifs_mensuels WHERE annee = ? AND mois = ?"
         existing = self.db.fetch_one(query_check, (annee, mois))
         
-        if existing:
-            query = """
-                UPDATE objectifs_mensuels 
-                SET ca_total = ?, ca_jour = ?, nb_clients = ?, 
-                    pct_ventes = ?, pct_couleurs = ?, pct_soins = ?,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE annee = ? AND mois = ?
-            """
-            cursor = self.db.execute_query(query, (
-                ca_total, ca_jour, nb_clients,
-                pct_ventes, pct_couleurs, pct_soins,
-                annee, mois
-            ))
-        else:
-            query = """
-                INSERT INTO objectifs_mensuels 
-                (annee, mois, ca_total, ca_jour, nb_clients, 
-                 pct_ventes, pct_couleurs, pct_soins)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            cursor = self.db.execute_query(query, (
-                annee, mois, ca_total, ca_jour, nb_clients,
-                pct_ventes, pct_couleurs, pct_soins
-            ))
-        
-        return cursor is not None
-    
-    def get_objectifs_annee(self, annee: int) -> List[Dict[str, Any]]:
+        with self.journal.lot("Objectifs Manager"):
+            if existing:
+                nb_modifiees = self.journal.mettre_a_jour("objectifs_mensuels", existing['id'], valeurs)
+                if nb_modifiees:
+                    self.db.execute_query(
+                        "UPDATE objectifs_mensuels SET updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                        (existing['id'],)
+                    )
+                return nb_modifiees is not None
+            
+            valeurs.update({"annee": annee, "mois": mois})
+            return self.journal.inserer("objectifs_mensuels", valeurs) is not None
+    
+    @ecriture_atomique(False)
+    def enregistrer_objectifs_annee(self, annee: int, objectifs: List[Dict[str, Any]],
+                                    libelle: str = "Objectifs de l'année") -> bool:
+        """
+        Enregistre les objectifs Manager de plusieurs mois en une seule écriture
+        
+        Les mois sont insérés ou mis à jour en une requête, dans une seule
+        action annulable ; les mois absents de la liste ne changent pas.
+        
+        Args:
+            annee: Année
+            objectifs: Liste de {'mois', 'ca_total', 'ca_jour', 'nb_clients',
+                       'pct_ventes', 'pct_couleurs', 'pct_soins'}
+            libelle: Description de l'action dans l'historique
+            
+        Returns:
+            True si succès, False sinon
+        """
+        lignes = [
+            {"annee": annee, "mois": objectif['mois'],
+             **{colonne: objectif.get(colonne) for colonne in COLONNES_OBJECTIFS}}
+            for objectif in objectifs
+        ]
+        with self.journal.lot(libelle):
+            return self.journal.inserer_ou_mettre_a_jour(
+                "objectifs_mensuels", ["annee", "mois"], lignes, colonne_horodatage="updated_at"
+            ) is not None
+    
+    def get_objectifs_annee(self, annee: int) -> List[Objectif]:
         """
         Récupère tous les objectifs Manager d'une année
         
@@ -124,9 +223,9 @@ class ObjectifsDB:
             WHERE annee = ? 
             ORDER BY mois
         """
-        return self.db.fetch_all(query, (annee,))
+        return self.db.fetch_models(Objectif, query, (annee,))
     
-    def get_objectif_mois(self, annee: int, mois: int) -> Optional[Dict[str, Any]]:
+    def get_objectif_mois(self, annee: int, mois: int) -> Optional[Objectif]:
         """
         Récupère les objectifs Manager d'un mois spécifique
         
@@ -135,11 +234,12 @@ class ObjectifsDB:
             mois: Mois (1-12)
             
         Returns:
-            Dictionnaire avec les objectifs ou None
+            Objectif ou None
         """
         query = "SELECT * FROM objectifs_mensuels WHERE annee = ? AND mois = ?"
-        return self.db.fetch_one(query, (annee, mois))
+        return self.db.fetch_model(Objectif, query, (annee, mois))
     
+    @ecriture_atomique(False)
     def supprimer_objectifs_annee(self, annee: int) -> bool:
         """
         Supprime tous les objectifs Manager d'une année
@@ -150,12 +250,12 @@ class ObjectifsDB:
         Returns:
             True si succès, False sinon
         """
-        query = "DELETE FROM objectifs_mensuels WHERE annee = ?"
-        cursor = self.db.execute_query(query, (annee,))
-        return cursor is not None
+        with self.journal.lot("Réinitialisation de l'année"):
+            return self.journal.supprimer("objectifs_mensuels", "annee = ?", (annee,))
     
     # ========== OBJECTIFS COLLABORATEURS ==========
     
+    @ecriture_atomique(False)
     def sauvegarder_objectif_collab(self, annee: int,
                                     ca_prestation: Optional[float] = None,
                                     ca_jour: Optional[float] = None,
@@ -178,37 +278,28 @@ class ObjectifsDB:
         Returns:
             True si succès, False sinon
         """
+        valeurs = {
+            "ca_prestation": ca_prestation, "ca_jour": ca_jour, "nb_visites": nb_visites,
+            "pct_ventes": pct_ventes, "pct_couleurs": pct_couleurs, "pct_soins": pct_soins
+        }
+        
         query_check = "SELECT id FROM objectifs_collaborateurs WHERE annee = ?"
         existing = self.db.fetch_one(query_check, (annee,))
         
-        if existing:
-            query = """
-                UPDATE objectifs_collaborateurs 
-                SET ca_prestation = ?, ca_jour = ?, nb_visites = ?, 
-                    pct_ventes = ?, pct_couleurs = ?, pct_soins = ?,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE annee = ?
-            """
-            cursor = self.db.execute_query(query, (
-                ca_prestation, ca_jour, nb_visites,
-                pct_ventes, pct_couleurs, pct_soins,
-                annee
-            ))
-        else:
-            query = """
-                INSERT INTO objectifs_collaborateurs 
-                (annee, ca_prestation, ca_jour, nb_visites, 
-                 pct_ventes, pct_couleurs, pct_soins)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """
-            cursor = self.db.execute_query(query, (
-                annee, ca_prestation, ca_jour, nb_visites,
-                pct_ventes, pct_couleurs, pct_soins
-            ))
-        
-        return cursor is not None
-    
-    def get_objectif_collab_annee(self, annee: int) -> Optional[Dict[str, Any]]:
+        with self.journal.lot("Objectifs Collaborateurs"):
+            if existing:
+                nb_modifiees = self.journal.mettre_a_jour("objectifs_collaborateurs", existing['id'], valeurs)
+                if nb_modifiees:
+                    self.db.execute_query(
+                        "UPDATE objectifs_collaborateurs SET updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                        (existing['id'],)
+                    )
+                return nb_modifiees is not None
+            
+            valeurs["annee"] = annee
+            return self.journal.inserer("objectifs_collaborateurs", valeurs) is not None
+    
+    def get_objectif_collab_annee(self, annee: int) -> Optional[ObjectifCollaborateur]:
         """
         Récupère les objectifs Collaborateurs d'une année
         
@@ -216,11 +307,12 @@ class ObjectifsDB:
             annee: Année
             
         Returns:
-            Dictionnaire avec les objectifs ou None
+            ObjectifCollaborateur ou None
         """
         query = "SELECT * FROM objectifs_collaborateurs WHERE annee = ?"
-        return self.db.fetch_one(query, (annee,))
+        return self.db.fetch_model(ObjectifCollaborateur, query, (annee,))
     
+    @ecriture_atomique(False)
     def supprimer_objectif_collab_annee(self, annee: int) -> bool:
         """
         Supprime les objectifs Collaborateurs d'une année
@@ -231,6 +323,65 @@ class ObjectifsDB:
         Returns:
             True si succès, False sinon
         """
-        query = "DELETE FROM objectifs_collaborateurs WHERE annee = ?"
-        cursor = self.db.execute_query(query, (annee,))
-        return cursor is not None
\ No newline at end of file
+        with self.journal.lot("Réinitialisation de l'année"):
+            return self.journal.supprimer("objectifs_collaborateurs", "annee = ?", (annee,))
+    
+    # ========== OBJECTIFS INDIVIDUELS ==========
+    
+    def get_objectifs_individuels(self, annee: int, mois: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Récupère les objectifs propres aux collaborateurs pour une année
+        
+        Args:
+            annee: Année
+            mois: Mois (1-12), TOUTE_ANNEE pour les objectifs annuels, None pour tous
+            
+        Returns:
+            Liste des objectifs {'collaborateur_id', 'mois', colonnes des objectifs}
+        """
+        query = """
+            SELECT * FROM objectifs_collaborateurs_individuels
+            WHERE annee = ? AND (? IS NULL OR mois = ?)
+            ORDER BY collaborateur_id, mois
+        """
+        return self.db.fetch_all(query, (annee, mois, mois))
+    
+    @ecriture_atomique(False)
+    def enregistrer_objectifs_individuels(self, annee: int, objectifs: List[Dict[str, Any]]) -> bool:
+        """
+        Enregistre les objectifs de plusieurs collaborateurs en une seule écriture
+        
+        Une ligne dont toutes les valeurs sont vides est supprimée (le
+        collaborateur reprend l'objectif d'équipe pondéré par l'ancienneté).
+        
+        Args:
+            annee: Année
+            objectifs: Liste de {'collaborateur_id', 'mois' (TOUTE_ANNEE ou 1-12),
+                       colonnes des objectifs}
+            
+        Returns:
+            True si succès, False sinon
+        """
+        lignes = [
+            {"collaborateur_id": objectif['collaborateur_id'], "annee": annee,
+             "mois": objectif.get('mois', TOUTE_ANNEE),
+             **{colonne: objectif.get(colonne) for colonne in COLONNES_OBJECTIFS_COLLAB}}
+            for objectif in objectifs
+        ]
+        a_ecrire, vides = [], []
+        for ligne in lignes:
+            renseignee = any(ligne[colonne] is not None for colonne in COLONNES_OBJECTIFS_COLLAB)
+            (a_ecrire if renseignee else vides).append(ligne)
+        
+        with self.journal.lot("Objectifs individuels"):
+            if vides and not self.journal.supprimer(
+                "objectifs_collaborateurs_individuels",
+                "annee = ? AND (collaborateur_id, mois) IN (VALUES "
+                + ", ".join(["(?, ?)"] * len(vides)) + ")",
+                (annee,) + tuple(v for ligne in vides for v in (ligne['collaborateur_id'], ligne['mois']))
+            ):
+                return False
+            return self.journal.inserer_ou_mettre_a_jour(
+                "objectifs_collaborateurs_individuels", ["collaborateur_id", "annee", "mois"],
+                a_ecrire, colonne_horodatage="updated_at"
+            ) is not None
@@ -0,0 +1,149 @@
+"""
+Objectifs ramenés aux périodes des suivis
+
+Les objectifs sont saisis pour un mois (Manager) ou pour l'année
+(Collaborateurs, valables chaque mois, éventuellement propres à chaque
+collaborateur : voir atteinte.py) alors que les tableaux de suivi
+affichent des périodes d'environ une semaine. Les objectifs de volume
+(C.A., visites) sont répartis entre les périodes au prorata de leurs jours
+d'ouverture ; les objectifs de ratio (C.A. /jour, pourcentages)
+s'appliquent tels quels à chaque période.
+
+Les objectifs de toutes les périodes d'un mois sont calculés en une fois
+(une seule lecture du calendrier) ; les écrans les conservent avec les
+données du mois, la coloration des cellules n'est qu'une lecture.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from modules.calendrier import CalendrierDB
+from modules.suivis_manager.utils import bornes_mois, calculer_periodes_mois, charger_objectifs
+
+from .atteinte import AtteinteObjectifs
+from .database import ObjectifsDB
+
+
+# Objectifs additifs, répartis entre les périodes du mois
+OBJECTIFS_VOLUME_MANAGER = ["ca_total", "nb_clients"]
+OBJECTIFS_VOLUME_COLLABORATEURS = ["ca_prestation", "nb_visites"]
+
+# Objectifs Collaborateurs, dans l'ordre des colonnes des tableaux de suivi
+OBJECTIFS_COLLABORATEURS = ["ca_prestation", "ca_jour", "nb_visites", "pct_ventes", "pct_couleurs", "pct_soins"]
+
+
+def repartir_objectifs(objectifs: Dict[str, Optional[float]], cles_volume: List[str],
+                       jours_periodes: List[int], jours_mois: int) -> List[Dict[str, Optional[float]]]:
+    """
+    Répartit des objectifs mensuels entre les périodes du mois
+    
+    Args:
+        objectifs: Objectifs du mois {clé: valeur}
+        cles_volume: Clés des objectifs additifs (répartis) ; les autres sont recopiés.
+            Chaque clé répartie reçoit aussi son objectif cumulé depuis le début
+            du mois ('<clé>_cumule')
+        jours_periodes: Jours d'ouverture de chaque période
+        jours_mois: Jours d'ouverture du mois
+    
+    Returns:
+        Objectifs de chaque période, dans l'ordre des périodes
+    """
+    resultats = []
+    cumuls = {}
+    for jours in jours_periodes:
+        periode = dict(objectifs)
+        for cle in cles_volume:
+            valeur = objectifs.get(cle)
+            if valeur is None:
+                continue
+            if not jours_mois:
+                # Aucun jour d'ouverture connu : répartition à parts égales
+                periode[cle] = round(valeur / len(jours_periodes), 2)
+            else:
+                # Période sans jour d'ouverture : pas d'objectif
+                periode[cle] = round(valeur * jours / jours_mois, 2) if jours else None
+            cumuls[cle] = round(cumuls.get(cle, 0) + (periode[cle] or 0), 2)
+            periode[f"{cle}_cumule"] = cumuls[cle]
+        resultats.append(periode)
+    return resultats
+
+
+class ObjectifsPeriodes:
+    """Calcule les objectifs de chaque période d'un mois"""
+    
+    def __init__(self, calendrier: Optional[CalendrierDB] = None):
+        self.calendrier = calendrier or CalendrierDB()
+        self.objectifs_db = ObjectifsDB()
+        self.atteinte = AtteinteObjectifs(self.objectifs_db, self.calendrier)
+    
+    def _jours_periodes(self, mois: int, annee: int) -> tuple:
+        """(jours d'ouverture de chaque période, jours d'ouverture du mois)"""
+        periodes = calculer_periodes_mois(mois, annee)
+        jours = self.calendrier.compter_jours_ouvres_periodes(periodes + [bornes_mois(mois, annee)])
+        return jours[:-1], jours[-1]
+    
+    def get_objectifs_manager(self, mois: int, annee: int,
+                              objectifs: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Calcule les objectifs Manager de chaque période d'un mois
+        
+        Args:
+            mois: Mois (1-12)
+            annee: Année
+            objectifs: Objectifs du mois déjà lus (charger_objectifs), None pour les lire
+        
+        Returns:
+            Objectifs de chaque période (clés de charger_objectifs, plus
+            'ca_total_cumule' et 'nb_clients_cumule')
+        """
+        if objectifs is None:
+            objectifs = charger_objectifs(annee, mois)
+        jours_periodes, jours_mois = self._jours_periodes(mois, annee)
+        return repartir_objectifs(objectifs, OBJECTIFS_VOLUME_MANAGER, jours_periodes, jours_mois)
+    
+    def get_objectifs_collaborateurs(self, mois: int, annee: int,
+                                     collaborateur_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Calcule les objectifs Collaborateurs de chaque période d'un mois
+        
+        Args:
+            mois: Mois (1-12)
+            annee: Année
+            collaborateur_id: Collaborateur dont les objectifs individuels
+                s'appliquent, None pour l'objectif d'équipe
+        
+        Returns:
+            Objectifs de chaque période {'ca_prestation', 'ca_jour', 'nb_visites',
+            'pct_ventes', 'pct_couleurs', 'pct_soins'} (valeurs None sans objectif)
+        """
+        objectif = None
+        if collaborateur_id is not None:
+            objectif = self.atteinte.get_objectifs_mois(mois, annee, collaborateur_id).get(collaborateur_id)
+        if objectif is None:
+            # Objectif d'équipe (pas de collaborateur, ou collaborateur inactif ce mois-ci)
+            objectif = self.objectifs_db.get_objectif_collab_annee(annee)
+        objectifs = {cle: objectif.get(cle) if objectif else None for cle in OBJECTIFS_COLLABORATEURS}
+        jours_periodes, jours_mois = self._jours_periodes(mois, annee)
+        return repartir_objectifs(objectifs, OBJECTIFS_VOLUME_COLLABORATEURS, jours_periodes, jours_mois)
+    
+    def get_objectifs_equipe(self, mois: int, annee: int) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Calcule les objectifs de chaque période d'un mois pour toute l'équipe
+        
+        Les objectifs individuels de tous les collaborateurs actifs sont lus
+        en une requête, le calendrier une seule fois.
+        
+        Args:
+            mois: Mois (1-12)
+            annee: Année
+        
+        Returns:
+            {collaborateur_id: objectifs de chaque période (comme get_objectifs_collaborateurs)}
+        """
+        jours_periodes, jours_mois = self._jours_periodes(mois, annee)
+        return {
+            collaborateur_id: repartir_objectifs(
+                {cle: objectif[cle] for cle in OBJECTIFS_COLLABORATEURS},
+                OBJECTIFS_VOLUME_COLLABORATEURS, jours_periodes, jours_mois
+            )
+            for collaborateur_id, objectif in self.atteinte.get_objectifs_mois(mois, annee).items()
+        }
@@ -0,0 +1,201 @@
+"""
+Génération des objectifs Manager d'une année à partir de l'historique
+
+Le poids de chaque mois dans l'année (saisonnalité) est la moyenne, sur
+les dernières années complètes, de sa part du C.A. et des visites de
+l'année ; il est calculé par une seule requête groupée sur les suivis.
+L'objectif annuel (C.A. réalisé de la dernière année complète, augmenté
+de la croissance demandée) est réparti selon ces poids, puis chaque mois
+peut être corrigé à la main avant l'enregistrement.
+
+Sans année complète dans l'historique, les mois sont pondérés par leurs
+jours d'ouverture.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from modules.calendrier import CalendrierDB
+from modules.suivis_manager.utils import bornes_mois
+
+from .database import ObjectifsDB, COLONNES_OBJECTIFS
+
+
+def normaliser_poids(parts: List[List[float]]) -> Optional[List[float]]:
+    """
+    Moyenne des parts de chaque mois, ramenée à une somme de 1
+    
+    Args:
+        parts: Parts de l'année de chaque mois, une liste par mois
+    
+    Returns:
+        12 poids, ou None si un mois n'a aucune part
+    """
+    if not all(parts):
+        return None
+    moyennes = [sum(valeurs) / len(valeurs) for valeurs in parts]
+    total = sum(moyennes)
+    return [moyenne / total for moyenne in moyennes] if total else None
+
+
+class GenerateurObjectifs:
+    """Calcule les objectifs mensuels d'une année (aperçu) et les enregistre"""
+    
+    def __init__(self, objectifs_db: Optional[ObjectifsDB] = None,
+                 calendrier: Optional[CalendrierDB] = None):
+        self.objectifs_db = objectifs_db or ObjectifsDB()
+        self.db = self.objectifs_db.db
+        self.calendrier = calendrier or CalendrierDB()
+    
+    def get_saisonnalite(self, annee_debut: int, annee_fin: int) -> Dict[str, Any]:
+        """
+        Calcule les poids mensuels du C.A. et des visites sur un intervalle d'années
+        
+        Seules les années dont les 12 mois ont un C.A. sont retenues.
+        
+        Args:
+            annee_debut: Première année de l'historique (incluse)
+            annee_fin: Dernière année de l'historique (incluse)
+        
+        Returns:
+            {'annees': {annee: {'ca_total', 'nombre_visites'}} (années complètes),
+            'poids_ca': [12 poids] ou None, 'poids_visites': [12 poids] ou None}
+        """
+        query = """
+            WITH mensuel AS (
+                SELECT s.annee, s.mois, SUM(p.ca_total) AS ca_total,
+                       SUM(p.nombre_visites) AS nombre_visites
+                FROM suivis_manager s
+                JOIN suivis_manager_periodes p ON p.suivi_id = s.id
+                WHERE s.annee BETWEEN ? AND ?
+                GROUP BY s.annee, s.mois
+                HAVING SUM(p.ca_total) > 0
+            ),
+            completes AS (
+                SELECT annee FROM mensuel GROUP BY annee HAVING COUNT(*) = 12
+            )
+            SELECT m.annee, m.mois, m.ca_total, m.nombre_visites,
+                   m.ca_total / SUM(m.ca_total) OVER (PARTITION BY m.annee) AS part_ca,
+                   m.nombre_visites * 1.0
+                       / NULLIF(SUM(m.nombre_visites) OVER (PARTITION BY m.annee), 0) AS part_visites
+            FROM mensuel m
+            JOIN completes c ON c.annee = m.annee
+            ORDER BY m.annee, m.mois
+        """
+        lignes = self.db.fetch_all(query, (annee_debut, annee_fin))
+        
+        annees: Dict[int, Dict[str, float]] = {}
+        parts_ca: List[List[float]] = [[] for _ in range(12)]
+        parts_visites: List[List[float]] = [[] for _ in range(12)]
+        for ligne in lignes:
+            totaux = annees.setdefault(ligne['annee'], {'ca_total': 0.0, 'nombre_visites': 0})
+            totaux['ca_total'] += ligne['ca_total']
+            totaux['nombre_visites'] += ligne['nombre_visites'] or 0
+            parts_ca[ligne['mois'] - 1].append(ligne['part_ca'])
+            if ligne['part_visites'] is not None:
+                parts_visites[ligne['mois'] - 1].append(ligne['part_visites'])
+        
+        return {
+            'annees': annees,
+            'poids_ca': normaliser_poids(parts_ca),
+            'poids_visites': normaliser_poids(parts_visites)
+        }
+    
+    def get_jours_ouvres_mois(self, annee: int) -> List[int]:
+        """
+        Compte les jours d'ouverture de chaque mois d'une année
+        
+        Args:
+            annee: Année
+        
+        Returns:
+            12 nombres de jours ouverts, de janvier à décembre
+        """
+        return self.calendrier.compter_jours_ouvres_periodes(
+            [bornes_mois(mois, annee) for mois in range(1, 13)]
+        )
+    
+    def generer(self, annee: int, croissance: float = 0.0, nb_annees: int = 3,
+                ca_reference: Optional[float] = None, visites_reference: Optional[float] = None,
+                surcharges: Optional[Dict[int, Dict[str, Optional[float]]]] = None) -> Dict[str, Any]:
+        """
+        Calcule les objectifs Manager d'une année (aperçu, rien n'est écrit)
+        
+        Args:
+            annee: Année des objectifs
+            croissance: Croissance par an en fraction (0.05 = +5 %), appliquée
+                depuis l'année de référence
+            nb_annees: Nombre d'années d'historique (avant annee) pour la saisonnalité
+            ca_reference: C.A. annuel de référence, None pour le réalisé de la
+                dernière année complète
+            visites_reference: Visites annuelles de référence, même principe
+            surcharges: Valeurs imposées {mois: {colonne: valeur}}, appliquées en dernier
+        
+        Returns:
+            {'annee_reference': dernière année complète ou None, 'annees_historique',
+            'ca_reference', 'visites_reference', 'saisonnalite' ('historique' ou
+            'jours_ouvres'), 'objectifs': 12 × {'mois', colonnes des objectifs}}
+        """
+        historique = self.get_saisonnalite(annee - nb_annees, annee - 1)
+        annee_reference = max(historique['annees'], default=None)
+        
+        # Objectif annuel : réalisé de la dernière année complète, avec la croissance
+        facteur = (1 + croissance) ** (annee - annee_reference) if annee_reference else 1 + croissance
+        if ca_reference is None and annee_reference:
+            ca_reference = historique['annees'][annee_reference]['ca_total']
+        if visites_reference is None and annee_reference:
+            visites_reference = historique['annees'][annee_reference]['nombre_visites'] or None
+        
+        # Sans historique complet, les mois sont pondérés par leurs jours d'ouverture
+        jours = self.get_jours_ouvres_mois(annee)
+        poids_ca = historique['poids_ca'] or normaliser_poids([[nb] for nb in jours]) or [1 / 12] * 12
+        poids_visites = historique['poids_visites'] or poids_ca
+        
+        # Pourcentages : ceux de l'année précédente, mois par mois
+        precedents = {obj['mois']: obj for obj in self.objectifs_db.get_objectifs_annee(annee - 1)}
+        
+        objectifs = []
+        for i in range(12):
+            mois = i + 1
+            surcharge = (surcharges or {}).get(mois, {})
+            ca_total = round(ca_reference * facteur * poids_ca[i]) if ca_reference else None
+            # Un C.A. corrigé à la main change aussi le C.A. /jour calculé
+            ca_total = surcharge.get('ca_total', ca_total)
+            nb_clients = round(visites_reference * facteur * poids_visites[i]) if visites_reference else None
+            precedent = precedents.get(mois, {})
+            objectif = {
+                'mois': mois,
+                'ca_total': ca_total,
+                'ca_jour': round(ca_total / jours[i]) if ca_total and jours[i] else precedent.get('ca_jour'),
+                'nb_clients': nb_clients,
+                'pct_ventes': precedent.get('pct_ventes'),
+                'pct_couleurs': precedent.get('pct_couleurs'),
+                'pct_soins': precedent.get('pct_soins'),
+            }
+            objectif.update(surcharge)
+            objectifs.append(objectif)
+        
+        return {
+            'annee_reference': annee_reference,
+            'annees_historique': sorted(historique['annees']),
+            'ca_reference': ca_reference,
+            'visites_reference': visites_reference,
+            'saisonnalite': 'historique' if historique['poids_ca'] else 'jours_ouvres',
+            'objectifs': objectifs
+        }
+    
+    def enregistrer(self, annee: int, objectifs: List[Dict[str, Any]]) -> bool:
+        """
+        Enregistre des objectifs générés (une écriture, une action annulable)
+        
+        Args:
+            annee: Année des objectifs
+            objectifs: Objectifs de generer()['objectifs'], éventuellement corrigés
+        
+        Returns:
+            True si succès, False sinon
+        """
+        return self.objectifs_db.enregistrer_objectifs_annee(
+            annee, [{colonne: objectif.get(colonne) for colonne in ['mois'] + COLONNES_OBJECTIFS}
+                    for objectif in objectifs],
+            libelle="Génération des objectifs"
+        )
@@ -5,14 +5,23 @@ Interface utilisateur pour le module Objectifs
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
     QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
-    QMessageBox, QTabWidget
+    QMessageBox, QTabWidget, QDialog, QDialogButtonBox, QFormLayout,
+    QDoubleSpinBox, QSpinBox, QLineEdit
 )
 from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QFont
+from PySide6.QtGui import QColor, QFont, QKeySequence, QShortcut
 from datetime import datetime
 from typing import Optional
 
-from .database import ObjectifsDB
+from .atteinte import AtteinteObjectifs, OBJECTIFS_ANCIENNETE
+from .database import ObjectifsDB, COLONNES_OBJECTIFS, COLONNES_OBJECTIFS_COLLAB, TOUTE_ANNEE
+from .saisonnalite import GenerateurObjectifs
+
+
+MOIS_NOMS = [
+    "Janvier", "Février", "Mars", "Avril", "Mai", "Juin",
+    "Juillet", "Août", "Septembre", "Octobre", "Novembre", "Décembre"
+]
 
 
 def normaliser_decimal(texte: str) -> str:
@@ -31,6 +40,160 @@ def parser_decimal(texte: str) -> Optional[float]:
         return None
 
 
+def formater_objectif(colonne: str, valeur: Optional[float]) -> str:
+    """Formate un objectif Manager pour le tableau (montants et clients en entiers)"""
+    if not valeur:
+        return ""
+    if colonne in ("ca_total", "ca_jour", "nb_clients"):
+        return str(int(valeur))
+    return normaliser_decimal(str(float(valeur)))
+
+
+class GenerationObjectifsDialog(QDialog):
+    """Dialog de génération des objectifs Manager d'une année (aperçu avant enregistrement)"""
+    
+    def __init__(self, annee: int, generateur: GenerateurObjectifs, parent=None):
+        """
+        Args:
+            annee: Année des objectifs à générer
+            generateur: Générateur utilisé pour l'aperçu et l'enregistrement
+        """
+        super().__init__(parent)
+        self.annee = annee
+        self.generateur = generateur
+        self.surcharges = {}  # Cellules corrigées à la main : {mois: {colonne: valeur}}
+        self.setWindowTitle(f"Générer les objectifs Manager {annee}")
+        self.setModal(True)
+        self.resize(850, 650)
+        
+        layout = QVBoxLayout(self)
+        
+        form_layout = QFormLayout()
+        
+        self.croissance_spin = QDoubleSpinBox()
+        self.croissance_spin.setRange(-50, 100)
+        self.croissance_spin.setDecimals(1)
+        self.croissance_spin.setSuffix(" %")
+        self.croissance_spin.setValue(3)
+        form_layout.addRow("Croissance par an :", self.croissance_spin)
+        
+        self.nb_annees_spin = QSpinBox()
+        self.nb_annees_spin.setRange(1, 10)
+        self.nb_annees_spin.setValue(3)
+        form_layout.addRow("Années d'historique :", self.nb_annees_spin)
+        
+        self.ca_reference_input = QLineEdit()
+        self.ca_reference_input.setPlaceholderText("Réalisé de la dernière année complète")
+        form_layout.addRow("C.A. annuel de référence :", self.ca_reference_input)
+        
+        self.visites_reference_input = QLineEdit()
+        self.visites_reference_input.setPlaceholderText("Réalisé de la dernière année complète")
+        form_layout.addRow("Visites annuelles de référence :", self.visites_reference_input)
+        
+        layout.addLayout(form_layout)
+        
+        btn_calculer = QPushButton("🔄 Recalculer l'aperçu")
+        btn_calculer.clicked.connect(self._calculer)
+        layout.addWidget(btn_calculer)
+        
+        self.info_label = QLabel()
+        self.info_label.setWordWrap(True)
+        layout.addWidget(self.info_label)
+        
+        # Aperçu : les cellules corrigées sont conservées aux recalculs
+        self.table = QTableWidget(12, 7)
+        self.table.setHorizontalHeaderLabels([
+            "Mois", "C.A. Total", "C.A. /Jour", "Nombre de Clients",
+            "% Ventes", "% Couleurs", "% Soins"
+        ])
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        for i in range(1, 7):
+            header.setSectionResizeMode(i, QHeaderView.Stretch)
+        for i, nom in enumerate(MOIS_NOMS):
+            item = QTableWidgetItem(nom)
+            item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+            item.setBackground(Qt.lightGray)
+            self.table.setItem(i, 0, item)
+        self.table.itemChanged.connect(self._on_item_changed)
+        layout.addWidget(self.table)
+        
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.button(QDialogButtonBox.Ok).setText("💾 Enregistrer")
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+        
+        self._calculer()
+    
+    def _calculer(self):
+        """Recalcule l'aperçu avec les paramètres saisis et les corrections"""
+        resultat = self.generateur.generer(
+            self.annee,
+            croissance=self.croissance_spin.value() / 100,
+            nb_annees=self.nb_annees_spin.value(),
+            ca_reference=parser_decimal(self.ca_reference_input.text()),
+            visites_reference=parser_decimal(self.visites_reference_input.text()),
+            surcharges=self.surcharges
+        )
+        
+        if resultat['saisonnalite'] == 'historique':
+            annees = ", ".join(str(annee) for annee in resultat['annees_historique'])
+            info = (f"Saisonnalité : moyenne de {annees}. "
+                    f"Référence : {resultat['annee_reference']}")
+        else:
+            info = ("Aucune année complète dans l'historique : les mois sont pondérés "
+                    "par leurs jours d'ouverture")
+        if resultat['ca_reference']:
+            info += f" (C.A. {int(resultat['ca_reference'])} €)"
+        if resultat['ca_reference'] is None:
+            info += ". Saisissez un C.A. annuel de référence pour calculer le C.A."
+        self.info_label.setText(info)
+        
+        self.table.blockSignals(True)
+        for objectif in resultat['objectifs']:
+            ligne = objectif['mois'] - 1
+            for col, colonne in enumerate(COLONNES_OBJECTIFS, start=1):
+                item = QTableWidgetItem(formater_objectif(colonne, objectif.get(colonne)))
+                item.setTextAlignment(Qt.AlignCenter)
+                if colonne in self.surcharges.get(objectif['mois'], {}):
+                    font = item.font()
+                    font.setBold(True)
+                    item.setFont(font)
+                self.table.setItem(ligne, col, item)
+        self.table.blockSignals(False)
+    
+    def _on_item_changed(self, item: QTableWidgetItem):
+        """Retient une cellule corrigée à la main"""
+        colonne = COLONNES_OBJECTIFS[item.column() - 1]
+        valeur = parser_decimal(item.text())
+        if colonne == "nb_clients" and valeur is not None:
+            valeur = int(valeur)
+        self.surcharges.setdefault(item.row() + 1, {})[colonne] = valeur
+        
+        font = item.font()
+        font.setBold(True)
+        item.setFont(font)
+    
+    def get_objectifs(self) -> list:
+        """
+        Récupère les objectifs de l'aperçu
+        
+        Returns:
+            12 × {'mois', 'ca_total', 'ca_jour', 'nb_clients', 'pct_ventes',
+            'pct_couleurs', 'pct_soins'}
+        """
+        objectifs = []
+        for ligne in range(12):
+            objectif = {'mois': ligne + 1}
+            for col, colonne in enumerate(COLONNES_OBJECTIFS, start=1):
+                valeur = parser_decimal(self.table.item(ligne, col).text())
+                objectif[colonne] = int(valeur) if colonne == "nb_clients" and valeur is not None else valeur
+            objectifs.append(objectif)
+        return objectifs
+
+
 class ObjectifsWidget(QWidget):
     """Widget principal pour le module Objectifs"""
     
@@ -39,6 +202,8 @@ class ObjectifsWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.db = ObjectifsDB()
+        self.generateur = GenerateurObjectifs(self.db)
+        self.atteinte = AtteinteObjectifs(self.db)
         
         self._init_ui()
         self._charger_annee_courante()
@@ -62,6 +227,19 @@ class ObjectifsWidget(QWidget):
         
         header_layout.addStretch()
         
+        self.btn_annuler = QPushButton("↩️ Annuler")
+        self.btn_annuler.setToolTip("Annuler la dernière modification (Ctrl+Z)")
+        self.btn_annuler.clicked.connect(self._annuler)
+        header_layout.addWidget(self.btn_annuler)
+        
+        self.btn_retablir = QPushButton("↪️ Rétablir")
+        self.btn_retablir.setToolTip("Rétablir la modification annulée (Ctrl+Y)")
+        self.btn_retablir.clicked.connect(self._retablir)
+        header_layout.addWidget(self.btn_retablir)
+        
+        QShortcut(QKeySequence.Undo, self, self._annuler)
+        QShortcut(QKeySequence.Redo, self, self._retablir)
+        
         # Sélecteur d'année
         header_layout.addWidget(QLabel("Année :"))
         self.annee_combo = QComboBox()
@@ -111,6 +289,13 @@ class ObjectifsWidget(QWidget):
         self.btn_copier_annee.clicked.connect(self._copier_vers_annee_suivante)
         buttons_layout.addWidget(self.btn_copier_annee)
         
+        self.btn_generer_annee = QPushButton("📈 Générer l'année suivante")
+        self.btn_generer_annee.setToolTip(
+            "Calcule les objectifs de l'année suivante à partir du réalisé des années passées"
+        )
+        self.btn_generer_annee.clicked.connect(self._generer_annee_suivante)
+        buttons_layout.addWidget(self.btn_generer_annee)
+        
         buttons_layout.addStretch()
         
         layout.addLayout(buttons_layout)
@@ -153,8 +338,40 @@ class ObjectifsWidget(QWidget):
         
         # Tableau
         self.table_collab = self._creer_tableau_collab()
+        self.table_collab.setMaximumHeight(110)
         layout.addWidget(self.table_collab)
         
+        # Objectifs propres à chaque collaborateur
+        individuels_layout = QHBoxLayout()
+        titre_individuels = QLabel("Objectifs individuels")
+        font = titre_individuels.font()
+        font.setBold(True)
+        titre_individuels.setFont(font)
+        individuels_layout.addWidget(titre_individuels)
+        
+        self.mois_individuels_combo = QComboBox()
+        self.mois_individuels_combo.addItems(["Toute l'année"] + MOIS_NOMS)
+        self.mois_individuels_combo.currentIndexChanged.connect(self._charger_donnees_individuels)
+        individuels_layout.addWidget(self.mois_individuels_combo)
+        
+        self.btn_sauvegarder_individuels = QPushButton("💾 Sauvegarder les objectifs individuels")
+        self.btn_sauvegarder_individuels.clicked.connect(self._sauvegarder_objectifs_individuels)
+        individuels_layout.addWidget(self.btn_sauvegarder_individuels)
+        individuels_layout.addStretch()
+        layout.addLayout(individuels_layout)
+        
+        aide = QLabel(
+            "En gris : objectif d'équipe pondéré par l'ancienneté (ou objectif annuel du "
+            "collaborateur pour un mois). Effacez une valeur pour revenir à cet objectif."
+        )
+        aide.setWordWrap(True)
+        aide.setStyleSheet("color: #4C566A;")
+        layout.addWidget(aide)
+        
+        self.table_individuels = self._creer_tableau_individuels()
+        self.table_individuels.itemChanged.connect(self._on_individuel_modifie)
+        layout.addWidget(self.table_individuels)
+        
         return widget
     
     def _creer_tableau_manager(self):
@@ -169,12 +386,7 @@ class ObjectifsWidget(QWidget):
         ])
         
         # Labels des mois en première colonne
-        mois_noms = [
-            "Janvier", "Février", "Mars", "Avril", "Mai", "Juin",
-            "Juillet", "Août", "Septembre", "Octobre", "Novembre", "Décembre"
-        ]
-        
-        for i, nom in enumerate(mois_noms):
+        for i, nom in enumerate(MOIS_NOMS):
             item = QTableWidgetItem(nom)
             item.setFlags(item.flags() & ~Qt.ItemIsEditable)
             item.setBackground(Qt.lightGray)
@@ -262,6 +474,43 @@ class ObjectifsWidget(QWidget):
         
         return table
     
+    def _creer_tableau_individuels(self):
+        """Crée le tableau des objectifs individuels (1 ligne par collaborateur actif)"""
+        table = QTableWidget()
+        table.setColumnCount(3 + len(COLONNES_OBJECTIFS_COLLAB))
+        table.setHorizontalHeaderLabels([
+            "Collaborateur", "Ancienneté", "Coef.", "C.A. Prestation", "C.A. /Jour",
+            "Nombre de Visites", "% Ventes", "% Couleurs", "% Soins"
+        ])
+        table.horizontalHeaderItem(2).setToolTip(
+            "Part des objectifs d'équipe de volume selon l'ancienneté (config.ini)"
+        )
+        table.verticalHeader().setVisible(False)
+        table.setAlternatingRowColors(True)
+        
+        header = table.horizontalHeader()
+        for i in range(3):
+            header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
+        for i in range(3, table.columnCount()):
+            header.setSectionResizeMode(i, QHeaderView.Stretch)
+        
+        table.setStyleSheet("""
+            QTableWidget {
+                gridline-color: #E5E9F0;
+                border: 1px solid #E5E9F0;
+                border-radius: 8px;
+            }
+            QHeaderView::section {
+                background-color: #5E81AC;
+                color: white;
+                padding: 10px;
+                border: none;
+                font-weight: bold;
+            }
+        """)
+        
+        return table
+    
     def _charger_annee_courante(self):
         """Charge les données de l'année courante"""
         now = datetime.now()
@@ -272,6 +521,8 @@ class ObjectifsWidget(QWidget):
         """Charge les objectifs de l'année sélectionnée"""
         self._charger_donnees_manager()
         self._charger_donnees_collab()
+        self._charger_donnees_individuels()
+        self._mettre_a_jour_historique()
     
     def _charger_donnees_manager(self):
         """Charge les objectifs Manager"""
@@ -283,46 +534,49 @@ class ObjectifsWidget(QWidget):
         self.table_manager.blockSignals(True)
         
         for mois in range(1, 13):
-            objectifs = objectifs_dict.get(mois, {})
-            
-            ca_total = objectifs.get('ca_total', '')
-            self.table_manager.setItem(mois - 1, 1, QTableWidgetItem(
-                normaliser_decimal(str(int(ca_total))) if ca_total else ""
-            ))
-            
-            ca_jour = objectifs.get('ca_jour', '')
-            self.table_manager.setItem(mois - 1, 2, QTableWidgetItem(
-                normaliser_decimal(str(int(ca_jour))) if ca_jour else ""
-            ))
-            
-            nb_clients = objectifs.get('nb_clients', '')
-            self.table_manager.setItem(mois - 1, 3, QTableWidgetItem(
-                str(int(nb_clients)) if nb_clients else ""
-            ))
-            
-            pct_ventes = objectifs.get('pct_ventes', '')
-            self.table_manager.setItem(mois - 1, 4, QTableWidgetItem(
-                normaliser_decimal(str(float(pct_ventes))) if pct_ventes else ""
-            ))
-            
-            pct_couleurs = objectifs.get('pct_couleurs', '')
-            self.table_manager.setItem(mois - 1, 5, QTableWidgetItem(
-                normaliser_decimal(str(float(pct_couleurs))) if pct_couleurs else ""
-            ))
-            
-            pct_soins = objectifs.get('pct_soins', '')
-            self.table_manager.setItem(mois - 1, 6, QTableWidgetItem(
-                normaliser_decimal(str(float(pct_soins))) if pct_soins else ""
-            ))
-        
-        for row in range(12):
-            for col in range(1, 7):
-                item = self.table_manager.item(row, col)
-                if item:
-                    item.setTextAlignment(Qt.AlignCenter)
+            self._remplir_ligne_manager(mois, objectifs_dict.get(mois, {}))
         
         self.table_manager.blockSignals(False)
     
+    def _remplir_ligne_manager(self, mois: int, objectifs: dict):
+        """Remplit la ligne d'un mois du tableau Manager"""
+        ligne = mois - 1
+        
+        ca_total = objectifs.get('ca_total', '')
+        self.table_manager.setItem(ligne, 1, QTableWidgetItem(
+            normaliser_decimal(str(int(ca_total))) if ca_total else ""
+        ))
+        
+        ca_jour = objectifs.get('ca_jour', '')
+        self.table_manager.setItem(ligne, 2, QTableWidgetItem(
+            normaliser_decimal(str(int(ca_jour))) if ca_jour else ""
+        ))
+        
+        nb_clients = objectifs.get('nb_clients', '')
+        self.table_manager.setItem(ligne, 3, QTableWidgetItem(
+            str(int(nb_clients)) if nb_clients else ""
+        ))
+        
+        pct_ventes = objectifs.get('pct_ventes', '')
+        self.table_manager.setItem(ligne, 4, QTableWidgetItem(
+            normaliser_decimal(str(float(pct_ventes))) if pct_ventes else ""
+        ))
+        
+        pct_couleurs = objectifs.get('pct_couleurs', '')
+        self.table_manager.setItem(ligne, 5, QTableWidgetItem(
+            normaliser_decimal(str(float(pct_couleurs))) if pct_couleurs else ""
+        ))
+        
+        pct_soins = objectifs.get('pct_soins', '')
+        self.table_manager.setItem(ligne, 6, QTableWidgetItem(
+            normaliser_decimal(str(float(pct_soins))) if pct_soins else ""
+        ))
+        
+        for col in range(1, 7):
+            item = self.table_manager.item(ligne, col)
+            if item:
+                item.setTextAlignment(Qt.AlignCenter)
+    
     def _charger_donnees_collab(self):
         """Charge les objectifs Collaborateurs"""
         annee = int(self.annee_combo.currentText())
@@ -330,7 +584,11 @@ class ObjectifsWidget(QWidget):
         objectifs = self.db.get_objectif_collab_annee(annee)
         
         self.table_collab.blockSignals(True)
-        
+        self._remplir_ligne_collab(objectifs)
+        self.table_collab.blockSignals(False)
+    
+    def _remplir_ligne_collab(self, objectifs: Optional[dict]):
+        """Remplit la ligne du tableau Collaborateurs"""
         if objectifs:
             ca_prestation = objectifs.get('ca_prestation', '')
             self.table_collab.setItem(0, 1, QTableWidgetItem(
@@ -370,61 +628,194 @@ class ObjectifsWidget(QWidget):
             item = self.table_collab.item(0, col)
             if item:
                 item.setTextAlignment(Qt.AlignCenter)
+    
+    def _mois_reference_individuels(self, annee: int) -> int:
+        """
+        Mois dont les collaborateurs actifs et l'ancienneté sont affichés
+        
+        Pour « Toute l'année » : le mois courant pour l'année en cours, sinon
+        janvier (année à venir) ou décembre (année passée).
+        """
+        mois = self.mois_individuels_combo.currentIndex()
+        if mois != TOUTE_ANNEE:
+            return mois
+        maintenant = datetime.now()
+        if annee == maintenant.year:
+            return maintenant.month
+        return 1 if annee > maintenant.year else 12
+    
+    def _charger_donnees_individuels(self):
+        """Charge les objectifs individuels du mois (ou de l'année) sélectionné"""
+        annee = int(self.annee_combo.currentText())
+        mois = self.mois_individuels_combo.currentIndex()  # 0 = toute l'année
+        
+        resolus = self.atteinte.get_objectifs_mois(self._mois_reference_individuels(annee), annee)
+        explicites = {obj['collaborateur_id']: obj for obj in self.db.get_objectifs_individuels(annee, mois)}
+        equipe = self.db.get_objectif_collab_annee(annee) or {}
+        
+        self.table_individuels.blockSignals(True)
+        self.table_individuels.setRowCount(len(resolus))
+        for ligne, (collaborateur_id, resolu) in enumerate(
+            sorted(resolus.items(), key=lambda element: element[1]['ordre'])
+        ):
+            nom_item = QTableWidgetItem(f"{resolu['prenom']} {resolu['nom']}")
+            nom_item.setData(Qt.UserRole, collaborateur_id)
+            anciennete = resolu['anciennete_mois']
+            anciennete_item = QTableWidgetItem(f"{anciennete} mois" if anciennete is not None else "")
+            coef_item = QTableWidgetItem(f"{resolu['coefficient']:g} %")
+            for col, item in enumerate([nom_item, anciennete_item, coef_item]):
+                item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+                self.table_individuels.setItem(ligne, col, item)
+            
+            explicite = explicites.get(collaborateur_id, {})
+            for col, colonne in enumerate(COLONNES_OBJECTIFS_COLLAB, start=3):
+                if explicite.get(colonne) is not None:
+                    self._remplir_cellule_individuelle(ligne, col, colonne, explicite[colonne], False)
+                    continue
+                if mois == TOUTE_ANNEE:
+                    # Objectif d'équipe pondéré (les objectifs d'un mois ne s'appliquent pas)
+                    valeur = equipe.get(colonne)
+                    if valeur is not None and colonne in OBJECTIFS_ANCIENNETE:
+                        valeur = valeur * resolu['coefficient'] / 100
+                else:
+                    valeur = resolu[colonne]
+                self._remplir_cellule_individuelle(ligne, col, colonne, valeur, True)
+        self.table_individuels.blockSignals(False)
+    
+    def recharger_objectifs_individuels(self):
+        """Relit les objectifs individuels (collaborateurs ou dates d'entrée modifiés)"""
+        self._charger_donnees_individuels()
+    
+    def _remplir_cellule_individuelle(self, ligne: int, col: int, colonne: str,
+                                      valeur: Optional[float], par_defaut: bool):
+        """
+        Remplit une cellule du tableau des objectifs individuels
+        
+        Args:
+            ligne: Ligne du collaborateur
+            col: Colonne du tableau
+            colonne: Colonne de l'objectif (COLONNES_OBJECTIFS_COLLAB)
+            valeur: Valeur affichée
+            par_defaut: True si la valeur est reprise (équipe ou année) et non saisie
+        """
+        if valeur is None:
+            texte = ""
+        elif colonne in ("ca_prestation", "ca_jour"):
+            texte = str(int(round(valeur)))
+        else:
+            texte = normaliser_decimal(f"{valeur:g}")
         
-        self.table_collab.blockSignals(False)
+        item = QTableWidgetItem(texte)
+        item.setTextAlignment(Qt.AlignCenter)
+        item.setData(Qt.UserRole, par_defaut)
+        if par_defaut:
+            item.setForeground(QColor(140, 140, 140))
+            font = item.font()
+            font.setItalic(True)
+            item.setFont(font)
+        self.table_individuels.setItem(ligne, col, item)
+    
+    def _on_individuel_modifie(self, item: QTableWidgetItem):
+        """Une valeur saisie devient un objectif propre au collaborateur"""
+        if item.column() < 3 or not item.data(Qt.UserRole):
+            return
+        self.table_individuels.blockSignals(True)
+        item.setData(Qt.UserRole, False)
+        item.setForeground(QColor(0, 0, 0))
+        font = item.font()
+        font.setItalic(False)
+        item.setFont(font)
+        self.table_individuels.blockSignals(False)
+    
+    def _sauvegarder_objectifs_individuels(self):
+        """Sauvegarde les objectifs individuels saisis (une seule action annulable)"""
+        annee = int(self.annee_combo.currentText())
+        mois = self.mois_individuels_combo.currentIndex()
+        
+        objectifs = []
+        for ligne in range(self.table_individuels.rowCount()):
+            objectif = {
+                'collaborateur_id': self.table_individuels.item(ligne, 0).data(Qt.UserRole),
+                'mois': mois
+            }
+            for col, colonne in enumerate(COLONNES_OBJECTIFS_COLLAB, start=3):
+                item = self.table_individuels.item(ligne, col)
+                # Les valeurs grisées sont reprises, pas saisies
+                if item is None or item.data(Qt.UserRole):
+                    objectif[colonne] = None
+                    continue
+                objectif[colonne] = parser_decimal(item.text())
+            objectifs.append(objectif)
+        
+        if not self.db.enregistrer_objectifs_individuels(annee, objectifs):
+            QMessageBox.warning(self, "Erreur", "Erreur lors de l'enregistrement des objectifs individuels.")
+            return
+        
+        self._charger_donnees_individuels()
+        QMessageBox.information(
+            self, "Sauvegarde",
+            f"Les objectifs individuels ({self.mois_individuels_combo.currentText()} {annee}) "
+            "ont été sauvegardés avec succès !"
+        )
+        
+        self._mettre_a_jour_historique()
+        self.objectifs_modifies.emit()
     
     def _sauvegarder_objectifs_manager(self):
         """Sauvegarde tous les objectifs Manager du tableau"""
         annee = int(self.annee_combo.currentText())
         
-        for mois in range(1, 13):
-            try:
-                ca_total_text = self.table_manager.item(mois - 1, 1).text() if self.table_manager.item(mois - 1, 1) else ""
-                ca_total = parser_decimal(ca_total_text)
-            except (ValueError, AttributeError):
-                ca_total = None
-            
-            try:
-                ca_jour_text = self.table_manager.item(mois - 1, 2).text() if self.table_manager.item(mois - 1, 2) else ""
-                ca_jour = parser_decimal(ca_jour_text)
-            except (ValueError, AttributeError):
-                ca_jour = None
-            
-            try:
-                nb_clients_text = self.table_manager.item(mois - 1, 3).text() if self.table_manager.item(mois - 1, 3) else ""
-                nb_clients = int(parser_decimal(nb_clients_text)) if nb_clients_text.strip() else None
-            except (ValueError, AttributeError):
-                nb_clients = None
-            
-            try:
-                pct_ventes_text = self.table_manager.item(mois - 1, 4).text() if self.table_manager.item(mois - 1, 4) else ""
-                pct_ventes = parser_decimal(pct_ventes_text)
-            except (ValueError, AttributeError):
-                pct_ventes = None
-            
-            try:
-                pct_couleurs_text = self.table_manager.item(mois - 1, 5).text() if self.table_manager.item(mois - 1, 5) else ""
-                pct_couleurs = parser_decimal(pct_couleurs_text)
-            except (ValueError, AttributeError):
-                pct_couleurs = None
-            
-            try:
-                pct_soins_text = self.table_manager.item(mois - 1, 6).text() if self.table_manager.item(mois - 1, 6) else ""
-                pct_soins = parser_decimal(pct_soins_text)
-            except (ValueError, AttributeError):
-                pct_soins = None
-            
-            self.db.sauvegarder_objectif(
-                annee, mois,
-                ca_total, ca_jour, nb_clients,
-                pct_ventes, pct_couleurs, pct_soins
-            )
+        # Les 12 mois forment une seule action annulable
+        with self.db.journal.lot("Objectifs Manager"):
+            for mois in range(1, 13):
+                try:
+                    ca_total_text = self.table_manager.item(mois - 1, 1).text() if self.table_manager.item(mois - 1, 1) else ""
+                    ca_total = parser_decimal(ca_total_text)
+                except (ValueError, AttributeError):
+                    ca_total = None
+                
+                try:
+                    ca_jour_text = self.table_manager.item(mois - 1, 2).text() if self.table_manager.item(mois - 1, 2) else ""
+                    ca_jour = parser_decimal(ca_jour_text)
+                except (ValueError, AttributeError):
+                    ca_jour = None
+                
+                try:
+                    nb_clients_text = self.table_manager.item(mois - 1, 3).text() if self.table_manager.item(mois - 1, 3) else ""
+                    nb_clients = int(parser_decimal(nb_clients_text)) if nb_clients_text.strip() else None
+                except (ValueError, AttributeError):
+                    nb_clients = None
+                
+                try:
+                    pct_ventes_text = self.table_manager.item(mois - 1, 4).text() if self.table_manager.item(mois - 1, 4) else ""
+                    pct_ventes = parser_decimal(pct_ventes_text)
+                except (ValueError, AttributeError):
+                    pct_ventes = None
+                
+                try:
+                    pct_couleurs_text = self.table_manager.item(mois - 1, 5).text() if self.table_manager.item(mois - 1, 5) else ""
+                    pct_couleurs = parser_decimal(pct_couleurs_text)
+                except (ValueError, AttributeError):
+                    pct_couleurs = None
+                
+                try:
+                    pct_soins_text = self.table_manager.item(mois - 1, 6).text() if self.table_manager.item(mois - 1, 6) else ""
+                    pct_soins = parser_decimal(pct_soins_text)
+                except (ValueError, AttributeError):
+                    pct_soins = None
+                
+                self.db.sauvegarder_objectif(
+                    annee, mois,
+                    ca_total, ca_jour, nb_clients,
+                    pct_ventes, pct_couleurs, pct_soins
+                )
         
         QMessageBox.information(
             self, "Sauvegarde",
             f"Les objectifs Manager de l'année {annee} ont été sauvegardés avec succès !"
         )
         
+        self._mettre_a_jour_historique()
         self.objectifs_modifies.emit()
     
     def _sauvegarder_objectifs_collab(self):
@@ -473,11 +864,13 @@ class ObjectifsWidget(QWidget):
             pct_ventes, pct_couleurs, pct_soins
         )
         
+        self._charger_donnees_individuels()
         QMessageBox.information(
             self, "Sauvegarde",
             f"Les objectifs Collaborateurs de l'année {annee} ont été sauvegardés avec succès !"
         )
         
+        self._mettre_a_jour_historique()
         self.objectifs_modifies.emit()
     
     def _reinitialiser_manager(self):
@@ -498,7 +891,7 @@ class ObjectifsWidget(QWidget):
             f"<b>Attention !</b><br><br>"
             f"Vous êtes sur le point de <b>supprimer définitivement</b> tous les objectifs Manager "
             f"de l'année <b>{annee}</b> (12 mois).<br><br>"
-            f"Cette action est <b>irréversible</b>.<br><br>"
+            f"Vous pourrez revenir en arrière avec <b>Annuler</b> (Ctrl+Z).<br><br>"
             f"Voulez-vous vraiment continuer ?",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
@@ -513,6 +906,7 @@ class ObjectifsWidget(QWidget):
                     f"Tous les objectifs Manager de l'année {annee} ont été supprimés."
                 )
                 
+                self._mettre_a_jour_historique()
                 self.objectifs_modifies.emit()
             else:
                 QMessageBox.critical(
@@ -538,7 +932,7 @@ class ObjectifsWidget(QWidget):
             f"<b>Attention !</b><br><br>"
             f"Vous êtes sur le point de <b>supprimer définitivement</b> tous les objectifs Collaborateurs "
             f"de l'année <b>{annee}</b>.<br><br>"
-            f"Cette action est <b>irréversible</b>.<br><br>"
+            f"Vous pourrez revenir en arrière avec <b>Annuler</b> (Ctrl+Z).<br><br>"
             f"Voulez-vous vraiment continuer ?",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
@@ -547,12 +941,14 @@ class ObjectifsWidget(QWidget):
         if reply == QMessageBox.Yes:
             if self.db.supprimer_objectif_collab_annee(annee):
                 self._charger_donnees_collab()
+                self._charger_donnees_individuels()
                 
                 QMessageBox.information(
                     self, "Réinitialisation réussie",
                     f"Tous les objectifs Collaborateurs de l'année {annee} ont été supprimés."
                 )
                 
+                self._mettre_a_jour_historique()
                 self.objectifs_modifies.emit()
             else:
                 QMessageBox.critical(
@@ -575,19 +971,87 @@ class ObjectifsWidget(QWidget):
         if reply == QMessageBox.Yes:
             objectifs = self.db.get_objectifs_annee(annee_actuelle)
             
-            for obj in objectifs:
-                self.db.sauvegarder_objectif(
-                    annee_suivante,
-                    obj['mois'],
-                    obj.get('ca_total'),
-                    obj.get('ca_jour'),
-                    obj.get('nb_clients'),
-                    obj.get('pct_ventes'),
-                    obj.get('pct_couleurs'),
-                    obj.get('pct_soins')
-                )
+            # Les 12 mois en une seule écriture (une action annulable)
+            self.db.enregistrer_objectifs_annee(
+                annee_suivante, objectifs, libelle="Copie vers l'année suivante"
+            )
             
             QMessageBox.information(
                 self, "Copie terminée",
                 f"Les objectifs Manager ont été copiés vers {annee_suivante}."
-            )
\ No newline at end of file
+            )
+            self._mettre_a_jour_historique()
+    
+    def _generer_annee_suivante(self):
+        """Génère les objectifs Manager de l'année suivante (aperçu puis enregistrement)"""
+        annee_suivante = int(self.annee_combo.currentText()) + 1
+        
+        dialog = GenerationObjectifsDialog(annee_suivante, self.generateur, self)
+        if dialog.exec() != QDialog.Accepted:
+            return
+        
+        if self.db.get_objectifs_annee(annee_suivante):
+            reply = QMessageBox.question(
+                self, "Générer l'année suivante",
+                f"Des objectifs Manager existent déjà pour {annee_suivante}.\n"
+                "Voulez-vous les remplacer ?",
+                QMessageBox.Yes | QMessageBox.No
+            )
+            if reply != QMessageBox.Yes:
+                return
+        
+        if not self.generateur.enregistrer(annee_suivante, dialog.get_objectifs()):
+            QMessageBox.warning(self, "Erreur", "Erreur lors de l'enregistrement des objectifs.")
+            return
+        
+        QMessageBox.information(
+            self, "Génération terminée",
+            f"Les objectifs Manager de {annee_suivante} ont été enregistrés."
+        )
+        self._mettre_a_jour_historique()
+        self.objectifs_modifies.emit()
+    
+    def _mettre_a_jour_historique(self):
+        """Active les boutons Annuler / Rétablir selon le journal"""
+        self.btn_annuler.setEnabled(self.db.journal.peut_annuler())
+        self.btn_retablir.setEnabled(self.db.journal.peut_retablir())
+    
+    def _annuler(self):
+        """Annule la dernière modification enregistrée"""
+        self._rafraichir_lignes(self.db.journal.annuler())
+    
+    def _retablir(self):
+        """Rétablit la dernière modification annulée"""
+        self._rafraichir_lignes(self.db.journal.retablir())
+    
+    def _rafraichir_lignes(self, lignes: list):
+        """
+        Met à jour les seules lignes des tableaux touchées par annuler/rétablir
+        
+        Args:
+            lignes: Lignes renvoyées par le journal ({'table', 'avant', 'apres'})
+        """
+        annee = int(self.annee_combo.currentText())
+        
+        self.table_manager.blockSignals(True)
+        self.table_collab.blockSignals(True)
+        for ligne in lignes:
+            objectif = ligne['apres'] or ligne['avant']
+            if objectif['annee'] != annee:
+                continue
+            
+            if ligne['table'] == "objectifs_mensuels":
+                self._remplir_ligne_manager(objectif['mois'], ligne['apres'] or {})
+            elif ligne['table'] == "objectifs_collaborateurs":
+                self._remplir_ligne_collab(ligne['apres'])
+        self.table_collab.blockSignals(False)
+        self.table_manager.blockSignals(False)
+        
+        # Objectifs individuels et valeurs par défaut qui en dépendent : tableau relu
+        if any(ligne['table'] in ("objectifs_collaborateurs", "objectifs_collaborateurs_individuels")
+               for ligne in lignes):
+            self._charger_donnees_individuels()
+        
+        self._mettre_a_jour_historique()
+        if lignes:
+            self.objectifs_modifies.emit()
\ No newline at end of file
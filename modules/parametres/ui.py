@@ -4,24 +4,34 @@ Interface utilisateur pour le module Paramètres
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
-    QPushButton, QGroupBox, QFormLayout, QMessageBox, QScrollArea
+    QPushButton, QGroupBox, QFormLayout, QMessageBox, QScrollArea,
+    QComboBox, QDialog, QCheckBox, QDateEdit, QTableWidget, QTableWidgetItem,
+    QHeaderView
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QDate
 from PySide6.QtGui import QFont
 import configparser
 from pathlib import Path
 
+from modules.salons import RegistreSalons
+from modules.sauvegarde import SauvegardeManager
+from modules.calendrier import CalendrierDB
+
 
 class ParametresWidget(QWidget):
     """Widget principal pour le module Paramètres"""
     
     parametres_enregistres = Signal()  # Signal émis quand les paramètres sont sauvegardés
+    sauvegarde_terminee = Signal(str)  # Émis depuis le thread de sauvegarde ("" en cas d'échec)
+    calendrier_modifie = Signal()  # Émis quand les jours d'ouverture ou les exceptions changent
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.config_path = Path("config.ini")
         self.config = configparser.ConfigParser()
         
+        self.sauvegarde_terminee.connect(self._on_sauvegarde_terminee)
+        
         self._init_ui()
         self._charger_parametres()
     
@@ -63,7 +73,16 @@ class ParametresWidget(QWidget):
         # Section 1 : Identification du salon
         self._creer_section_identification(layout)
         
-        # Section 2 : Objectifs Suivis Manager
+        # Section 2 : Salons (multi-salons)
+        self._creer_section_salons(layout)
+        
+        # Section 3 : Sauvegardes
+        self._creer_section_sauvegardes(layout)
+        
+        # Section 4 : Calendrier d'ouverture
+        self._creer_section_calendrier(layout)
+        
+        # Section 5 : Objectifs Suivis Manager
         self._creer_section_objectifs(layout)
         
         # Boutons d'action
@@ -97,6 +116,304 @@ class ParametresWidget(QWidget):
         group.setLayout(form_layout)
         parent_layout.addWidget(group)
     
+    def _creer_section_salons(self, parent_layout):
+        """Crée la section de gestion des salons"""
+        group = QGroupBox("🏬 Salons")
+        group.setObjectName("parametres_group")
+        
+        layout = QVBoxLayout()
+        layout.setSpacing(15)
+        
+        desc_label = QLabel(
+            "Chaque salon dispose de sa propre base de données. "
+            "Le changement de salon actif prend effet au prochain démarrage."
+        )
+        desc_label.setWordWrap(True)
+        layout.addWidget(desc_label)
+        
+        salons_layout = QHBoxLayout()
+        
+        salons_layout.addWidget(QLabel("Salon actif :"))
+        self.salon_combo = QComboBox()
+        self.salon_combo.setMinimumHeight(35)
+        salons_layout.addWidget(self.salon_combo, 1)
+        
+        self.btn_activer_salon = QPushButton("✔️ Activer")
+        self.btn_activer_salon.clicked.connect(self._activer_salon)
+        salons_layout.addWidget(self.btn_activer_salon)
+        
+        self.btn_ajouter_salon = QPushButton("➕ Ajouter un salon")
+        self.btn_ajouter_salon.clicked.connect(self._ajouter_salon)
+        salons_layout.addWidget(self.btn_ajouter_salon)
+        
+        self.btn_synthese_salons = QPushButton("📊 Synthèse multi-salons")
+        self.btn_synthese_salons.clicked.connect(self._afficher_synthese_salons)
+        salons_layout.addWidget(self.btn_synthese_salons)
+        
+        layout.addLayout(salons_layout)
+        
+        group.setLayout(layout)
+        parent_layout.addWidget(group)
+    
+    def _charger_salons(self):
+        """Charge la liste des salons du registre"""
+        registre = RegistreSalons(self.config_path)
+        code_actif = registre.get_code_actif()
+        
+        self.salon_combo.clear()
+        salons = registre.lister_salons()
+        
+        if not salons:
+            # Mode salon unique
+            nom = registre.config.get('Salon', 'nom', fallback='').strip()
+            self.salon_combo.addItem(nom or "Salon unique", None)
+            self.btn_activer_salon.setEnabled(False)
+            return
+        
+        self.btn_activer_salon.setEnabled(True)
+        for salon in salons:
+            libelle = f"{salon['nom']} - {salon['ville']}" if salon['ville'] else salon['nom']
+            self.salon_combo.addItem(libelle, salon['code'])
+            if salon['code'] == code_actif:
+                self.salon_combo.setCurrentIndex(self.salon_combo.count() - 1)
+    
+    def _ajouter_salon(self):
+        """Ajoute un salon au registre"""
+        from modules.salons.ui import AjouterSalonDialog
+        
+        dialog = AjouterSalonDialog(self)
+        
+        if dialog.exec() == QDialog.Accepted:
+            data = dialog.get_data()
+            
+            try:
+                RegistreSalons(self.config_path).ajouter_salon(data['nom'], data['ville'])
+            except ValueError as e:
+                QMessageBox.warning(self, "Salon non ajouté", str(e))
+                return
+            
+            self._charger_salons()
+            QMessageBox.information(
+                self, "Salon ajouté",
+                f"Le salon {data['nom']} a été ajouté.\n"
+                "Activez-le puis redémarrez l'application pour saisir ses données."
+            )
+    
+    def _activer_salon(self):
+        """Définit le salon sélectionné comme salon actif"""
+        code = self.salon_combo.currentData()
+        if not code:
+            return
+        
+        registre = RegistreSalons(self.config_path)
+        if code == registre.get_code_actif():
+            return
+        
+        if registre.definir_salon_actif(code):
+            self._charger_parametres()
+            QMessageBox.information(
+                self, "Salon activé",
+                "Le salon a été activé.\n"
+                "Redémarrez l'application pour ouvrir sa base de données."
+            )
+    
+    def _afficher_synthese_salons(self):
+        """Affiche la synthèse consolidée de tous les salons"""
+        from modules.salons.ui import SyntheseSalonsDialog
+        
+        SyntheseSalonsDialog(self).exec()
+    
+    def _creer_section_sauvegardes(self, parent_layout):
+        """Crée la section des sauvegardes de la base de données"""
+        group = QGroupBox("💾 Sauvegardes")
+        group.setObjectName("parametres_group")
+        
+        layout = QVBoxLayout()
+        layout.setSpacing(15)
+        
+        desc_label = QLabel(
+            "La base est sauvegardée automatiquement (périodiquement et à la fermeture) "
+            "selon la section [Sauvegarde] de config.ini."
+        )
+        desc_label.setWordWrap(True)
+        layout.addWidget(desc_label)
+        
+        sauvegarde_layout = QHBoxLayout()
+        
+        self.derniere_sauvegarde_label = QLabel()
+        sauvegarde_layout.addWidget(self.derniere_sauvegarde_label, 1)
+        
+        self.btn_sauvegarder_base = QPushButton("💾 Sauvegarder maintenant")
+        self.btn_sauvegarder_base.clicked.connect(self._sauvegarder_base)
+        sauvegarde_layout.addWidget(self.btn_sauvegarder_base)
+        
+        layout.addLayout(sauvegarde_layout)
+        
+        group.setLayout(layout)
+        parent_layout.addWidget(group)
+    
+    def _afficher_derniere_sauvegarde(self):
+        """Affiche le nom de la sauvegarde la plus récente"""
+        sauvegardes = SauvegardeManager(str(self.config_path)).lister_sauvegardes()
+        if sauvegardes:
+            self.derniere_sauvegarde_label.setText(f"Dernière sauvegarde : {sauvegardes[0].name}")
+        else:
+            self.derniere_sauvegarde_label.setText("Aucune sauvegarde")
+    
+    def _sauvegarder_base(self):
+        """Lance une sauvegarde de la base en arrière-plan"""
+        self.btn_sauvegarder_base.setEnabled(False)
+        self.derniere_sauvegarde_label.setText("Sauvegarde en cours...")
+        
+        SauvegardeManager(str(self.config_path)).sauvegarder_en_arriere_plan(
+            lambda chemin: self.sauvegarde_terminee.emit(str(chemin) if chemin else "")
+        )
+    
+    def _on_sauvegarde_terminee(self, chemin: str):
+        """Met à jour l'interface à la fin d'une sauvegarde (thread principal)"""
+        self.btn_sauvegarder_base.setEnabled(True)
+        
+        if not chemin:
+            QMessageBox.warning(
+                self, "Sauvegarde échouée",
+                "La sauvegarde de la base de données a échoué."
+            )
+        self._afficher_derniere_sauvegarde()
+    
+    def _creer_section_calendrier(self, parent_layout):
+        """Crée la section des jours d'ouverture et des fermetures exceptionnelles"""
+        group = QGroupBox("📅 Calendrier d'ouverture")
+        group.setObjectName("parametres_group")
+        
+        layout = QVBoxLayout()
+        layout.setSpacing(15)
+        
+        desc_label = QLabel(
+            "Les jours d'ouverture servent au calcul du C.A. /jour. Les jours fériés sont "
+            "fermés, sauf ouverture exceptionnelle. Les modifications sont enregistrées immédiatement."
+        )
+        desc_label.setWordWrap(True)
+        layout.addWidget(desc_label)
+        
+        # Jours d'ouverture de la semaine
+        jours_layout = QHBoxLayout()
+        jours_layout.addWidget(QLabel("Ouvert le :"))
+        self.jours_ouverture_checks = []
+        for libelle in ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]:
+            check = QCheckBox(libelle)
+            check.toggled.connect(self._enregistrer_jours_ouverture)
+            jours_layout.addWidget(check)
+            self.jours_ouverture_checks.append(check)
+        jours_layout.addStretch()
+        layout.addLayout(jours_layout)
+        
+        # Fermetures / ouvertures exceptionnelles
+        self.exceptions_table = QTableWidget(0, 3)
+        self.exceptions_table.setHorizontalHeaderLabels(["Date", "Type", "Motif"])
+        self.exceptions_table.verticalHeader().setVisible(False)
+        self.exceptions_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.exceptions_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.exceptions_table.setMinimumHeight(150)
+        header = self.exceptions_table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(2, QHeaderView.Stretch)
+        layout.addWidget(self.exceptions_table)
+        
+        exception_layout = QHBoxLayout()
+        self.exception_date_input = QDateEdit(QDate.currentDate())
+        self.exception_date_input.setCalendarPopup(True)
+        self.exception_date_input.setDisplayFormat("dd/MM/yyyy")
+        exception_layout.addWidget(self.exception_date_input)
+        
+        self.exception_type_combo = QComboBox()
+        self.exception_type_combo.addItems(["Fermeture", "Ouverture"])
+        exception_layout.addWidget(self.exception_type_combo)
+        
+        self.exception_motif_input = QLineEdit()
+        self.exception_motif_input.setPlaceholderText("Motif (ex: Congés, Inventaire)")
+        exception_layout.addWidget(self.exception_motif_input, 1)
+        
+        self.btn_ajouter_exception = QPushButton("➕ Ajouter")
+        self.btn_ajouter_exception.clicked.connect(self._ajouter_exception)
+        exception_layout.addWidget(self.btn_ajouter_exception)
+        
+        self.btn_supprimer_exception = QPushButton("🗑️ Supprimer")
+        self.btn_supprimer_exception.clicked.connect(self._supprimer_exception)
+        exception_layout.addWidget(self.btn_supprimer_exception)
+        
+        layout.addLayout(exception_layout)
+        
+        # Jours fériés de l'année en cours
+        self.feries_label = QLabel()
+        self.feries_label.setWordWrap(True)
+        layout.addWidget(self.feries_label)
+        
+        group.setLayout(layout)
+        parent_layout.addWidget(group)
+    
+    def _charger_calendrier(self):
+        """Affiche les jours d'ouverture, les exceptions à venir et les jours fériés"""
+        self.calendrier = CalendrierDB(str(self.config_path))
+        
+        jours_ouverture = self.calendrier.get_jours_ouverture()
+        for jour, check in enumerate(self.jours_ouverture_checks):
+            check.blockSignals(True)
+            check.setChecked(jour in jours_ouverture)
+            check.blockSignals(False)
+        
+        aujourd_hui = QDate.currentDate()
+        exceptions = self.calendrier.get_exceptions(
+            aujourd_hui.addYears(-1).toString("yyyy-MM-dd")
+        )
+        self.exceptions_table.setRowCount(len(exceptions))
+        for i, exception in enumerate(exceptions):
+            date_item = QTableWidgetItem(QDate.fromString(exception['date'], "yyyy-MM-dd").toString("dd/MM/yyyy"))
+            date_item.setData(Qt.UserRole, exception['date'])
+            self.exceptions_table.setItem(i, 0, date_item)
+            self.exceptions_table.setItem(
+                i, 1, QTableWidgetItem("Ouverture" if exception['ouvert'] else "Fermeture")
+            )
+            self.exceptions_table.setItem(i, 2, QTableWidgetItem(exception['motif'] or ""))
+        
+        feries = self.calendrier.get_feries(aujourd_hui.year())
+        self.feries_label.setText(
+            f"Jours fériés {aujourd_hui.year()} : "
+            + ", ".join(f"{libelle} ({jour.strftime('%d/%m')})" for jour, libelle in feries.items())
+        )
+    
+    def _enregistrer_jours_ouverture(self):
+        """Enregistre les jours d'ouverture cochés"""
+        jours = [jour for jour, check in enumerate(self.jours_ouverture_checks) if check.isChecked()]
+        if not self.calendrier.definir_jours_ouverture(jours):
+            QMessageBox.warning(self, "Erreur", "Erreur lors de l'enregistrement des jours d'ouverture.")
+            return
+        
+        self.calendrier_modifie.emit()
+    
+    def _ajouter_exception(self):
+        """Déclare une fermeture ou une ouverture exceptionnelle"""
+        date_exception = self.exception_date_input.date().toString("yyyy-MM-dd")
+        ouvert = self.exception_type_combo.currentText() == "Ouverture"
+        if not self.calendrier.ajouter_exception(date_exception, ouvert, self.exception_motif_input.text().strip()):
+            QMessageBox.warning(self, "Erreur", "Erreur lors de l'enregistrement de l'exception.")
+            return
+        
+        self.exception_motif_input.clear()
+        self._charger_calendrier()
+        self.calendrier_modifie.emit()
+    
+    def _supprimer_exception(self):
+        """Supprime l'exception sélectionnée"""
+        ligne = self.exceptions_table.currentRow()
+        if ligne < 0:
+            QMessageBox.information(self, "Aucune sélection", "Sélectionnez une exception à supprimer.")
+            return
+        
+        self.calendrier.supprimer_exception(self.exceptions_table.item(ligne, 0).data(Qt.UserRole))
+        self._charger_calendrier()
+        self.calendrier_modifie.emit()
+    
     def _creer_section_objectifs(self, parent_layout):
         """Crée la section des objectifs Suivis Manager"""
         group = QGroupBox("🎯 Objectifs Suivis Manager")
@@ -198,6 +515,10 @@ class ParametresWidget(QWidget):
     
     def _charger_parametres(self):
         """Charge les paramètres depuis le fichier config.ini"""
+        self._charger_salons()
+        self._afficher_derniere_sauvegarde()
+        self._charger_calendrier()
+        
         if self.config_path.exists():
             self.config.read(self.config_path, encoding='utf-8')
             
@@ -283,6 +604,15 @@ class ParametresWidget(QWidget):
             if not config.has_option('Database', 'path'):
                 config.set('Database', 'path', 'data/mallia.db')
             
+            # Section Sauvegarde
+            if not config.has_section('Sauvegarde'):
+                config.add_section('Sauvegarde')
+            for key, default in [('dossier', 'data/sauvegardes'), ('intervalle_minutes', '60'),
+                                 ('retention', '10'), ('compression', 'gzip'),
+                                 ('pages_par_etape', '256'), ('a_la_sortie', 'true')]:
+                if not config.has_option('Sauvegarde', key):
+                    config.set('Sauvegarde', key, default)
+            
             # Section Salon
             if not config.has_section('Salon'):
                 config.add_section('Salon')
@@ -305,6 +635,13 @@ class ParametresWidget(QWidget):
             with open(self.config_path, 'w', encoding='utf-8') as f:
                 config.write(f)
             
+            # Répercuter l'identité sur le salon actif du registre
+            registre = RegistreSalons(self.config_path)
+            code_actif = registre.get_code_actif()
+            if code_actif:
+                registre.modifier_salon(code_actif, nom_salon, ville_salon)
+                self._charger_salons()
+            
             print(f"Configuration sauvegardée dans {self.config_path.absolute()}")
             
             QMessageBox.information(
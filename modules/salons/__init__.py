@@ -0,0 +1,8 @@
+"""
+Module Salons - Registre multi-salons et consolidation
+"""
+
+from .registre import RegistreSalons, chemin_base_courante, normaliser_code_salon
+from .consolidation import ConsolidationSalons
+
+__all__ = ['RegistreSalons', 'ConsolidationSalons', 'chemin_base_courante', 'normaliser_code_salon']
@@ -0,0 +1,233 @@
+"""
+Consolidation multi-salons : requêtes agrégées sur les bases de tous les salons
+
+Les fichiers des salons sont attachés en lecture seule (ATTACH ... mode=ro) à
+une connexion en mémoire : les agrégats sont calculés en une seule requête
+SQL, sans copier les données.
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+from .registre import RegistreSalons
+
+
+# Nombre maximal de bases attachées par connexion (valeur par défaut de SQLite)
+LIMITE_ATTACH_DEFAUT = 10
+
+
+class ConsolidationSalons:
+    """Classe pour interroger plusieurs salons en une seule passe SQL"""
+    
+    def __init__(self, salons: Optional[List[Dict[str, str]]] = None):
+        """
+        Initialise la consolidation
+        
+        Args:
+            salons: Salons à consolider (par défaut : tous les salons du registre)
+        """
+        if salons is None:
+            registre = RegistreSalons()
+            salons = registre.lister_salons()
+            if not salons:
+                # Mode salon unique : consolider la base courante seule
+                code = registre.get_code_actif() or "salon"
+                salons = [{
+                    'code': code,
+                    'nom': registre.config.get('Salon', 'nom', fallback=''),
+                    'ville': registre.config.get('Salon', 'ville', fallback=''),
+                    'base': registre.chemin_base_active()
+                }]
+        
+        self.salons = [s for s in salons if self._base_existe(s)]
+    
+    def _base_existe(self, salon: Dict[str, str]) -> bool:
+        """Vérifie que le fichier de base du salon existe"""
+        if Path(salon['base']).exists():
+            return True
+        print(f"Base introuvable pour le salon '{salon['code']}': {salon['base']}")
+        return False
+    
+    def _ouvrir(self, salons: List[Dict[str, str]]) -> Tuple[sqlite3.Connection, List[Tuple[str, Dict[str, str]]]]:
+        """
+        Ouvre une connexion en mémoire et attache les bases en lecture seule
+        
+        Returns:
+            Tuple (connexion, liste des couples (alias, salon))
+        """
+        connection = sqlite3.connect("file::memory:", uri=True)
+        connection.row_factory = sqlite3.Row
+        
+        attaches = []
+        for index, salon in enumerate(salons):
+            alias = f"salon_{index}"
+            uri = Path(salon['base']).resolve().as_uri() + "?mode=ro"
+            connection.execute(f"ATTACH DATABASE ? AS {alias}", (uri,))
+            attaches.append((alias, salon))
+        
+        return connection, attaches
+    
+    def _limite_attach(self) -> int:
+        """Nombre maximal de bases attachables sur une connexion"""
+        connection = sqlite3.connect(":memory:")
+        try:
+            if hasattr(connection, 'getlimit'):
+                return connection.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+            return LIMITE_ATTACH_DEFAUT
+        finally:
+            connection.close()
+    
+    def _lots_de_salons(self) -> List[List[Dict[str, str]]]:
+        """
+        Découpe la liste des salons selon la limite d'ATTACH de SQLite
+        
+        Au-delà de la limite (10 par défaut), la requête est exécutée une fois
+        par lot et les lignes sont concaténées.
+        """
+        limite = self._limite_attach()
+        return [self.salons[i:i + limite] for i in range(0, len(self.salons), limite)]
+    
+    def _tables(self, connection: sqlite3.Connection, alias: str) -> set:
+        """Liste les tables présentes dans une base attachée"""
+        rows = connection.execute(f"SELECT name FROM {alias}.sqlite_master WHERE type = 'table'")
+        return {row['name'] for row in rows}
+    
+    def _union_periodes(self, connection: sqlite3.Connection,
+                        attaches: List[Tuple[str, Dict[str, str]]],
+                        annee: int) -> Tuple[str, list]:
+        """Construit l'union des périodes Manager de tous les salons attachés"""
+        parties, params = [], []
+        for alias, salon in attaches:
+            tables = self._tables(connection, alias)
+            if not {'suivis_manager', 'suivis_manager_periodes'} <= tables:
+                continue
+            parties.append(f"""
+                SELECT ? AS salon, sm.annee, sm.mois, p.numero_periode,
+                       p.ca_total, p.nombre_visites
+                FROM {alias}.suivis_manager sm
+                JOIN {alias}.suivis_manager_periodes p ON p.suivi_id = sm.id
+                WHERE sm.annee = ?
+            """)
+            params.extend([salon['code'], annee])
+        
+        if not parties:
+            return "", []
+        return " UNION ALL ".join(parties), params
+    
+    def _union_objectifs(self, connection: sqlite3.Connection,
+                         attaches: List[Tuple[str, Dict[str, str]]],
+                         annee: int) -> Tuple[str, list]:
+        """Construit l'union des objectifs mensuels de tous les salons attachés"""
+        parties, params = [], []
+        for alias, salon in attaches:
+            if 'objectifs_mensuels' not in self._tables(connection, alias):
+                continue
+            parties.append(f"""
+                SELECT ? AS salon, annee, mois, ca_total AS objectif_ca,
+                       nb_clients AS objectif_clients
+                FROM {alias}.objectifs_mensuels
+                WHERE annee = ?
+            """)
+            params.extend([salon['code'], annee])
+        
+        if not parties:
+            return ("SELECT NULL AS salon, NULL AS annee, NULL AS mois, "
+                    "NULL AS objectif_ca, NULL AS objectif_clients WHERE 0"), []
+        return " UNION ALL ".join(parties), params
+    
+    def _requete_mois(self, union_periodes: str, union_objectifs: str) -> str:
+        """
+        Requête des réalisations mensuelles par salon
+        
+        Chaque période porte son propre chiffre : le chiffre du mois est la
+        somme des périodes renseignées.
+        """
+        return f"""
+            WITH periodes AS ({union_periodes}),
+            objectifs AS ({union_objectifs}),
+            mensuel AS (
+                SELECT salon, annee, mois, SUM(ca_total) AS ca_total,
+                       SUM(nombre_visites) AS nombre_visites
+                FROM periodes
+                WHERE ca_total IS NOT NULL
+                GROUP BY salon, annee, mois
+            )
+            SELECT m.salon, m.annee, m.mois, m.ca_total, m.nombre_visites,
+                   o.objectif_ca, o.objectif_clients,
+                   ROUND(100.0 * m.ca_total / NULLIF(o.objectif_ca, 0), 2) AS taux_atteinte_ca,
+                   ROUND(100.0 * m.nombre_visites / NULLIF(o.objectif_clients, 0), 2) AS taux_atteinte_clients
+            FROM mensuel m
+            LEFT JOIN objectifs o
+                   ON o.salon = m.salon AND o.annee = m.annee AND o.mois = m.mois
+        """
+    
+    def _executer(self, annee: int, construire_requete) -> List[Dict[str, Any]]:
+        """Exécute une requête consolidée sur chaque lot de salons"""
+        resultats = []
+        for lot in self._lots_de_salons():
+            connection, attaches = self._ouvrir(lot)
+            try:
+                union_periodes, params_periodes = self._union_periodes(connection, attaches, annee)
+                if not union_periodes:
+                    continue
+                union_objectifs, params_objectifs = self._union_objectifs(connection, attaches, annee)
+                
+                query = construire_requete(self._requete_mois(union_periodes, union_objectifs))
+                # Lecture au fil du curseur, sans liste intermédiaire
+                rows = connection.execute(query, params_periodes + params_objectifs)
+                resultats.extend(dict(row) for row in rows)
+            except sqlite3.Error as e:
+                print(f"Erreur lors de la consolidation des salons: {e}")
+            finally:
+                connection.close()
+        
+        noms = {s['code']: s['nom'] for s in self.salons}
+        for row in resultats:
+            row['nom'] = noms.get(row['salon'], row['salon'])
+        return resultats
+    
+    def get_ca_mensuels(self, annee: int) -> List[Dict[str, Any]]:
+        """
+        Récupère le CA et les visites de chaque mois, par salon, avec les objectifs
+        
+        Args:
+            annee: Année
+        
+        Returns:
+            Liste triée par salon puis mois (salon, mois, ca_total, nombre_visites,
+            objectif_ca, objectif_clients, taux_atteinte_ca, taux_atteinte_clients)
+        """
+        return self._executer(
+            annee,
+            lambda requete_mois: f"SELECT * FROM ({requete_mois}) ORDER BY salon, mois"
+        )
+    
+    def get_synthese_annuelle(self, annee: int) -> List[Dict[str, Any]]:
+        """
+        Récupère le CA cumulé de l'année et l'atteinte des objectifs, par salon
+        
+        Le taux d'atteinte compare le CA des mois renseignés qui ont un
+        objectif à la somme de ces objectifs.
+        
+        Args:
+            annee: Année
+        
+        Returns:
+            Liste triée par CA décroissant (salon, nb_mois, ca_total,
+            nombre_visites, objectif_ca, taux_atteinte_ca)
+        """
+        def construire(requete_mois: str) -> str:
+            return f"""
+                SELECT salon, COUNT(*) AS nb_mois,
+                       SUM(ca_total) AS ca_total,
+                       SUM(nombre_visites) AS nombre_visites,
+                       SUM(objectif_ca) AS objectif_ca,
+                       ROUND(100.0 * SUM(CASE WHEN objectif_ca IS NOT NULL THEN ca_total END)
+                             / NULLIF(SUM(objectif_ca), 0), 2) AS taux_atteinte_ca
+                FROM ({requete_mois})
+                GROUP BY salon
+                ORDER BY ca_total DESC
+            """
+        
+        return self._executer(annee, construire)
@@ -0,0 +1,264 @@
+"""
+Registre des salons : un fichier de base de données SQLite par salon
+
+Le registre est stocké dans config.ini :
+    
+    [Salons]
+    actif = coiff_boe
+    
+    [Salon.coiff_boe]
+    nom = COIFF & CO
+    ville = BOE
+    base = data/mallia.db
+
+La section [Salon] reste celle du salon actif (utilisée par les PDF et les
+paramètres) et [Database] path reste la base par défaut tant qu'aucun salon
+n'est enregistré.
+"""
+
+import configparser
+import re
+import unicodedata
+from pathlib import Path
+from typing import List, Dict, Optional
+
+
+CHEMIN_CONFIG = "config.ini"
+BASE_PAR_DEFAUT = "data/mallia.db"
+DOSSIER_SALONS = "data/salons"
+PREFIXE_SECTION = "Salon."
+
+
+def normaliser_code_salon(texte: str) -> str:
+    """
+    Construit un code de salon utilisable comme nom de section et de fichier
+    
+    Args:
+        texte: Texte libre (ex: "COIFF & CO Boé")
+    
+    Returns:
+        Code en minuscules sans caractères spéciaux (ex: "coiff_co_boe")
+    """
+    texte = unicodedata.normalize('NFKD', texte).encode('ascii', 'ignore').decode('ascii')
+    code = re.sub(r'[^a-z0-9]+', '_', texte.lower())
+    return code.strip('_')
+
+
+class RegistreSalons:
+    """Classe pour gérer la liste des salons et le salon actif"""
+    
+    def __init__(self, config_path: str = CHEMIN_CONFIG):
+        self.config_path = Path(config_path)
+        self.config = configparser.ConfigParser()
+        self._charger()
+    
+    def _charger(self):
+        """Relit le fichier de configuration"""
+        self.config = configparser.ConfigParser()
+        if self.config_path.exists():
+            self.config.read(self.config_path, encoding='utf-8')
+    
+    def _enregistrer(self):
+        """Écrit la configuration sur le disque"""
+        with open(self.config_path, 'w', encoding='utf-8') as f:
+            self.config.write(f)
+    
+    def _section(self, code: str) -> str:
+        """Nom de la section config.ini d'un salon"""
+        return f"{PREFIXE_SECTION}{code}"
+    
+    def lister_salons(self) -> List[Dict[str, str]]:
+        """
+        Liste les salons enregistrés
+        
+        Returns:
+            Liste de dictionnaires {code, nom, ville, base}
+        """
+        salons = []
+        for section in self.config.sections():
+            if section.startswith(PREFIXE_SECTION):
+                salons.append(self.get_salon(section[len(PREFIXE_SECTION):]))
+        return salons
+    
+    def get_salon(self, code: str) -> Optional[Dict[str, str]]:
+        """
+        Récupère un salon par son code
+        
+        Args:
+            code: Code du salon
+        
+        Returns:
+            Dictionnaire {code, nom, ville, base} ou None
+        """
+        section = self._section(code)
+        if not self.config.has_section(section):
+            return None
+        
+        return {
+            'code': code,
+            'nom': self.config.get(section, 'nom', fallback=''),
+            'ville': self.config.get(section, 'ville', fallback=''),
+            'base': self.config.get(section, 'base', fallback=f"{DOSSIER_SALONS}/{code}.db")
+        }
+    
+    def get_code_actif(self) -> Optional[str]:
+        """Retourne le code du salon actif, ou None en mode salon unique"""
+        code = self.config.get('Salons', 'actif', fallback='').strip()
+        if code and self.config.has_section(self._section(code)):
+            return code
+        return None
+    
+    def get_salon_actif(self) -> Optional[Dict[str, str]]:
+        """Retourne le salon actif, ou None en mode salon unique"""
+        code = self.get_code_actif()
+        return self.get_salon(code) if code else None
+    
+    def chemin_base_active(self) -> str:
+        """
+        Retourne le chemin de la base de données du salon actif
+        
+        Returns:
+            Chemin de la base du salon actif, ou [Database] path en mode salon unique
+        """
+        salon = self.get_salon_actif()
+        if salon:
+            return salon['base']
+        return self.config.get('Database', 'path', fallback=BASE_PAR_DEFAUT).strip() or BASE_PAR_DEFAUT
+    
+    def initialiser_depuis_config(self) -> Optional[str]:
+        """
+        Enregistre le salon de la section [Salon] comme premier salon du registre
+        
+        Le salon existant garde sa base actuelle ([Database] path) : aucune
+        donnée n'est déplacée.
+        
+        Returns:
+            Code du salon enregistré, ou None si le registre n'est pas vide
+        """
+        if self.lister_salons():
+            return None
+        
+        nom = self.config.get('Salon', 'nom', fallback='').strip()
+        ville = self.config.get('Salon', 'ville', fallback='').strip()
+        code = normaliser_code_salon(f"{nom} {ville}") or "salon"
+        base = self.config.get('Database', 'path', fallback=BASE_PAR_DEFAUT).strip() or BASE_PAR_DEFAUT
+        
+        self._ecrire_salon(code, nom, ville, base)
+        if not self.config.has_section('Salons'):
+            self.config.add_section('Salons')
+        self.config.set('Salons', 'actif', code)
+        self._enregistrer()
+        return code
+    
+    def ajouter_salon(self, nom: str, ville: str, code: str = None, base: str = None) -> str:
+        """
+        Ajoute un salon au registre avec son propre fichier de base
+        
+        Args:
+            nom: Nom du salon
+            ville: Ville du salon
+            code: Code du salon (déduit du nom et de la ville si absent)
+            base: Chemin de la base (par défaut data/salons/<code>.db)
+        
+        Returns:
+            Code du salon ajouté
+        """
+        # Le salon actuel doit être enregistré avant d'en ajouter un autre
+        self.initialiser_depuis_config()
+        
+        code = code or normaliser_code_salon(f"{nom} {ville}")
+        if not code:
+            raise ValueError("Le code du salon est vide")
+        if self.get_salon(code):
+            raise ValueError(f"Le salon '{code}' existe déjà")
+        
+        self._ecrire_salon(code, nom.strip(), ville.strip(), base or f"{DOSSIER_SALONS}/{code}.db")
+        self._enregistrer()
+        return code
+    
+    def supprimer_salon(self, code: str) -> bool:
+        """
+        Retire un salon du registre (le fichier de base n'est pas supprimé)
+        
+        Args:
+            code: Code du salon
+        
+        Returns:
+            True si succès, False si le salon est inconnu ou actif
+        """
+        if code == self.get_code_actif():
+            return False
+        
+        if not self.config.remove_section(self._section(code)):
+            return False
+        
+        self._enregistrer()
+        return True
+    
+    def modifier_salon(self, code: str, nom: str, ville: str) -> bool:
+        """
+        Modifie le nom et la ville d'un salon enregistré
+        
+        Args:
+            code: Code du salon
+            nom: Nouveau nom
+            ville: Nouvelle ville
+        
+        Returns:
+            True si succès, False si le salon est inconnu
+        """
+        salon = self.get_salon(code)
+        if not salon:
+            return False
+        
+        self._ecrire_salon(code, nom.strip(), ville.strip(), salon['base'])
+        self._enregistrer()
+        return True
+    
+    def definir_salon_actif(self, code: str) -> bool:
+        """
+        Change le salon actif et recopie son identité dans la section [Salon]
+        
+        Les connexions déjà ouvertes restent sur l'ancienne base : le
+        changement prend effet au prochain démarrage.
+        
+        Args:
+            code: Code du salon
+        
+        Returns:
+            True si succès, False si le salon est inconnu
+        """
+        salon = self.get_salon(code)
+        if not salon:
+            return False
+        
+        if not self.config.has_section('Salons'):
+            self.config.add_section('Salons')
+        self.config.set('Salons', 'actif', code)
+        
+        if not self.config.has_section('Salon'):
+            self.config.add_section('Salon')
+        self.config.set('Salon', 'nom', salon['nom'])
+        self.config.set('Salon', 'ville', salon['ville'])
+        
+        self._enregistrer()
+        return True
+    
+    def _ecrire_salon(self, code: str, nom: str, ville: str, base: str):
+        """Écrit la section d'un salon (sans enregistrer le fichier)"""
+        section = self._section(code)
+        if not self.config.has_section(section):
+            self.config.add_section(section)
+        self.config.set(section, 'nom', nom)
+        self.config.set(section, 'ville', ville)
+        self.config.set(section, 'base', base)
+
+
+def chemin_base_courante() -> str:
+    """
+    Retourne le chemin de la base de données du salon actif
+    
+    Returns:
+        Chemin du fichier SQLite à ouvrir par défaut
+    """
+    return RegistreSalons().chemin_base_active()
@@ -0,0 +1,132 @@
+"""
+Interface utilisateur pour la gestion multi-salons
+"""
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QLineEdit,
+    QComboBox, QDialogButtonBox, QMessageBox, QTableWidget,
+    QTableWidgetItem, QHeaderView
+)
+from PySide6.QtCore import Qt
+from datetime import datetime
+
+from .consolidation import ConsolidationSalons
+from modules.suivis_manager.utils import formater_montant, formater_pourcentage
+
+
+class AjouterSalonDialog(QDialog):
+    """Dialog pour ajouter un salon au registre"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Ajouter un salon")
+        self.setModal(True)
+        self.setMinimumWidth(400)
+        
+        layout = QVBoxLayout(self)
+        
+        form_layout = QFormLayout()
+        
+        self.nom_input = QLineEdit()
+        self.nom_input.setPlaceholderText("Ex: Salon Élégance")
+        form_layout.addRow("Nom du salon :", self.nom_input)
+        
+        self.ville_input = QLineEdit()
+        self.ville_input.setPlaceholderText("Ex: Paris")
+        form_layout.addRow("Ville :", self.ville_input)
+        
+        layout.addLayout(form_layout)
+        
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+    
+    def get_data(self):
+        """Récupère les données du formulaire"""
+        return {
+            'nom': self.nom_input.text().strip(),
+            'ville': self.ville_input.text().strip()
+        }
+    
+    def accept(self):
+        """Valide le formulaire"""
+        data = self.get_data()
+        
+        if not data['nom']:
+            QMessageBox.warning(self, "Champ requis", "Le nom du salon est obligatoire.")
+            return
+        
+        if not data['ville']:
+            QMessageBox.warning(self, "Champ requis", "La ville du salon est obligatoire.")
+            return
+        
+        super().accept()
+
+
+class SyntheseSalonsDialog(QDialog):
+    """Dialog affichant le CA et l'atteinte des objectifs de tous les salons"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Synthèse multi-salons")
+        self.setModal(True)
+        self.resize(800, 400)
+        
+        layout = QVBoxLayout(self)
+        
+        # Sélecteur d'année
+        header_layout = QHBoxLayout()
+        header_layout.addWidget(QLabel("Année :"))
+        self.annee_combo = QComboBox()
+        annee_actuelle = datetime.now().year
+        for annee in range(annee_actuelle - 5, annee_actuelle + 1):
+            self.annee_combo.addItem(str(annee))
+        self.annee_combo.setCurrentText(str(annee_actuelle))
+        self.annee_combo.currentIndexChanged.connect(self._charger_donnees)
+        header_layout.addWidget(self.annee_combo)
+        header_layout.addStretch()
+        layout.addLayout(header_layout)
+        
+        # Tableau
+        self.table = QTableWidget()
+        self.table.setColumnCount(6)
+        self.table.setHorizontalHeaderLabels([
+            "Salon", "Mois renseignés", "C.A. réalisé", "Objectif C.A.",
+            "% Atteinte", "Visites"
+        ])
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        for i in range(1, 6):
+            header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
+        layout.addWidget(self.table)
+        
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+        
+        self._charger_donnees()
+    
+    def _charger_donnees(self):
+        """Charge la synthèse de l'année sélectionnée"""
+        annee = int(self.annee_combo.currentText())
+        synthese = ConsolidationSalons().get_synthese_annuelle(annee)
+        
+        self.table.setRowCount(len(synthese))
+        
+        for i, ligne in enumerate(synthese):
+            valeurs = [
+                ligne['nom'],
+                str(ligne['nb_mois']),
+                formater_montant(ligne['ca_total']),
+                formater_montant(ligne['objectif_ca']),
+                formater_pourcentage(ligne['taux_atteinte_ca']),
+                str(ligne['nombre_visites'] or "")
+            ]
+            for col, valeur in enumerate(valeurs):
+                item = QTableWidgetItem(valeur.replace('.', ',') if col in (2, 3, 4) else valeur)
+                if col > 0:
+                    item.setTextAlignment(Qt.AlignCenter)
+                self.table.setItem(i, col, item)
@@ -0,0 +1,7 @@
+"""
+Module Sauvegarde - Sauvegardes à chaud de la base de données
+"""
+
+from .gestionnaire import SauvegardeManager
+
+__all__ = ['SauvegardeManager']
@@ -0,0 +1,215 @@
+"""
+Sauvegardes à chaud de la base de données avec l'API de sauvegarde SQLite
+
+La copie est faite par sqlite3.Connection.backup, par étapes d'un nombre
+limité de pages : l'application peut continuer à écrire pendant la copie, et
+le fichier obtenu est toujours cohérent (contrairement à une copie du
+fichier pendant une écriture).
+"""
+
+import configparser
+import gzip
+import lzma
+import re
+import shutil
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from modules.salons.registre import RegistreSalons
+
+
+COMPRESSIONS = {
+    "gzip": (".gz", gzip.open),
+    "lzma": (".xz", lzma.open),
+    "aucune": ("", None),
+}
+
+
+class SauvegardeManager:
+    """Gère les sauvegardes planifiées, à la sortie, la rotation et la vérification"""
+    
+    def __init__(self, config_path: str = "config.ini", db_path: Optional[str] = None):
+        """
+        Initialise le gestionnaire depuis la section [Sauvegarde] de config.ini
+        
+        Args:
+            config_path: Chemin du fichier de configuration
+            db_path: Base à sauvegarder (par défaut : base du salon actif)
+        """
+        config = configparser.ConfigParser()
+        if Path(config_path).exists():
+            config.read(config_path, encoding='utf-8')
+        
+        registre = RegistreSalons(config_path)
+        self.db_path = Path(db_path or registre.chemin_base_active())
+        self.prefixe = registre.get_code_actif() or self.db_path.stem
+        
+        self.dossier = Path(config.get('Sauvegarde', 'dossier', fallback='data/sauvegardes'))
+        self.intervalle_minutes = config.getint('Sauvegarde', 'intervalle_minutes', fallback=60)
+        self.retention = config.getint('Sauvegarde', 'retention', fallback=10)
+        self.compression = config.get('Sauvegarde', 'compression', fallback='gzip')
+        self.pages_par_etape = config.getint('Sauvegarde', 'pages_par_etape', fallback=256)
+        self.a_la_sortie = config.getboolean('Sauvegarde', 'a_la_sortie', fallback=True)
+        
+        if self.compression not in COMPRESSIONS:
+            print(f"Compression inconnue '{self.compression}', gzip utilisé")
+            self.compression = "gzip"
+        
+        self._verrou = threading.Lock()
+        self._arret = threading.Event()
+        self._planificateur: Optional[threading.Thread] = None
+    
+    def sauvegarder(self) -> Optional[Path]:
+        """
+        Effectue une sauvegarde complète (bloquant)
+        
+        Étapes : copie par l'API de sauvegarde, vérification d'intégrité de
+        la copie, compression puis rotation des anciennes sauvegardes.
+        
+        Returns:
+            Chemin de la sauvegarde créée ou None en cas d'erreur
+        """
+        if not self.db_path.exists():
+            print(f"Aucune base à sauvegarder : {self.db_path}")
+            return None
+        
+        with self._verrou:
+            self.dossier.mkdir(parents=True, exist_ok=True)
+            horodatage = datetime.now().strftime("%Y%m%d_%H%M%S")
+            copie = self.dossier / f"{self.prefixe}_{horodatage}.db"
+            temporaire = copie.with_suffix(".db.tmp")
+            
+            try:
+                self._copier(temporaire)
+                
+                if not self._verifier_integrite(temporaire):
+                    print(f"Sauvegarde corrompue, abandonnée : {temporaire}")
+                    temporaire.unlink(missing_ok=True)
+                    return None
+                
+                destination = self._compresser(temporaire, copie)
+                self._appliquer_retention()
+                print(f"Sauvegarde créée : {destination}")
+                return destination
+            except (sqlite3.Error, OSError) as e:
+                print(f"Erreur lors de la sauvegarde: {e}")
+                temporaire.unlink(missing_ok=True)
+                return None
+    
+    def _copier(self, destination: Path):
+        """Copie la base par étapes de pages_par_etape pages"""
+        source = sqlite3.connect(str(self.db_path))
+        cible = sqlite3.connect(str(destination))
+        try:
+            # Une courte pause entre les étapes laisse la main aux écritures
+            source.backup(cible, pages=self.pages_par_etape, sleep=0.005)
+        finally:
+            cible.close()
+            source.close()
+    
+    def _verifier_integrite(self, chemin: Path) -> bool:
+        """Exécute PRAGMA integrity_check sur la copie"""
+        connection = sqlite3.connect(str(chemin))
+        try:
+            resultat = connection.execute("PRAGMA integrity_check").fetchone()
+            return resultat is not None and resultat[0] == "ok"
+        finally:
+            connection.close()
+    
+    def _compresser(self, temporaire: Path, copie: Path) -> Path:
+        """Compresse la copie vérifiée et renvoie le chemin final"""
+        extension, ouvrir = COMPRESSIONS[self.compression]
+        
+        if ouvrir is None:
+            temporaire.replace(copie)
+            return copie
+        
+        destination = copie.with_name(copie.name + extension)
+        with open(temporaire, "rb") as source, ouvrir(destination, "wb") as cible:
+            shutil.copyfileobj(source, cible, 1024 * 1024)
+        temporaire.unlink()
+        return destination
+    
+    def lister_sauvegardes(self) -> List[Path]:
+        """
+        Liste les sauvegardes du salon, de la plus récente à la plus ancienne
+        
+        Returns:
+            Liste des chemins de sauvegarde
+        """
+        if not self.dossier.exists():
+            return []
+        # Nom exact : le préfixe d'un salon peut commencer celui d'un autre (paris / paris_nord)
+        extensions = "|".join(re.escape(extension) for extension, _ in COMPRESSIONS.values() if extension)
+        modele = re.compile(rf"{re.escape(self.prefixe)}_\d{{8}}_\d{{6}}\.db(?:{extensions})?")
+        sauvegardes = [
+            p for p in self.dossier.glob(f"{self.prefixe}_*.db*")
+            if modele.fullmatch(p.name)
+        ]
+        return sorted(sauvegardes, key=lambda p: p.name, reverse=True)
+    
+    def _appliquer_retention(self):
+        """Supprime les sauvegardes au-delà du nombre à conserver"""
+        if self.retention <= 0:
+            return
+        for ancienne in self.lister_sauvegardes()[self.retention:]:
+            try:
+                ancienne.unlink()
+                print(f"Ancienne sauvegarde supprimée : {ancienne}")
+            except OSError as e:
+                print(f"Impossible de supprimer {ancienne}: {e}")
+    
+    def sauvegarder_en_arriere_plan(self, callback: Optional[Callable[[Optional[Path]], None]] = None,
+                                    daemon: bool = True) -> threading.Thread:
+        """
+        Lance une sauvegarde sur un thread séparé
+        
+        Args:
+            callback: Fonction appelée (depuis le thread) avec le chemin créé ou None
+            daemon: False pour que le processus attende la fin de la sauvegarde
+        
+        Returns:
+            Thread de sauvegarde démarré
+        """
+        def executer():
+            resultat = self.sauvegarder()
+            if callback:
+                callback(resultat)
+        
+        thread = threading.Thread(target=executer, name="mallia-sauvegarde", daemon=daemon)
+        thread.start()
+        return thread
+    
+    def demarrer_planification(self):
+        """Démarre les sauvegardes périodiques (intervalle_minutes, 0 pour désactiver)"""
+        if self.intervalle_minutes <= 0 or self._planificateur:
+            return
+        
+        def boucle():
+            while not self._arret.wait(self.intervalle_minutes * 60):
+                self.sauvegarder()
+        
+        self._arret.clear()
+        self._planificateur = threading.Thread(target=boucle, name="mallia-planification", daemon=True)
+        self._planificateur.start()
+        print(f"Sauvegardes planifiées toutes les {self.intervalle_minutes} minutes")
+    
+    def arreter(self) -> Optional[threading.Thread]:
+        """
+        Arrête la planification et lance la sauvegarde de sortie si configurée
+        
+        La sauvegarde de sortie tourne sur un thread non démon : la fenêtre
+        se ferme immédiatement et le processus attend la fin de la copie.
+        
+        Returns:
+            Thread de la sauvegarde de sortie, ou None
+        """
+        self._arret.set()
+        self._planificateur = None
+        
+        if self.a_la_sortie:
+            return self.sauvegarder_en_arriere_plan(daemon=False)
+        return None
@@ -0,0 +1,120 @@
+"""
+Classement des collaborateurs sur l'atteinte de leurs objectifs du mois
+"""
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
+    QHeaderView, QDialogButtonBox
+)
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QFont
+
+from modules.bdd.executeur_qt import ExecuteurQt
+from modules.objectifs.atteinte import AtteinteObjectifs
+from modules.suivis_manager.utils import formater_montant, formater_pourcentage
+
+
+# (clé, en-tête, format du réalisé et de l'objectif)
+INDICATEURS = [
+    ("ca_prestation", "C.A. Prestation", formater_montant),
+    ("ca_jour", "C.A. /Jour", formater_montant),
+    ("nb_visites", "Visites", lambda valeur: "" if valeur is None else f"{valeur:.0f}"),
+    ("pct_ventes", "% Ventes", formater_pourcentage),
+    ("pct_couleurs", "% Couleurs", formater_pourcentage),
+    ("pct_soins", "% Soins", formater_pourcentage),
+]
+
+
+class ClassementDialog(QDialog):
+    """Dialog du classement de l'équipe sur un mois (atteinte des objectifs individuels)"""
+    
+    def __init__(self, mois: int, annee: int, mois_nom: str, parent=None):
+        """
+        Args:
+            mois: Mois (1-12)
+            annee: Année
+            mois_nom: Nom du mois affiché
+            parent: Widget parent
+        """
+        super().__init__(parent)
+        self.setWindowTitle(f"Classement - {mois_nom} {annee}")
+        self.setModal(True)
+        self.resize(1000, 500)
+        
+        self.atteinte = AtteinteObjectifs()
+        self.executeur = ExecuteurQt(self)
+        
+        layout = QVBoxLayout(self)
+        
+        self.info_label = QLabel("Chargement...")
+        layout.addWidget(self.info_label)
+        
+        self.table = QTableWidget()
+        self.table.setColumnCount(4 + len(INDICATEURS))
+        self.table.setHorizontalHeaderLabels(
+            ["Rang", "Collaborateur", "Ancienneté", "Score"] + [entete for _, entete, _ in INDICATEURS]
+        )
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+        
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+        
+        self.executeur.executer(self._lire_classement, mois, annee, rappel=self._afficher_classement)
+    
+    def _lire_classement(self, mois: int, annee: int) -> dict:
+        """Calcule le classement du mois (thread de la base)"""
+        part_mois = self.atteinte.part_ecoulee(mois, annee)
+        return {
+            'part_mois': part_mois,
+            'classement': self.atteinte.get_classement(mois, annee, part_mois)
+        }
+    
+    def _afficher_classement(self, donnees: dict):
+        """Remplit le tableau avec le classement lu par _lire_classement"""
+        classement = donnees['classement']
+        part_mois = donnees['part_mois']
+        
+        if part_mois < 1:
+            self.info_label.setText(
+                f"Mois en cours : C.A. et visites comparés à {part_mois * 100:.0f} % de l'objectif "
+                "du mois (jours d'ouverture écoulés). Score : moyenne des atteintes (plafonnées à 150 %)."
+            )
+        else:
+            self.info_label.setText("Score : moyenne des atteintes des objectifs (plafonnées à 150 %).")
+        
+        self.table.setRowCount(len(classement))
+        for ligne, collab in enumerate(classement):
+            anciennete = collab['anciennete_mois']
+            valeurs = [
+                str(collab['rang'] or ""),
+                f"{collab['prenom']} {collab['nom']}",
+                f"{anciennete} mois" if anciennete is not None else "",
+                formater_pourcentage(collab['score'])
+            ]
+            for col, valeur in enumerate(valeurs):
+                item = QTableWidgetItem(valeur)
+                if col != 1:
+                    item.setTextAlignment(Qt.AlignCenter)
+                if col == 3:
+                    font = QFont()
+                    font.setBold(True)
+                    item.setFont(font)
+                self.table.setItem(ligne, col, item)
+            
+            for col, (cle, _, formater) in enumerate(INDICATEURS, start=4):
+                atteinte = collab[f'atteinte_{cle}']
+                item = QTableWidgetItem(formater_pourcentage(atteinte))
+                item.setTextAlignment(Qt.AlignCenter)
+                item.setToolTip(
+                    f"Réalisé : {formater(collab[cle]) or '-'}\n"
+                    f"Objectif du mois : {formater(collab[f'objectif_{cle}']) or '-'}"
+                )
+                if atteinte is not None:
+                    item.setForeground(QColor(34, 139, 34) if atteinte >= 100 else QColor(178, 34, 34))
+                self.table.setItem(ligne, col, item)
@@ -2,9 +2,19 @@
 Gestion de la base de données pour le module Suivis Collaborateurs
 """
 
-from modules.bdd import Database
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from modules.bdd import Database, JournalModifications, ecriture_atomique, Collaborateur, Suivi, Periode
+from modules.calendrier import CalendrierDB, appliquer_ca_par_jour_ouvre, deriver_ca_par_jour_periodes
+from modules.collaborateurs.database import CollaborateursDB
+from modules.suivis_manager.utils import bornes_mois, calculer_periodes_mois, grouper_dates_par_periode
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+from itertools import groupby
+import calendar
+
+
+# Valeurs saisies pour une journée (les périodes en sont calculées)
+COLONNES_JOUR = ["ca_prestation", "nombre_visites", "pourcentage_ventes", "pourcentage_couleurs", "pourcentage_soins"]
+COLONNES_PERIODE = ["ca_prestation", "ca_par_jour", "nombre_visites",
+                    "pourcentage_ventes", "pourcentage_couleurs", "pourcentage_soins"]
 
 
 class SuivisCollaborateursDB:
@@ -13,6 +23,10 @@ class SuivisCollaborateursDB:
     def __init__(self):
         self.db = Database()
         self._create_tables()
+        self._migrate_database()
+        self.journal = JournalModifications(self.db, "suivis_collaborateurs")
+        self.collaborateurs = CollaborateursDB()
+        self.calendrier = CalendrierDB()
     
     def _create_tables(self):
         """Crée les tables nécessaires pour le module Suivis Collaborateurs"""
@@ -41,9 +55,24 @@ class SuivisCollaborateursDB:
             "pourcentage_ventes": "REAL",  # %
             "pourcentage_couleurs": "REAL",  # %
             "pourcentage_soins": "REAL",  # %
+            "source": "TEXT DEFAULT 'saisie'",  # saisie (valeurs tapées), jours (calculées des jours)
             "FOREIGN KEY (suivi_id)": "REFERENCES suivis_collaborateurs(id) ON DELETE CASCADE"
         }
         
+        # Table des valeurs par collaborateur et par jour : les périodes en sont la projection
+        jours_table = {
+            "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+            "collaborateur_id": "INTEGER NOT NULL",
+            "date": "TEXT NOT NULL",  # Format YYYY-MM-DD
+            "ca_prestation": "REAL",
+            "nombre_visites": "INTEGER",
+            "pourcentage_ventes": "REAL",  # %
+            "pourcentage_couleurs": "REAL",  # %
+            "pourcentage_soins": "REAL",  # %
+            "source": "TEXT",  # saisie, caisse
+            "FOREIGN KEY (collaborateur_id)": "REFERENCES collaborateurs(id) ON DELETE CASCADE"
+        }
+        
         if not self.db.table_exists("suivis_collaborateurs"):
             self.db.create_table("suivis_collaborateurs", suivis_table)
             print("Table 'suivis_collaborateurs' créée avec succès")
@@ -51,6 +80,46 @@ class SuivisCollaborateursDB:
         if not self.db.table_exists("suivis_collaborateurs_periodes"):
             self.db.create_table("suivis_collaborateurs_periodes", periodes_table)
             print("Table 'suivis_collaborateurs_periodes' créée avec succès")
+        
+        if not self.db.table_exists("suivis_collaborateurs_jours"):
+            self.db.create_table("suivis_collaborateurs_jours", jours_table)
+            print("Table 'suivis_collaborateurs_jours' créée avec succès")
+        
+        # Une ligne par collaborateur et par jour ; les agrégats par période
+        # parcourent l'index par plage de dates
+        self.db.execute_query(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_suivis_collaborateurs_jours_date "
+            "ON suivis_collaborateurs_jours (collaborateur_id, date)"
+        )
+        
+        # Index de la vue équipe (jointure suivis du mois -> périodes), créés
+        # aussi sur les bases existantes
+        self.db.execute_query(
+            "CREATE INDEX IF NOT EXISTS idx_suivis_collaborateurs_mois "
+            "ON suivis_collaborateurs (mois, annee, collaborateur_id)"
+        )
+        self.db.execute_query(
+            "CREATE INDEX IF NOT EXISTS idx_suivis_collaborateurs_periodes_suivi "
+            "ON suivis_collaborateurs_periodes (suivi_id, numero_periode)"
+        )
+    
+    def _migrate_database(self):
+        """Migre la base de données pour ajouter les colonnes manquantes"""
+        colonnes = [col['name'] for col in self.db.get_table_info("suivis_collaborateurs_periodes")]
+        
+        # Ajouter la colonne source si elle n'existe pas
+        if 'source' not in colonnes:
+            self.db.execute_query("ALTER TABLE suivis_collaborateurs_periodes ADD COLUMN source TEXT DEFAULT 'saisie'")
+            # Les périodes qui ont des jours ont été calculées à partir de ces jours
+            self.db.execute_query("""
+                UPDATE suivis_collaborateurs_periodes SET source = 'jours'
+                WHERE id IN (
+                    SELECT p.id FROM suivis_collaborateurs_periodes p
+                    JOIN suivis_collaborateurs s ON s.id = p.suivi_id
+                    JOIN suivis_collaborateurs_jours j ON j.collaborateur_id = s.collaborateur_id AND j.date BETWEEN p.date_debut AND p.date_fin
+                )
+            """)
+            print("Colonne 'source' ajoutée avec succès")
     
     def creer_suivi(self, collaborateur_id: int, mois: int, annee: int) -> Optional[int]:
         """
@@ -69,18 +138,12 @@ class SuivisCollaborateursDB:
         if existing:
             return existing['id']
         
-        query = """
-            INSERT INTO suivis_collaborateurs (collaborateur_id, mois, annee)
-            VALUES (?, ?, ?)
-        """
-        cursor = self.db.execute_query(query, (collaborateur_id, mois, annee))
-        
-        if cursor:
-            return cursor.lastrowid
-        return None
+        return self.journal.inserer("suivis_collaborateurs", {
+            "collaborateur_id": collaborateur_id, "mois": mois, "annee": annee
+        })
     
     def get_suivi_by_collaborateur_mois_annee(self, collaborateur_id: int, 
-                                               mois: int, annee: int) -> Optional[Dict[str, Any]]:
+                                               mois: int, annee: int) -> Optional[Suivi]:
         """
         Récupère un suivi par collaborateur, mois et année
         
@@ -90,15 +153,15 @@ class SuivisCollaborateursDB:
             annee: Année
             
         Returns:
-            Dictionnaire avec les données du suivi ou None
+            Suivi ou None
         """
         query = """
             SELECT * FROM suivis_collaborateurs 
             WHERE collaborateur_id = ? AND mois = ? AND annee = ?
         """
-        return self.db.fetch_one(query, (collaborateur_id, mois, annee))
+        return self.db.fetch_model(Suivi, query, (collaborateur_id, mois, annee))
     
-    def get_periodes_by_suivi_id(self, suivi_id: int) -> List[Dict[str, Any]]:
+    def get_periodes_by_suivi_id(self, suivi_id: int) -> List[Periode]:
         """
         Récupère toutes les périodes d'un suivi
         
@@ -113,8 +176,9 @@ class SuivisCollaborateursDB:
             WHERE suivi_id = ? 
             ORDER BY numero_periode
         """
-        return self.db.fetch_all(query, (suivi_id,))
+        return self.db.fetch_models(Periode, query, (suivi_id,))
     
+    @ecriture_atomique(False)
     def sauvegarder_periode(self, suivi_id: int, numero_periode: int, 
                            date_debut: str, date_fin: str,
                            ca_prestation: Optional[float] = None,
@@ -122,13 +186,30 @@ class SuivisCollaborateursDB:
                            nombre_visites: Optional[int] = None,
                            pourcentage_ventes: Optional[float] = None,
                            pourcentage_couleurs: Optional[float] = None,
-                           pourcentage_soins: Optional[float] = None) -> bool:
+                           pourcentage_soins: Optional[float] = None,
+                           source: str = "saisie") -> bool:
         """
         Sauvegarde ou met à jour une période
         
+        Args:
+            source: Origine des valeurs ('saisie' : tapées dans le tableau,
+                    'jours' : calculées à partir des jours) ; notée seulement
+                    si une valeur change
+        
         Returns:
             True si succès, False sinon
         """
+        valeurs = {
+            "date_debut": date_debut,
+            "date_fin": date_fin,
+            "ca_prestation": ca_prestation,
+            "ca_par_jour": ca_par_jour,
+            "nombre_visites": nombre_visites,
+            "pourcentage_ventes": pourcentage_ventes,
+            "pourcentage_couleurs": pourcentage_couleurs,
+            "pourcentage_soins": pourcentage_soins
+        }
+        
         # Vérifier si la période existe
         query_check = """
             SELECT id FROM suivis_collaborateurs_periodes 
@@ -136,47 +217,29 @@ class SuivisCollaborateursDB:
         """
         existing = self.db.fetch_one(query_check, (suivi_id, numero_periode))
         
-        if existing:
-            # Mise à jour
-            query = """
-                UPDATE suivis_collaborateurs_periodes 
-                SET date_debut = ?, date_fin = ?, ca_prestation = ?, ca_par_jour = ?,
-                    nombre_visites = ?, pourcentage_ventes = ?, 
-                    pourcentage_couleurs = ?, pourcentage_soins = ?
-                WHERE suivi_id = ? AND numero_periode = ?
-            """
-            cursor = self.db.execute_query(query, (
-                date_debut, date_fin, ca_prestation, ca_par_jour,
-                nombre_visites, pourcentage_ventes, pourcentage_couleurs,
-                pourcentage_soins, suivi_id, numero_periode
-            ))
-        else:
-            # Insertion
-            query = """
-                INSERT INTO suivis_collaborateurs_periodes 
-                (suivi_id, numero_periode, date_debut, date_fin, ca_prestation, 
-                 ca_par_jour, nombre_visites, pourcentage_ventes, 
-                 pourcentage_couleurs, pourcentage_soins)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            cursor = self.db.execute_query(query, (
-                suivi_id, numero_periode, date_debut, date_fin, ca_prestation,
-                ca_par_jour, nombre_visites, pourcentage_ventes,
-                pourcentage_couleurs, pourcentage_soins
-            ))
-        
-        # Mettre à jour la date de modification du suivi
-        if cursor:
-            update_query = """
-                UPDATE suivis_collaborateurs 
-                SET updated_at = CURRENT_TIMESTAMP 
-                WHERE id = ?
-            """
-            self.db.execute_query(update_query, (suivi_id,))
-            return True
-        
-        return False
+        with self.journal.lot("Saisie"):
+            if existing:
+                # Mise à jour des seules colonnes modifiées
+                nb_modifiees = self.journal.mettre_a_jour("suivis_collaborateurs_periodes", existing['id'], valeurs)
+                if nb_modifiees:
+                    self.journal.mettre_a_jour("suivis_collaborateurs_periodes", existing['id'], {"source": source})
+            else:
+                # Insertion
+                valeurs.update({"suivi_id": suivi_id, "numero_periode": numero_periode, "source": source})
+                nb_modifiees = 1 if self.journal.inserer("suivis_collaborateurs_periodes", valeurs) else None
+            
+            # Mettre à jour la date de modification du suivi
+            if nb_modifiees:
+                update_query = """
+                    UPDATE suivis_collaborateurs 
+                    SET updated_at = CURRENT_TIMESTAMP 
+                    WHERE id = ?
+                """
+                self.db.execute_query(update_query, (suivi_id,))
+        
+        return nb_modifiees is not None
     
+    @ecriture_atomique(False)
     def supprimer_suivi(self, suivi_id: int) -> bool:
         """
         Supprime un suivi et toutes ses périodes
@@ -187,10 +250,21 @@ class SuivisCollaborateursDB:
         Returns:
             True si succès, False sinon
         """
-        query = "DELETE FROM suivis_collaborateurs WHERE id = ?"
-        cursor = self.db.execute_query(query, (suivi_id,))
-        return cursor is not None
+        suivi = self.db.fetch_one(
+            "SELECT collaborateur_id, mois, annee FROM suivis_collaborateurs WHERE id = ?", (suivi_id,)
+        )
+        
+        # Les clés étrangères ne sont pas activées : supprimer les périodes explicitement
+        with self.journal.lot("Suppression du suivi"):
+            # Les jours du mois aussi, sans quoi le prochain recalcul referait les périodes
+            if suivi and not self.journal.supprimer(
+                    "suivis_collaborateurs_jours", "collaborateur_id = ? AND date BETWEEN ? AND ?",
+                    (suivi['collaborateur_id'],) + bornes_mois(suivi['mois'], suivi['annee'])):
+                return False
+            return (self.journal.supprimer("suivis_collaborateurs_periodes", "suivi_id = ?", (suivi_id,))
+                    and self.journal.supprimer("suivis_collaborateurs", "id = ?", (suivi_id,)))
     
+    @ecriture_atomique(False)
     def supprimer_suivis_mois(self, mois: int, annee: int) -> bool:
         """
         Supprime tous les suivis d'un mois (tous collaborateurs)
@@ -202,18 +276,23 @@ class SuivisCollaborateursDB:
         Returns:
             True si succès, False sinon
         """
-        query = "DELETE FROM suivis_collaborateurs WHERE mois = ? AND annee = ?"
-        cursor = self.db.execute_query(query, (mois, annee))
-        return cursor is not None
+        with self.journal.lot("Réinitialisation du mois"):
+            if not self.journal.supprimer(
+                    "suivis_collaborateurs_jours", "date BETWEEN ? AND ?", bornes_mois(mois, annee)):
+                return False
+            return (self.journal.supprimer(
+                        "suivis_collaborateurs_periodes",
+                        "suivi_id IN (SELECT id FROM suivis_collaborateurs WHERE mois = ? AND annee = ?)",
+                        (mois, annee))
+                    and self.journal.supprimer(
+                        "suivis_collaborateurs", "mois = ? AND annee = ?", (mois, annee)))
     
-    def get_collaborateurs_actifs_mois(self, mois: int, annee: int) -> List[Dict[str, Any]]:
+    def get_collaborateurs_actifs_mois(self, mois: int, annee: int) -> List[Collaborateur]:
         """
         Récupère les collaborateurs actifs pour un mois donné
         
-        Un collaborateur est considéré actif si :
-        - Il est actuellement actif (etat = 'Actif')
-        - OU il était actif durant ce mois (date_inactivation >= dernier jour du mois)
-        - ET sa date d'entrée est <= dernier jour du mois
+        Un collaborateur est considéré actif s'il a une période d'emploi qui
+        couvre au moins un jour du mois (y compris après un départ et un retour).
         
         Args:
             mois: Numéro du mois (1-12)
@@ -222,20 +301,10 @@ class SuivisCollaborateursDB:
         Returns:
             Liste des collaborateurs triés par ordre
         """
-        from datetime import datetime
-        import calendar
-        
-        # Dernier jour du mois sélectionné
         dernier_jour = calendar.monthrange(annee, mois)[1]
-        date_limite = f"{annee}-{mois:02d}-{dernier_jour:02d}"
-        
-        query = """
-            SELECT * FROM collaborateurs 
-            WHERE (etat = 'Actif' OR (etat = 'Inactif' AND date_inactivation >= ?))
-              AND (date_entree IS NULL OR date_entree <= ?)
-            ORDER BY ordre
-        """
-        return self.db.fetch_all(query, (date_limite, date_limite))
+        return self.collaborateurs.get_collaborateurs_actifs_entre(
+            f"{annee}-{mois:02d}-01", f"{annee}-{mois:02d}-{dernier_jour:02d}"
+        )
     
     def get_tous_les_suivis_mois(self, mois: int, annee: int) -> List[Dict[str, Any]]:
         """
@@ -255,4 +324,381 @@ class SuivisCollaborateursDB:
             WHERE sc.mois = ? AND sc.annee = ?
             ORDER BY c.ordre
         """
-        return self.db.fetch_all(query, (mois, annee))
\ No newline at end of file
+        return self.db.fetch_all(query, (mois, annee))
+    
+    def get_grille_mois(self, mois: int, annee: int) -> List[Dict[str, Any]]:
+        """
+        Récupère en une requête les périodes de tous les collaborateurs actifs d'un mois
+        
+        Args:
+            mois: Numéro du mois (1-12)
+            annee: Année
+            
+        Returns:
+            Liste triée par ordre de {'id', 'nom', 'prenom', 'suivi_id',
+            'periodes': {numero_periode: période}} (suivi_id None et périodes
+            vides si le collaborateur n'a pas encore de suivi)
+        """
+        dernier_jour = calendar.monthrange(annee, mois)[1]
+        query = """
+            SELECT c.id, c.nom, c.prenom, s.id AS suivi_id,
+                   p.numero_periode, p.ca_prestation, p.ca_par_jour, p.nombre_visites,
+                   p.pourcentage_ventes, p.pourcentage_couleurs, p.pourcentage_soins
+            FROM collaborateurs c
+            LEFT JOIN suivis_collaborateurs s
+                ON s.collaborateur_id = c.id AND s.mois = ? AND s.annee = ?
+            LEFT JOIN suivis_collaborateurs_periodes p ON p.suivi_id = s.id
+            WHERE c.id IN (
+                SELECT collaborateur_id FROM collaborateurs_periodes_emploi
+                WHERE date_fin >= ? AND date_debut <= ?
+            )
+            ORDER BY c.ordre, c.id, p.numero_periode
+        """
+        lignes = self.db.fetch_iter(query, (
+            mois, annee, f"{annee}-{mois:02d}-01", f"{annee}-{mois:02d}-{dernier_jour:02d}"
+        ))
+        
+        grille = []
+        for _, periodes in groupby(lignes, key=lambda ligne: ligne['id']):
+            premiere = next(periodes)
+            collaborateur = {
+                'id': premiere['id'],
+                'nom': premiere['nom'],
+                'prenom': premiere['prenom'],
+                'suivi_id': premiere['suivi_id'],
+                'periodes': {}
+            }
+            for periode in (premiere, *periodes):
+                if periode['numero_periode'] is not None:
+                    collaborateur['periodes'][periode['numero_periode']] = periode
+            grille.append(collaborateur)
+        return grille
+    
+    def get_analyse_mois(self, mois: int, annee: int,
+                         collaborateur_id: Optional[int] = None) -> Dict[tuple, Dict[str, Any]]:
+        """
+        Calcule les cumuls, évolutions et rangs des collaborateurs pour un mois
+        
+        Tout est calculé par SQLite (fonctions de fenêtrage) dans une seule
+        requête : cumul de chaque collaborateur depuis le début du mois, écart
+        avec sa dernière période renseignée et rang dans l'équipe sur le C.A.
+        prestation de chaque période.
+        
+        Args:
+            mois: Numéro du mois (1-12)
+            annee: Année
+            collaborateur_id: Limiter le résultat à un collaborateur (les rangs
+                              restent calculés sur toute l'équipe)
+            
+        Returns:
+            {(collaborateur_id, numero_periode): {'ca_cumule', 'visites_cumulees',
+            'evolution_ca', 'evolution_visites', 'rang_ca', 'nb_classes'}}
+            (None si la période n'a pas de valeur)
+        """
+        query = """
+            SELECT * FROM (
+                SELECT s.collaborateur_id, p.numero_periode,
+                       CASE WHEN p.ca_prestation IS NOT NULL
+                            THEN SUM(p.ca_prestation) OVER cumul END AS ca_cumule,
+                       CASE WHEN p.nombre_visites IS NOT NULL
+                            THEN SUM(p.nombre_visites) OVER cumul END AS visites_cumulees,
+                       p.ca_prestation - LAG(p.ca_prestation) OVER (
+                           PARTITION BY s.collaborateur_id, p.ca_prestation IS NULL
+                           ORDER BY p.numero_periode
+                       ) AS evolution_ca,
+                       p.nombre_visites - LAG(p.nombre_visites) OVER (
+                           PARTITION BY s.collaborateur_id, p.nombre_visites IS NULL
+                           ORDER BY p.numero_periode
+                       ) AS evolution_visites,
+                       CASE WHEN p.ca_prestation IS NOT NULL
+                            THEN RANK() OVER equipe END AS rang_ca,
+                       COUNT(p.ca_prestation) OVER (PARTITION BY p.numero_periode) AS nb_classes
+                FROM suivis_collaborateurs s
+                JOIN suivis_collaborateurs_periodes p ON p.suivi_id = s.id
+                WHERE s.mois = ? AND s.annee = ?
+                WINDOW ordre AS (PARTITION BY s.collaborateur_id ORDER BY p.numero_periode),
+                       cumul AS (ordre ROWS UNBOUNDED PRECEDING),
+                       equipe AS (PARTITION BY p.numero_periode
+                                  ORDER BY p.ca_prestation IS NULL, p.ca_prestation DESC)
+            )
+            WHERE ? IS NULL OR collaborateur_id = ?
+            ORDER BY collaborateur_id, numero_periode
+        """
+        lignes = self.db.fetch_all(query, (mois, annee, collaborateur_id, collaborateur_id))
+        return {(ligne['collaborateur_id'], ligne['numero_periode']): ligne for ligne in lignes}
+    
+    @ecriture_atomique(False)
+    def sauvegarder_grille(self, mois: int, annee: int, saisies: Dict[int, List[tuple]]) -> bool:
+        """
+        Enregistre les périodes de plusieurs collaborateurs en une seule action annulable
+        
+        Args:
+            mois: Numéro du mois (1-12)
+            annee: Année
+            saisies: {collaborateur_id: [(numero_periode, date_debut, date_fin,
+                      ca_prestation, ca_par_jour, nombre_visites, pourcentage_ventes,
+                      pourcentage_couleurs, pourcentage_soins), ...]}
+            
+        Returns:
+            True si succès, False sinon
+        """
+        with self.journal.lot("Saisie (vue équipe)"):
+            for collaborateur_id, lignes in saisies.items():
+                suivi_id = self.creer_suivi(collaborateur_id, mois, annee)
+                if not suivi_id:
+                    return False
+                
+                for ligne in lignes:
+                    if not self.sauvegarder_periode(suivi_id, *ligne):
+                        return False
+        return True
+    
+    # ========== VALEURS PAR JOUR ==========
+    
+    def get_jours(self, collaborateur_id: int, date_debut: str, date_fin: str) -> List[Dict[str, Any]]:
+        """
+        Récupère les valeurs d'un collaborateur saisies ou importées jour par jour
+        
+        Args:
+            collaborateur_id: ID du collaborateur
+            date_debut: Premier jour (YYYY-MM-DD, inclus)
+            date_fin: Dernier jour (YYYY-MM-DD, inclus)
+            
+        Returns:
+            Liste des jours renseignés, par date
+        """
+        query = """
+            SELECT * FROM suivis_collaborateurs_jours
+            WHERE collaborateur_id = ? AND date BETWEEN ? AND ?
+            ORDER BY date
+        """
+        return self.db.fetch_all(query, (collaborateur_id, date_debut, date_fin))
+    
+    @ecriture_atomique(False)
+    def sauvegarder_jours(self, jours: List[Dict[str, Any]], source: str = "saisie",
+                          remplacer_saisies: bool = False) -> bool:
+        """
+        Enregistre des jours puis recalcule les périodes qui les contiennent
+        
+        Jours et périodes sont écrits en une seule action annulable.
+        
+        Args:
+            jours: Liste de {'collaborateur_id', 'date': 'YYYY-MM-DD', 'ca_prestation',
+                   'nombre_visites', 'pourcentage_ventes', 'pourcentage_couleurs',
+                   'pourcentage_soins'}
+            source: Origine des valeurs ('saisie' ou 'caisse')
+            remplacer_saisies: Recalcule aussi les périodes dont les valeurs
+                               ont été tapées directement (voir recalculer_periodes)
+            
+        Returns:
+            True si succès, False sinon
+        """
+        dates_par_collaborateur: Dict[int, List[str]] = {}
+        with self.journal.lot("Saisie par jour"):
+            for jour in jours:
+                valeurs = {colonne: jour.get(colonne) for colonne in COLONNES_JOUR}
+                valeurs["source"] = source
+                
+                existing = self.db.fetch_one(
+                    "SELECT id FROM suivis_collaborateurs_jours WHERE collaborateur_id = ? AND date = ?",
+                    (jour['collaborateur_id'], jour['date'])
+                )
+                if existing:
+                    resultat = self.journal.mettre_a_jour("suivis_collaborateurs_jours", existing['id'], valeurs)
+                else:
+                    valeurs.update({"collaborateur_id": jour['collaborateur_id'], "date": jour['date']})
+                    resultat = self.journal.inserer("suivis_collaborateurs_jours", valeurs)
+                if resultat is None:
+                    return False
+                dates_par_collaborateur.setdefault(jour['collaborateur_id'], []).append(jour['date'])
+            
+            for collaborateur_id, dates in dates_par_collaborateur.items():
+                if not self.recalculer_periodes(collaborateur_id, dates, remplacer_saisies):
+                    return False
+        return True
+    
+    @ecriture_atomique(False)
+    def remplacer_jours(self, dates: Iterable[str], jours: List[Dict[str, Any]],
+                        source: str = "caisse") -> bool:
+        """
+        Remplace tous les jours des dates données (import de caisse)
+        
+        Les valeurs de ces dates sont d'abord effacées pour tous les
+        collaborateurs : un collaborateur absent d'un export corrigé ne garde
+        pas ses anciennes valeurs. Ses périodes sont recalculées avec les autres.
+        
+        Args:
+            dates: Dates couvertes par l'import (format YYYY-MM-DD)
+            jours: Nouveaux jours, au format de sauvegarder_jours
+            source: Origine des valeurs
+            
+        Returns:
+            True si succès, False sinon
+        """
+        dates = sorted(set(dates))
+        if not dates:
+            return self.sauvegarder_jours(jours, source=source)
+        
+        condition = f"date IN ({', '.join('?' for _ in dates)})"
+        with self.journal.lot("Saisie par jour"):
+            anciens = self.db.fetch_all(
+                f"SELECT collaborateur_id, date FROM suivis_collaborateurs_jours WHERE {condition}", tuple(dates)
+            )
+            if not self.journal.supprimer("suivis_collaborateurs_jours", condition, tuple(dates)):
+                return False
+            if not self.sauvegarder_jours(jours, source=source):
+                return False
+            
+            # Périodes des collaborateurs qui n'ont plus de valeurs ces jours-là
+            nouveaux = {(jour['collaborateur_id'], jour['date']) for jour in jours}
+            retires: Dict[int, List[str]] = {}
+            for ancien in anciens:
+                if (ancien['collaborateur_id'], ancien['date']) not in nouveaux:
+                    retires.setdefault(ancien['collaborateur_id'], []).append(ancien['date'])
+            for collaborateur_id, dates_retirees in retires.items():
+                if not self.recalculer_periodes(collaborateur_id, dates_retirees):
+                    return False
+        return True
+    
+    def get_agregats_jours(self, collaborateur_id: int,
+                           periodes: List[Tuple[int, str, str]]) -> Dict[int, Dict[str, Any]]:
+        """
+        Calcule les valeurs de périodes d'un collaborateur à partir des jours, en une requête
+        
+        Le C.A. /jour est le C.A. rapporté aux jours d'ouverture du calendrier,
+        du début de la période au dernier jour renseigné (moyenne des jours
+        renseignés si aucun n'est ouvert) ; les pourcentages sont pondérés
+        par le nombre de visites de chaque jour.
+        
+        Args:
+            collaborateur_id: ID du collaborateur
+            periodes: Tuples (numero_periode, date_debut, date_fin), dates
+                      au format YYYY-MM-DD (incluses)
+            
+        Returns:
+            {numero_periode: {'ca_prestation', 'ca_par_jour', 'nombre_visites',
+            'pourcentage_ventes', 'pourcentage_couleurs', 'pourcentage_soins'}}
+            (périodes sans aucun jour absentes)
+        """
+        if not periodes:
+            return {}
+        
+        query = f"""
+            WITH periodes (numero_periode, date_debut, date_fin) AS (
+                VALUES {', '.join(['(?, ?, ?)'] * len(periodes))}
+            )
+            SELECT p.numero_periode, p.date_debut, MAX(j.date) AS dernier_jour,
+                   ROUND(SUM(j.ca_prestation), 2) AS ca_prestation,
+                   ROUND(AVG(j.ca_prestation), 2) AS ca_par_jour,
+                   SUM(j.nombre_visites) AS nombre_visites,
+                   ROUND(SUM(j.pourcentage_ventes * j.nombre_visites)
+                         / SUM(CASE WHEN j.pourcentage_ventes IS NOT NULL THEN j.nombre_visites END), 2)
+                       AS pourcentage_ventes,
+                   ROUND(SUM(j.pourcentage_couleurs * j.nombre_visites)
+                         / SUM(CASE WHEN j.pourcentage_couleurs IS NOT NULL THEN j.nombre_visites END), 2)
+                       AS pourcentage_couleurs,
+                   ROUND(SUM(j.pourcentage_soins * j.nombre_visites)
+                         / SUM(CASE WHEN j.pourcentage_soins IS NOT NULL THEN j.nombre_visites END), 2)
+                       AS pourcentage_soins
+            FROM periodes p
+            JOIN suivis_collaborateurs_jours j
+                ON j.collaborateur_id = ? AND j.date BETWEEN p.date_debut AND p.date_fin
+            GROUP BY p.numero_periode
+        """
+        params = tuple(valeur for periode in periodes for valeur in periode) + (collaborateur_id,)
+        lignes = self.db.fetch_all(query, params)
+        appliquer_ca_par_jour_ouvre(self.calendrier, lignes, "ca_prestation")
+        return {ligne['numero_periode']: ligne for ligne in lignes}
+    
+    @ecriture_atomique(None)
+    def deriver_ca_par_jour(self, date_debut: str, date_fin: str) -> Optional[int]:
+        """
+        Recalcule le C.A. /jour des périodes d'un intervalle à partir du calendrier
+        
+        Voir modules.calendrier.deriver_ca_par_jour_periodes (une seule action annulable).
+        
+        Args:
+            date_debut: Premier jour (YYYY-MM-DD, inclus)
+            date_fin: Dernier jour (YYYY-MM-DD, inclus)
+            
+        Returns:
+            Nombre de périodes modifiées ou None en cas d'erreur
+        """
+        return deriver_ca_par_jour_periodes(
+            self.journal, self.calendrier, "suivis_collaborateurs_periodes", "ca_prestation", date_debut, date_fin
+        )
+    
+    @ecriture_atomique(False)
+    def recalculer_periodes(self, collaborateur_id: int, dates: Iterable[str],
+                            remplacer_saisies: bool = False) -> bool:
+        """
+        Recalcule à partir des jours les périodes d'un collaborateur contenant les dates données
+        
+        Une période dont les valeurs ont été tapées directement dans le
+        tableau est conservée : la somme des quelques jours renseignés ne
+        remplace pas un total saisi, sauf demande explicite.
+        
+        Args:
+            collaborateur_id: ID du collaborateur
+            dates: Dates modifiées (format YYYY-MM-DD)
+            remplacer_saisies: Recalcule aussi les périodes tapées directement
+            
+        Returns:
+            True si succès, False sinon
+        """
+        with self.journal.lot("Saisie par jour"):
+            for (mois, annee), numeros in grouper_dates_par_periode(dates).items():
+                periodes = [
+                    (numero, debut.strftime("%Y-%m-%d"), fin.strftime("%Y-%m-%d"))
+                    for numero, (debut, fin) in enumerate(calculer_periodes_mois(mois, annee), start=1)
+                    if numero in numeros
+                ]
+                agregats = self.get_agregats_jours(collaborateur_id, periodes)
+                
+                suivi_id = self.creer_suivi(collaborateur_id, mois, annee)
+                if not suivi_id:
+                    return False
+                
+                saisies = set() if remplacer_saisies else self._periodes_saisies(suivi_id)
+                for numero, debut, fin in periodes:
+                    if numero in saisies:
+                        print(f"Période {numero} de {mois:02d}/{annee} (collaborateur {collaborateur_id}) "
+                              f"saisie directement : total conservé")
+                        continue
+                    valeurs = agregats.get(numero, {})
+                    if not self.sauvegarder_periode(
+                            suivi_id, numero, debut, fin,
+                            **{colonne: valeurs.get(colonne) for colonne in COLONNES_PERIODE},
+                            source="jours"):
+                        return False
+        return True
+    
+    def _periodes_saisies(self, suivi_id: int) -> Set[int]:
+        """Numéros des périodes d'un suivi dont les valeurs ont été tapées directement"""
+        query = f"""
+            SELECT numero_periode FROM suivis_collaborateurs_periodes
+            WHERE suivi_id = ? AND source = 'saisie'
+              AND COALESCE({', '.join(COLONNES_PERIODE)}) IS NOT NULL
+        """
+        return {ligne['numero_periode'] for ligne in self.db.fetch_all(query, (suivi_id,))}
+    
+    def periode_saisie(self, collaborateur_id: int, date_debut: str, date_fin: str) -> bool:
+        """
+        Indique si les valeurs d'une période d'un collaborateur ont été tapées directement
+        
+        Args:
+            collaborateur_id: ID du collaborateur
+            date_debut: Premier jour de la période (YYYY-MM-DD)
+            date_fin: Dernier jour de la période (YYYY-MM-DD)
+            
+        Returns:
+            True si recalculer la période à partir des jours remplacerait un total saisi
+        """
+        query = f"""
+            SELECT 1 FROM suivis_collaborateurs_periodes p
+            JOIN suivis_collaborateurs s ON s.id = p.suivi_id
+            WHERE s.collaborateur_id = ? AND p.date_debut = ? AND p.date_fin = ?
+              AND p.source = 'saisie'
+              AND COALESCE({', '.join(f'p.{colonne}' for colonne in COLONNES_PERIODE)}) IS NOT NULL
+        """
+        return self.db.fetch_one(query, (collaborateur_id, date_debut, date_fin)) is not None
@@ -8,20 +8,38 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
+from modules.suivis_manager.pdf_export import creer_annexe_rapprochement
 from modules.suivis_manager.utils import (
     formater_montant, formater_pourcentage, formater_periode,
-    charger_info_salon
+    formater_evolution, formater_rang, charger_info_salon
 )
 
 
+# Colonnes colorées selon les objectifs : (colonne, clé de la donnée, clé de l'objectif)
+COLONNES_OBJECTIFS = [
+    (1, 'ca_prestation', 'ca_prestation'),
+    (2, 'ca_par_jour', 'ca_jour'),
+    (3, 'nombre_visites', 'nb_visites'),
+    (4, 'pourcentage_ventes', 'pct_ventes'),
+    (5, 'pourcentage_couleurs', 'pct_couleurs'),
+    (6, 'pourcentage_soins', 'pct_soins'),
+]
+
+
 class SuivisCollaborateursPDFExporter:
     """Classe pour exporter les données du Suivis Collaborateurs en PDF"""
     
-    def __init__(self):
+    def __init__(self, objectifs_periodes: List[Dict[str, float]] = None):
+        """
+        Args:
+            objectifs_periodes: Objectifs de chaque période (ObjectifsPeriodes), pour les
+                collaborateurs sans objectifs propres ('objectifs'), None sans coloration
+        """
         self.styles = getSampleStyleSheet()
         self._setup_styles()
+        self.objectifs_periodes = objectifs_periodes or []
     
     def _setup_styles(self):
         """Configure les styles pour le PDF"""
@@ -71,7 +89,8 @@ class SuivisCollaborateursPDFExporter:
     
     def generer_pdf(self, filepath: str, mois: str, annee: int, 
                     periodes_data: List[tuple], 
-                    donnees_collaborateurs: List[Dict[str, Any]]) -> bool:
+                    donnees_collaborateurs: List[Dict[str, Any]],
+                    rapprochement: Optional[List[Dict[str, Any]]] = None) -> bool:
         """
         Génère un PDF avec les données de tous les collaborateurs
         
@@ -81,6 +100,9 @@ class SuivisCollaborateursPDFExporter:
             annee: Année
             periodes_data: Liste des tuples (date_debut, date_fin)
             donnees_collaborateurs: Liste des dictionnaires avec données par collaborateur
+                ('nom', 'prenom', 'donnees', 'analyse', et 'objectifs' de chaque période)
+            rapprochement: Périodes rapprochées avec le suivi manager
+                           (RapprochementSuivis), ajoutées en annexe si fournies
             
         Returns:
             True si succès, False sinon
@@ -123,7 +145,9 @@ class SuivisCollaborateursPDFExporter:
                 elements.append(Paragraph(nom_complet, self.nom_collab_style))
                 
                 # Créer le tableau (filtrer les lignes vides)
-                table_data = self._creer_donnees_tableau_filtrees(periodes_data, collab_data['donnees'])
+                table_data = self._creer_donnees_tableau_filtrees(
+                    periodes_data, collab_data['donnees'], collab_data.get('analyse')
+                )
                 
                 # Si pas de données, ne pas afficher ce collaborateur
                 if len(table_data) <= 1:  # Seulement l'en-tête
@@ -132,16 +156,11 @@ class SuivisCollaborateursPDFExporter:
                 # Largeur totale disponible : 21cm (A4) sans marges
                 largeur_totale = 21*cm
                 
-                # Répartition des colonnes
-                col_widths = [
-                    largeur_totale * 0.25,  # Périodes: 25%
-                    largeur_totale * 0.125, # C.A. Prestation: 12.5%
-                    largeur_totale * 0.125, # C.A. /Jour: 12.5%
-                    largeur_totale * 0.125, # Nb Visites: 12.5%
-                    largeur_totale * 0.125, # % Ventes: 12.5%
-                    largeur_totale * 0.125, # % Couleurs: 12.5%
-                    largeur_totale * 0.125  # % Soins: 12.5%
-                ]
+                # Répartition des colonnes : Périodes 25%, le reste à parts égales
+                # (C.A. Prestation, C.A. /Jour, Nb Visites, % Ventes, % Couleurs,
+                # % Soins, puis C.A. cumulé, Évol. C.A. et Rang avec l'analyse)
+                nb_colonnes = len(table_data[0]) - 1
+                col_widths = [largeur_totale * 0.25] + [largeur_totale * 0.75 / nb_colonnes] * nb_colonnes
                 
                 table = Table(table_data, colWidths=col_widths)
                 
@@ -183,6 +202,8 @@ class SuivisCollaborateursPDFExporter:
                     ('BOTTOMPADDING', (0, 1), (-1, -1), padding),
                 ]
                 
+                style_commands += self._styles_objectifs(collab_data['donnees'], collab_data.get('objectifs'))
+                
                 table.setStyle(TableStyle(style_commands))
                 elements.append(table)
                 
@@ -190,6 +211,8 @@ class SuivisCollaborateursPDFExporter:
                 if idx < len(donnees_collaborateurs) - 1:
                     elements.append(Spacer(1, 0.3*cm))
             
+            elements += creer_annexe_rapprochement(rapprochement, 19*cm, self.titre_style)
+            
             # Générer le PDF
             doc.build(elements)
             
@@ -201,14 +224,52 @@ class SuivisCollaborateursPDFExporter:
             traceback.print_exc()
             return False
     
+    def _styles_objectifs(self, donnees: List[Dict[str, Any]],
+                          objectifs_periodes: Optional[List[Dict[str, Any]]] = None) -> List[tuple]:
+        """
+        Colore les valeurs selon les objectifs de leur période
+        
+        Args:
+            donnees: Données de chaque période (lignes vides comprises)
+            objectifs_periodes: Objectifs du collaborateur pour chaque période,
+                None pour ceux de l'exporteur
+        
+        Returns:
+            Commandes de style (vert gras si l'objectif est atteint, rouge sinon)
+        """
+        if objectifs_periodes is None:
+            objectifs_periodes = self.objectifs_periodes
+        commandes = []
+        ligne_actuelle = 1  # Commence à 1 car 0 est l'en-tête
+        for i, data in enumerate(donnees):
+            # Les lignes vides ne sont pas dans le tableau
+            if not any(data.get(cle) for _, cle, _ in COLONNES_OBJECTIFS):
+                continue
+            
+            objectifs = objectifs_periodes[i] if i < len(objectifs_periodes) else {}
+            for colonne, cle, cle_objectif in COLONNES_OBJECTIFS:
+                valeur, objectif = data.get(cle), objectifs.get(cle_objectif)
+                if not valeur or not objectif:
+                    continue
+                cellule = (colonne, ligne_actuelle)
+                if valeur >= objectif:
+                    commandes.append(('TEXTCOLOR', cellule, cellule, colors.HexColor('#228B22')))
+                    commandes.append(('FONTNAME', cellule, cellule, 'Helvetica-Bold'))
+                else:
+                    commandes.append(('TEXTCOLOR', cellule, cellule, colors.HexColor('#B22222')))
+            ligne_actuelle += 1
+        return commandes
+    
     def _creer_donnees_tableau_filtrees(self, periodes_data: List[tuple], 
-                                        donnees: List[Dict[str, Any]]) -> List[List[str]]:
+                                        donnees: List[Dict[str, Any]],
+                                        analyse: Optional[List[Dict[str, Any]]] = None) -> List[List[str]]:
         """
         Crée les données du tableau pour le PDF en filtrant les lignes vides
         
         Args:
             periodes_data: Liste des tuples (date_debut, date_fin)
             donnees: Liste des dictionnaires de données
+            analyse: Cumuls, évolutions et rangs par période (optionnel)
             
         Returns:
             Liste de listes représentant le tableau
@@ -223,6 +284,8 @@ class SuivisCollaborateursPDFExporter:
             '% Couleurs',
             '% Soins'
         ]]
+        if analyse:
+            data[0] += ['C.A. cumulé', 'Évol. C.A.', 'Rang']
         
         # Premier jour travaillé
         premier_jour_travaille = periodes_data[0][0] if periodes_data else None
@@ -255,6 +318,14 @@ class SuivisCollaborateursPDFExporter:
                 formater_pourcentage(periode_data.get('pourcentage_soins')) if periode_data.get('pourcentage_soins') else ''
             ]
             
+            if analyse:
+                periode_analyse = analyse[i] if i < len(analyse) else {}
+                row += [
+                    formater_montant(periode_analyse.get('ca_cumule')),
+                    formater_evolution(periode_analyse.get('evolution_ca')),
+                    formater_rang(periode_analyse.get('rang_ca'), periode_analyse.get('nb_classes'))
+                ]
+            
             data.append(row)
         
         return data
\ No newline at end of file
@@ -5,22 +5,32 @@ Interface utilisateur pour le module Suivis Collaborateurs
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, 
     QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
-    QMessageBox, QFileDialog, QScrollArea
+    QMessageBox, QFileDialog, QScrollArea, QDialog
 )
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont, QColor
+from PySide6.QtCore import Qt, Signal, QCoreApplication
+from PySide6.QtGui import QFont, QColor, QBrush, QKeySequence, QShortcut, QAction
 from datetime import datetime
 from typing import Optional
 import calendar
 
+from .classement import ClassementDialog
 from .pdf_export import SuivisCollaborateursPDFExporter
 from .database import SuivisCollaborateursDB
 from modules.collaborateurs.database import CollaborateursDB
+from modules.bdd.executeur_qt import ExecuteurQt
+from modules.bdd.autosauvegarde_qt import PlanificateurSauvegarde
+from modules.bdd.cache import CacheLRU
+from modules.objectifs.prorata import ObjectifsPeriodes, OBJECTIFS_COLLABORATEURS
 
 # Réutilisation des utils de suivis_manager
+from modules.suivis_manager.edition import EditionTableau
+from modules.suivis_manager.jours import DetailJoursDialog
+from modules.suivis_manager.rapprochement import RapprochementSuivis, decrire_ecarts
+from modules.suivis_manager.anomalies import DetecteurAnomalies, INDICATEURS
 from modules.suivis_manager.utils import (
     calculer_periodes_mois, formater_periode, formater_montant,
-    formater_pourcentage, charger_info_salon, nettoyer_nom_fichier
+    formater_pourcentage, formater_evolution, formater_rang, charger_info_salon,
+    nettoyer_nom_fichier, mois_voisins
 )
 
 
@@ -40,16 +50,54 @@ def parser_decimal(texte: str) -> Optional[float]:
         return None
 
 
+def creer_item_calcule(texte: str) -> QTableWidgetItem:
+    """Crée une cellule de valeur calculée (non modifiable, grisée)"""
+    item = QTableWidgetItem(texte)
+    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+    item.setTextAlignment(Qt.AlignCenter)
+    item.setForeground(QColor(76, 86, 106))
+    return item
+
+
 class SuivisCollaborateursWidget(QWidget):
     """Widget principal pour le module Suivis Collaborateurs"""
     
+    # Suivis d'un mois enregistrés (mois, annee) : le rapprochement du
+    # Suivi Manager de ce mois est à refaire
+    suivis_enregistres = Signal(int, int)
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.db = SuivisCollaborateursDB()
         self.collab_db = CollaborateursDB()
+        self.executeur = ExecuteurQt(self)  # Accès à la base hors du thread de l'interface
         self.collaborateur_courant = None
+        self.affichage = None  # (collaborateur_id, mois, annee) des données affichées
         self.periodes_dates = []
-        self.donnees_modifiees = False
+        self.objectifs_periodes = []  # Objectifs ramenés à chaque période du mois affiché
+        self.prorata = ObjectifsPeriodes()
+        self.rapprochement = RapprochementSuivis()
+        self.anomalies = DetecteurAnomalies(self.prorata.calendrier)
+        self.references = None  # Historique servant à juger les saisies du mois affiché
+        # Données déjà lues : listes des collaborateurs actifs par (mois, annee)
+        # et données par (collaborateur_id, mois, annee)
+        self.cache_listes = CacheLRU(capacite=12)
+        self.cache = CacheLRU(capacite=64)
+        # Sauvegarde regroupée après un temps calme (et à chaque changement de données)
+        self.autosauvegarde = PlanificateurSauvegarde(
+            "suivis_collaborateurs", self._sauvegarder_donnees_silencieuse, self
+        )
+        
+        # Vue équipe : tous les collaborateurs actifs du mois dans un seul tableau
+        self.grille_affichee = None  # (mois, annee) affichés dans la grille
+        self.grille_periodes = []  # Dates des périodes du mois de la grille
+        self.grille_lignes = []  # (collaborateur_id, numero_periode) de chaque ligne
+        self.grille_objectifs = {}  # {collaborateur_id: objectifs de chaque période du mois de la grille}
+        self.grille_references = None  # Historique servant à juger les saisies de la grille
+        self.grille_modifies = set()  # Collaborateurs modifiés depuis la dernière sauvegarde
+        self.autosauvegarde_grille = PlanificateurSauvegarde(
+            "suivis_collaborateurs_equipe", self._sauvegarder_grille, self
+        )
         
         self._init_ui()
         self._charger_mois_courant()
@@ -119,14 +167,45 @@ class SuivisCollaborateursWidget(QWidget):
         """)
         buttons_layout.addWidget(self.btn_reinitialiser)
         
+        self.btn_annuler = QPushButton("↩️ Annuler")
+        self.btn_annuler.setToolTip("Annuler la dernière modification (Ctrl+Z)")
+        self.btn_annuler.clicked.connect(self._annuler)
+        buttons_layout.addWidget(self.btn_annuler)
+        
+        self.btn_retablir = QPushButton("↪️ Rétablir")
+        self.btn_retablir.setToolTip("Rétablir la modification annulée (Ctrl+Y)")
+        self.btn_retablir.clicked.connect(self._retablir)
+        buttons_layout.addWidget(self.btn_retablir)
+        
+        QShortcut(QKeySequence.Undo, self, self._annuler)
+        QShortcut(QKeySequence.Redo, self, self._retablir)
+        
+        # État de la sauvegarde automatique
+        self.etat_sauvegarde_label = QLabel()
+        self.autosauvegarde.etat_change.connect(self.etat_sauvegarde_label.setText)
+        self.autosauvegarde_grille.etat_change.connect(self.etat_sauvegarde_label.setText)
+        buttons_layout.addWidget(self.etat_sauvegarde_label)
+        
         buttons_layout.addStretch()
         
         # Sélecteur de collaborateur
-        buttons_layout.addWidget(QLabel("Collaborateur :"))
+        self.collaborateur_label = QLabel("Collaborateur :")
+        buttons_layout.addWidget(self.collaborateur_label)
         self.collaborateur_combo = QComboBox()
         self.collaborateur_combo.currentIndexChanged.connect(self._on_collaborateur_change_with_save)
         buttons_layout.addWidget(self.collaborateur_combo)
         
+        self.btn_vue_equipe = QPushButton("👥 Vue équipe")
+        self.btn_vue_equipe.setCheckable(True)
+        self.btn_vue_equipe.setToolTip("Saisir tous les collaborateurs du mois dans un seul tableau")
+        self.btn_vue_equipe.toggled.connect(self._basculer_vue_equipe)
+        buttons_layout.addWidget(self.btn_vue_equipe)
+        
+        self.btn_classement = QPushButton("🏆 Classement")
+        self.btn_classement.setToolTip("Classer l'équipe sur l'atteinte de ses objectifs du mois")
+        self.btn_classement.clicked.connect(self._afficher_classement_mois)
+        buttons_layout.addWidget(self.btn_classement)
+        
         layout.addLayout(buttons_layout)
         
         # Zone du tableau (avec nom du collaborateur)
@@ -142,11 +221,25 @@ class SuivisCollaborateursWidget(QWidget):
         self.nom_collaborateur_label.setFont(nom_font)
         self.tableau_layout.addWidget(self.nom_collaborateur_label)
         
+        # Écarts avec le Suivi Manager du mois (masqué sans écart)
+        self.rapprochement_label = QLabel()
+        self.rapprochement_label.setWordWrap(True)
+        self.rapprochement_label.setStyleSheet(
+            "background-color: #FDEBD0; color: #B22222; border-radius: 6px; padding: 8px;"
+        )
+        self.tableau_layout.addWidget(self.rapprochement_label)
+        self.rapprochement_label.hide()
+        
         # Tableau
         self.table = None
         self._creer_tableau()
         self.tableau_layout.addWidget(self.table)
         
+        # Vue équipe (masquée par défaut)
+        self._creer_grille()
+        self.tableau_layout.addWidget(self.grille)
+        self.grille.hide()
+        
         layout.addWidget(self.tableau_container)
     
     def _creer_tableau(self):
@@ -156,17 +249,19 @@ class SuivisCollaborateursWidget(QWidget):
             self.table.deleteLater()
         
         self.table = QTableWidget()
-        self.table.setColumnCount(7)
+        self.table.setColumnCount(10)
         self.table.setHorizontalHeaderLabels([
             "Périodes", "C.A. Prestation", "C.A. /Jour", "Nombre de Visites",
-            "% Ventes", "% Couleurs", "% Soins"
+            "% Ventes", "% Couleurs", "% Soins",
+            # Colonnes calculées (lecture seule)
+            "C.A. cumulé", "Évolution C.A.", "Rang équipe"
         ])
         
         self.table.verticalHeader().setVisible(False)
         
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
-        for i in range(1, 7):
+        for i in range(1, 10):
             header.setSectionResizeMode(i, QHeaderView.Stretch)
         
         self.table.verticalHeader().setDefaultSectionSize(50)
@@ -191,7 +286,36 @@ class SuivisCollaborateursWidget(QWidget):
         """)
         
         self.table.itemChanged.connect(self._on_item_changed)
-        self.table.currentCellChanged.connect(self._on_cell_exit)
+        self.edition = EditionTableau(self.table, range(1, 7), self._appliquer_edition)
+        
+        # Saisie jour par jour : double-clic sur l'intitulé de la période ou menu contextuel
+        self.table.cellDoubleClicked.connect(self._on_cellule_double_cliquee)
+        action_jours = QAction("📅 Détail par jour", self.table)
+        action_jours.triggered.connect(lambda: self._ouvrir_detail_jours(self.table.currentRow()))
+        self.table.addAction(action_jours)
+    
+    def _creer_grille(self):
+        """Crée le tableau de la vue équipe (collaborateurs × périodes × indicateurs)"""
+        self.grille = QTableWidget()
+        self.grille.setColumnCount(8)
+        self.grille.setHorizontalHeaderLabels([
+            "Collaborateur", "Périodes", "C.A. Prestation", "C.A. /Jour",
+            "Nombre de Visites", "% Ventes", "% Couleurs", "% Soins"
+        ])
+        
+        self.grille.verticalHeader().setVisible(False)
+        
+        header = self.grille.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        for i in range(2, 8):
+            header.setSectionResizeMode(i, QHeaderView.Stretch)
+        
+        self.grille.verticalHeader().setDefaultSectionSize(40)
+        self.grille.setStyleSheet(self.table.styleSheet())
+        
+        self.grille.itemChanged.connect(self._on_grille_item_changed)
+        self.edition_grille = EditionTableau(self.grille, range(2, 8), self._appliquer_edition_grille)
     
     def _charger_mois_courant(self):
         """Charge les données du mois courant"""
@@ -203,30 +327,214 @@ class SuivisCollaborateursWidget(QWidget):
         self.mois_combo.blockSignals(False)
         self.annee_combo.blockSignals(False)
         self._charger_collaborateurs()
+        self._lire_rapprochement(now.month, now.year)
     
     def _on_mois_annee_change_with_save(self):
         """Sauvegarde automatique avant changement de mois/année"""
-        if self.donnees_modifiees:
-            self._sauvegarder_donnees_silencieuse()
-        self._charger_collaborateurs()
+        self._vider_sauvegardes()
+        if self.btn_vue_equipe.isChecked():
+            self._charger_grille()
+        else:
+            self._charger_collaborateurs()
+        self._lire_rapprochement(self.mois_combo.currentIndex() + 1, int(self.annee_combo.currentText()))
+    
+    def _lire_rapprochement(self, mois: int, annee: int):
+        """Rapproche le mois du Suivi Manager puis affiche ses écarts"""
+        self.executeur.executer(
+            self.rapprochement.rapprocher_mois, mois, annee,
+            rappel=lambda rapprochement: self._afficher_rapprochement(mois, annee, rapprochement),
+            canal="rapprochement"
+        )
+    
+    def _afficher_rapprochement(self, mois: int, annee: int, rapprochement: dict):
+        """
+        Affiche les périodes du mois dont la somme de l'équipe s'écarte du Suivi Manager
+        
+        Args:
+            mois: Mois rapproché (1-12)
+            annee: Année
+            rapprochement: Résultat de rapprocher_mois {numero_periode: valeurs}
+        """
+        if (self.mois_combo.currentIndex() + 1, int(self.annee_combo.currentText())) != (mois, annee):
+            return
+        
+        messages = []
+        for ligne in rapprochement.values():
+            ecarts = decrire_ecarts(ligne)
+            if ecarts:
+                debut = datetime.strptime(ligne['date_debut'], "%Y-%m-%d").strftime("%d/%m")
+                fin = datetime.strptime(ligne['date_fin'], "%Y-%m-%d").strftime("%d/%m")
+                messages.append(f"Période {ligne['numero_periode']} ({debut} - {fin}) : " + " ; ".join(ecarts))
+        
+        self.rapprochement_label.setText(
+            "⚠️ Écarts avec le Suivi Manager :\n" + "\n".join(messages) if messages else ""
+        )
+        self.rapprochement_label.setVisible(bool(messages))
+    
+    def actualiser_rapprochement(self, mois: int, annee: int):
+        """
+        Refait le rapprochement d'un mois dont le Suivi Manager a été enregistré
+        
+        Args:
+            mois: Mois (1-12)
+            annee: Année
+        """
+        if (self.mois_combo.currentIndex() + 1, int(self.annee_combo.currentText())) == (mois, annee):
+            self._lire_rapprochement(mois, annee)
+    
+    def _suivis_modifies(self, mois: int, annee: int):
+        """Refait le rapprochement d'un mois enregistré, ici et dans le Suivi Manager"""
+        self.actualiser_rapprochement(mois, annee)
+        self.suivis_enregistres.emit(mois, annee)
+    
+    def _vider_sauvegardes(self):
+        """Enregistre tout de suite les saisies en attente (tableau et vue équipe)"""
+        self.autosauvegarde.vider()
+        self.autosauvegarde_grille.vider()
+    
+    def _basculer_vue_equipe(self, active: bool):
+        """Passe du tableau d'un collaborateur à la vue équipe, et inversement"""
+        self._vider_sauvegardes()
+        
+        self.collaborateur_label.setVisible(not active)
+        self.collaborateur_combo.setVisible(not active)
+        self.nom_collaborateur_label.setVisible(not active)
+        self.table.setVisible(not active)
+        self.grille.setVisible(active)
+        
+        if active:
+            self._charger_grille()
+        else:
+            self._charger_collaborateurs()
+    
+    def _afficher_classement_mois(self):
+        """Ouvre le classement du mois sélectionné (données enregistrées)"""
+        mois = self.mois_combo.currentIndex() + 1
+        annee = int(self.annee_combo.currentText())
+        ClassementDialog(mois, annee, self.mois_combo.itemText(mois - 1), self).exec()
+    
+    def _charger_grille(self):
+        """Charge la vue équipe du mois sélectionné (une seule requête)"""
+        mois = self.mois_combo.currentIndex() + 1
+        annee = int(self.annee_combo.currentText())
+        
+        self.grille.setEnabled(False)
+        self.executeur.executer(
+            self._lire_grille, mois, annee,
+            rappel=self._afficher_grille, canal="chargement"
+        )
+    
+    def _lire_grille(self, mois: int, annee: int) -> dict:
+        """Lit les périodes de tous les collaborateurs actifs du mois (thread de la base)"""
+        return {
+            'mois': mois,
+            'annee': annee,
+            'equipe': self.db.get_grille_mois(mois, annee),
+            'objectifs_periodes': self.prorata.get_objectifs_equipe(mois, annee),
+            'references': self.anomalies.get_references('collaborateurs', mois, annee),
+            'historique': self._lire_historique()
+        }
+    
+    def _afficher_grille(self, donnees: dict):
+        """Remplit la vue équipe avec les données lues par _lire_grille"""
+        mois, annee = donnees['mois'], donnees['annee']
+        periodes_dates = calculer_periodes_mois(mois, annee)
+        premier_jour_travaille = periodes_dates[0][0] if periodes_dates else None
+        nb_periodes = len(periodes_dates)
+        
+        self.grille_affichee = (mois, annee)
+        self.grille_periodes = periodes_dates
+        self.grille_lignes = []
+        self.grille_objectifs = donnees['objectifs_periodes']
+        self.grille_references = donnees['references']
+        self.grille_modifies = set()
+        
+        self.grille.blockSignals(True)
+        self.grille.clearSpans()
+        self.grille.setRowCount(len(donnees['equipe']) * nb_periodes)
+        
+        for k, collab in enumerate(donnees['equipe']):
+            debut = k * nb_periodes
+            objectifs_collab = self.grille_objectifs.get(collab['id'], [])
+            
+            # Nom du collaborateur sur toutes ses lignes
+            nom_item = QTableWidgetItem(f"{collab['prenom']} {collab['nom']}")
+            nom_item.setFlags(nom_item.flags() & ~Qt.ItemIsEditable)
+            font = nom_item.font()
+            font.setBold(True)
+            nom_item.setFont(font)
+            self.grille.setItem(debut, 0, nom_item)
+            if nb_periodes > 1:
+                self.grille.setSpan(debut, 0, nb_periodes, 1)
+            
+            for i, (date_debut, date_fin) in enumerate(periodes_dates):
+                self.grille.setItem(
+                    debut + i, 1, self._creer_item_periode(date_debut, date_fin, premier_jour_travaille)
+                )
+                self.grille_lignes.append((collab['id'], i + 1))
+                self._remplir_ligne(debut + i, collab['periodes'].get(i + 1, {}), self.grille, decalage=1,
+                                    objectifs=objectifs_collab[i] if i < len(objectifs_collab) else {})
+        
+        self.grille.blockSignals(False)
+        self._appliquer_historique(donnees['historique'])
+        self.grille.setEnabled(True)
+        
+        self.autosauvegarde_grille.definir_contexte(self.grille_affichee)
+        self._proposer_recuperation(
+            f"la vue équipe ({self.mois_combo.itemText(mois - 1)} {annee})",
+            self.autosauvegarde_grille, self.grille
+        )
     
     def _charger_collaborateurs(self):
         """Charge la liste des collaborateurs actifs pour le mois sélectionné"""
         mois = self.mois_combo.currentIndex() + 1
         annee = int(self.annee_combo.currentText())
         
-        self.periodes_dates = calculer_periodes_mois(mois, annee)
+        # Mois déjà lu : affichage immédiat, la lecture en cours est abandonnée
+        collaborateurs = self.cache_listes.get((mois, annee))
+        if collaborateurs is not None:
+            self.executeur.annuler("chargement")
+            self._afficher_collaborateurs(
+                {'mois': mois, 'annee': annee, 'collaborateurs': collaborateurs}
+            )
+            return
         
-        collaborateurs = self.db.get_collaborateurs_actifs_mois(mois, annee)
+        # Lecture sur le thread de la base ; un changement de mois rapide
+        # remplace la lecture précédente. Saisie verrouillée d'ici là.
+        self.collaborateur_combo.setEnabled(False)
+        self.table.setEnabled(False)
+        self.executeur.executer(
+            self._lire_collaborateurs, mois, annee,
+            rappel=self._afficher_collaborateurs, canal="chargement"
+        )
+    
+    def _lire_collaborateurs(self, mois: int, annee: int) -> dict:
+        """Lit les collaborateurs actifs du mois (thread de la base)"""
+        return {
+            'mois': mois,
+            'annee': annee,
+            'collaborateurs': self.db.get_collaborateurs_actifs_mois(mois, annee),
+            'historique': self._lire_historique()
+        }
+    
+    def _afficher_collaborateurs(self, donnees: dict):
+        """Remplit la liste des collaborateurs lue par _lire_collaborateurs (ou en cache)"""
+        collaborateurs = donnees['collaborateurs']
+        self.cache_listes.mettre((donnees['mois'], donnees['annee']), collaborateurs)
         
         self.collaborateur_combo.blockSignals(True)
+        selection = self.collaborateur_combo.currentData()
         self.collaborateur_combo.clear()
         
         if not collaborateurs:
             self.collaborateur_combo.addItem("Aucun collaborateur actif")
             self.collaborateur_combo.setEnabled(False)
             self.nom_collaborateur_label.setText("")
+            self.collaborateur_courant = None
+            self.affichage = None
+            self.autosauvegarde.definir_contexte(None)
             self._vider_tableau()
+            self.table.setEnabled(True)
         else:
             self.collaborateur_combo.setEnabled(True)
             for collab in collaborateurs:
@@ -235,15 +543,19 @@ class SuivisCollaborateursWidget(QWidget):
                     collab['id']
                 )
             
+            # Le collaborateur affiché reste sélectionné s'il est toujours actif
+            index = self.collaborateur_combo.findData(selection)
+            if index >= 0:
+                self.collaborateur_combo.setCurrentIndex(index)
             self._charger_donnees_collaborateur()
         
         self.collaborateur_combo.blockSignals(False)
-        self.donnees_modifiees = False
+        if 'historique' in donnees:
+            self._appliquer_historique(donnees['historique'])
     
     def _on_collaborateur_change_with_save(self):
         """Sauvegarde automatique avant changement de collaborateur"""
-        if self.donnees_modifiees:
-            self._sauvegarder_donnees_silencieuse()
+        self._vider_sauvegardes()
         self._on_collaborateur_change()
     
     def _on_collaborateur_change(self):
@@ -263,25 +575,166 @@ class SuivisCollaborateursWidget(QWidget):
         mois = self.mois_combo.currentIndex() + 1
         annee = int(self.annee_combo.currentText())
         
-        collaborateur = self.collab_db.get_collaborateur(collaborateur_id)
+        donnees = self.cache.get((collaborateur_id, mois, annee))
+        if donnees is not None:
+            self.executeur.annuler("chargement")
+            self._afficher_donnees_collaborateur(donnees)
+            return
+        
+        self.table.setEnabled(False)
+        self.executeur.executer(
+            self._lire_donnees_collaborateur, collaborateur_id, mois, annee,
+            rappel=self._afficher_donnees_collaborateur, canal="chargement"
+        )
+    
+    def _lire_donnees_collaborateur(self, collaborateur_id: int, mois: int, annee: int) -> dict:
+        """Lit le suivi et les périodes d'un collaborateur pour un mois (thread de la base)"""
+        suivi = self.db.get_suivi_by_collaborateur_mois_annee(collaborateur_id, mois, annee)
+        return {
+            'affichage': (collaborateur_id, mois, annee),
+            'collaborateur': self.collab_db.get_collaborateur(collaborateur_id),
+            'periodes': self.db.get_periodes_by_suivi_id(suivi['id']) if suivi else [],
+            'analyse': self.db.get_analyse_mois(mois, annee, collaborateur_id),
+            'objectifs_periodes': self.prorata.get_objectifs_collaborateurs(mois, annee, collaborateur_id),
+            'references': self.anomalies.get_references('collaborateurs', mois, annee),
+            'historique': self._lire_historique()
+        }
+    
+    def _mettre_en_cache(self, donnees: dict):
+        """Conserve les données lues d'un collaborateur (sans l'état annuler/rétablir)"""
+        self.cache.mettre(
+            donnees['affichage'],
+            {cle: valeur for cle, valeur in donnees.items() if cle != 'historique'}
+        )
+    
+    def _lire_mois_voisin(self, mois: int, annee: int) -> dict:
+        """
+        Lit la liste des collaborateurs d'un mois et les données du premier,
+        affiché à l'arrivée sur ce mois (thread de la base)
+        """
+        collaborateurs = self.db.get_collaborateurs_actifs_mois(mois, annee)
+        premier = None
+        if collaborateurs:
+            premier = self._lire_donnees_collaborateur(collaborateurs[0]['id'], mois, annee)
+        
+        return {
+            'mois': mois,
+            'annee': annee,
+            'collaborateurs': collaborateurs,
+            'premier': premier
+        }
+    
+    def _ranger_mois_voisin(self, resultat: dict):
+        """Met en cache un mois lu par _lire_mois_voisin"""
+        self.cache_listes.mettre((resultat['mois'], resultat['annee']), resultat['collaborateurs'])
+        if resultat['premier']:
+            self._mettre_en_cache(resultat['premier'])
+    
+    def _precharger(self, collaborateur_id: int, mois: int, annee: int):
+        """Lit en arrière-plan le collaborateur suivant, le mois précédent et le mois suivant"""
+        index_suivant = self.collaborateur_combo.currentIndex() + 1
+        if index_suivant < self.collaborateur_combo.count():
+            suivant_id = self.collaborateur_combo.itemData(index_suivant)
+            if suivant_id and (suivant_id, mois, annee) not in self.cache:
+                self.executeur.executer(
+                    self._lire_donnees_collaborateur, suivant_id, mois, annee,
+                    rappel=self._mettre_en_cache, canal="prechargement_collaborateur"
+                )
+        
+        for canal, (mois_voisin, annee_voisine) in zip(
+            ("prechargement_precedent", "prechargement_suivant"), mois_voisins(mois, annee)
+        ):
+            if (mois_voisin, annee_voisine) not in self.cache_listes:
+                self.executeur.executer(
+                    self._lire_mois_voisin, mois_voisin, annee_voisine,
+                    rappel=self._ranger_mois_voisin, canal=canal
+                )
+    
+    def invalider_cache(self):
+        """
+        Oublie les données déjà lues et relit la vue affichée
+        
+        Appelé quand les données ont changé hors de l'écran (collaborateurs
+        modifiés dans un autre écran, périodes importées de la caisse).
+        """
+        self._vider_sauvegardes()
+        self.cache_listes.vider()
+        self.cache.vider()
+        if self.btn_vue_equipe.isChecked():
+            self._charger_grille()
+        else:
+            self._charger_collaborateurs()
+    
+    def _afficher_donnees_collaborateur(self, donnees: dict):
+        """Affiche les données lues par _lire_donnees_collaborateur (ou en cache)"""
+        self.table.setEnabled(True)
+        collaborateur = donnees['collaborateur']
         if not collaborateur:
             return
         
+        _, mois, annee = donnees['affichage']
         self.collaborateur_courant = collaborateur
+        self.affichage = donnees['affichage']
+        self.periodes_dates = calculer_periodes_mois(mois, annee)
+        self.objectifs_periodes = donnees['objectifs_periodes']
+        self.references = donnees['references']
         
         self.nom_collaborateur_label.setText(
             f"{collaborateur['prenom']} {collaborateur['nom']}"
         )
         
-        suivi = self.db.get_suivi_by_collaborateur_mois_annee(collaborateur_id, mois, annee)
-        
-        if suivi:
-            periodes_data = self.db.get_periodes_by_suivi_id(suivi['id'])
+        self._remplir_tableau(donnees['periodes'])
+        self._remplir_analyse(donnees['analyse'])
+        if 'historique' in donnees:
+            self._mettre_en_cache(donnees)
+            self._appliquer_historique(donnees['historique'])
         else:
-            periodes_data = []
+            self._mettre_a_jour_historique()
+        self._precharger(*self.affichage)
         
-        self._remplir_tableau(periodes_data)
-        self.donnees_modifiees = False
+        self.autosauvegarde.definir_contexte(self.affichage)
+        self._proposer_recuperation(
+            f"{collaborateur['prenom']} {collaborateur['nom']} "
+            f"({self.mois_combo.itemText(mois - 1)} {annee})"
+        )
+    
+    def _proposer_recuperation(self, libelle: str, planificateur: Optional[PlanificateurSauvegarde] = None,
+                               table: Optional[QTableWidget] = None):
+        """
+        Propose de restaurer les saisies perdues lors d'un arrêt inattendu
+        
+        Args:
+            libelle: Description des données affichées (ex: "Julie Martin (Mars 2025)")
+            planificateur: Sauvegarde automatique concernée (par défaut : tableau)
+            table: Tableau à compléter (par défaut : tableau du collaborateur)
+        """
+        planificateur = planificateur or self.autosauvegarde
+        if table is None:
+            table = self.table
+        
+        cellules = planificateur.recuperer()
+        if not cellules:
+            return
+        
+        reply = QMessageBox.question(
+            self, "Saisies non enregistrées",
+            f"Des saisies de {libelle} n'ont pas été enregistrées avant l'arrêt "
+            f"de l'application.\n\nVoulez-vous les restaurer ?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        
+        if reply != QMessageBox.Yes:
+            planificateur.abandonner_recuperation()
+            return
+        
+        # Chaque cellule restaurée repasse par _on_item_changed (mise en forme, sauvegarde)
+        for (ligne, colonne), texte in cellules.items():
+            if ligne < table.rowCount():
+                item = table.item(ligne, colonne)
+                if item is None:
+                    item = QTableWidgetItem()
+                    table.setItem(ligne, colonne, item)
+                item.setText(texte)
     
     def _remplir_tableau(self, periodes_data: list):
         """Remplit le tableau avec les données"""
@@ -296,53 +749,172 @@ class SuivisCollaborateursWidget(QWidget):
         for i, (date_debut, date_fin) in enumerate(self.periodes_dates):
             numero_periode = i + 1
             
-            periode_item = QTableWidgetItem(formater_periode(date_debut, date_fin, premier_jour_travaille))
-            periode_item.setFlags(periode_item.flags() & ~Qt.ItemIsEditable)
-            periode_item.setBackground(Qt.lightGray)
-            font = periode_item.font()
-            font.setBold(True)
-            periode_item.setFont(font)
-            self.table.setItem(i, 0, periode_item)
-            
-            data = data_dict.get(numero_periode, {})
-            
-            # C.A. Prestation
-            ca_prestation = data.get('ca_prestation')
-            ca_prestation_item = QTableWidgetItem(normaliser_decimal(formater_montant(ca_prestation)) if ca_prestation else "")
-            ca_prestation_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 1, ca_prestation_item)
-            
-            # C.A. /Jour
-            ca_jour = data.get('ca_par_jour')
-            ca_jour_item = QTableWidgetItem(normaliser_decimal(formater_montant(ca_jour)) if ca_jour else "")
-            ca_jour_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 2, ca_jour_item)
+            self.table.setItem(i, 0, self._creer_item_periode(date_debut, date_fin, premier_jour_travaille))
             
-            # Nombre de Visites (peut avoir des décimales)
-            nb_visites = data.get('nombre_visites')
-            nb_visites_str = str(nb_visites).replace('.', ',') if nb_visites else ""
-            nb_visites_item = QTableWidgetItem(nb_visites_str)
-            nb_visites_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 3, nb_visites_item)
-            
-            # % Ventes
-            pct_ventes = data.get('pourcentage_ventes')
-            pct_ventes_item = QTableWidgetItem(normaliser_decimal(formater_pourcentage(pct_ventes)) if pct_ventes else "")
-            pct_ventes_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 4, pct_ventes_item)
+            self._remplir_ligne(i, data_dict.get(numero_periode, {}), objectifs=self._objectifs_ligne(self.table, i))
+        
+        self.table.blockSignals(False)
+    
+    def _creer_item_periode(self, date_debut: datetime, date_fin: datetime,
+                            premier_jour_travaille: datetime) -> QTableWidgetItem:
+        """Crée la cellule (non modifiable) d'intitulé d'une période"""
+        periode_item = QTableWidgetItem(formater_periode(date_debut, date_fin, premier_jour_travaille))
+        periode_item.setFlags(periode_item.flags() & ~Qt.ItemIsEditable)
+        periode_item.setBackground(Qt.lightGray)
+        font = periode_item.font()
+        font.setBold(True)
+        periode_item.setFont(font)
+        return periode_item
+    
+    def _appliquer_couleur_objectif(self, item: QTableWidgetItem, valeur: Optional[float],
+                                     objectif: Optional[float]):
+        """Applique la couleur à un item en fonction de l'objectif"""
+        if valeur is None or objectif is None:
+            return
+        
+        font = item.font()
+        font.setBold(valeur >= objectif)
+        item.setFont(font)
+        item.setForeground(QColor(34, 139, 34) if valeur >= objectif else QColor(178, 34, 34))
+    
+    def _objectifs_ligne(self, table: QTableWidget, ligne: int) -> dict:
+        """Objectifs de la période d'une ligne du tableau ou de la vue équipe"""
+        if table is self.grille:
+            if ligne >= len(self.grille_lignes):
+                return {}
+            collaborateur_id, numero_periode = self.grille_lignes[ligne]
+            objectifs, i = self.grille_objectifs.get(collaborateur_id, []), numero_periode - 1
+        else:
+            objectifs, i = self.objectifs_periodes, ligne
+        return objectifs[i] if 0 <= i < len(objectifs) else {}
+    
+    def _remplir_ligne(self, i: int, data: dict, table: Optional[QTableWidget] = None, decalage: int = 0,
+                       objectifs: Optional[dict] = None):
+        """
+        Remplit les cellules de saisie d'une ligne du tableau
+        
+        Args:
+            i: Ligne à remplir
+            data: Valeurs de la période
+            table: Tableau à remplir (par défaut : tableau du collaborateur)
+            decalage: Colonnes avant les indicateurs en plus de la colonne Périodes
+            objectifs: Objectifs de la période (ObjectifsPeriodes), None sans coloration
+        """
+        if table is None:
+            table = self.table
+        objectifs = objectifs or {}
+        
+        # C.A. Prestation
+        ca_prestation = data.get('ca_prestation')
+        ca_prestation_item = QTableWidgetItem(normaliser_decimal(formater_montant(ca_prestation)) if ca_prestation else "")
+        ca_prestation_item.setTextAlignment(Qt.AlignCenter)
+        self._appliquer_couleur_objectif(ca_prestation_item, ca_prestation, objectifs.get('ca_prestation'))
+        table.setItem(i, 1 + decalage, ca_prestation_item)
+        
+        # C.A. /Jour
+        ca_jour = data.get('ca_par_jour')
+        ca_jour_item = QTableWidgetItem(normaliser_decimal(formater_montant(ca_jour)) if ca_jour else "")
+        ca_jour_item.setTextAlignment(Qt.AlignCenter)
+        self._appliquer_couleur_objectif(ca_jour_item, ca_jour, objectifs.get('ca_jour'))
+        table.setItem(i, 2 + decalage, ca_jour_item)
+        
+        # Nombre de Visites (peut avoir des décimales)
+        nb_visites = data.get('nombre_visites')
+        nb_visites_str = str(nb_visites).replace('.', ',') if nb_visites else ""
+        nb_visites_item = QTableWidgetItem(nb_visites_str)
+        nb_visites_item.setTextAlignment(Qt.AlignCenter)
+        self._appliquer_couleur_objectif(nb_visites_item, nb_visites, objectifs.get('nb_visites'))
+        table.setItem(i, 3 + decalage, nb_visites_item)
+        
+        # % Ventes
+        pct_ventes = data.get('pourcentage_ventes')
+        pct_ventes_item = QTableWidgetItem(normaliser_decimal(formater_pourcentage(pct_ventes)) if pct_ventes else "")
+        pct_ventes_item.setTextAlignment(Qt.AlignCenter)
+        self._appliquer_couleur_objectif(pct_ventes_item, pct_ventes, objectifs.get('pct_ventes'))
+        table.setItem(i, 4 + decalage, pct_ventes_item)
+        
+        # % Couleurs
+        pct_couleurs = data.get('pourcentage_couleurs')
+        pct_couleurs_item = QTableWidgetItem(normaliser_decimal(formater_pourcentage(pct_couleurs)) if pct_couleurs else "")
+        pct_couleurs_item.setTextAlignment(Qt.AlignCenter)
+        self._appliquer_couleur_objectif(pct_couleurs_item, pct_couleurs, objectifs.get('pct_couleurs'))
+        table.setItem(i, 5 + decalage, pct_couleurs_item)
+        
+        # % Soins
+        pct_soins = data.get('pourcentage_soins')
+        pct_soins_item = QTableWidgetItem(normaliser_decimal(formater_pourcentage(pct_soins)) if pct_soins else "")
+        pct_soins_item.setTextAlignment(Qt.AlignCenter)
+        self._appliquer_couleur_objectif(pct_soins_item, pct_soins, objectifs.get('pct_soins'))
+        table.setItem(i, 6 + decalage, pct_soins_item)
+        
+        for colonne in range(1, 7):
+            self._signaler_anomalie(table, table.item(i, colonne + decalage), colonne)
+    
+    def _signaler_anomalie(self, table: QTableWidget, item: QTableWidgetItem, colonne: int):
+        """
+        Surligne une cellule de saisie dont la valeur s'écarte de l'historique
+        du collaborateur (de l'équipe à défaut)
+        
+        Args:
+            table: Tableau de la cellule
+            item: Cellule de saisie
+            colonne: Indicateur de la cellule (1 = C.A. Prestation ... 6 = % Soins)
+        """
+        if table is self.grille:
+            references = self.grille_references
+            collaborateur_id, numero_periode = (
+                self.grille_lignes[item.row()] if item.row() < len(self.grille_lignes) else (None, 0)
+            )
+            i = numero_periode - 1
+        else:
+            references = self.references
+            collaborateur_id = self.affichage[0] if self.affichage else None
+            i = item.row()
+        
+        message = None
+        jours = references['jours'] if references else []
+        if collaborateur_id is not None and 0 <= i < len(jours):
+            valeur = parser_decimal(item.text().replace("€", "").replace("%", ""))
+            message = self.anomalies.evaluer(
+                references, collaborateur_id, INDICATEURS['collaborateurs'][colonne - 1], valeur, jours[i]
+            )
+        
+        signaux_bloques = table.blockSignals(True)
+        item.setBackground(QColor(253, 235, 208) if message else QBrush())
+        item.setToolTip(f"⚠️ {message}" if message else "")
+        table.blockSignals(signaux_bloques)
+    
+    def _remplir_analyse(self, analyse: dict):
+        """
+        Remplit les colonnes calculées (cumul, évolution, rang dans l'équipe) du tableau
+        
+        Args:
+            analyse: Résultat de get_analyse_mois {(collaborateur_id, numero_periode): valeurs}
+        """
+        if self.affichage is None:
+            return
+        collaborateur_id = self.affichage[0]
+        
+        self.table.blockSignals(True)
+        for i in range(self.table.rowCount()):
+            ligne = analyse.get((collaborateur_id, i + 1), {})
+            textes = [
+                normaliser_decimal(formater_montant(ligne.get('ca_cumule'))),
+                normaliser_decimal(formater_evolution(ligne.get('evolution_ca'))),
+                formater_rang(ligne.get('rang_ca'), ligne.get('nb_classes'))
+            ]
+            for j, texte in enumerate(textes):
+                self.table.setItem(i, 7 + j, creer_item_calcule(texte))
             
-            # % Couleurs
-            pct_couleurs = data.get('pourcentage_couleurs')
-            pct_couleurs_item = QTableWidgetItem(normaliser_decimal(formater_pourcentage(pct_couleurs)) if pct_couleurs else "")
-            pct_couleurs_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 5, pct_couleurs_item)
+            # Cumul comparé à l'objectif cumulé depuis le début du mois
+            self._appliquer_couleur_objectif(self.table.item(i, 7), ligne.get('ca_cumule'),
+                                             self._objectifs_ligne(self.table, i).get('ca_prestation_cumule'))
             
-            # % Soins
-            pct_soins = data.get('pourcentage_soins')
-            pct_soins_item = QTableWidgetItem(normaliser_decimal(formater_pourcentage(pct_soins)) if pct_soins else "")
-            pct_soins_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 6, pct_soins_item)
-        
+            evolution = ligne.get('evolution_ca')
+            if evolution:
+                self.table.item(i, 8).setForeground(
+                    QColor(34, 139, 34) if evolution > 0 else QColor(178, 34, 34)
+                )
         self.table.blockSignals(False)
     
     def _vider_tableau(self):
@@ -356,90 +928,311 @@ class SuivisCollaborateursWidget(QWidget):
         if item.column() == 0:
             return
         
-        self.donnees_modifiees = True
+        self._formater_saisie(self.table, item, item.column())
+        self.autosauvegarde.signaler_modification(item.row(), item.column(), item.text())
+    
+    def _on_grille_item_changed(self, item):
+        """Appelé quand une cellule de la vue équipe est modifiée"""
+        if item.column() < 2:
+            return
+        
+        self._formater_saisie(self.grille, item, item.column() - 1)
+        self.grille_modifies.add(self.grille_lignes[item.row()][0])
+        self.autosauvegarde_grille.signaler_modification(item.row(), item.column(), item.text())
+    
+    def _appliquer_edition(self, items: list):
+        """
+        Met en forme et enregistre les cellules d'un collage, d'une recopie ou d'un effacement
+        
+        Les cellules sont sauvegardées tout de suite, en une seule écriture :
+        l'opération s'annule en une fois.
+        
+        Args:
+            items: Cellules modifiées (voir EditionTableau)
+        """
+        for item in items:
+            self._formater_saisie(self.table, item, item.column())
+        self.autosauvegarde.signaler_modifications(
+            {(item.row(), item.column()): item.text() for item in items}
+        )
+        self.autosauvegarde.vider()
+    
+    def _appliquer_edition_grille(self, items: list):
+        """Comme _appliquer_edition, pour la vue équipe (un seul lot pour tous les collaborateurs)"""
+        for item in items:
+            self._formater_saisie(self.grille, item, item.column() - 1)
+            self.grille_modifies.add(self.grille_lignes[item.row()][0])
+        self.autosauvegarde_grille.signaler_modifications(
+            {(item.row(), item.column()): item.text() for item in items}
+        )
+        self.autosauvegarde_grille.vider()
+    
+    def _formater_saisie(self, table: QTableWidget, item: QTableWidgetItem, colonne: int):
+        """
+        Met en forme la valeur saisie dans une cellule et sa couleur d'objectif
+        
+        Args:
+            table: Tableau de la cellule
+            item: Cellule modifiée
+            colonne: Indicateur de la cellule (1 = C.A. Prestation ... 6 = % Soins)
+        """
         text = item.text()
+        objectif = self._objectifs_ligne(table, item.row()).get(OBJECTIFS_COLLABORATEURS[colonne - 1])
         
-        if item.column() in [1, 2]:  # Montants
+        if colonne in [1, 2]:  # Montants
             valeur = parser_decimal(text.replace("€", "").strip())
             if valeur is not None:
-                self.table.blockSignals(True)
+                table.blockSignals(True)
                 item.setText(normaliser_decimal(formater_montant(valeur)))
                 item.setTextAlignment(Qt.AlignCenter)
-                self.table.blockSignals(False)
+                self._appliquer_couleur_objectif(item, valeur, objectif)
+                table.blockSignals(False)
         
-        elif item.column() == 3:  # Nombre de Visites (avec décimales)
+        elif colonne == 3:  # Nombre de Visites (avec décimales)
             item.setTextAlignment(Qt.AlignCenter)
             valeur = parser_decimal(text)
             if valeur is not None:
-                self.table.blockSignals(True)
+                table.blockSignals(True)
                 item.setText(str(valeur).replace('.', ','))
                 item.setTextAlignment(Qt.AlignCenter)
-                self.table.blockSignals(False)
+                self._appliquer_couleur_objectif(item, valeur, objectif)
+                table.blockSignals(False)
         
-        elif item.column() in [4, 5, 6]:  # Pourcentages
+        elif colonne in [4, 5, 6]:  # Pourcentages
             valeur = parser_decimal(text.replace("%", "").strip())
             if valeur is not None:
-                self.table.blockSignals(True)
+                table.blockSignals(True)
                 item.setText(normaliser_decimal(formater_pourcentage(valeur)))
                 item.setTextAlignment(Qt.AlignCenter)
-                self.table.blockSignals(False)
+                self._appliquer_couleur_objectif(item, valeur, objectif)
+                table.blockSignals(False)
+        
+        self._signaler_anomalie(table, item, colonne)
     
-    def _on_cell_exit(self, currentRow, currentColumn, previousRow, previousColumn):
-        """Sauvegarde automatique quand on quitte une cellule"""
-        if self.donnees_modifiees and previousRow >= 0:
-            self._sauvegarder_donnees_silencieuse()
+    def _lire_ligne(self, table: QTableWidget, i: int, decalage: int = 0) -> tuple:
+        """
+        Lit les indicateurs saisis sur une ligne
+        
+        Args:
+            table: Tableau à lire
+            i: Ligne
+            decalage: Colonnes avant les indicateurs en plus de la colonne Périodes
+        
+        Returns:
+            (ca_prestation, ca_par_jour, nombre_visites, pourcentage_ventes,
+             pourcentage_couleurs, pourcentage_soins)
+        """
+        def texte(colonne: int) -> str:
+            item = table.item(i, colonne + decalage)
+            return item.text() if item else ""
+        
+        return (
+            parser_decimal(texte(1).replace("€", "")),
+            parser_decimal(texte(2).replace("€", "")),
+            parser_decimal(texte(3)),
+            parser_decimal(texte(4).replace("%", "")),
+            parser_decimal(texte(5).replace("%", "")),
+            parser_decimal(texte(6).replace("%", ""))
+        )
     
-    def _sauvegarder_donnees_silencieuse(self):
-        """Sauvegarde sans message de confirmation"""
-        mois = self.mois_combo.currentIndex() + 1
-        annee = int(self.annee_combo.currentText())
-        
-        if not self.collaborateur_courant:
+    def _sauvegarder_donnees_silencieuse(self, apres=None):
+        """
+        Sauvegarde sans message de confirmation
+        
+        Les valeurs sont lues dans le tableau puis écrites sur le thread de
+        la base ; les sauvegardes successives y sont exécutées dans l'ordre.
+        
+        Args:
+            apres: Fonction appelée une fois la sauvegarde écrite
+        """
+        if not self.collaborateur_courant or self.affichage is None:
+            self.autosauvegarde.sauvegarde_terminee()
             return
         
-        collaborateur_id = self.collaborateur_courant['id']
-        
-        suivi = self.db.get_suivi_by_collaborateur_mois_annee(collaborateur_id, mois, annee)
-        if not suivi:
-            suivi_id = self.db.creer_suivi(collaborateur_id, mois, annee)
-        else:
-            suivi_id = suivi['id']
-        
+        lignes = []
         for i in range(self.table.rowCount()):
             date_debut, date_fin = self.periodes_dates[i]
-            
-            ca_prestation = parser_decimal((self.table.item(i, 1).text() if self.table.item(i, 1) else "").replace("€", ""))
-            ca_jour = parser_decimal((self.table.item(i, 2).text() if self.table.item(i, 2) else "").replace("€", ""))
-            
-            nb_visites_text = self.table.item(i, 3).text() if self.table.item(i, 3) else ""
-            nb_visites = parser_decimal(nb_visites_text)
-            
-            pct_ventes = parser_decimal((self.table.item(i, 4).text() if self.table.item(i, 4) else "").replace("%", ""))
-            pct_couleurs = parser_decimal((self.table.item(i, 5).text() if self.table.item(i, 5) else "").replace("%", ""))
-            pct_soins = parser_decimal((self.table.item(i, 6).text() if self.table.item(i, 6) else "").replace("%", ""))
-            
-            self.db.sauvegarder_periode(
-                suivi_id,
+            lignes.append((
                 i + 1,
                 date_debut.strftime("%Y-%m-%d"),
                 date_fin.strftime("%Y-%m-%d"),
-                ca_prestation,
-                ca_jour,
-                nb_visites,
-                pct_ventes,
-                pct_couleurs,
-                pct_soins
-            )
+                *self._lire_ligne(self.table, i)
+            ))
+        
+        # Les données en cache ne correspondent plus au tableau ; une lecture
+        # déjà soumise (préchargement) la remettrait en cache avant
+        # l'écriture, d'où la seconde invalidation à la fin de la sauvegarde.
+        # Les rangs dans l'équipe changent aussi pour les autres
+        # collaborateurs : tout le mois est invalidé.
+        affichage = self.affichage
+        self.cache.invalider_si(lambda cle: cle[1:] == affichage[1:])
+        
+        def sauvegarde_terminee(resultat: dict):
+            self.cache.invalider_si(lambda cle: cle[1:] == affichage[1:])
+            self.autosauvegarde.sauvegarde_terminee()
+            self._appliquer_historique(resultat['historique'])
+            if self.affichage == affichage:
+                self._remplir_analyse(resultat['analyse'])
+            self._suivis_modifies(*affichage[1:])
+            if apres:
+                apres()
+        
+        def sauvegarde_echouee(exception: BaseException):
+            print(f"Erreur lors de la sauvegarde du suivi: {exception}")
+            self.autosauvegarde.sauvegarde_echouee()
+        
+        self.executeur.executer(
+            self._ecrire_donnees, *self.affichage, lignes,
+            rappel=sauvegarde_terminee, erreur=sauvegarde_echouee
+        )
+    
+    def _ecrire_donnees(self, collaborateur_id: int, mois: int, annee: int, lignes: list) -> dict:
+        """Écrit les périodes d'un collaborateur en une seule action annulable (thread de la base)"""
+        with self.db.journal.lot("Saisie"):
+            suivi = self.db.get_suivi_by_collaborateur_mois_annee(collaborateur_id, mois, annee)
+            if not suivi:
+                suivi_id = self.db.creer_suivi(collaborateur_id, mois, annee)
+            else:
+                suivi_id = suivi['id']
+            
+            for ligne in lignes:
+                self.db.sauvegarder_periode(suivi_id, *ligne)
+        
+        return {
+            'analyse': self.db.get_analyse_mois(mois, annee, collaborateur_id),
+            'historique': self._lire_historique()
+        }
+    
+    def _on_cellule_double_cliquee(self, ligne: int, colonne: int):
+        """Ouvre le détail par jour sur un double-clic dans la colonne Périodes"""
+        if colonne == 0:
+            self._ouvrir_detail_jours(ligne)
+    
+    def _ouvrir_detail_jours(self, ligne: int):
+        """Lit les jours d'une période du collaborateur affiché puis ouvre leur saisie"""
+        if self.affichage is None or not 0 <= ligne < len(self.periodes_dates):
+            return
         
-        self.donnees_modifiees = False
+        # La saisie en cours est enregistrée avant que les jours ne recalculent la période
+        self._vider_sauvegardes()
+        collaborateur_id = self.affichage[0]
+        date_debut, date_fin = self.periodes_dates[ligne]
+        titre = f"Détail par jour - {self.table.item(ligne, 0).text()}"
+        self.executeur.executer(
+            self._lire_jours, collaborateur_id,
+            date_debut.strftime("%Y-%m-%d"), date_fin.strftime("%Y-%m-%d"),
+            rappel=lambda lu: self._saisir_jours(titre, collaborateur_id, date_debut, date_fin, *lu)
+        )
+    
+    def _lire_jours(self, collaborateur_id: int, date_debut: str, date_fin: str) -> tuple:
+        """Lit les jours d'une période et indique si son total a été tapé directement (thread de la base)"""
+        return (self.db.get_jours(collaborateur_id, date_debut, date_fin),
+                self.db.periode_saisie(collaborateur_id, date_debut, date_fin))
+    
+    def _saisir_jours(self, titre: str, collaborateur_id: int, date_debut: datetime,
+                      date_fin: datetime, jours: list, periode_saisie: bool = False):
+        """Affiche le détail par jour et enregistre les jours modifiés"""
+        dialog = DetailJoursDialog(
+            titre, date_debut, date_fin, jours,
+            colonne_ca="ca_prestation", libelle_ca="C.A. Prestation", parent=self
+        )
+        if dialog.exec() != QDialog.Accepted or not dialog.get_jours():
+            return
+        
+        remplacer = periode_saisie and self._confirmer_remplacement_total()
+        
+        jours_modifies = [dict(jour, collaborateur_id=collaborateur_id) for jour in dialog.get_jours()]
+        
+        def jours_sauvegardes(succes: bool):
+            if not succes:
+                QMessageBox.warning(self, "Erreur", "Erreur lors de l'enregistrement des jours.")
+            # Les rangs dans l'équipe changent aussi pour les autres collaborateurs
+            self.cache.vider()
+            self._charger_donnees_collaborateur()
+            if self.affichage:
+                self._suivis_modifies(*self.affichage[1:])
+        
+        self.executeur.executer(
+            self.db.sauvegarder_jours, jours_modifies, remplacer_saisies=remplacer,
+            rappel=jours_sauvegardes
+        )
+    
+    def _confirmer_remplacement_total(self) -> bool:
+        """Demande si le total tapé d'une période doit être remplacé par la somme de ses jours"""
+        reply = QMessageBox.question(
+            self, "Total saisi",
+            "Les valeurs de cette période ont été saisies directement.\n\n"
+            "Les remplacer par le calcul à partir des jours renseignés ?\n"
+            "(Non : les jours sont enregistrés, la période garde ses valeurs.)",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
+        return reply == QMessageBox.Yes
+    
+    def _sauvegarder_grille(self, apres=None):
+        """
+        Enregistre les collaborateurs modifiés dans la vue équipe
+        
+        Une seule écriture (une transaction, une action annulable) pour tous
+        les collaborateurs modifiés depuis la dernière sauvegarde.
+        
+        Args:
+            apres: Fonction appelée une fois la sauvegarde écrite
+        """
+        if self.grille_affichee is None:
+            self.autosauvegarde_grille.sauvegarde_terminee()
+            return
+        mois, annee = self.grille_affichee
+        
+        saisies = {}
+        for ligne, (collaborateur_id, numero_periode) in enumerate(self.grille_lignes):
+            if collaborateur_id not in self.grille_modifies:
+                continue
+            date_debut, date_fin = self.grille_periodes[numero_periode - 1]
+            saisies.setdefault(collaborateur_id, []).append((
+                numero_periode,
+                date_debut.strftime("%Y-%m-%d"),
+                date_fin.strftime("%Y-%m-%d"),
+                *self._lire_ligne(self.grille, ligne, decalage=1)
+            ))
+        self.grille_modifies = set()
+        
+        # Données en cache du mois (voir _sauvegarder_donnees_silencieuse)
+        self.cache.invalider_si(lambda cle: cle[1:] == (mois, annee))
+        
+        def sauvegarde_terminee(historique: tuple):
+            self.cache.invalider_si(lambda cle: cle[1:] == (mois, annee))
+            self.autosauvegarde_grille.sauvegarde_terminee()
+            self._appliquer_historique(historique)
+            self._suivis_modifies(mois, annee)
+            if apres:
+                apres()
+        
+        def sauvegarde_echouee(exception: BaseException):
+            print(f"Erreur lors de la sauvegarde de la vue équipe: {exception}")
+            if self.grille_affichee == (mois, annee):
+                self.grille_modifies.update(saisies)
+            self.autosauvegarde_grille.sauvegarde_echouee()
+        
+        self.executeur.executer(
+            self._ecrire_grille, mois, annee, saisies,
+            rappel=sauvegarde_terminee, erreur=sauvegarde_echouee
+        )
+    
+    def _ecrire_grille(self, mois: int, annee: int, saisies: dict) -> tuple:
+        """Écrit les saisies de la vue équipe (thread de la base)"""
+        self.db.sauvegarder_grille(mois, annee, saisies)
+        return self._lire_historique()
     
     def _sauvegarder_donnees(self):
         """Sauvegarde les données de tous les collaborateurs"""
-        self._sauvegarder_donnees_silencieuse()
-        QMessageBox.information(
+        if self.btn_vue_equipe.isChecked():
+            planificateur = self.autosauvegarde_grille
+        else:
+            planificateur = self.autosauvegarde
+        planificateur.vider(forcer=True, apres=lambda: QMessageBox.information(
             self, "Sauvegarde",
             "Les données ont été sauvegardées avec succès !"
-        )
+        ))
     
     def _reinitialiser_mois_with_save(self):
         """Réinitialisation sans sauvegarde"""
@@ -449,9 +1242,15 @@ class SuivisCollaborateursWidget(QWidget):
         """Réinitialise tous les suivis du mois (tous collaborateurs)"""
         mois = self.mois_combo.currentIndex() + 1
         annee = int(self.annee_combo.currentText())
-        mois_nom = self.mois_combo.currentText()
         
-        suivis = self.db.get_tous_les_suivis_mois(mois, annee)
+        self.executeur.executer(
+            self.db.get_tous_les_suivis_mois, mois, annee,
+            rappel=lambda suivis: self._confirmer_reinitialisation(mois, annee, suivis)
+        )
+    
+    def _confirmer_reinitialisation(self, mois: int, annee: int, suivis: list):
+        """Supprime les suivis du mois après confirmation"""
+        mois_nom = self.mois_combo.itemText(mois - 1)
         
         if not suivis:
             QMessageBox.information(
@@ -465,16 +1264,23 @@ class SuivisCollaborateursWidget(QWidget):
             f"<b>Attention !</b><br><br>"
             f"Vous êtes sur le point de <b>supprimer définitivement</b> toutes les données "
             f"de <b>tous les collaborateurs</b> pour le mois de <b>{mois_nom} {annee}</b>.<br><br>"
-            f"Cette action est <b>irréversible</b>.<br><br>"
+            f"Vous pourrez revenir en arrière avec <b>Annuler</b> (Ctrl+Z).<br><br>"
             f"Voulez-vous vraiment continuer ?",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
         )
         
-        if reply == QMessageBox.Yes:
-            if self.db.supprimer_suivis_mois(mois, annee):
-                self._charger_donnees_collaborateur()
-                self.donnees_modifiees = False
+        if reply != QMessageBox.Yes:
+            return
+        
+        def suivis_supprimes(succes: bool):
+            if succes:
+                self.cache.invalider_si(lambda cle: cle[1:] == (mois, annee))
+                if self.btn_vue_equipe.isChecked():
+                    self._charger_grille()
+                else:
+                    self._charger_donnees_collaborateur()
+                self._suivis_modifies(mois, annee)
                 
                 QMessageBox.information(
                     self, "Réinitialisation réussie",
@@ -485,29 +1291,118 @@ class SuivisCollaborateursWidget(QWidget):
                     self, "Erreur",
                     "Une erreur est survenue lors de la réinitialisation."
                 )
+        
+        self.executeur.executer(self.db.supprimer_suivis_mois, mois, annee, rappel=suivis_supprimes)
+    
+    def _mettre_a_jour_historique(self):
+        """Active les boutons Annuler / Rétablir selon le journal"""
+        self.executeur.executer(
+            self._lire_historique, rappel=self._appliquer_historique, canal="historique"
+        )
+    
+    def _lire_historique(self) -> tuple:
+        """Indique si on peut annuler / rétablir (thread de la base)"""
+        return self.db.journal.peut_annuler(), self.db.journal.peut_retablir()
+    
+    def _appliquer_historique(self, historique: tuple):
+        """Active les boutons Annuler / Rétablir"""
+        peut_annuler, peut_retablir = historique
+        self.btn_annuler.setEnabled(peut_annuler)
+        self.btn_retablir.setEnabled(peut_retablir)
+    
+    def _annuler(self):
+        """Annule la dernière modification enregistrée"""
+        self._rejouer(self.db.journal.annuler)
+    
+    def _retablir(self):
+        """Rétablit la dernière modification annulée"""
+        self._rejouer(self.db.journal.retablir)
+    
+    def _rejouer(self, operation):
+        """Sauvegarde la saisie en cours puis annule / rétablit sur le thread de la base"""
+        self._vider_sauvegardes()
+        self.executeur.executer(
+            self._rejouer_journal, operation, self.affichage,
+            rappel=self._rafraichir_lignes
+        )
+    
+    def _rejouer_journal(self, operation, affichage: Optional[tuple]) -> dict:
+        """Annule / rétablit puis relit le suivi affiché (thread de la base)"""
+        lignes = operation()
+        suivi = self.db.get_suivi_by_collaborateur_mois_annee(*affichage) if affichage else None
+        return {
+            'affichage': affichage,
+            'lignes': lignes,
+            'suivi_id': suivi['id'] if suivi else None,
+            'analyse': self.db.get_analyse_mois(affichage[1], affichage[2], affichage[0]) if affichage else {},
+            'historique': self._lire_historique()
+        }
+    
+    def _rafraichir_lignes(self, resultat: dict):
+        """
+        Met à jour les seules lignes du tableau touchées par annuler/rétablir
+        
+        Args:
+            resultat: Résultat de _rejouer_journal (lignes renvoyées par le
+                      journal : {'table', 'avant', 'apres'})
+        """
+        # Annuler / rétablir peut toucher n'importe quel mois
+        self.cache.vider()
+        self._appliquer_historique(resultat['historique'])
+        self._suivis_modifies(self.mois_combo.currentIndex() + 1, int(self.annee_combo.currentText()))
+        if self.btn_vue_equipe.isChecked():
+            # Un lot de la vue équipe touche plusieurs collaborateurs : relecture complète
+            self._charger_grille()
+            return
+        if resultat['affichage'] is None or resultat['affichage'] != self.affichage:
+            return
+        
+        collaborateur_id, mois, annee = self.affichage
+        lignes = resultat['lignes']
+        
+        # Suivis (supprimés ou présents) du collaborateur affiché pour ce mois
+        suivis_affiches = {
+            ligne['id'] for ligne in lignes
+            if ligne['table'] == "suivis_collaborateurs"
+            and (ligne['apres'] or ligne['avant'])['collaborateur_id'] == collaborateur_id
+            and (ligne['apres'] or ligne['avant'])['mois'] == mois
+            and (ligne['apres'] or ligne['avant'])['annee'] == annee
+        }
+        if resultat['suivi_id']:
+            suivis_affiches.add(resultat['suivi_id'])
+        
+        self.table.blockSignals(True)
+        for ligne in lignes:
+            if ligne['table'] != "suivis_collaborateurs_periodes":
+                continue
+            
+            periode = ligne['apres'] or ligne['avant']
+            index = periode['numero_periode'] - 1
+            if periode['suivi_id'] in suivis_affiches and 0 <= index < self.table.rowCount():
+                self._remplir_ligne(index, ligne['apres'] or {})
+        self.table.blockSignals(False)
+        self._remplir_analyse(resultat['analyse'])
     
     def _exporter_pdf_with_save(self):
         """Sauvegarde automatique avant export PDF"""
-        if self.donnees_modifiees:
-            self._sauvegarder_donnees_silencieuse()
+        self._vider_sauvegardes()
         self._exporter_pdf()
     
     def _exporter_pdf(self):
         """Exporte tous les tableaux en PDF"""
         mois = self.mois_combo.currentIndex() + 1
         annee = int(self.annee_combo.currentText())
-        mois_nom = self.mois_combo.currentText()
         
+        self.executeur.executer(
+            self._lire_donnees_pdf, mois, annee,
+            rappel=lambda donnees: self._enregistrer_pdf(mois, annee, donnees)
+        )
+    
+    def _lire_donnees_pdf(self, mois: int, annee: int) -> dict:
+        """Lit les périodes de tous les collaborateurs actifs du mois (thread de la base)"""
         collaborateurs = self.db.get_collaborateurs_actifs_mois(mois, annee)
         
-        if not collaborateurs:
-            QMessageBox.warning(
-                self, "Aucun collaborateur",
-                "Aucun collaborateur actif pour ce mois."
-            )
-            return
-        
-        # Filtrer les collaborateurs qui ont des données
+        # Ne garder que les collaborateurs qui ont des données
         collaborateurs_avec_donnees = []
         for collab in collaborateurs:
             suivi = self.db.get_suivi_by_collaborateur_mois_annee(collab['id'], mois, annee)
@@ -520,7 +1415,27 @@ class SuivisCollaborateursWidget(QWidget):
                     for p in periodes_data
                 )
                 if has_data:
-                    collaborateurs_avec_donnees.append(collab)
+                    collaborateurs_avec_donnees.append((collab, periodes_data))
+        
+        return {
+            'nb_collaborateurs': len(collaborateurs),
+            'collaborateurs': collaborateurs_avec_donnees,
+            'analyse': self.db.get_analyse_mois(mois, annee),
+            'objectifs_periodes': self.prorata.get_objectifs_equipe(mois, annee),
+            'rapprochement': self.rapprochement.rapprocher_mois(mois, annee)
+        }
+    
+    def _enregistrer_pdf(self, mois: int, annee: int, donnees: dict):
+        """Demande le fichier de destination et génère le PDF des données lues"""
+        mois_nom = self.mois_combo.itemText(mois - 1)
+        collaborateurs_avec_donnees = donnees['collaborateurs']
+        
+        if not donnees['nb_collaborateurs']:
+            QMessageBox.warning(
+                self, "Aucun collaborateur",
+                "Aucun collaborateur actif pour ce mois."
+            )
+            return
         
         if not collaborateurs_avec_donnees:
             QMessageBox.warning(
@@ -568,20 +1483,23 @@ class SuivisCollaborateursWidget(QWidget):
         with open('config.ini', 'w', encoding='utf-8') as f:
             config.write(f)
         
+        periodes_dates = calculer_periodes_mois(mois, annee)
+        
         donnees_collaborateurs = []
-        for collab in collaborateurs_avec_donnees:
-            suivi = self.db.get_suivi_by_collaborateur_mois_annee(collab['id'], mois, annee)
-            periodes_data = self.db.get_periodes_by_suivi_id(suivi['id'])
-            
+        for collab, periodes_data in collaborateurs_avec_donnees:
             data_dict = {p['numero_periode']: p for p in periodes_data}
             donnees_ordonnees = []
-            for i in range(len(self.periodes_dates)):
+            analyse_ordonnee = []
+            for i in range(len(periodes_dates)):
                 donnees_ordonnees.append(data_dict.get(i + 1, {}))
+                analyse_ordonnee.append(donnees['analyse'].get((collab['id'], i + 1), {}))
             
             donnees_collaborateurs.append({
                 'nom': collab['nom'],
                 'prenom': collab['prenom'],
-                'donnees': donnees_ordonnees
+                'donnees': donnees_ordonnees,
+                'analyse': analyse_ordonnee,
+                'objectifs': donnees['objectifs_periodes'].get(collab['id'])
             })
         
         exporter = SuivisCollaborateursPDFExporter()
@@ -589,8 +1507,9 @@ class SuivisCollaborateursWidget(QWidget):
             filepath,
             mois_nom,
             annee,
-            self.periodes_dates,
-            donnees_collaborateurs
+            periodes_dates,
+            donnees_collaborateurs,
+            list(donnees['rapprochement'].values())
         )
         
         if success:
@@ -621,8 +1540,19 @@ class SuivisCollaborateursWidget(QWidget):
                 "Une erreur est survenue lors de la génération du PDF."
             )
     
+    def fermer(self):
+        """
+        Enregistre les saisies en attente et attend la fin des écritures
+        
+        Appelé à la fermeture de l'écran et par la fenêtre principale avant
+        la sauvegarde de sortie, pour que celle-ci contienne les dernières saisies.
+        """
+        self._vider_sauvegardes()
+        self.executeur.attendre()
+        # Livre le résultat de la dernière sauvegarde (efface le fichier de récupération)
+        QCoreApplication.processEvents()
+    
     def closeEvent(self, event):
         """Sauvegarde automatique à la fermeture"""
-        if self.donnees_modifiees:
-            self._sauvegarder_donnees_silencieuse()
+        self.fermer()
         event.accept()
\ No newline at end of file
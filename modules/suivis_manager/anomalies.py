@@ -0,0 +1,285 @@
+"""
+Détection des valeurs saisies inhabituelles (fautes de frappe)
+
+Chaque valeur d'une période est comparée à l'historique du même
+indicateur : celui du salon pour le Suivi Manager, celui du collaborateur
+pour les Suivis Collaborateurs (l'historique de toute l'équipe à défaut
+d'un historique personnel suffisant). Les statistiques sont robustes : une
+ancienne faute de frappe ne déplace ni la médiane ni l'écart absolu
+médian (MAD). Le score est le z-score modifié 0,6745 × (x - médiane) / MAD.
+
+Les volumes (C.A., visites) sont rapportés aux jours d'ouverture de leur
+période, pour comparer les semaines incomplètes aux semaines pleines. Une
+valeur nulle (congés, fermeture) n'est ni comptée ni signalée. Les valeurs
+impossibles (négatives, pourcentages au-delà de 100 %) sont toujours
+signalées.
+
+L'historique de tous les collaborateurs est lu en une requête, les
+jours d'ouverture de toutes ses périodes en une lecture du calendrier, et
+les statistiques sont calculées colonne par colonne (une liste de valeurs
+par série et par indicateur) : le contrôle d'une année importée entière
+ne fait pas plus de lectures que celui d'un mois.
+"""
+
+import configparser
+from pathlib import Path
+from statistics import median
+from typing import Any, Dict, List, Optional, Tuple
+
+from modules.bdd import Database
+from modules.calendrier import CalendrierDB
+
+from .utils import calculer_periodes_mois
+
+
+# Sources contrôlées : (table des suivis, table des périodes, colonne de la série)
+SOURCES = {
+    'manager': ("suivis_manager", "suivis_manager_periodes", None),
+    'collaborateurs': ("suivis_collaborateurs", "suivis_collaborateurs_periodes", "collaborateur_id"),
+}
+
+# Indicateurs de chaque source, dans l'ordre des colonnes de saisie des tableaux
+INDICATEURS = {
+    'manager': ["ca_total", "ca_par_jour", "nombre_visites",
+                "pourcentage_ventes", "pourcentage_couleurs", "pourcentage_soins"],
+    'collaborateurs': ["ca_prestation", "ca_par_jour", "nombre_visites",
+                       "pourcentage_ventes", "pourcentage_couleurs", "pourcentage_soins"],
+}
+
+# Volumes rapportés aux jours d'ouverture de la période
+INDICATEURS_VOLUME = {"ca_total", "ca_prestation", "nombre_visites"}
+INDICATEURS_POURCENTAGE = {"pourcentage_ventes", "pourcentage_couleurs", "pourcentage_soins"}
+
+# Séries de référence sans collaborateur
+SALON = "salon"
+EQUIPE = "equipe"
+
+# Seuils par défaut (section [Anomalies] de config.ini)
+SEUILS_ANOMALIES_DEFAUT = {
+    'score_max': 3.5,  # |z-score modifié| au-delà duquel une valeur est signalée
+    'historique_mois': 24.0,  # Mois d'historique pris en compte
+    'historique_min': 6.0,  # Valeurs d'historique nécessaires pour juger une série
+    'mad_min_pct': 5.0,  # MAD minimal en % de la médiane (historique très régulier)
+}
+
+
+def lire_seuils_anomalies(config_path: str = "config.ini") -> Dict[str, float]:
+    """
+    Lit les seuils de la détection (section [Anomalies] de config.ini)
+    
+    Args:
+        config_path: Chemin du fichier de configuration
+    
+    Returns:
+        Seuils {'score_max', 'historique_mois', 'historique_min', 'mad_min_pct'}
+        (valeurs par défaut pour les clés absentes)
+    """
+    config = configparser.ConfigParser()
+    if Path(config_path).exists():
+        config.read(config_path, encoding='utf-8')
+    
+    seuils = {}
+    for cle, defaut in SEUILS_ANOMALIES_DEFAUT.items():
+        try:
+            seuils[cle] = config.getfloat('Anomalies', cle, fallback=defaut)
+        except ValueError:
+            print(f"Seuil de détection invalide dans {config_path} : {cle}")
+            seuils[cle] = defaut
+    return seuils
+
+
+def statistiques_robustes(valeurs: List[float]) -> Tuple[float, float, int]:
+    """
+    Médiane et écart absolu médian d'une série
+    
+    Args:
+        valeurs: Valeurs de la série (non vide)
+    
+    Returns:
+        (médiane, MAD, nombre de valeurs)
+    """
+    mediane = median(valeurs)
+    return mediane, median([abs(valeur - mediane) for valeur in valeurs]), len(valeurs)
+
+
+class DetecteurAnomalies:
+    """Compare les valeurs des périodes à l'historique du salon et des collaborateurs"""
+    
+    def __init__(self, calendrier: Optional[CalendrierDB] = None, config_path: str = "config.ini"):
+        self.db = Database()
+        self.calendrier = calendrier or CalendrierDB()
+        self.seuils = lire_seuils_anomalies(config_path)
+    
+    def _lire_periodes(self, source: str, debut: int, fin: int) -> List[Dict[str, Any]]:
+        """
+        Lit les périodes d'une source sur un intervalle de mois (une requête)
+        
+        Args:
+            source: 'manager' ou 'collaborateurs'
+            debut: Premier mois, en annee * 12 + mois (inclus)
+            fin: Dernier mois, en annee * 12 + mois (inclus)
+        
+        Returns:
+            Périodes {'serie', 'annee', 'mois', 'numero_periode', 'date_debut',
+            'date_fin', indicateurs..., 'jours'} (jours d'ouverture de la période)
+        """
+        table_suivis, table_periodes, colonne_serie = SOURCES[source]
+        serie = f"s.{colonne_serie}" if colonne_serie else f"'{SALON}'"
+        lignes = self.db.fetch_all(f"""
+            SELECT {serie} AS serie, s.annee, s.mois, p.numero_periode, p.date_debut, p.date_fin,
+                   {', '.join(f'p.{indicateur}' for indicateur in INDICATEURS[source])}
+            FROM {table_suivis} s
+            JOIN {table_periodes} p ON p.suivi_id = s.id
+            WHERE s.annee * 12 + s.mois BETWEEN ? AND ?
+            ORDER BY s.annee, s.mois, p.numero_periode
+        """, (debut, fin))
+        
+        # Jours d'ouverture de chaque période distincte, en une lecture du calendrier
+        periodes = sorted({(ligne['date_debut'], ligne['date_fin']) for ligne in lignes})
+        jours = dict(zip(periodes, self.calendrier.compter_jours_ouvres_periodes(periodes)))
+        for ligne in lignes:
+            ligne['jours'] = jours[(ligne['date_debut'], ligne['date_fin'])]
+        return lignes
+    
+    def _calculer_references(self, source: str, lignes: List[Dict[str, Any]]) -> Dict[Any, Dict[str, tuple]]:
+        """
+        Calcule les statistiques robustes de chaque série et indicateur
+        
+        Args:
+            source: 'manager' ou 'collaborateurs'
+            lignes: Périodes lues par _lire_periodes
+        
+        Returns:
+            {serie: {indicateur: (médiane, MAD, nombre de valeurs)}} ; pour les
+            collaborateurs, la série EQUIPE regroupe tout l'historique de l'équipe
+        """
+        colonnes: Dict[Tuple[Any, str], List[float]] = {}
+        for ligne in lignes:
+            for indicateur in INDICATEURS[source]:
+                valeur = self._normaliser(indicateur, ligne[indicateur], ligne['jours'])
+                if valeur is None:
+                    continue
+                colonnes.setdefault((ligne['serie'], indicateur), []).append(valeur)
+                if source == 'collaborateurs':
+                    colonnes.setdefault((EQUIPE, indicateur), []).append(valeur)
+        
+        historique_min = self.seuils['historique_min']
+        references: Dict[Any, Dict[str, tuple]] = {}
+        for (serie, indicateur), valeurs in colonnes.items():
+            if len(valeurs) >= historique_min:
+                references.setdefault(serie, {})[indicateur] = statistiques_robustes(valeurs)
+        return references
+    
+    @staticmethod
+    def _normaliser(indicateur: str, valeur: Optional[float], jours: int) -> Optional[float]:
+        """Valeur comparable d'une période (volumes par jour d'ouverture), None si non jugée"""
+        if not valeur or valeur < 0:
+            return None
+        if indicateur in INDICATEURS_VOLUME:
+            return valeur / jours if jours else None
+        return valeur
+    
+    def get_references(self, source: str, mois: int, annee: int) -> Dict[str, Any]:
+        """
+        Lit l'historique servant à juger les saisies d'un mois
+        
+        Args:
+            source: 'manager' ou 'collaborateurs'
+            mois: Mois saisi (1-12)
+            annee: Année
+        
+        Returns:
+            {'source', 'series': statistiques de _calculer_references,
+            'jours': jours d'ouverture de chaque période du mois}
+        """
+        fin = annee * 12 + mois
+        lignes = self._lire_periodes(source, fin - int(self.seuils['historique_mois']), fin)
+        return {
+            'source': source,
+            'series': self._calculer_references(source, lignes),
+            'jours': self.calendrier.compter_jours_ouvres_periodes(calculer_periodes_mois(mois, annee))
+        }
+    
+    def evaluer(self, references: Dict[str, Any], serie: Any, indicateur: str,
+                valeur: Optional[float], jours: int) -> Optional[str]:
+        """
+        Juge une valeur saisie
+        
+        Args:
+            references: Résultat de get_references
+            serie: Collaborateur (id) dont la valeur est saisie, SALON pour le manager
+            indicateur: Colonne de la valeur (voir INDICATEURS)
+            valeur: Valeur saisie (None : rien à juger)
+            jours: Jours d'ouverture de la période
+        
+        Returns:
+            Message décrivant l'anomalie, None si la valeur est plausible
+        """
+        if valeur is None:
+            return None
+        if valeur < 0:
+            return "Valeur négative"
+        if indicateur in INDICATEURS_POURCENTAGE and valeur > 100:
+            return f"Pourcentage impossible ({valeur:.1f} %)"
+        
+        x = self._normaliser(indicateur, valeur, jours)
+        series = references['series']
+        stats = series.get(serie, {}).get(indicateur)
+        origine = "l'historique"
+        if stats is None and references['source'] == 'collaborateurs':
+            stats = series.get(EQUIPE, {}).get(indicateur)
+            origine = "l'historique de l'équipe"
+        if x is None or stats is None:
+            return None
+        
+        mediane, mad, _ = stats
+        ecart = max(mad, abs(mediane) * self.seuils['mad_min_pct'] / 100)
+        if not ecart:
+            return None
+        score = 0.6745 * (x - mediane) / ecart
+        if abs(score) <= self.seuils['score_max']:
+            return None
+        
+        habituel = mediane * jours if indicateur in INDICATEURS_VOLUME else mediane
+        return (f"Valeur inhabituelle pour {origine} : habituellement autour de "
+                f"{habituel:.2f} sur cette période (score {score:+.1f})")
+    
+    def verifier_annee(self, source: str, annee: int) -> List[Dict[str, Any]]:
+        """
+        Contrôle toutes les valeurs d'une année (import de caisse, reprise d'historique)
+        
+        L'historique (l'année et les mois qui la précèdent) est lu en une
+        requête et ses statistiques calculées une fois pour toute l'année.
+        
+        Args:
+            source: 'manager' ou 'collaborateurs'
+            annee: Année contrôlée
+        
+        Returns:
+            Valeurs signalées {'serie', 'annee', 'mois', 'numero_periode',
+            'date_debut', 'date_fin', 'indicateur', 'valeur', 'message'}
+        """
+        debut = annee * 12 + 1
+        lignes = self._lire_periodes(source, debut - int(self.seuils['historique_mois']), debut + 11)
+        references = {'source': source, 'series': self._calculer_references(source, lignes)}
+        
+        anomalies = []
+        for ligne in lignes:
+            if ligne['annee'] != annee:
+                continue
+            for indicateur in INDICATEURS[source]:
+                message = self.evaluer(references, ligne['serie'], indicateur,
+                                       ligne[indicateur], ligne['jours'])
+                if message:
+                    anomalies.append({
+                        'serie': ligne['serie'],
+                        'annee': ligne['annee'],
+                        'mois': ligne['mois'],
+                        'numero_periode': ligne['numero_periode'],
+                        'date_debut': ligne['date_debut'],
+                        'date_fin': ligne['date_fin'],
+                        'indicateur': indicateur,
+                        'valeur': ligne[indicateur],
+                        'message': message
+                    })
+        return anomalies
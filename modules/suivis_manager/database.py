@@ -2,9 +2,17 @@
 Gestion de la base de données pour le module Suivis Manager
 """
 
-from modules.bdd import Database
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from modules.bdd import Database, JournalModifications, ecriture_atomique, Suivi, Periode
+from modules.calendrier import CalendrierDB, appliquer_ca_par_jour_ouvre, deriver_ca_par_jour_periodes
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+
+from .utils import bornes_mois, calculer_periodes_mois, date_annee_precedente, grouper_dates_par_periode
+
+
+# Valeurs saisies pour une journée (les périodes en sont calculées)
+COLONNES_JOUR = ["ca_total", "nombre_visites", "pourcentage_ventes", "pourcentage_couleurs", "pourcentage_soins"]
+COLONNES_PERIODE = ["ca_total", "ca_par_jour", "nombre_visites",
+                    "pourcentage_ventes", "pourcentage_couleurs", "pourcentage_soins"]
 
 
 class SuivisManagerDB:
@@ -13,6 +21,9 @@ class SuivisManagerDB:
     def __init__(self):
         self.db = Database()
         self._create_tables()
+        self._migrate_database()
+        self.journal = JournalModifications(self.db, "suivis_manager")
+        self.calendrier = CalendrierDB()
     
     def _create_tables(self):
         """Crée les tables nécessaires pour le module Suivis Manager"""
@@ -39,9 +50,22 @@ class SuivisManagerDB:
             "pourcentage_ventes": "REAL",  # %
             "pourcentage_couleurs": "REAL",  # %
             "pourcentage_soins": "REAL",  # %
+            "source": "TEXT DEFAULT 'saisie'",  # saisie (valeurs tapées), jours (calculées des jours)
             "FOREIGN KEY (suivi_id)": "REFERENCES suivis_manager(id) ON DELETE CASCADE"
         }
         
+        # Table des valeurs par jour : les périodes en sont la projection
+        jours_table = {
+            "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+            "date": "TEXT NOT NULL",  # Format YYYY-MM-DD
+            "ca_total": "REAL",
+            "nombre_visites": "INTEGER",
+            "pourcentage_ventes": "REAL",  # %
+            "pourcentage_couleurs": "REAL",  # %
+            "pourcentage_soins": "REAL",  # %
+            "source": "TEXT",  # saisie, caisse
+        }
+        
         if not self.db.table_exists("suivis_manager"):
             self.db.create_table("suivis_manager", suivis_table)
             print("Table 'suivis_manager' créée avec succès")
@@ -49,6 +73,44 @@ class SuivisManagerDB:
         if not self.db.table_exists("suivis_manager_periodes"):
             self.db.create_table("suivis_manager_periodes", periodes_table)
             print("Table 'suivis_manager_periodes' créée avec succès")
+        
+        if not self.db.table_exists("suivis_manager_jours"):
+            self.db.create_table("suivis_manager_jours", jours_table)
+            print("Table 'suivis_manager_jours' créée avec succès")
+        
+        # Une ligne par jour ; les agrégats par période parcourent l'index par plage de dates
+        self.db.execute_query(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_suivis_manager_jours_date "
+            "ON suivis_manager_jours (date)"
+        )
+        
+        # Rapprochement avec les suivis collaborateurs (jointure mois -> périodes),
+        # créés aussi sur les bases existantes
+        self.db.execute_query(
+            "CREATE INDEX IF NOT EXISTS idx_suivis_manager_mois "
+            "ON suivis_manager (annee, mois)"
+        )
+        self.db.execute_query(
+            "CREATE INDEX IF NOT EXISTS idx_suivis_manager_periodes_suivi "
+            "ON suivis_manager_periodes (suivi_id, numero_periode)"
+        )
+    
+    def _migrate_database(self):
+        """Migre la base de données pour ajouter les colonnes manquantes"""
+        colonnes = [col['name'] for col in self.db.get_table_info("suivis_manager_periodes")]
+        
+        # Ajouter la colonne source si elle n'existe pas
+        if 'source' not in colonnes:
+            self.db.execute_query("ALTER TABLE suivis_manager_periodes ADD COLUMN source TEXT DEFAULT 'saisie'")
+            # Les périodes qui ont des jours ont été calculées à partir de ces jours
+            self.db.execute_query("""
+                UPDATE suivis_manager_periodes SET source = 'jours'
+                WHERE id IN (
+                    SELECT p.id FROM suivis_manager_periodes p
+                    JOIN suivis_manager_jours j ON j.date BETWEEN p.date_debut AND p.date_fin
+                )
+            """)
+            print("Colonne 'source' ajoutée avec succès")
     
     def creer_suivi(self, mois: int, annee: int) -> Optional[int]:
         """
@@ -67,17 +129,9 @@ class SuivisManagerDB:
             print(f"Un suivi existe déjà pour {mois}/{annee}")
             return existing['id']
         
-        query = """
-            INSERT INTO suivis_manager (mois, annee)
-            VALUES (?, ?)
-        """
-        cursor = self.db.execute_query(query, (mois, annee))
-        
-        if cursor:
-            return cursor.lastrowid
-        return None
+        return self.journal.inserer("suivis_manager", {"mois": mois, "annee": annee})
     
-    def get_suivi_by_mois_annee(self, mois: int, annee: int) -> Optional[Dict[str, Any]]:
+    def get_suivi_by_mois_annee(self, mois: int, annee: int) -> Optional[Suivi]:
         """
         Récupère un suivi par mois et année
         
@@ -86,12 +140,12 @@ class SuivisManagerDB:
             annee: Année
             
         Returns:
-            Dictionnaire avec les données du suivi ou None
+            Suivi ou None
         """
         query = "SELECT * FROM suivis_manager WHERE mois = ? AND annee = ?"
-        return self.db.fetch_one(query, (mois, annee))
+        return self.db.fetch_model(Suivi, query, (mois, annee))
     
-    def get_periodes_by_suivi_id(self, suivi_id: int) -> List[Dict[str, Any]]:
+    def get_periodes_by_suivi_id(self, suivi_id: int) -> List[Periode]:
         """
         Récupère toutes les périodes d'un suivi
         
@@ -106,8 +160,9 @@ class SuivisManagerDB:
             WHERE suivi_id = ? 
             ORDER BY numero_periode
         """
-        return self.db.fetch_all(query, (suivi_id,))
+        return self.db.fetch_models(Periode, query, (suivi_id,))
     
+    @ecriture_atomique(False)
     def sauvegarder_periode(self, suivi_id: int, numero_periode: int, 
                            date_debut: str, date_fin: str,
                            ca_total: Optional[float] = None,
@@ -115,13 +170,30 @@ class SuivisManagerDB:
                            nombre_visites: Optional[int] = None,
                            pourcentage_ventes: Optional[float] = None,
                            pourcentage_couleurs: Optional[float] = None,
-                           pourcentage_soins: Optional[float] = None) -> bool:
+                           pourcentage_soins: Optional[float] = None,
+                           source: str = "saisie") -> bool:
         """
         Sauvegarde ou met à jour une période
         
+        Args:
+            source: Origine des valeurs ('saisie' : tapées dans le tableau,
+                    'jours' : calculées à partir des jours) ; notée seulement
+                    si une valeur change
+        
         Returns:
             True si succès, False sinon
         """
+        valeurs = {
+            "date_debut": date_debut,
+            "date_fin": date_fin,
+            "ca_total": ca_total,
+            "ca_par_jour": ca_par_jour,
+            "nombre_visites": nombre_visites,
+            "pourcentage_ventes": pourcentage_ventes,
+            "pourcentage_couleurs": pourcentage_couleurs,
+            "pourcentage_soins": pourcentage_soins
+        }
+        
         # Vérifier si la période existe
         query_check = """
             SELECT id FROM suivis_manager_periodes 
@@ -129,47 +201,29 @@ class SuivisManagerDB:
         """
         existing = self.db.fetch_one(query_check, (suivi_id, numero_periode))
         
-        if existing:
-            # Mise à jour
-            query = """
-                UPDATE suivis_manager_periodes 
-                SET date_debut = ?, date_fin = ?, ca_total = ?, ca_par_jour = ?,
-                    nombre_visites = ?, pourcentage_ventes = ?, 
-                    pourcentage_couleurs = ?, pourcentage_soins = ?
-                WHERE suivi_id = ? AND numero_periode = ?
-            """
-            cursor = self.db.execute_query(query, (
-                date_debut, date_fin, ca_total, ca_par_jour,
-                nombre_visites, pourcentage_ventes, pourcentage_couleurs,
-                pourcentage_soins, suivi_id, numero_periode
-            ))
-        else:
-            # Insertion
-            query = """
-                INSERT INTO suivis_manager_periodes 
-                (suivi_id, numero_periode, date_debut, date_fin, ca_total, 
-                 ca_par_jour, nombre_visites, pourcentage_ventes, 
-                 pourcentage_couleurs, pourcentage_soins)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            cursor = self.db.execute_query(query, (
-                suivi_id, numero_periode, date_debut, date_fin, ca_total,
-                ca_par_jour, nombre_visites, pourcentage_ventes,
-                pourcentage_couleurs, pourcentage_soins
-            ))
-        
-        # Mettre à jour la date de modification du suivi
-        if cursor:
-            update_query = """
-                UPDATE suivis_manager 
-                SET updated_at = CURRENT_TIMESTAMP 
-                WHERE id = ?
-            """
-            self.db.execute_query(update_query, (suivi_id,))
-            return True
-        
-        return False
+        with self.journal.lot("Saisie"):
+            if existing:
+                # Mise à jour des seules colonnes modifiées
+                nb_modifiees = self.journal.mettre_a_jour("suivis_manager_periodes", existing['id'], valeurs)
+                if nb_modifiees:
+                    self.journal.mettre_a_jour("suivis_manager_periodes", existing['id'], {"source": source})
+            else:
+                # Insertion
+                valeurs.update({"suivi_id": suivi_id, "numero_periode": numero_periode, "source": source})
+                nb_modifiees = 1 if self.journal.inserer("suivis_manager_periodes", valeurs) else None
+            
+            # Mettre à jour la date de modification du suivi
+            if nb_modifiees:
+                update_query = """
+                    UPDATE suivis_manager 
+                    SET updated_at = CURRENT_TIMESTAMP 
+                    WHERE id = ?
+                """
+                self.db.execute_query(update_query, (suivi_id,))
+        
+        return nb_modifiees is not None
     
+    @ecriture_atomique(False)
     def supprimer_suivi(self, suivi_id: int) -> bool:
         """
         Supprime un suivi et toutes ses périodes
@@ -180,11 +234,18 @@ class SuivisManagerDB:
         Returns:
             True si succès, False sinon
         """
-        query = "DELETE FROM suivis_manager WHERE id = ?"
-        cursor = self.db.execute_query(query, (suivi_id,))
-        return cursor is not None
+        suivi = self.db.fetch_one("SELECT mois, annee FROM suivis_manager WHERE id = ?", (suivi_id,))
+        
+        # Les clés étrangères ne sont pas activées : supprimer les périodes explicitement
+        with self.journal.lot("Réinitialisation du mois"):
+            # Les jours du mois aussi, sans quoi le prochain recalcul referait les périodes
+            if suivi and not self.journal.supprimer(
+                    "suivis_manager_jours", "date BETWEEN ? AND ?", bornes_mois(suivi['mois'], suivi['annee'])):
+                return False
+            return (self.journal.supprimer("suivis_manager_periodes", "suivi_id = ?", (suivi_id,))
+                    and self.journal.supprimer("suivis_manager", "id = ?", (suivi_id,)))
     
-    def get_tous_les_suivis(self) -> List[Dict[str, Any]]:
+    def get_tous_les_suivis(self) -> List[Suivi]:
         """
         Récupère tous les suivis existants
         
@@ -192,4 +253,352 @@ class SuivisManagerDB:
             Liste des suivis
         """
         query = "SELECT * FROM suivis_manager ORDER BY annee DESC, mois DESC"
-        return self.db.fetch_all(query)
\ No newline at end of file
+        return self.db.fetch_models(Suivi, query)
+    
+    def get_analyse_mois(self, mois: int, annee: int) -> Dict[int, Dict[str, Any]]:
+        """
+        Calcule les cumuls, évolutions et rangs des périodes d'un mois
+        
+        Tout est calculé par SQLite (fonctions de fenêtrage) dans une seule
+        requête : cumul depuis le début du mois, écart avec la dernière période
+        renseignée et rang de la période sur le C.A. du mois.
+        
+        Args:
+            mois: Numéro du mois (1-12)
+            annee: Année
+            
+        Returns:
+            {numero_periode: {'ca_cumule', 'visites_cumulees', 'evolution_ca',
+            'evolution_visites', 'rang_ca', 'nb_classees'}} (None si la
+            période n'a pas de valeur)
+        """
+        query = """
+            SELECT p.numero_periode,
+                   CASE WHEN p.ca_total IS NOT NULL
+                        THEN SUM(p.ca_total) OVER cumul END AS ca_cumule,
+                   CASE WHEN p.nombre_visites IS NOT NULL
+                        THEN SUM(p.nombre_visites) OVER cumul END AS visites_cumulees,
+                   p.ca_total - LAG(p.ca_total) OVER (
+                       PARTITION BY p.ca_total IS NULL ORDER BY p.numero_periode
+                   ) AS evolution_ca,
+                   p.nombre_visites - LAG(p.nombre_visites) OVER (
+                       PARTITION BY p.nombre_visites IS NULL ORDER BY p.numero_periode
+                   ) AS evolution_visites,
+                   CASE WHEN p.ca_total IS NOT NULL
+                        THEN RANK() OVER (ORDER BY p.ca_total IS NULL, p.ca_total DESC) END AS rang_ca,
+                   COUNT(p.ca_total) OVER () AS nb_classees
+            FROM suivis_manager s
+            JOIN suivis_manager_periodes p ON p.suivi_id = s.id
+            WHERE s.mois = ? AND s.annee = ?
+            WINDOW ordre AS (ORDER BY p.numero_periode),
+                   cumul AS (ordre ROWS UNBOUNDED PRECEDING)
+            ORDER BY p.numero_periode
+        """
+        return {ligne['numero_periode']: ligne for ligne in self.db.fetch_all(query, (mois, annee))}
+    
+    def get_comparaison_n1(self, mois: int, annee: int) -> Dict[int, Dict[str, Any]]:
+        """
+        Compare les périodes d'un mois avec les mêmes dates de l'année précédente
+        
+        Chaque période N est comparée à l'intervalle [date_debut, date_fin]
+        décalé d'un an, quelles que soient les périodes N-1 qui le couvrent
+        (leurs bornes ne tombent pas aux mêmes dates d'une année à l'autre).
+        Une période N-1 calculée à partir de ses jours contribue par la somme
+        de ses jours compris dans l'intervalle ; une période saisie directement,
+        au prorata de ses jours d'ouverture compris dans l'intervalle.
+        
+        Args:
+            mois: Numéro du mois (1-12)
+            annee: Année N
+            
+        Returns:
+            {numero_periode: {'ca_total', 'ca_total_n1', 'ecart_ca_n1',
+            'evolution_ca_n1' (en %), 'nombre_visites', 'nombre_visites_n1',
+            'ecart_visites_n1', 'date_debut_n1', 'date_fin_n1'}}
+            (None si une des deux valeurs manque)
+        """
+        query_n = """
+            SELECT p.numero_periode, p.date_debut, p.date_fin, p.ca_total, p.nombre_visites
+            FROM suivis_manager s
+            JOIN suivis_manager_periodes p ON p.suivi_id = s.id
+            WHERE s.mois = ? AND s.annee = ?
+        """
+        valeurs_n = {ligne['numero_periode']: ligne for ligne in self.db.fetch_all(query_n, (mois, annee))}
+        
+        # Intervalles N-1 : périodes enregistrées, à défaut celles du calendrier
+        intervalles = {
+            numero: (date_annee_precedente(debut.strftime("%Y-%m-%d")),
+                     date_annee_precedente(fin.strftime("%Y-%m-%d")))
+            for numero, (debut, fin) in enumerate(calculer_periodes_mois(mois, annee), start=1)
+        }
+        for numero, ligne in valeurs_n.items():
+            intervalles[numero] = (date_annee_precedente(ligne['date_debut']),
+                                   date_annee_precedente(ligne['date_fin']))
+        debut_n1 = min(debut for debut, _ in intervalles.values())
+        fin_n1 = max(fin for _, fin in intervalles.values())
+        
+        # Périodes N-1 chevauchant l'intervalle (sur un ou deux mois) et leurs jours
+        query_n1 = """
+            SELECT p.date_debut, p.date_fin, p.ca_total, p.nombre_visites,
+                   p.source <> 'saisie' AND EXISTS (
+                       SELECT 1 FROM suivis_manager_jours j
+                       WHERE j.date BETWEEN p.date_debut AND p.date_fin
+                   ) AS par_jours
+            FROM suivis_manager_periodes p
+            WHERE p.date_debut <= ? AND p.date_fin >= ?
+        """
+        periodes_n1 = self.db.fetch_all(query_n1, (fin_n1, debut_n1))
+        jours_n1 = self.get_jours(debut_n1, fin_n1)
+        
+        # Recouvrements (période N, période N-1) à répartir au prorata
+        recouvrements = []
+        for numero, (debut, fin) in intervalles.items():
+            for periode in periodes_n1:
+                debut_commun = max(debut, periode['date_debut'])
+                fin_commune = min(fin, periode['date_fin'])
+                if debut_commun <= fin_commune:
+                    recouvrements.append((numero, periode, debut_commun, fin_commune))
+        jours_ouvres = self.calendrier.compter_jours_ouvres_periodes(
+            [(debut, fin) for _, _, debut, fin in recouvrements]
+            + [(periode['date_debut'], periode['date_fin']) for periode in periodes_n1]
+        )
+        ouvres_recouvrement = jours_ouvres[:len(recouvrements)]
+        ouvres_periode = dict(zip(map(id, periodes_n1), jours_ouvres[len(recouvrements):]))
+        
+        cumuls: Dict[int, Dict[str, Optional[float]]] = {
+            numero: {'ca_total': None, 'nombre_visites': None} for numero in intervalles
+        }
+        for (numero, periode, debut, fin), nb_ouvres in zip(recouvrements, ouvres_recouvrement):
+            if periode['par_jours']:
+                jours = [jour for jour in jours_n1 if debut <= jour['date'] <= fin]
+                parts = {colonne: [jour[colonne] for jour in jours if jour[colonne] is not None]
+                         for colonne in ('ca_total', 'nombre_visites')}
+                parts = {colonne: sum(valeurs) if valeurs else None for colonne, valeurs in parts.items()}
+            else:
+                nb_ouvres_periode = ouvres_periode[id(periode)]
+                parts = {
+                    colonne: periode[colonne] * nb_ouvres / nb_ouvres_periode
+                    if periode[colonne] is not None and nb_ouvres_periode else None
+                    for colonne in ('ca_total', 'nombre_visites')
+                }
+            for colonne, part in parts.items():
+                if part is not None:
+                    cumuls[numero][colonne] = (cumuls[numero][colonne] or 0) + part
+        
+        comparaison = {}
+        for numero, (debut, fin) in sorted(intervalles.items()):
+            ligne_n = valeurs_n.get(numero, {})
+            ca_total, nombre_visites = ligne_n.get('ca_total'), ligne_n.get('nombre_visites')
+            ca_total_n1, nombre_visites_n1 = cumuls[numero]['ca_total'], cumuls[numero]['nombre_visites']
+            if ca_total is None and ca_total_n1 is None and nombre_visites is None and nombre_visites_n1 is None:
+                continue
+            
+            if ca_total_n1 is not None:
+                ca_total_n1 = round(ca_total_n1, 2)
+            if nombre_visites_n1 is not None:
+                nombre_visites_n1 = round(nombre_visites_n1)
+            comparer = ca_total is not None and ca_total_n1 is not None
+            comparer_visites = nombre_visites is not None and nombre_visites_n1 is not None
+            comparaison[numero] = {
+                'numero_periode': numero,
+                'ca_total': ca_total,
+                'ca_total_n1': ca_total_n1,
+                'ecart_ca_n1': round(ca_total - ca_total_n1, 2) if comparer else None,
+                'evolution_ca_n1': (ca_total - ca_total_n1) * 100.0 / ca_total_n1
+                if comparer and ca_total_n1 else None,
+                'nombre_visites': nombre_visites,
+                'nombre_visites_n1': nombre_visites_n1,
+                'ecart_visites_n1': nombre_visites - nombre_visites_n1 if comparer_visites else None,
+                'date_debut_n1': debut,
+                'date_fin_n1': fin
+            }
+        return comparaison
+    
+    # ========== VALEURS PAR JOUR ==========
+    
+    def get_jours(self, date_debut: str, date_fin: str) -> List[Dict[str, Any]]:
+        """
+        Récupère les valeurs saisies ou importées jour par jour
+        
+        Args:
+            date_debut: Premier jour (YYYY-MM-DD, inclus)
+            date_fin: Dernier jour (YYYY-MM-DD, inclus)
+            
+        Returns:
+            Liste des jours renseignés, par date
+        """
+        query = """
+            SELECT * FROM suivis_manager_jours
+            WHERE date BETWEEN ? AND ?
+            ORDER BY date
+        """
+        return self.db.fetch_all(query, (date_debut, date_fin))
+    
+    @ecriture_atomique(False)
+    def sauvegarder_jours(self, jours: List[Dict[str, Any]], source: str = "saisie",
+                          remplacer_saisies: bool = False) -> bool:
+        """
+        Enregistre des jours puis recalcule les périodes qui les contiennent
+        
+        Jours et périodes sont écrits en une seule action annulable.
+        
+        Args:
+            jours: Liste de {'date': 'YYYY-MM-DD', 'ca_total', 'nombre_visites',
+                   'pourcentage_ventes', 'pourcentage_couleurs', 'pourcentage_soins'}
+            source: Origine des valeurs ('saisie' ou 'caisse')
+            remplacer_saisies: Recalcule aussi les périodes dont les valeurs
+                               ont été tapées directement (voir recalculer_periodes)
+            
+        Returns:
+            True si succès, False sinon
+        """
+        with self.journal.lot("Saisie par jour"):
+            for jour in jours:
+                valeurs = {colonne: jour.get(colonne) for colonne in COLONNES_JOUR}
+                valeurs["source"] = source
+                
+                existing = self.db.fetch_one("SELECT id FROM suivis_manager_jours WHERE date = ?", (jour['date'],))
+                if existing:
+                    resultat = self.journal.mettre_a_jour("suivis_manager_jours", existing['id'], valeurs)
+                else:
+                    valeurs["date"] = jour['date']
+                    resultat = self.journal.inserer("suivis_manager_jours", valeurs)
+                if resultat is None:
+                    return False
+            
+            return self.recalculer_periodes((jour['date'] for jour in jours), remplacer_saisies)
+    
+    def get_agregats_jours(self, periodes: List[Tuple[int, str, str]]) -> Dict[int, Dict[str, Any]]:
+        """
+        Calcule les valeurs de périodes à partir des jours, en une requête
+        
+        Le C.A. /jour est le C.A. rapporté aux jours d'ouverture du calendrier,
+        du début de la période au dernier jour renseigné (moyenne des jours
+        renseignés si aucun n'est ouvert) ; les pourcentages sont pondérés
+        par le nombre de visites de chaque jour.
+        
+        Args:
+            periodes: Tuples (numero_periode, date_debut, date_fin), dates
+                      au format YYYY-MM-DD (incluses)
+            
+        Returns:
+            {numero_periode: {'ca_total', 'ca_par_jour', 'nombre_visites',
+            'pourcentage_ventes', 'pourcentage_couleurs', 'pourcentage_soins'}}
+            (périodes sans aucun jour absentes)
+        """
+        if not periodes:
+            return {}
+        
+        query = f"""
+            WITH periodes (numero_periode, date_debut, date_fin) AS (
+                VALUES {', '.join(['(?, ?, ?)'] * len(periodes))}
+            )
+            SELECT p.numero_periode, p.date_debut, MAX(j.date) AS dernier_jour,
+                   ROUND(SUM(j.ca_total), 2) AS ca_total,
+                   ROUND(AVG(j.ca_total), 2) AS ca_par_jour,
+                   SUM(j.nombre_visites) AS nombre_visites,
+                   ROUND(SUM(j.pourcentage_ventes * j.nombre_visites)
+                         / SUM(CASE WHEN j.pourcentage_ventes IS NOT NULL THEN j.nombre_visites END), 2)
+                       AS pourcentage_ventes,
+                   ROUND(SUM(j.pourcentage_couleurs * j.nombre_visites)
+                         / SUM(CASE WHEN j.pourcentage_couleurs IS NOT NULL THEN j.nombre_visites END), 2)
+                       AS pourcentage_couleurs,
+                   ROUND(SUM(j.pourcentage_soins * j.nombre_visites)
+                         / SUM(CASE WHEN j.pourcentage_soins IS NOT NULL THEN j.nombre_visites END), 2)
+                       AS pourcentage_soins
+            FROM periodes p
+            JOIN suivis_manager_jours j ON j.date BETWEEN p.date_debut AND p.date_fin
+            GROUP BY p.numero_periode
+        """
+        params = tuple(valeur for periode in periodes for valeur in periode)
+        lignes = self.db.fetch_all(query, params)
+        appliquer_ca_par_jour_ouvre(self.calendrier, lignes, "ca_total")
+        return {ligne['numero_periode']: ligne for ligne in lignes}
+    
+    @ecriture_atomique(None)
+    def deriver_ca_par_jour(self, date_debut: str, date_fin: str) -> Optional[int]:
+        """
+        Recalcule le C.A. /jour des périodes d'un intervalle à partir du calendrier
+        
+        Voir modules.calendrier.deriver_ca_par_jour_periodes (une seule action annulable).
+        
+        Args:
+            date_debut: Premier jour (YYYY-MM-DD, inclus)
+            date_fin: Dernier jour (YYYY-MM-DD, inclus)
+            
+        Returns:
+            Nombre de périodes modifiées ou None en cas d'erreur
+        """
+        return deriver_ca_par_jour_periodes(
+            self.journal, self.calendrier, "suivis_manager_periodes", "ca_total", date_debut, date_fin
+        )
+    
+    @ecriture_atomique(False)
+    def recalculer_periodes(self, dates: Iterable[str], remplacer_saisies: bool = False) -> bool:
+        """
+        Recalcule à partir des jours les périodes contenant les dates données
+        
+        Une période dont les valeurs ont été tapées directement dans le
+        tableau est conservée : la somme des quelques jours renseignés ne
+        remplace pas un total saisi, sauf demande explicite.
+        
+        Args:
+            dates: Dates modifiées (format YYYY-MM-DD)
+            remplacer_saisies: Recalcule aussi les périodes tapées directement
+            
+        Returns:
+            True si succès, False sinon
+        """
+        with self.journal.lot("Saisie par jour"):
+            for (mois, annee), numeros in grouper_dates_par_periode(dates).items():
+                periodes = [
+                    (numero, debut.strftime("%Y-%m-%d"), fin.strftime("%Y-%m-%d"))
+                    for numero, (debut, fin) in enumerate(calculer_periodes_mois(mois, annee), start=1)
+                    if numero in numeros
+                ]
+                agregats = self.get_agregats_jours(periodes)
+                
+                suivi = self.get_suivi_by_mois_annee(mois, annee)
+                suivi_id = suivi['id'] if suivi else self.creer_suivi(mois, annee)
+                if not suivi_id:
+                    return False
+                
+                saisies = set() if remplacer_saisies else self._periodes_saisies(suivi_id)
+                for numero, debut, fin in periodes:
+                    if numero in saisies:
+                        print(f"Période {numero} de {mois:02d}/{annee} saisie directement : total conservé")
+                        continue
+                    valeurs = agregats.get(numero, {})
+                    if not self.sauvegarder_periode(
+                            suivi_id, numero, debut, fin,
+                            **{colonne: valeurs.get(colonne) for colonne in COLONNES_PERIODE},
+                            source="jours"):
+                        return False
+        return True
+    
+    def _periodes_saisies(self, suivi_id: int) -> Set[int]:
+        """Numéros des périodes d'un suivi dont les valeurs ont été tapées directement"""
+        query = f"""
+            SELECT numero_periode FROM suivis_manager_periodes
+            WHERE suivi_id = ? AND source = 'saisie'
+              AND COALESCE({', '.join(COLONNES_PERIODE)}) IS NOT NULL
+        """
+        return {ligne['numero_periode'] for ligne in self.db.fetch_all(query, (suivi_id,))}
+    
+    def periode_saisie(self, date_debut: str, date_fin: str) -> bool:
+        """
+        Indique si les valeurs d'une période ont été tapées directement
+        
+        Args:
+            date_debut: Premier jour de la période (YYYY-MM-DD)
+            date_fin: Dernier jour de la période (YYYY-MM-DD)
+            
+        Returns:
+            True si recalculer la période à partir des jours remplacerait un total saisi
+        """
+        query = f"""
+            SELECT 1 FROM suivis_manager_periodes
+            WHERE date_debut = ? AND date_fin = ? AND source = 'saisie'
+              AND COALESCE({', '.join(COLONNES_PERIODE)}) IS NOT NULL
+        """
+        return self.db.fetch_one(query, (date_debut, date_fin)) is not None
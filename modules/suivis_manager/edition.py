@@ -0,0 +1,172 @@
+"""
+Édition par plages des tableaux de suivi
+
+Coller un bloc copié depuis un tableur (texte séparé par des tabulations),
+recopier vers le bas (Ctrl+D) et effacer une sélection (Suppr). Toutes les
+cellules touchées sont modifiées d'un coup, signaux du tableau bloqués,
+puis transmises ensemble à l'écran : une seule mise en forme, une seule
+sauvegarde (une transaction) et une seule action à annuler.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, Qt
+from PySide6.QtGui import QAction, QGuiApplication, QKeySequence
+from PySide6.QtWidgets import QTableWidget, QTableWidgetItem
+
+
+def decouper_tsv(texte: str) -> List[List[str]]:
+    """
+    Découpe le texte copié depuis un tableur en lignes et colonnes
+    
+    Args:
+        texte: Contenu du presse-papiers (lignes séparées par des retours à
+               la ligne, colonnes par des tabulations)
+    
+    Returns:
+        Liste des lignes, chacune étant la liste de ses cellules
+    """
+    lignes = texte.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    
+    # Les tableurs terminent la copie par un retour à la ligne
+    if lignes and lignes[-1] == "":
+        lignes.pop()
+    
+    return [[cellule.strip() for cellule in ligne.split("\t")] for ligne in lignes]
+
+
+class EditionTableau(QObject):
+    """Actions Coller / Recopier vers le bas / Effacer d'un tableau de suivi"""
+    
+    def __init__(self, table: QTableWidget, colonnes: range,
+                 appliquer: Callable[[List[QTableWidgetItem]], None]):
+        """
+        Ajoute les actions au tableau (raccourcis et menu contextuel)
+        
+        Args:
+            table: Tableau de suivi
+            colonnes: Colonnes de saisie (les autres sont des intitulés ou
+                      des valeurs calculées)
+            appliquer: Méthode de l'écran appelée avec les cellules modifiées,
+                       pour les mettre en forme et les sauvegarder en une fois
+        """
+        super().__init__(table)
+        self.table = table
+        self.colonnes = colonnes
+        self._appliquer = appliquer
+        
+        # Raccourcis limités au tableau : pendant la saisie dans une cellule,
+        # Ctrl+V et Suppr gardent leur comportement habituel
+        for libelle, raccourci, action in [
+            ("📋 Coller", QKeySequence.Paste, self.coller),
+            ("⬇️ Recopier vers le bas", QKeySequence("Ctrl+D"), self.recopier_vers_le_bas),
+            ("🗑️ Effacer", QKeySequence.Delete, self.effacer),
+        ]:
+            qaction = QAction(libelle, table)
+            qaction.setShortcut(raccourci)
+            qaction.setShortcutContext(Qt.WidgetShortcut)
+            qaction.triggered.connect(action)
+            table.addAction(qaction)
+        
+        table.setContextMenuPolicy(Qt.ActionsContextMenu)
+    
+    def coller(self):
+        """
+        Colle le contenu du presse-papiers à partir de la cellule courante
+        
+        Une valeur unique est recopiée dans toute la sélection ; un bloc est
+        collé à partir du coin supérieur gauche de la sélection.
+        """
+        lignes = decouper_tsv(QGuiApplication.clipboard().text())
+        if not lignes:
+            return
+        
+        cellules = {}
+        if len(lignes) == 1 and len(lignes[0]) == 1:
+            for ligne, colonne in self._cellules_selectionnees():
+                cellules[(ligne, colonne)] = lignes[0][0]
+        else:
+            depart = self._coin_selection()
+            if depart is None:
+                return
+            for i, valeurs in enumerate(lignes):
+                for j, texte in enumerate(valeurs):
+                    cellules[(depart[0] + i, depart[1] + j)] = texte
+        
+        self._modifier(cellules)
+    
+    def recopier_vers_le_bas(self):
+        """
+        Recopie la première ligne de chaque plage sélectionnée sur les suivantes
+        
+        Si la plage ne compte qu'une ligne, c'est la ligne du dessus qui est recopiée.
+        """
+        cellules = {}
+        for plage in self.table.selectedRanges():
+            haut = plage.topRow()
+            if plage.rowCount() == 1:
+                haut -= 1
+            if haut < 0:
+                continue
+            
+            for colonne in range(plage.leftColumn(), plage.rightColumn() + 1):
+                source = self.table.item(haut, colonne)
+                texte = source.text() if source else ""
+                for ligne in range(haut + 1, plage.bottomRow() + 1):
+                    cellules[(ligne, colonne)] = texte
+        
+        self._modifier(cellules)
+    
+    def effacer(self):
+        """Vide les cellules sélectionnées"""
+        self._modifier({cellule: "" for cellule in self._cellules_selectionnees()})
+    
+    def _cellules_selectionnees(self) -> List[Tuple[int, int]]:
+        """Renvoie les (ligne, colonne) de toutes les cellules sélectionnées"""
+        return [
+            (ligne, colonne)
+            for plage in self.table.selectedRanges()
+            for ligne in range(plage.topRow(), plage.bottomRow() + 1)
+            for colonne in range(plage.leftColumn(), plage.rightColumn() + 1)
+        ]
+    
+    def _coin_selection(self) -> Optional[Tuple[int, int]]:
+        """Renvoie la cellule en haut à gauche de la sélection (ou la cellule courante)"""
+        cellules = self._cellules_selectionnees()
+        if cellules:
+            return min(ligne for ligne, _ in cellules), min(colonne for _, colonne in cellules)
+        if self.table.currentRow() < 0:
+            return None
+        return self.table.currentRow(), self.table.currentColumn()
+    
+    def _modifier(self, cellules: Dict[Tuple[int, int], str]):
+        """
+        Écrit les textes dans le tableau, signaux bloqués, puis les transmet à l'écran
+        
+        Les cellules hors du tableau ou des colonnes de saisie et les cellules
+        non modifiables sont ignorées.
+        
+        Args:
+            cellules: Texte par cellule {(ligne, colonne): texte}
+        """
+        modifiees = []
+        self.table.blockSignals(True)
+        for (ligne, colonne), texte in cellules.items():
+            if ligne >= self.table.rowCount() or colonne not in self.colonnes:
+                continue
+            
+            item = self.table.item(ligne, colonne)
+            if item is None:
+                item = QTableWidgetItem()
+                item.setTextAlignment(Qt.AlignCenter)
+                self.table.setItem(ligne, colonne, item)
+            elif not item.flags() & Qt.ItemIsEditable:
+                continue
+            
+            if item.text() != texte:
+                item.setText(texte)
+                modifiees.append(item)
+        self.table.blockSignals(False)
+        
+        if modifiees:
+            self._appliquer(modifiees)
@@ -0,0 +1,168 @@
+"""
+Saisie jour par jour d'une période de suivi
+
+Les jours sont la source des suivis : les valeurs d'une période sont
+recalculées à partir de ses jours à chaque enregistrement. Le même
+dialogue sert au Suivi Manager (C.A. total) et aux suivis des
+collaborateurs (C.A. prestation).
+"""
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QLabel, QDialogButtonBox, QMessageBox,
+    QTableWidget, QTableWidgetItem, QHeaderView
+)
+from PySide6.QtCore import Qt
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from .utils import parser_montant, parser_pourcentage
+
+
+JOURS_SEMAINE = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]
+
+# Colonnes saisies après celle du C.A. : (clé, intitulé, pourcentage)
+COLONNES_DETAIL = [
+    ("nombre_visites", "Nombre de Visites", False),
+    ("pourcentage_ventes", "% Ventes", True),
+    ("pourcentage_couleurs", "% Couleurs", True),
+    ("pourcentage_soins", "% Soins", True),
+]
+
+
+def formater_valeur_jour(valeur: Optional[float], entier: bool = False) -> str:
+    """Formate une valeur de jour pour la saisie (virgule décimale, vide si None)"""
+    if valeur is None:
+        return ""
+    if entier:
+        return str(int(valeur))
+    return f"{valeur:.2f}".replace('.', ',')
+
+
+class DetailJoursDialog(QDialog):
+    """Dialog de saisie des valeurs d'une période jour par jour"""
+    
+    def __init__(self, titre: str, date_debut: datetime, date_fin: datetime,
+                 jours: List[Dict[str, Any]], colonne_ca: str = "ca_total",
+                 libelle_ca: str = "C.A. Total", parent=None):
+        """
+        Args:
+            titre: Titre du dialogue (période affichée)
+            date_debut: Premier jour de la période
+            date_fin: Dernier jour de la période
+            jours: Jours déjà renseignés (get_jours() de la base du module)
+            colonne_ca: Colonne du C.A. ('ca_total' ou 'ca_prestation')
+            libelle_ca: Intitulé de la colonne du C.A.
+        """
+        super().__init__(parent)
+        self.setWindowTitle(titre)
+        self.setModal(True)
+        self.resize(800, 450)
+        
+        self.colonnes = [(colonne_ca, libelle_ca, False)] + COLONNES_DETAIL
+        self.jours_initiaux = {jour['date']: jour for jour in jours}
+        self.dates = []
+        date = date_debut
+        while date <= date_fin:
+            self.dates.append(date)
+            date += timedelta(days=1)
+        
+        layout = QVBoxLayout(self)
+        
+        aide = QLabel(
+            "Les valeurs de la période sont recalculées à partir des jours "
+            "(C.A. et visites additionnés, pourcentages pondérés par les visites)."
+        )
+        aide.setWordWrap(True)
+        layout.addWidget(aide)
+        
+        # Tableau : une ligne par jour
+        self.table = QTableWidget(len(self.dates), len(self.colonnes) + 2)
+        self.table.setHorizontalHeaderLabels(
+            ["Jour"] + [libelle for _, libelle, _ in self.colonnes] + ["Source"]
+        )
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        for i in range(1, len(self.colonnes) + 2):
+            header.setSectionResizeMode(i, QHeaderView.Stretch)
+        
+        for i, date in enumerate(self.dates):
+            jour = self.jours_initiaux.get(date.strftime("%Y-%m-%d"), {})
+            
+            item = QTableWidgetItem(f"{JOURS_SEMAINE[date.weekday()]} {date.strftime('%d/%m')}")
+            item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+            item.setBackground(Qt.lightGray)
+            self.table.setItem(i, 0, item)
+            
+            for col, (cle, _, _) in enumerate(self.colonnes, start=1):
+                item = QTableWidgetItem(formater_valeur_jour(jour.get(cle), cle == "nombre_visites"))
+                item.setTextAlignment(Qt.AlignCenter)
+                self.table.setItem(i, col, item)
+            
+            item = QTableWidgetItem(jour.get('source') or "")
+            item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+            item.setTextAlignment(Qt.AlignCenter)
+            self.table.setItem(i, len(self.colonnes) + 1, item)
+        
+        layout.addWidget(self.table)
+        
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+        
+        self.jours_modifies: List[Dict[str, Any]] = []
+    
+    def _lire_valeur(self, i: int, col: int) -> tuple:
+        """
+        Lit une cellule de saisie
+        
+        Returns:
+            (valeur ou None, True si la cellule est valide)
+        """
+        cle, _, est_pourcentage = self.colonnes[col - 1]
+        texte = self.table.item(i, col).text().strip().replace(',', '.')
+        if not texte:
+            return None, True
+        
+        valeur = parser_pourcentage(texte) if est_pourcentage else parser_montant(texte)
+        if valeur is None:
+            return None, False
+        if cle == "nombre_visites":
+            return (int(valeur), True) if valeur == int(valeur) and valeur >= 0 else (None, False)
+        return valeur, True
+    
+    def get_jours(self) -> List[Dict[str, Any]]:
+        """
+        Récupère les jours modifiés (après validation du dialogue)
+        
+        Returns:
+            Liste de {'date': 'YYYY-MM-DD', colonnes saisies}, seulement pour
+            les jours dont une valeur a changé
+        """
+        return self.jours_modifies
+    
+    def accept(self):
+        """Valide la saisie et retient les jours modifiés"""
+        jours_modifies = []
+        for i, date in enumerate(self.dates):
+            date_texte = date.strftime("%Y-%m-%d")
+            jour = {'date': date_texte}
+            for col, (cle, libelle, _) in enumerate(self.colonnes, start=1):
+                valeur, valide = self._lire_valeur(i, col)
+                if not valide:
+                    QMessageBox.warning(
+                        self, "Valeur invalide",
+                        f"{libelle} du {date.strftime('%d/%m/%Y')} : "
+                        f"« {self.table.item(i, col).text()} » n'est pas un nombre valide."
+                    )
+                    self.table.setCurrentCell(i, col)
+                    return
+                jour[cle] = valeur
+            
+            initial = self.jours_initiaux.get(date_texte, {})
+            if any(jour[cle] != initial.get(cle) for cle, _, _ in self.colonnes):
+                jours_modifies.append(jour)
+        
+        self.jours_modifies = jours_modifies
+        super().accept()
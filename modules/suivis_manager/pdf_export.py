@@ -3,23 +3,102 @@ Génération de PDF pour le module Suivis Manager
 """
 
 from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
+from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from .utils import formater_montant, formater_pourcentage, charger_objectifs, charger_info_salon
+from .rapprochement import decrire_ecarts
+from .utils import (
+    formater_montant, formater_pourcentage, formater_evolution,
+    charger_objectifs, charger_info_salon
+)
+
+
+def creer_annexe_rapprochement(rapprochement: List[Dict[str, Any]], largeur_totale: float,
+                               titre_style: ParagraphStyle) -> list:
+    """
+    Crée la page annexe du rapprochement équipe / salon
+    
+    Args:
+        rapprochement: Périodes rapprochées (RapprochementSuivis.rapprocher)
+        largeur_totale: Largeur disponible pour le tableau
+        titre_style: Style du titre de l'annexe
+    
+    Returns:
+        Éléments à ajouter au document (vide si aucune période n'est rapprochée)
+    """
+    if not rapprochement:
+        return []
+    
+    texte_style = ParagraphStyle('Rapprochement', fontName='Helvetica', fontSize=7, leading=9)
+    data = [['Période', 'C.A. salon', 'C.A. équipe', 'Non attribué',
+             'Visites salon', 'Visites équipe', 'Contrôle']]
+    lignes_signalees = []
+    for ligne in rapprochement:
+        debut = datetime.strptime(ligne['date_debut'], "%Y-%m-%d").strftime("%d/%m")
+        fin = datetime.strptime(ligne['date_fin'], "%Y-%m-%d").strftime("%d/%m")
+        ecarts = decrire_ecarts(ligne)
+        if ecarts:
+            lignes_signalees.append(len(data))
+        data.append([
+            f"{debut} - {fin}",
+            formater_montant(ligne['ca_manager']),
+            formater_montant(ligne['ca_collaborateurs']),
+            formater_pourcentage(ligne['part_non_attribuee']),
+            "" if ligne['visites_manager'] is None else str(ligne['visites_manager']),
+            "" if ligne['visites_collaborateurs'] is None else str(ligne['visites_collaborateurs']),
+            Paragraph("<br/>".join(ecarts) if ecarts else "OK", texte_style)
+        ])
+    
+    col_widths = [largeur_totale * 0.12] + [largeur_totale * 0.1] * 5 + [largeur_totale * 0.38]
+    table = Table(data, colWidths=col_widths)
+    style_commands = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#5E81AC')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('ALIGN', (0, 0), (-2, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#E5E9F0')),
+        ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#5E81AC')),
+    ]
+    for index in lignes_signalees:
+        style_commands.append(('BACKGROUND', (0, index), (-1, index), colors.HexColor('#FDEBD0')))
+        style_commands.append(('TEXTCOLOR', (0, index), (-2, index), colors.HexColor('#B22222')))
+    table.setStyle(TableStyle(style_commands))
+    
+    return [
+        PageBreak(),
+        Paragraph("ANNEXE - RAPPROCHEMENT ÉQUIPE / SALON", titre_style),
+        Spacer(1, 0.3*cm),
+        table
+    ]
 
 
 class SuivisManagerPDFExporter:
     """Classe pour exporter les données du Suivis Manager en PDF"""
     
-    def __init__(self, objectifs: Dict[str, float] = None):
+    def __init__(self, objectifs: Dict[str, float] = None,
+                 objectifs_periodes: List[Dict[str, float]] = None):
+        """
+        Args:
+            objectifs: Objectifs du mois
+            objectifs_periodes: Objectifs de chaque période (ObjectifsPeriodes), None pour
+                appliquer les objectifs du mois à toutes les périodes
+        """
         self.styles = getSampleStyleSheet()
         self._setup_styles()
         self.objectifs = objectifs or {}
+        self.objectifs_periodes = objectifs_periodes or []
+    
+    def _objectifs_periode(self, i: int) -> Dict[str, float]:
+        """Objectifs de la i-ème période (objectifs du mois à défaut)"""
+        if 0 <= i < len(self.objectifs_periodes):
+            return self.objectifs_periodes[i]
+        return self.objectifs
     
     def _setup_styles(self):
         """Configure les styles pour le PDF"""
@@ -73,7 +152,10 @@ class SuivisManagerPDFExporter:
             return colors.HexColor('#B22222')  # Rouge brique
     
     def generer_pdf(self, filepath: str, mois: str, annee: int, 
-                    periodes_data: List[tuple], donnees: List[Dict[str, Any]]) -> bool:
+                    periodes_data: List[tuple], donnees: List[Dict[str, Any]],
+                    analyse: Optional[List[Dict[str, Any]]] = None,
+                    comparaison: Optional[List[Dict[str, Any]]] = None,
+                    rapprochement: Optional[List[Dict[str, Any]]] = None) -> bool:
         """
         Génère un PDF avec les données du suivi manager
         
@@ -83,15 +165,22 @@ class SuivisManagerPDFExporter:
             annee: Année
             periodes_data: Liste des tuples (date_debut, date_fin)
             donnees: Liste des dictionnaires de données par période
+            analyse: Cumuls et évolutions par période (get_analyse_mois), ajoutés
+                     en colonnes C.A. cumulé / Évol. C.A. si fournis
+            comparaison: Valeurs N-1 par période (get_comparaison_n1), ajoutées
+                         en colonnes C.A. N-1 / Écart N-1 / Écart obj. si fournies
+                         (page en paysage)
+            rapprochement: Périodes rapprochées avec les suivis collaborateurs
+                           (RapprochementSuivis), ajoutées en annexe si fournies
             
         Returns:
             True si succès, False sinon
         """
         try:
-            # Créer le document en mode PORTRAIT
+            # Créer le document en mode PORTRAIT (PAYSAGE avec la comparaison N-1)
             doc = SimpleDocTemplate(
                 filepath,
-                pagesize=A4,  # Portrait par défaut
+                pagesize=landscape(A4) if comparaison else A4,
                 rightMargin=0,
                 leftMargin=0,
                 topMargin=0,
@@ -121,21 +210,17 @@ class SuivisManagerPDFExporter:
             elements.append(Spacer(1, 0.3*cm))
             
             # Créer le tableau (filtrer les lignes vides)
-            table_data = self._creer_donnees_tableau_filtrees(periodes_data, donnees)
+            table_data = self._creer_donnees_tableau_filtrees(periodes_data, donnees, analyse, comparaison)
             
-            # Largeur totale disponible : 21cm (A4) - 2cm (marges) = 19cm
-            largeur_totale = 19*cm
+            # Largeur totale disponible : 21cm (A4) - 2cm (marges) = 19cm,
+            # 29.7cm - 2cm en paysage
+            largeur_totale = 27.7*cm if comparaison else 19*cm
             
-            # Répartition des colonnes
-            col_widths = [
-                largeur_totale * 0.25,  # Périodes: 25%
-                largeur_totale * 0.125, # C.A. Total: 12.5%
-                largeur_totale * 0.125, # C.A. /Jour: 12.5%
-                largeur_totale * 0.125, # Nombre de Visites: 12.5%
-                largeur_totale * 0.125, # % Ventes: 12.5%
-                largeur_totale * 0.125, # % Couleurs: 12.5%
-                largeur_totale * 0.125  # % Soins: 12.5%
-            ]
+            # Répartition des colonnes : Périodes 25%, le reste à parts égales
+            # (C.A. Total, C.A. /Jour, Nb Visites, % Ventes, % Couleurs, % Soins,
+            # puis C.A. cumulé et Évol. C.A. avec l'analyse, et les colonnes N-1)
+            nb_colonnes = len(table_data[0]) - 1
+            col_widths = [largeur_totale * 0.25] + [largeur_totale * 0.75 / nb_colonnes] * nb_colonnes
             
             # Créer le tableau avec ReportLab
             table = Table(table_data, colWidths=col_widths)
@@ -188,59 +273,70 @@ class SuivisManagerPDFExporter:
                 if not has_data:
                     continue
                 
+                objectifs = self._objectifs_periode(i)
+                
                 # C.A. Total (colonne 1)
                 ca_total = data.get('ca_total')
-                if ca_total and self.objectifs.get('ca_total'):
-                    couleur = self._get_couleur_objectif(ca_total, self.objectifs['ca_total'])
+                if ca_total and objectifs.get('ca_total'):
+                    couleur = self._get_couleur_objectif(ca_total, objectifs['ca_total'])
                     style_commands.append(('TEXTCOLOR', (1, ligne_actuelle), (1, ligne_actuelle), couleur))
-                    if ca_total >= self.objectifs['ca_total']:
+                    if ca_total >= objectifs['ca_total']:
                         style_commands.append(('FONTNAME', (1, ligne_actuelle), (1, ligne_actuelle), 'Helvetica-Bold'))
                 
                 # C.A. /Jour (colonne 2)
                 ca_jour = data.get('ca_par_jour')
-                if ca_jour and self.objectifs.get('ca_jour'):
-                    couleur = self._get_couleur_objectif(ca_jour, self.objectifs['ca_jour'])
+                if ca_jour and objectifs.get('ca_jour'):
+                    couleur = self._get_couleur_objectif(ca_jour, objectifs['ca_jour'])
                     style_commands.append(('TEXTCOLOR', (2, ligne_actuelle), (2, ligne_actuelle), couleur))
-                    if ca_jour >= self.objectifs['ca_jour']:
+                    if ca_jour >= objectifs['ca_jour']:
                         style_commands.append(('FONTNAME', (2, ligne_actuelle), (2, ligne_actuelle), 'Helvetica-Bold'))
                 
                 # Nombre de Visites (colonne 3)
                 nb_visites = data.get('nombre_visites')
-                if nb_visites and self.objectifs.get('nb_clients'):
-                    couleur = self._get_couleur_objectif(float(nb_visites), self.objectifs['nb_clients'])
+                if nb_visites and objectifs.get('nb_clients'):
+                    couleur = self._get_couleur_objectif(float(nb_visites), objectifs['nb_clients'])
                     style_commands.append(('TEXTCOLOR', (3, ligne_actuelle), (3, ligne_actuelle), couleur))
-                    if nb_visites >= self.objectifs['nb_clients']:
+                    if nb_visites >= objectifs['nb_clients']:
                         style_commands.append(('FONTNAME', (3, ligne_actuelle), (3, ligne_actuelle), 'Helvetica-Bold'))
                 
                 # % Ventes (colonne 4)
                 pct_ventes = data.get('pourcentage_ventes')
-                if pct_ventes and self.objectifs.get('pct_ventes'):
-                    couleur = self._get_couleur_objectif(pct_ventes, self.objectifs['pct_ventes'])
+                if pct_ventes and objectifs.get('pct_ventes'):
+                    couleur = self._get_couleur_objectif(pct_ventes, objectifs['pct_ventes'])
                     style_commands.append(('TEXTCOLOR', (4, ligne_actuelle), (4, ligne_actuelle), couleur))
-                    if pct_ventes >= self.objectifs['pct_ventes']:
+                    if pct_ventes >= objectifs['pct_ventes']:
                         style_commands.append(('FONTNAME', (4, ligne_actuelle), (4, ligne_actuelle), 'Helvetica-Bold'))
                 
                 # % Couleurs (colonne 5)
                 pct_couleurs = data.get('pourcentage_couleurs')
-                if pct_couleurs and self.objectifs.get('pct_couleurs'):
-                    couleur = self._get_couleur_objectif(pct_couleurs, self.objectifs['pct_couleurs'])
+                if pct_couleurs and objectifs.get('pct_couleurs'):
+                    couleur = self._get_couleur_objectif(pct_couleurs, objectifs['pct_couleurs'])
                     style_commands.append(('TEXTCOLOR', (5, ligne_actuelle), (5, ligne_actuelle), couleur))
-                    if pct_couleurs >= self.objectifs['pct_couleurs']:
+                    if pct_couleurs >= objectifs['pct_couleurs']:
                         style_commands.append(('FONTNAME', (5, ligne_actuelle), (5, ligne_actuelle), 'Helvetica-Bold'))
                 
                 # % Soins (colonne 6)
                 pct_soins = data.get('pourcentage_soins')
-                if pct_soins and self.objectifs.get('pct_soins'):
-                    couleur = self._get_couleur_objectif(pct_soins, self.objectifs['pct_soins'])
+                if pct_soins and objectifs.get('pct_soins'):
+                    couleur = self._get_couleur_objectif(pct_soins, objectifs['pct_soins'])
                     style_commands.append(('TEXTCOLOR', (6, ligne_actuelle), (6, ligne_actuelle), couleur))
-                    if pct_soins >= self.objectifs['pct_soins']:
+                    if pct_soins >= objectifs['pct_soins']:
                         style_commands.append(('FONTNAME', (6, ligne_actuelle), (6, ligne_actuelle), 'Helvetica-Bold'))
                 
+                # C.A. cumulé (colonne 7), comparé à l'objectif cumulé depuis le début du mois
+                ca_cumule = analyse[i].get('ca_cumule') if analyse and i < len(analyse) else None
+                if ca_cumule and objectifs.get('ca_total_cumule'):
+                    couleur = self._get_couleur_objectif(ca_cumule, objectifs['ca_total_cumule'])
+                    style_commands.append(('TEXTCOLOR', (7, ligne_actuelle), (7, ligne_actuelle), couleur))
+                    if ca_cumule >= objectifs['ca_total_cumule']:
+                        style_commands.append(('FONTNAME', (7, ligne_actuelle), (7, ligne_actuelle), 'Helvetica-Bold'))
+                
                 ligne_actuelle += 1
             
             table.setStyle(TableStyle(style_commands))
             
             elements.append(table)
+            elements += creer_annexe_rapprochement(rapprochement, largeur_totale, self.titre_style)
             
             # Générer le PDF
             doc.build(elements)
@@ -254,13 +350,17 @@ class SuivisManagerPDFExporter:
             return False
     
     def _creer_donnees_tableau_filtrees(self, periodes_data: List[tuple], 
-                                        donnees: List[Dict[str, Any]]) -> List[List[str]]:
+                                        donnees: List[Dict[str, Any]],
+                                        analyse: Optional[List[Dict[str, Any]]] = None,
+                                        comparaison: Optional[List[Dict[str, Any]]] = None) -> List[List[str]]:
         """
         Crée les données du tableau pour le PDF en filtrant les lignes vides
         
         Args:
             periodes_data: Liste des tuples (date_debut, date_fin)
             donnees: Liste des dictionnaires de données
+            analyse: Cumuls et évolutions par période (optionnel)
+            comparaison: Valeurs N-1 par période (optionnel)
             
         Returns:
             Liste de listes représentant le tableau
@@ -275,6 +375,10 @@ class SuivisManagerPDFExporter:
             '% Couleurs',
             '% Soins'
         ]]
+        if analyse:
+            data[0] += ['C.A. cumulé', 'Évol. C.A.']
+        if comparaison:
+            data[0] += ['C.A. N-1', 'Écart N-1', 'Écart obj.']
         
         # Récupérer le premier jour travaillé
         premier_jour_travaille = periodes_data[0][0] if periodes_data else None
@@ -309,6 +413,23 @@ class SuivisManagerPDFExporter:
                 formater_pourcentage(periode_data.get('pourcentage_soins')) if periode_data.get('pourcentage_soins') else ''
             ]
             
+            if analyse:
+                periode_analyse = analyse[i] if i < len(analyse) else {}
+                row += [
+                    formater_montant(periode_analyse.get('ca_cumule')),
+                    formater_evolution(periode_analyse.get('evolution_ca'))
+                ]
+            
+            if comparaison:
+                periode_n1 = comparaison[i] if i < len(comparaison) else {}
+                ca_total = periode_data.get('ca_total')
+                objectif = self._objectifs_periode(i).get('ca_total')
+                row += [
+                    formater_montant(periode_n1.get('ca_total_n1')),
+                    formater_evolution(periode_n1.get('ecart_ca_n1')),
+                    formater_evolution(ca_total - objectif) if ca_total and objectif else ''
+                ]
+            
             data.append(row)
         
         return data
\ No newline at end of file
@@ -0,0 +1,192 @@
+"""
+Rapprochement des suivis collaborateurs avec le suivi manager
+
+Le C.A. et les visites du salon (suivis_manager_periodes) et ceux de
+chaque collaborateur (suivis_collaborateurs_periodes) sont saisis
+séparément. Pour chaque période renseignée des deux côtés, la somme de
+l'équipe est comparée au total du salon par une seule requête groupée :
+- C.A. : le C.A. prestation de l'équipe ne compte pas les ventes de
+  produits, il doit être inférieur au C.A. total du salon, sans que la part
+  non attribuée dépasse la part plausible des ventes ;
+- visites : chaque ticket est la visite d'un collaborateur, les deux
+  comptes doivent être égaux à la tolérance près.
+
+Les seuils sont lus dans la section [Rapprochement] de config.ini. Le
+contrôle porte sur une liste de mois : les écrans ne relisent que le mois
+enregistré, la ligne de commande contrôle une année entière.
+"""
+
+import configparser
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from modules.bdd import Database
+
+
+# Seuils par défaut (section [Rapprochement] de config.ini)
+SEUILS_RAPPROCHEMENT_DEFAUT = {
+    'ecart_ca_pct': 2.0,  # C.A. équipe supérieur au C.A. salon de plus de ... %
+    'part_non_attribuee_max_pct': 35.0,  # C.A. salon non attribué à l'équipe au-delà de ... %
+    'ecart_visites_pct': 5.0,  # Écart de visites au-delà de ... % des visites du salon
+    'ecart_visites_min': 2.0,  # ... et d'au moins ce nombre de visites
+}
+
+
+def lire_seuils_rapprochement(config_path: str = "config.ini") -> Dict[str, float]:
+    """
+    Lit les seuils du rapprochement (section [Rapprochement] de config.ini)
+    
+    Args:
+        config_path: Chemin du fichier de configuration
+    
+    Returns:
+        Seuils {'ecart_ca_pct', 'part_non_attribuee_max_pct', 'ecart_visites_pct',
+        'ecart_visites_min'} (valeurs par défaut pour les clés absentes)
+    """
+    config = configparser.ConfigParser()
+    if Path(config_path).exists():
+        config.read(config_path, encoding='utf-8')
+    
+    seuils = {}
+    for cle, defaut in SEUILS_RAPPROCHEMENT_DEFAUT.items():
+        try:
+            seuils[cle] = config.getfloat('Rapprochement', cle, fallback=defaut)
+        except ValueError:
+            print(f"Seuil de rapprochement invalide dans {config_path} : {cle}")
+            seuils[cle] = defaut
+    return seuils
+
+
+def decrire_ecarts(ligne: Dict[str, Any]) -> List[str]:
+    """
+    Décrit les écarts signalés d'une période rapprochée
+    
+    Args:
+        ligne: Période rapprochée (RapprochementSuivis.rapprocher)
+    
+    Returns:
+        Messages des écarts, liste vide si la période est cohérente
+    """
+    messages = []
+    if ligne['alerte_ca'] == 'ca_superieur':
+        messages.append(
+            f"C.A. équipe ({ligne['ca_collaborateurs']:.2f} €) supérieur au C.A. salon "
+            f"({ligne['ca_manager']:.2f} €)"
+        )
+    elif ligne['alerte_ca'] == 'ca_non_attribue':
+        messages.append(
+            f"{ligne['part_non_attribuee']:.1f} % du C.A. salon non attribué à l'équipe "
+            f"({ligne['ca_collaborateurs']:.2f} € sur {ligne['ca_manager']:.2f} €)"
+        )
+    if ligne['alerte_visites']:
+        messages.append(
+            f"Visites équipe ({ligne['visites_collaborateurs']}) différentes des visites salon "
+            f"({ligne['visites_manager']}, écart {ligne['ecart_visites']:+d})"
+        )
+    return messages
+
+
+class RapprochementSuivis:
+    """Compare, période par période, la somme des suivis collaborateurs au suivi manager"""
+    
+    def __init__(self, config_path: str = "config.ini"):
+        self.db = Database()
+        self.seuils = lire_seuils_rapprochement(config_path)
+    
+    def rapprocher(self, mois_annees: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        """
+        Rapproche les périodes de plusieurs mois (une seule requête)
+        
+        Seules les périodes renseignées à la fois dans le suivi manager et
+        pour au moins un collaborateur sont comparées.
+        
+        Args:
+            mois_annees: Mois à contrôler [(mois, annee), ...]
+        
+        Returns:
+            Périodes par mois et numéro : {'annee', 'mois', 'numero_periode',
+            'date_debut', 'date_fin', 'ca_manager', 'ca_collaborateurs', 'ecart_ca',
+            'part_non_attribuee' (%), 'visites_manager', 'visites_collaborateurs',
+            'ecart_visites', 'alerte_ca' (None, 'ca_superieur' ou 'ca_non_attribue'),
+            'alerte_visites' (0 ou 1), 'nb_collaborateurs'}
+        """
+        if not mois_annees:
+            return []
+        
+        # Paramètres nommés (comme les seuils) : :m0, :a0, :m1, :a1...
+        cibles = ", ".join(f"(:m{i}, :a{i})" for i in range(len(mois_annees)))
+        query = f"""
+            WITH cibles (mois, annee) AS (VALUES {cibles}),
+            salon AS (
+                SELECT s.annee, s.mois, p.numero_periode, p.date_debut, p.date_fin,
+                       p.ca_total AS ca_manager, p.nombre_visites AS visites_manager
+                FROM cibles c
+                JOIN suivis_manager s ON s.annee = c.annee AND s.mois = c.mois
+                JOIN suivis_manager_periodes p ON p.suivi_id = s.id
+            ),
+            equipe AS (
+                SELECT s.annee, s.mois, p.numero_periode,
+                       SUM(p.ca_prestation) AS ca_collaborateurs,
+                       SUM(p.nombre_visites) AS visites_collaborateurs,
+                       COUNT(DISTINCT CASE WHEN p.ca_prestation IS NOT NULL
+                                             OR p.nombre_visites IS NOT NULL
+                                           THEN s.collaborateur_id END) AS nb_collaborateurs
+                FROM cibles c
+                JOIN suivis_collaborateurs s ON s.mois = c.mois AND s.annee = c.annee
+                JOIN suivis_collaborateurs_periodes p ON p.suivi_id = s.id
+                GROUP BY s.annee, s.mois, p.numero_periode
+            )
+            SELECT sa.annee, sa.mois, sa.numero_periode, sa.date_debut, sa.date_fin,
+                   sa.ca_manager, e.ca_collaborateurs,
+                   ROUND(e.ca_collaborateurs - sa.ca_manager, 2) AS ecart_ca,
+                   ROUND((sa.ca_manager - e.ca_collaborateurs) * 100.0
+                         / NULLIF(sa.ca_manager, 0), 1) AS part_non_attribuee,
+                   sa.visites_manager, e.visites_collaborateurs,
+                   e.visites_collaborateurs - sa.visites_manager AS ecart_visites,
+                   CASE
+                       WHEN e.ca_collaborateurs > sa.ca_manager * (1 + :ecart_ca_pct / 100.0)
+                           THEN 'ca_superieur'
+                       WHEN sa.ca_manager - e.ca_collaborateurs
+                            > sa.ca_manager * :part_non_attribuee_max_pct / 100.0
+                           THEN 'ca_non_attribue'
+                   END AS alerte_ca,
+                   COALESCE(ABS(e.visites_collaborateurs - sa.visites_manager)
+                            > MAX(:ecart_visites_min, sa.visites_manager * :ecart_visites_pct / 100.0),
+                            0) AS alerte_visites,
+                   e.nb_collaborateurs
+            FROM salon sa
+            JOIN equipe e USING (annee, mois, numero_periode)
+            WHERE e.nb_collaborateurs > 0
+              AND (sa.ca_manager IS NOT NULL OR sa.visites_manager IS NOT NULL)
+            ORDER BY sa.annee, sa.mois, sa.numero_periode
+        """
+        params = dict(self.seuils)
+        for i, (mois, annee) in enumerate(mois_annees):
+            params[f"m{i}"] = mois
+            params[f"a{i}"] = annee
+        return self.db.fetch_all(query, params)
+    
+    def rapprocher_mois(self, mois: int, annee: int) -> Dict[int, Dict[str, Any]]:
+        """
+        Rapproche les périodes d'un mois
+        
+        Args:
+            mois: Mois (1-12)
+            annee: Année
+        
+        Returns:
+            {numero_periode: période rapprochée (voir rapprocher)}
+        """
+        return {ligne['numero_periode']: ligne for ligne in self.rapprocher([(mois, annee)])}
+    
+    def rapprocher_annee(self, annee: int) -> List[Dict[str, Any]]:
+        """
+        Rapproche les périodes des 12 mois d'une année (une seule requête)
+        
+        Args:
+            annee: Année
+        
+        Returns:
+            Périodes rapprochées de l'année (voir rapprocher)
+        """
+        return self.rapprocher([(mois, annee) for mois in range(1, 13)])
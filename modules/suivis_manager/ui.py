@@ -5,20 +5,29 @@ Interface utilisateur pour le module Suivis Manager
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, 
     QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
-    QMessageBox, QLineEdit, QFileDialog
+    QMessageBox, QLineEdit, QFileDialog, QDialog
 )
 from typing import Optional
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QFont, QColor, QBrush
+from PySide6.QtCore import Qt, Signal, QCoreApplication
+from PySide6.QtGui import QFont, QColor, QBrush, QKeySequence, QShortcut, QAction
 from datetime import datetime
 import calendar
 
 from .pdf_export import SuivisManagerPDFExporter
 from .database import SuivisManagerDB
+from .edition import EditionTableau
+from .jours import DetailJoursDialog
+from .rapprochement import RapprochementSuivis, decrire_ecarts
+from .anomalies import DetecteurAnomalies, INDICATEURS, SALON
+from modules.objectifs.prorata import ObjectifsPeriodes
+from modules.bdd.executeur_qt import ExecuteurQt
+from modules.bdd.autosauvegarde_qt import PlanificateurSauvegarde
+from modules.bdd.cache import CacheLRU
 from .utils import (
     calculer_periodes_mois, formater_periode, formater_montant,
     formater_pourcentage, parser_montant, parser_pourcentage,
-    charger_objectifs, charger_info_salon, nettoyer_nom_fichier
+    formater_evolution, formater_rang, charger_objectifs, charger_info_salon,
+    nettoyer_nom_fichier, mois_voisins
 )
 
 
@@ -39,16 +48,40 @@ def parser_decimal(texte: str) -> Optional[float]:
         return None
 
 
+def creer_item_calcule(texte: str) -> QTableWidgetItem:
+    """Crée une cellule de valeur calculée (non modifiable, grisée)"""
+    item = QTableWidgetItem(texte)
+    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+    item.setTextAlignment(Qt.AlignCenter)
+    item.setForeground(QColor(76, 86, 106))
+    return item
+
+
 class SuivisManagerWidget(QWidget):
     """Widget principal pour le module Suivis Manager"""
     
+    # Périodes d'un mois enregistrées (mois, annee) : le rapprochement des
+    # Suivis Collaborateurs de ce mois est à refaire
+    suivis_enregistres = Signal(int, int)
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.db = SuivisManagerDB()
+        self.executeur = ExecuteurQt(self)  # Accès à la base hors du thread de l'interface
         self.suivi_id_courant = None
+        self.mois_affiche = None  # (mois, annee) des données affichées
         self.periodes_dates = []  # Stocke les dates des périodes
         self.objectifs = {}  # Sera chargé dynamiquement
-        self.donnees_modifiees = False  # Flag pour sauvegarde auto
+        self.objectifs_periodes = []  # Objectifs ramenés à chaque période du mois affiché
+        self.prorata = ObjectifsPeriodes()
+        self.rapprochement = RapprochementSuivis()
+        self.anomalies = DetecteurAnomalies(self.prorata.calendrier)
+        self.references = None  # Historique du salon servant à juger les saisies du mois affiché
+        self.cache = CacheLRU(capacite=12)  # Mois déjà lus : (mois, annee) -> données de _lire_mois
+        # Sauvegarde regroupée après un temps calme (et à chaque changement de données)
+        self.autosauvegarde = PlanificateurSauvegarde(
+            "suivis_manager", self._sauvegarder_donnees_silencieuse, self
+        )
         
         self._init_ui()
         self._charger_mois_courant()
@@ -122,8 +155,41 @@ class SuivisManagerWidget(QWidget):
         """)
         buttons_layout.addWidget(self.btn_reinitialiser)
         
+        self.btn_comparer_n1 = QPushButton("📅 Comparer N-1")
+        self.btn_comparer_n1.setCheckable(True)
+        self.btn_comparer_n1.setToolTip(
+            "Afficher le même mois de l'année précédente et l'écart à l'objectif (aussi dans le PDF)"
+        )
+        self.btn_comparer_n1.toggled.connect(self._afficher_colonnes_n1)
+        buttons_layout.addWidget(self.btn_comparer_n1)
+        
+        self.btn_ca_jour = QPushButton("🧮 Calculer C.A. /jour")
+        self.btn_ca_jour.setToolTip(
+            "Diviser le C.A. de chaque période par ses jours d'ouverture (jours fériés et fermetures exclus)"
+        )
+        self.btn_ca_jour.clicked.connect(self._calculer_ca_par_jour)
+        buttons_layout.addWidget(self.btn_ca_jour)
+        
         buttons_layout.addStretch()
         
+        # État de la sauvegarde automatique
+        self.etat_sauvegarde_label = QLabel()
+        self.autosauvegarde.etat_change.connect(self.etat_sauvegarde_label.setText)
+        buttons_layout.addWidget(self.etat_sauvegarde_label)
+        
+        self.btn_annuler = QPushButton("↩️ Annuler")
+        self.btn_annuler.setToolTip("Annuler la dernière modification (Ctrl+Z)")
+        self.btn_annuler.clicked.connect(self._annuler)
+        buttons_layout.addWidget(self.btn_annuler)
+        
+        self.btn_retablir = QPushButton("↪️ Rétablir")
+        self.btn_retablir.setToolTip("Rétablir la modification annulée (Ctrl+Y)")
+        self.btn_retablir.clicked.connect(self._retablir)
+        buttons_layout.addWidget(self.btn_retablir)
+        
+        QShortcut(QKeySequence.Undo, self, self._annuler)
+        QShortcut(QKeySequence.Redo, self, self._retablir)
+        
         layout.addLayout(buttons_layout)
         
         # Tableau
@@ -150,18 +216,25 @@ class SuivisManagerWidget(QWidget):
     def _creer_tableau(self):
         """Crée le tableau des données"""
         self.table = QTableWidget()
-        self.table.setColumnCount(7)
+        self.table.setColumnCount(15)
         self.table.setHorizontalHeaderLabels([
             "Périodes", "C.A. Total", "C.A. /Jour", "Nombre de Visites",
-            "% Ventes", "% Couleurs", "% Soins"
+            "% Ventes", "% Couleurs", "% Soins",
+            # Colonnes calculées (lecture seule)
+            "C.A. cumulé", "Évolution C.A.", "Visites cumulées", "Rang C.A.",
+            # Comparaison N-1 (affichée à la demande)
+            "C.A. N-1", "Écart N-1", "Écart objectif",
+            # Rapprochement avec les Suivis Collaborateurs
+            "Contrôle équipe"
         ])
         
         self.table.verticalHeader().setVisible(False)
         
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
-        for i in range(1, 7):
+        for i in range(1, 15):
             header.setSectionResizeMode(i, QHeaderView.Stretch)
+        self._afficher_colonnes_n1(self.btn_comparer_n1.isChecked())
         
         self.table.verticalHeader().setDefaultSectionSize(50)
         
@@ -186,7 +259,13 @@ class SuivisManagerWidget(QWidget):
         
         # Connecter les signaux
         self.table.itemChanged.connect(self._on_item_changed)
-        self.table.currentCellChanged.connect(self._on_cell_exit)
+        self.edition = EditionTableau(self.table, range(1, 7), self._appliquer_edition)
+        
+        # Saisie jour par jour : double-clic sur l'intitulé de la période ou menu contextuel
+        self.table.cellDoubleClicked.connect(self._on_cellule_double_cliquee)
+        action_jours = QAction("📅 Détail par jour", self.table)
+        action_jours.triggered.connect(lambda: self._ouvrir_detail_jours(self.table.currentRow()))
+        self.table.addAction(action_jours)
     
     def _charger_mois_courant(self):
         """Charge les données du mois courant"""
@@ -201,8 +280,7 @@ class SuivisManagerWidget(QWidget):
     
     def _on_mois_annee_change_with_save(self):
         """Sauvegarde automatique avant changement de mois/année"""
-        if self.donnees_modifiees:
-            self._sauvegarder_donnees_silencieuse()
+        self.autosauvegarde.vider()
         self._charger_donnees()
     
     def _charger_donnees(self):
@@ -210,24 +288,126 @@ class SuivisManagerWidget(QWidget):
         mois = self.mois_combo.currentIndex() + 1
         annee = int(self.annee_combo.currentText())
         
-        self.objectifs = charger_objectifs(annee, mois)
-        
         mois_nom = self.mois_combo.currentText()
         self.titre_label.setText(f"TABLEAU SUIVI MANAGER {mois_nom.upper()} {annee}")
         
-        self.periodes_dates = calculer_periodes_mois(mois, annee)
+        # Mois déjà lu : affichage immédiat, la lecture en cours est abandonnée
+        donnees = self.cache.get((mois, annee))
+        if donnees is not None:
+            self.executeur.annuler("chargement")
+            self._afficher_mois(donnees)
+            return
         
+        # Lecture sur le thread de la base ; un changement de mois rapide
+        # remplace la lecture précédente. Le tableau reste verrouillé d'ici là.
+        self.table.setEnabled(False)
+        self.executeur.executer(
+            self._lire_mois, mois, annee,
+            rappel=self._afficher_mois, canal="chargement"
+        )
+    
+    def _lire_mois(self, mois: int, annee: int) -> dict:
+        """Lit le suivi, les périodes et les objectifs d'un mois (thread de la base)"""
         suivi = self.db.get_suivi_by_mois_annee(mois, annee)
+        objectifs = charger_objectifs(annee, mois)
+        return {
+            'mois': mois,
+            'annee': annee,
+            'objectifs': objectifs,
+            'objectifs_periodes': self.prorata.get_objectifs_manager(mois, annee, objectifs),
+            'suivi_id': suivi['id'] if suivi else None,
+            'periodes': self.db.get_periodes_by_suivi_id(suivi['id']) if suivi else [],
+            'analyse': self.db.get_analyse_mois(mois, annee),
+            'comparaison': self.db.get_comparaison_n1(mois, annee),
+            'rapprochement': self.rapprochement.rapprocher_mois(mois, annee),
+            'references': self.anomalies.get_references('manager', mois, annee),
+            'historique': self._lire_historique()
+        }
+    
+    def _mettre_en_cache(self, donnees: dict):
+        """Conserve un mois lu (sans l'état annuler/rétablir, qui change à chaque action)"""
+        self.cache.mettre(
+            (donnees['mois'], donnees['annee']),
+            {cle: valeur for cle, valeur in donnees.items() if cle != 'historique'}
+        )
+    
+    def _invalider_mois(self, mois: int, annee: int):
+        """
+        Retire du cache un mois modifié
         
-        if suivi:
-            self.suivi_id_courant = suivi['id']
-            periodes_data = self.db.get_periodes_by_suivi_id(self.suivi_id_courant)
+        Le même mois de l'année suivante est retiré aussi : ce mois y est
+        affiché en comparaison N-1.
+        """
+        self.cache.invalider((mois, annee))
+        self.cache.invalider((mois, annee + 1))
+    
+    def _precharger_voisins(self, mois: int, annee: int):
+        """Lit en arrière-plan le mois précédent et le mois suivant s'ils ne sont pas en cache"""
+        for canal, (mois_voisin, annee_voisine) in zip(
+            ("prechargement_precedent", "prechargement_suivant"), mois_voisins(mois, annee)
+        ):
+            if (mois_voisin, annee_voisine) not in self.cache:
+                self.executeur.executer(
+                    self._lire_mois, mois_voisin, annee_voisine,
+                    rappel=self._mettre_en_cache, canal=canal
+                )
+    
+    def _afficher_mois(self, donnees: dict):
+        """Affiche les données lues par _lire_mois (ou conservées dans le cache)"""
+        self.mois_affiche = (donnees['mois'], donnees['annee'])
+        self.objectifs = donnees['objectifs']
+        self.objectifs_periodes = donnees['objectifs_periodes']
+        self.periodes_dates = calculer_periodes_mois(donnees['mois'], donnees['annee'])
+        self.suivi_id_courant = donnees['suivi_id']
+        self.references = donnees['references']
+        
+        self._remplir_tableau(donnees['periodes'])
+        self._remplir_analyse(donnees['analyse'])
+        self._remplir_comparaison(donnees['comparaison'])
+        self._remplir_rapprochement(donnees['rapprochement'])
+        if 'historique' in donnees:
+            self._mettre_en_cache(donnees)
+            self._appliquer_historique(donnees['historique'])
         else:
-            self.suivi_id_courant = None
-            periodes_data = []
+            self._mettre_a_jour_historique()
+        self.table.setEnabled(True)
+        self._precharger_voisins(donnees['mois'], donnees['annee'])
+        
+        self.autosauvegarde.definir_contexte(self.mois_affiche)
+        self._proposer_recuperation(
+            f"{self.mois_combo.itemText(donnees['mois'] - 1)} {donnees['annee']}"
+        )
+    
+    def _proposer_recuperation(self, libelle: str):
+        """
+        Propose de restaurer les saisies perdues lors d'un arrêt inattendu
+        
+        Args:
+            libelle: Description des données affichées (ex: "Mars 2025")
+        """
+        cellules = self.autosauvegarde.recuperer()
+        if not cellules:
+            return
+        
+        reply = QMessageBox.question(
+            self, "Saisies non enregistrées",
+            f"Des saisies de {libelle} n'ont pas été enregistrées avant l'arrêt "
+            f"de l'application.\n\nVoulez-vous les restaurer ?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        
+        if reply != QMessageBox.Yes:
+            self.autosauvegarde.abandonner_recuperation()
+            return
         
-        self._remplir_tableau(periodes_data)
-        self.donnees_modifiees = False
+        # Chaque cellule restaurée repasse par _on_item_changed (mise en forme, sauvegarde)
+        for (ligne, colonne), texte in cellules.items():
+            if ligne < self.table.rowCount():
+                item = self.table.item(ligne, colonne)
+                if item is None:
+                    item = QTableWidgetItem()
+                    self.table.setItem(ligne, colonne, item)
+                item.setText(texte)
     
     def _remplir_tableau(self, periodes_data: list):
         """Remplit le tableau avec les données"""
@@ -250,60 +430,234 @@ class SuivisManagerWidget(QWidget):
             periode_item.setFont(font)
             self.table.setItem(i, 0, periode_item)
             
-            data = data_dict.get(numero_periode, {})
-            
-            # C.A. Total
-            ca_total = data.get('ca_total')
-            ca_total_item = QTableWidgetItem(normaliser_decimal(formater_montant(ca_total)) if ca_total else "")
-            ca_total_item.setTextAlignment(Qt.AlignCenter)
-            self._appliquer_couleur_objectif(ca_total_item, ca_total, self.objectifs.get('ca_total'))
-            self.table.setItem(i, 1, ca_total_item)
+            self._remplir_ligne(i, data_dict.get(numero_periode, {}))
+        
+        self.table.blockSignals(False)
+    
+    def _remplir_ligne(self, i: int, data: dict):
+        """Remplit les cellules de saisie d'une ligne du tableau"""
+        objectifs = self._objectifs_ligne(i)
+        
+        # C.A. Total
+        ca_total = data.get('ca_total')
+        ca_total_item = QTableWidgetItem(normaliser_decimal(formater_montant(ca_total)) if ca_total else "")
+        ca_total_item.setTextAlignment(Qt.AlignCenter)
+        self._appliquer_couleur_objectif(ca_total_item, ca_total, objectifs.get('ca_total'))
+        self.table.setItem(i, 1, ca_total_item)
+        
+        # C.A. /Jour
+        ca_jour = data.get('ca_par_jour')
+        ca_jour_item = QTableWidgetItem(normaliser_decimal(formater_montant(ca_jour)) if ca_jour else "")
+        ca_jour_item.setTextAlignment(Qt.AlignCenter)
+        self._appliquer_couleur_objectif(ca_jour_item, ca_jour, objectifs.get('ca_jour'))
+        self.table.setItem(i, 2, ca_jour_item)
+        
+        # Nombre de Visites
+        nb_visites = data.get('nombre_visites')
+        nb_visites_item = QTableWidgetItem(str(nb_visites) if nb_visites else "")
+        nb_visites_item.setTextAlignment(Qt.AlignCenter)
+        self._appliquer_couleur_objectif(nb_visites_item, float(nb_visites) if nb_visites else None, 
+                                        objectifs.get('nb_clients'))
+        self.table.setItem(i, 3, nb_visites_item)
+        
+        # % Ventes
+        pct_ventes = data.get('pourcentage_ventes')
+        pct_ventes_item = QTableWidgetItem(normaliser_decimal(formater_pourcentage(pct_ventes)) if pct_ventes else "")
+        pct_ventes_item.setTextAlignment(Qt.AlignCenter)
+        self._appliquer_couleur_objectif(pct_ventes_item, pct_ventes, objectifs.get('pct_ventes'), True)
+        self.table.setItem(i, 4, pct_ventes_item)
+        
+        # % Couleurs
+        pct_couleurs = data.get('pourcentage_couleurs')
+        pct_couleurs_item = QTableWidgetItem(normaliser_decimal(formater_pourcentage(pct_couleurs)) if pct_couleurs else "")
+        pct_couleurs_item.setTextAlignment(Qt.AlignCenter)
+        self._appliquer_couleur_objectif(pct_couleurs_item, pct_couleurs, objectifs.get('pct_couleurs'), True)
+        self.table.setItem(i, 5, pct_couleurs_item)
+        
+        # % Soins
+        pct_soins = data.get('pourcentage_soins')
+        pct_soins_item = QTableWidgetItem(normaliser_decimal(formater_pourcentage(pct_soins)) if pct_soins else "")
+        pct_soins_item.setTextAlignment(Qt.AlignCenter)
+        self._appliquer_couleur_objectif(pct_soins_item, pct_soins, objectifs.get('pct_soins'), True)
+        self.table.setItem(i, 6, pct_soins_item)
+        
+        for colonne in range(1, 7):
+            self._signaler_anomalie(self.table.item(i, colonne))
+    
+    def _signaler_anomalie(self, item: QTableWidgetItem):
+        """Surligne une cellule de saisie dont la valeur s'écarte de l'historique du salon"""
+        message = None
+        jours = self.references['jours'] if self.references else []
+        if item.row() < len(jours):
+            valeur = parser_decimal(item.text().replace("€", "").replace("%", ""))
+            message = self.anomalies.evaluer(
+                self.references, SALON, INDICATEURS['manager'][item.column() - 1], valeur, jours[item.row()]
+            )
+        
+        signaux_bloques = self.table.blockSignals(True)
+        item.setBackground(QColor(253, 235, 208) if message else QBrush())
+        item.setToolTip(f"⚠️ {message}" if message else "")
+        self.table.blockSignals(signaux_bloques)
+    
+    def _objectifs_ligne(self, i: int) -> dict:
+        """Objectifs de la période d'une ligne (objectifs du mois à défaut)"""
+        if 0 <= i < len(self.objectifs_periodes):
+            return self.objectifs_periodes[i]
+        return self.objectifs
+    
+    def _remplir_analyse(self, analyse: dict):
+        """
+        Remplit les colonnes calculées (cumuls, évolution, rang) du tableau
+        
+        Args:
+            analyse: Résultat de get_analyse_mois {numero_periode: valeurs}
+        """
+        self.table.blockSignals(True)
+        for i in range(self.table.rowCount()):
+            ligne = analyse.get(i + 1, {})
+            visites_cumulees = ligne.get('visites_cumulees')
+            textes = [
+                normaliser_decimal(formater_montant(ligne.get('ca_cumule'))),
+                normaliser_decimal(formater_evolution(ligne.get('evolution_ca'))),
+                str(visites_cumulees) if visites_cumulees is not None else "",
+                formater_rang(ligne.get('rang_ca'), ligne.get('nb_classees'))
+            ]
+            for j, texte in enumerate(textes):
+                self.table.setItem(i, 7 + j, creer_item_calcule(texte))
             
-            # C.A. /Jour
-            ca_jour = data.get('ca_par_jour')
-            ca_jour_item = QTableWidgetItem(normaliser_decimal(formater_montant(ca_jour)) if ca_jour else "")
-            ca_jour_item.setTextAlignment(Qt.AlignCenter)
-            self._appliquer_couleur_objectif(ca_jour_item, ca_jour, self.objectifs.get('ca_jour'))
-            self.table.setItem(i, 2, ca_jour_item)
+            # Cumuls comparés aux objectifs cumulés depuis le début du mois
+            objectifs = self._objectifs_ligne(i)
+            self._appliquer_couleur_objectif(self.table.item(i, 7), ligne.get('ca_cumule'),
+                                             objectifs.get('ca_total_cumule'))
+            self._appliquer_couleur_objectif(self.table.item(i, 9), visites_cumulees,
+                                             objectifs.get('nb_clients_cumule'))
             
-            # Nombre de Visites
-            nb_visites = data.get('nombre_visites')
-            nb_visites_item = QTableWidgetItem(str(nb_visites) if nb_visites else "")
-            nb_visites_item.setTextAlignment(Qt.AlignCenter)
-            self._appliquer_couleur_objectif(nb_visites_item, float(nb_visites) if nb_visites else None, 
-                                            self.objectifs.get('nb_clients'))
-            self.table.setItem(i, 3, nb_visites_item)
+            evolution = ligne.get('evolution_ca')
+            if evolution:
+                self.table.item(i, 8).setForeground(
+                    QColor(34, 139, 34) if evolution > 0 else QColor(178, 34, 34)
+                )
+        self.table.blockSignals(False)
+    
+    def _remplir_comparaison(self, comparaison: dict):
+        """
+        Remplit les colonnes de comparaison (N-1 et écart à l'objectif) du tableau
+        
+        Args:
+            comparaison: Résultat de get_comparaison_n1 {numero_periode: valeurs}
+        """
+        self.table.blockSignals(True)
+        for i in range(self.table.rowCount()):
+            ligne = comparaison.get(i + 1, {})
+            ca_total = ligne.get('ca_total')
+            objectif = self._objectifs_ligne(i).get('ca_total')
             
-            # % Ventes
-            pct_ventes = data.get('pourcentage_ventes')
-            pct_ventes_item = QTableWidgetItem(normaliser_decimal(formater_pourcentage(pct_ventes)) if pct_ventes else "")
-            pct_ventes_item.setTextAlignment(Qt.AlignCenter)
-            self._appliquer_couleur_objectif(pct_ventes_item, pct_ventes, self.objectifs.get('pct_ventes'), True)
-            self.table.setItem(i, 4, pct_ventes_item)
+            ecart_n1 = formater_evolution(ligne.get('ecart_ca_n1'))
+            if ligne.get('evolution_ca_n1') is not None:
+                ecart_n1 += f" ({ligne['evolution_ca_n1']:+.1f} %)"
+            ecart_objectif = ca_total - objectif if ca_total is not None and objectif else None
             
-            # % Couleurs
-            pct_couleurs = data.get('pourcentage_couleurs')
-            pct_couleurs_item = QTableWidgetItem(normaliser_decimal(formater_pourcentage(pct_couleurs)) if pct_couleurs else "")
-            pct_couleurs_item.setTextAlignment(Qt.AlignCenter)
-            self._appliquer_couleur_objectif(pct_couleurs_item, pct_couleurs, self.objectifs.get('pct_couleurs'), True)
-            self.table.setItem(i, 5, pct_couleurs_item)
+            textes = [
+                normaliser_decimal(formater_montant(ligne.get('ca_total_n1'))),
+                normaliser_decimal(ecart_n1),
+                normaliser_decimal(formater_evolution(ecart_objectif))
+            ]
+            for j, texte in enumerate(textes):
+                self.table.setItem(i, 11 + j, creer_item_calcule(texte))
             
-            # % Soins
-            pct_soins = data.get('pourcentage_soins')
-            pct_soins_item = QTableWidgetItem(normaliser_decimal(formater_pourcentage(pct_soins)) if pct_soins else "")
-            pct_soins_item.setTextAlignment(Qt.AlignCenter)
-            self._appliquer_couleur_objectif(pct_soins_item, pct_soins, self.objectifs.get('pct_soins'), True)
-            self.table.setItem(i, 6, pct_soins_item)
+            for colonne, ecart in ((12, ligne.get('ecart_ca_n1')), (13, ecart_objectif)):
+                if ecart:
+                    self.table.item(i, colonne).setForeground(
+                        QColor(34, 139, 34) if ecart > 0 else QColor(178, 34, 34)
+                    )
+        self.table.blockSignals(False)
+    
+    def _remplir_rapprochement(self, rapprochement: dict):
+        """
+        Remplit la colonne du rapprochement avec les Suivis Collaborateurs
         
+        Args:
+            rapprochement: Résultat de rapprocher_mois {numero_periode: valeurs}
+        """
+        self.table.blockSignals(True)
+        for i in range(self.table.rowCount()):
+            ligne = rapprochement.get(i + 1)
+            if ligne is None:
+                # Période non saisie d'un côté ou de l'autre
+                self.table.setItem(i, 14, creer_item_calcule(""))
+                continue
+            
+            ecarts = decrire_ecarts(ligne)
+            item = creer_item_calcule("⚠️ Écart" if ecarts else "✓")
+            item.setToolTip("\n".join(ecarts + [
+                f"C.A. équipe : {formater_montant(ligne['ca_collaborateurs'])} "
+                f"({ligne['nb_collaborateurs']} collaborateur(s)), salon : {formater_montant(ligne['ca_manager'])}",
+                f"Visites équipe : {ligne['visites_collaborateurs'] or 0}, "
+                f"salon : {ligne['visites_manager'] or 0}"
+            ]))
+            if ecarts:
+                item.setForeground(QColor(178, 34, 34))
+                item.setBackground(QColor(253, 235, 208))
+            else:
+                item.setForeground(QColor(34, 139, 34))
+            self.table.setItem(i, 14, item)
         self.table.blockSignals(False)
     
+    def actualiser_rapprochement(self, mois: int, annee: int):
+        """
+        Refait le rapprochement d'un mois dont les Suivis Collaborateurs ont été enregistrés
+        
+        Args:
+            mois: Mois (1-12)
+            annee: Année
+        """
+        self.cache.invalider((mois, annee))
+        if self.mois_affiche != (mois, annee):
+            return
+        
+        def rapprochement_lu(rapprochement: dict):
+            if self.mois_affiche == (mois, annee):
+                self._remplir_rapprochement(rapprochement)
+        
+        self.executeur.executer(
+            self.rapprochement.rapprocher_mois, mois, annee,
+            rappel=rapprochement_lu, canal="rapprochement"
+        )
+    
+    def _afficher_colonnes_n1(self, afficher: bool):
+        """Affiche ou masque les colonnes de comparaison N-1"""
+        for colonne in range(11, 14):
+            self.table.setColumnHidden(colonne, not afficher)
+    
     def _on_item_changed(self, item):
         """Appelé quand une cellule est modifiée"""
         if item.column() == 0:
             return
         
-        self.donnees_modifiees = True
+        self._formater_saisie(item)
+        self.autosauvegarde.signaler_modification(item.row(), item.column(), item.text())
+    
+    def _appliquer_edition(self, items: list):
+        """
+        Met en forme et enregistre les cellules d'un collage, d'une recopie ou d'un effacement
+        
+        Les cellules sont sauvegardées tout de suite, en une seule écriture :
+        l'opération s'annule en une fois.
+        
+        Args:
+            items: Cellules modifiées (voir EditionTableau)
+        """
+        for item in items:
+            self._formater_saisie(item)
+        self.autosauvegarde.signaler_modifications(
+            {(item.row(), item.column()): item.text() for item in items}
+        )
+        self.autosauvegarde.vider()
+    
+    def _formater_saisie(self, item: QTableWidgetItem):
+        """Met en forme la valeur saisie dans une cellule et sa couleur d'objectif"""
         text = item.text()
+        objectifs = self._objectifs_ligne(item.row())
         
         if item.column() in [1, 2]:  # Montants
             valeur = parser_decimal(text.replace("€", "").strip())
@@ -313,9 +667,9 @@ class SuivisManagerWidget(QWidget):
                 item.setTextAlignment(Qt.AlignCenter)
                 
                 if item.column() == 1:
-                    self._appliquer_couleur_objectif(item, valeur, self.objectifs.get('ca_total'))
+                    self._appliquer_couleur_objectif(item, valeur, objectifs.get('ca_total'))
                 else:
-                    self._appliquer_couleur_objectif(item, valeur, self.objectifs.get('ca_jour'))
+                    self._appliquer_couleur_objectif(item, valeur, objectifs.get('ca_jour'))
                 
                 self.table.blockSignals(False)
         
@@ -323,7 +677,7 @@ class SuivisManagerWidget(QWidget):
             item.setTextAlignment(Qt.AlignCenter)
             try:
                 valeur = float(text.replace(',', '.')) if text.strip() else None
-                self._appliquer_couleur_objectif(item, valeur, self.objectifs.get('nb_clients'))
+                self._appliquer_couleur_objectif(item, valeur, objectifs.get('nb_clients'))
             except ValueError:
                 pass
         
@@ -335,23 +689,96 @@ class SuivisManagerWidget(QWidget):
                 item.setTextAlignment(Qt.AlignCenter)
                 
                 if item.column() == 4:
-                    self._appliquer_couleur_objectif(item, valeur, self.objectifs.get('pct_ventes'), True)
+                    self._appliquer_couleur_objectif(item, valeur, objectifs.get('pct_ventes'), True)
                 elif item.column() == 5:
-                    self._appliquer_couleur_objectif(item, valeur, self.objectifs.get('pct_couleurs'), True)
+                    self._appliquer_couleur_objectif(item, valeur, objectifs.get('pct_couleurs'), True)
                 else:
-                    self._appliquer_couleur_objectif(item, valeur, self.objectifs.get('pct_soins'), True)
+                    self._appliquer_couleur_objectif(item, valeur, objectifs.get('pct_soins'), True)
                 
                 self.table.blockSignals(False)
+        
+        if 1 <= item.column() <= 6:
+            self._signaler_anomalie(item)
+    
+    def _on_cellule_double_cliquee(self, ligne: int, colonne: int):
+        """Ouvre le détail par jour sur un double-clic dans la colonne Périodes"""
+        if colonne == 0:
+            self._ouvrir_detail_jours(ligne)
     
-    def _on_cell_exit(self, currentRow, currentColumn, previousRow, previousColumn):
-        """Sauvegarde automatique quand on quitte une cellule"""
-        if self.donnees_modifiees and previousRow >= 0:
-            self._sauvegarder_donnees_silencieuse()
+    def _ouvrir_detail_jours(self, ligne: int):
+        """Lit les jours d'une période puis ouvre leur saisie"""
+        if self.mois_affiche is None or not 0 <= ligne < len(self.periodes_dates):
+            return
+        
+        # La saisie en cours est enregistrée avant que les jours ne recalculent la période
+        self.autosauvegarde.vider()
+        date_debut, date_fin = self.periodes_dates[ligne]
+        titre = f"Détail par jour - {self.table.item(ligne, 0).text()}"
+        self.executeur.executer(
+            self._lire_jours, date_debut.strftime("%Y-%m-%d"), date_fin.strftime("%Y-%m-%d"),
+            rappel=lambda lu: self._saisir_jours(titre, date_debut, date_fin, *lu)
+        )
+    
+    def _lire_jours(self, date_debut: str, date_fin: str) -> tuple:
+        """Lit les jours d'une période et indique si son total a été tapé directement (thread de la base)"""
+        return self.db.get_jours(date_debut, date_fin), self.db.periode_saisie(date_debut, date_fin)
+    
+    def _saisir_jours(self, titre: str, date_debut: datetime, date_fin: datetime, jours: list,
+                      periode_saisie: bool = False):
+        """Affiche le détail par jour et enregistre les jours modifiés"""
+        dialog = DetailJoursDialog(titre, date_debut, date_fin, jours, parent=self)
+        if dialog.exec() != QDialog.Accepted or not dialog.get_jours():
+            return
+        
+        remplacer = periode_saisie and self._confirmer_remplacement_total()
+        
+        def jours_sauvegardes(succes: bool):
+            if not succes:
+                QMessageBox.warning(self, "Erreur", "Erreur lors de l'enregistrement des jours.")
+            # Une période peut déborder sur le mois voisin
+            self.cache.vider()
+            self._charger_donnees()
+            if self.mois_affiche:
+                self.suivis_enregistres.emit(*self.mois_affiche)
+        
+        self.executeur.executer(
+            self.db.sauvegarder_jours, dialog.get_jours(), remplacer_saisies=remplacer,
+            rappel=jours_sauvegardes
+        )
+    
+    def _confirmer_remplacement_total(self) -> bool:
+        """Demande si le total tapé d'une période doit être remplacé par la somme de ses jours"""
+        reply = QMessageBox.question(
+            self, "Total saisi",
+            "Les valeurs de cette période ont été saisies directement.\n\n"
+            "Les remplacer par le calcul à partir des jours renseignés ?\n"
+            "(Non : les jours sont enregistrés, la période garde ses valeurs.)",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
+        return reply == QMessageBox.Yes
+    
+    def _calculer_ca_par_jour(self):
+        """Recalcule le C.A. /jour des périodes du mois affiché à partir du calendrier"""
+        if self.mois_affiche is None or not self.periodes_dates:
+            return
+        
+        self.autosauvegarde.vider()
+        date_debut = self.periodes_dates[0][0].strftime("%Y-%m-%d")
+        date_fin = self.periodes_dates[-1][1].strftime("%Y-%m-%d")
+        
+        def ca_par_jour_calcule(nb_modifiees: Optional[int]):
+            if nb_modifiees is None:
+                QMessageBox.warning(self, "Erreur", "Erreur lors du calcul du C.A. /jour.")
+            self.cache.vider()
+            self._charger_donnees()
+        
+        self.executeur.executer(
+            self.db.deriver_ca_par_jour, date_debut, date_fin, rappel=ca_par_jour_calcule
+        )
     
     def _nouveau_mois_with_save(self):
         """Sauvegarde automatique avant nouveau mois"""
-        if self.donnees_modifiees:
-            self._sauvegarder_donnees_silencieuse()
+        self.autosauvegarde.vider()
         self._nouveau_mois()
     
     def _nouveau_mois(self):
@@ -359,27 +786,47 @@ class SuivisManagerWidget(QWidget):
         mois = self.mois_combo.currentIndex() + 1
         annee = int(self.annee_combo.currentText())
         
-        suivi = self.db.get_suivi_by_mois_annee(mois, annee)
+        self.executeur.executer(
+            self.db.get_suivi_by_mois_annee, mois, annee,
+            rappel=lambda suivi: self._confirmer_nouveau_mois(mois, annee, suivi)
+        )
+    
+    def _confirmer_nouveau_mois(self, mois: int, annee: int, suivi):
+        """Crée le suivi du mois, ou le réinitialise après confirmation s'il existe"""
+        mois_nom = self.mois_combo.itemText(mois - 1)
         
         if suivi:
             reply = QMessageBox.question(
                 self, "Mois existant",
-                f"Un suivi existe déjà pour {self.mois_combo.currentText()} {annee}.\n"
+                f"Un suivi existe déjà pour {mois_nom} {annee}.\n"
                 "Voulez-vous le réinitialiser ?",
                 QMessageBox.Yes | QMessageBox.No
             )
             
             if reply == QMessageBox.Yes:
-                self.db.supprimer_suivi(suivi['id'])
-                self.suivi_id_courant = self.db.creer_suivi(mois, annee)
-                self._charger_donnees()
+                def suivi_recree(_):
+                    self._invalider_mois(mois, annee)
+                    self._charger_donnees()
+                
+                self.executeur.executer(
+                    self._recreer_suivi, suivi['id'], mois, annee, rappel=suivi_recree
+                )
         else:
-            self.suivi_id_courant = self.db.creer_suivi(mois, annee)
-            QMessageBox.information(
-                self, "Nouveau mois",
-                f"Nouveau suivi créé pour {self.mois_combo.currentText()} {annee}"
-            )
-            self._charger_donnees()
+            def suivi_cree(_):
+                self._invalider_mois(mois, annee)
+                QMessageBox.information(
+                    self, "Nouveau mois",
+                    f"Nouveau suivi créé pour {mois_nom} {annee}"
+                )
+                self._charger_donnees()
+            
+            self.executeur.executer(self.db.creer_suivi, mois, annee, rappel=suivi_cree)
+    
+    def _recreer_suivi(self, suivi_id: int, mois: int, annee: int) -> Optional[int]:
+        """Remplace un suivi par un suivi vide, en une action annulable (thread de la base)"""
+        with self.db.journal.lot("Nouveau mois"):
+            self.db.supprimer_suivi(suivi_id)
+            return self.db.creer_suivi(mois, annee)
     
     def _reinitialiser_mois_with_save(self):
         """Réinitialisation sans sauvegarde"""
@@ -389,9 +836,15 @@ class SuivisManagerWidget(QWidget):
         """Réinitialise le mois en cours"""
         mois = self.mois_combo.currentIndex() + 1
         annee = int(self.annee_combo.currentText())
-        mois_nom = self.mois_combo.currentText()
         
-        suivi = self.db.get_suivi_by_mois_annee(mois, annee)
+        self.executeur.executer(
+            self.db.get_suivi_by_mois_annee, mois, annee,
+            rappel=lambda suivi: self._confirmer_reinitialisation(mois, annee, suivi)
+        )
+    
+    def _confirmer_reinitialisation(self, mois: int, annee: int, suivi):
+        """Supprime les données du mois après confirmation"""
+        mois_nom = self.mois_combo.itemText(mois - 1)
         
         if not suivi:
             QMessageBox.information(
@@ -405,17 +858,21 @@ class SuivisManagerWidget(QWidget):
             f"<b>Attention !</b><br><br>"
             f"Vous êtes sur le point de <b>supprimer définitivement</b> toutes les données "
             f"du mois de <b>{mois_nom} {annee}</b>.<br><br>"
-            f"Cette action est <b>irréversible</b>.<br><br>"
+            f"Vous pourrez revenir en arrière avec <b>Annuler</b> (Ctrl+Z).<br><br>"
             f"Voulez-vous vraiment continuer ?",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
         )
         
-        if reply == QMessageBox.Yes:
-            if self.db.supprimer_suivi(suivi['id']):
+        if reply != QMessageBox.Yes:
+            return
+        
+        def suivi_supprime(succes: bool):
+            if succes:
                 self.suivi_id_courant = None
+                self._invalider_mois(mois, annee)
                 self._charger_donnees()
-                self.donnees_modifiees = False
+                self.suivis_enregistres.emit(mois, annee)
                 
                 QMessageBox.information(
                     self, "Réinitialisation réussie",
@@ -427,15 +884,25 @@ class SuivisManagerWidget(QWidget):
                     self, "Erreur",
                     "Une erreur est survenue lors de la réinitialisation."
                 )
+        
+        self.executeur.executer(self.db.supprimer_suivi, suivi['id'], rappel=suivi_supprime)
     
-    def _sauvegarder_donnees_silencieuse(self):
-        """Sauvegarde sans message de confirmation"""
-        mois = self.mois_combo.currentIndex() + 1
-        annee = int(self.annee_combo.currentText())
+    def _sauvegarder_donnees_silencieuse(self, apres=None):
+        """
+        Sauvegarde sans message de confirmation
         
-        if not self.suivi_id_courant:
-            self.suivi_id_courant = self.db.creer_suivi(mois, annee)
+        Les valeurs sont lues dans le tableau puis écrites sur le thread de
+        la base ; les sauvegardes successives y sont exécutées dans l'ordre.
         
+        Args:
+            apres: Fonction appelée une fois la sauvegarde écrite
+        """
+        if self.mois_affiche is None:
+            self.autosauvegarde.sauvegarde_terminee()
+            return
+        mois, annee = self.mois_affiche
+        
+        lignes = []
         for i in range(self.table.rowCount()):
             date_debut, date_fin = self.periodes_dates[i]
             
@@ -449,8 +916,7 @@ class SuivisManagerWidget(QWidget):
             pct_couleurs = parser_decimal((self.table.item(i, 5).text() if self.table.item(i, 5) else "").replace("%", ""))
             pct_soins = parser_decimal((self.table.item(i, 6).text() if self.table.item(i, 6) else "").replace("%", ""))
             
-            self.db.sauvegarder_periode(
-                self.suivi_id_courant,
+            lignes.append((
                 i + 1,
                 date_debut.strftime("%Y-%m-%d"),
                 date_fin.strftime("%Y-%m-%d"),
@@ -460,22 +926,152 @@ class SuivisManagerWidget(QWidget):
                 pct_ventes,
                 pct_couleurs,
                 pct_soins
-            )
+            ))
+        
+        # Les données en cache du mois ne correspondent plus au tableau ; une
+        # lecture déjà soumise (préchargement) la remettrait en cache avant
+        # l'écriture, d'où la seconde invalidation à la fin de la sauvegarde
+        self._invalider_mois(mois, annee)
+        
+        def sauvegarde_terminee(resultat: dict):
+            self._invalider_mois(resultat['mois'], resultat['annee'])
+            # Le suivi a pu être créé par cette sauvegarde
+            if self.mois_affiche == (resultat['mois'], resultat['annee']):
+                self.suivi_id_courant = resultat['suivi_id']
+                self._remplir_analyse(resultat['analyse'])
+                self._remplir_comparaison(resultat['comparaison'])
+                self._remplir_rapprochement(resultat['rapprochement'])
+            self.autosauvegarde.sauvegarde_terminee()
+            self.suivis_enregistres.emit(resultat['mois'], resultat['annee'])
+            self._appliquer_historique(resultat['historique'])
+            if apres:
+                apres()
+        
+        def sauvegarde_echouee(exception: BaseException):
+            print(f"Erreur lors de la sauvegarde du suivi: {exception}")
+            self.autosauvegarde.sauvegarde_echouee()
+        
+        self.executeur.executer(
+            self._ecrire_mois, self.suivi_id_courant, mois, annee, lignes,
+            rappel=sauvegarde_terminee, erreur=sauvegarde_echouee
+        )
+    
+    def _ecrire_mois(self, suivi_id: Optional[int], mois: int, annee: int, lignes: list) -> dict:
+        """
+        Écrit les périodes d'un mois en une seule action annulable (thread de la base)
+        
+        Le rapprochement avec les Suivis Collaborateurs n'est refait que pour ce mois.
+        """
+        with self.db.journal.lot("Saisie"):
+            if not suivi_id:
+                suivi_id = self.db.creer_suivi(mois, annee)
+            
+            for ligne in lignes:
+                self.db.sauvegarder_periode(suivi_id, *ligne)
         
-        self.donnees_modifiees = False
+        return {
+            'mois': mois,
+            'annee': annee,
+            'suivi_id': suivi_id,
+            'analyse': self.db.get_analyse_mois(mois, annee),
+            'comparaison': self.db.get_comparaison_n1(mois, annee),
+            'rapprochement': self.rapprochement.rapprocher_mois(mois, annee),
+            'historique': self._lire_historique()
+        }
     
     def _sauvegarder_donnees(self):
         """Sauvegarde les données du tableau"""
-        self._sauvegarder_donnees_silencieuse()
-        QMessageBox.information(
+        self.autosauvegarde.vider(forcer=True, apres=lambda: QMessageBox.information(
             self, "Sauvegarde",
             "Les données ont été sauvegardées avec succès !"
+        ))
+    
+    def _mettre_a_jour_historique(self):
+        """Active les boutons Annuler / Rétablir selon le journal"""
+        self.executeur.executer(
+            self._lire_historique, rappel=self._appliquer_historique, canal="historique"
+        )
+    
+    def _lire_historique(self) -> tuple:
+        """Indique si on peut annuler / rétablir (thread de la base)"""
+        return self.db.journal.peut_annuler(), self.db.journal.peut_retablir()
+    
+    def _appliquer_historique(self, historique: tuple):
+        """Active les boutons Annuler / Rétablir"""
+        peut_annuler, peut_retablir = historique
+        self.btn_annuler.setEnabled(peut_annuler)
+        self.btn_retablir.setEnabled(peut_retablir)
+    
+    def _annuler(self):
+        """Annule la dernière modification enregistrée"""
+        self._rejouer(self.db.journal.annuler)
+    
+    def _retablir(self):
+        """Rétablit la dernière modification annulée"""
+        self._rejouer(self.db.journal.retablir)
+    
+    def _rejouer(self, operation):
+        """Sauvegarde la saisie en cours puis annule / rétablit sur le thread de la base"""
+        if self.mois_affiche is None:
+            return
+        self.autosauvegarde.vider()
+        self.executeur.executer(
+            self._rejouer_journal, operation, *self.mois_affiche,
+            rappel=self._rafraichir_lignes
         )
     
+    def _rejouer_journal(self, operation, mois: int, annee: int) -> dict:
+        """Annule / rétablit puis relit le suivi du mois affiché (thread de la base)"""
+        lignes = operation()
+        # Le suivi du mois affiché peut avoir été supprimé ou recréé
+        suivi = self.db.get_suivi_by_mois_annee(mois, annee)
+        return {
+            'mois': mois,
+            'annee': annee,
+            'lignes': lignes,
+            'suivi_id': suivi['id'] if suivi else None,
+            'analyse': self.db.get_analyse_mois(mois, annee),
+            'comparaison': self.db.get_comparaison_n1(mois, annee),
+            'rapprochement': self.rapprochement.rapprocher_mois(mois, annee),
+            'historique': self._lire_historique()
+        }
+    
+    def _rafraichir_lignes(self, resultat: dict):
+        """
+        Met à jour les seules lignes du tableau touchées par annuler/rétablir
+        
+        Args:
+            resultat: Résultat de _rejouer_journal (lignes renvoyées par le
+                      journal : {'table', 'avant', 'apres'})
+        """
+        # Annuler / rétablir peut toucher n'importe quel mois
+        self.cache.vider()
+        self._appliquer_historique(resultat['historique'])
+        if self.mois_affiche != (resultat['mois'], resultat['annee']):
+            return
+        
+        suivi_affiche = self.suivi_id_courant
+        self.suivi_id_courant = resultat['suivi_id']
+        suivis_du_mois = {suivi_affiche, self.suivi_id_courant} - {None}
+        
+        self.table.blockSignals(True)
+        for ligne in resultat['lignes']:
+            if ligne['table'] != "suivis_manager_periodes":
+                continue
+            
+            periode = ligne['apres'] or ligne['avant']
+            index = periode['numero_periode'] - 1
+            if periode['suivi_id'] in suivis_du_mois and 0 <= index < self.table.rowCount():
+                self._remplir_ligne(index, ligne['apres'] or {})
+        self.table.blockSignals(False)
+        self._remplir_analyse(resultat['analyse'])
+        self._remplir_comparaison(resultat['comparaison'])
+        self._remplir_rapprochement(resultat['rapprochement'])
+        self.suivis_enregistres.emit(resultat['mois'], resultat['annee'])
+    
     def _exporter_pdf_with_save(self):
         """Sauvegarde automatique avant export PDF"""
-        if self.donnees_modifiees:
-            self._sauvegarder_donnees_silencieuse()
+        self.autosauvegarde.vider()
         self._exporter_pdf()
     
     def _exporter_pdf(self):
@@ -530,26 +1126,34 @@ class SuivisManagerWidget(QWidget):
         with open('config.ini', 'w', encoding='utf-8') as f:
             config.write(f)
         
-        suivi = self.db.get_suivi_by_mois_annee(mois, annee)
-        
-        if suivi:
-            periodes_data = self.db.get_periodes_by_suivi_id(suivi['id'])
-        else:
-            periodes_data = []
-        
-        data_dict = {p['numero_periode']: p for p in periodes_data}
+        self.executeur.executer(
+            self._lire_mois, mois, annee,
+            rappel=lambda donnees: self._generer_pdf(filepath, mois_nom, donnees)
+        )
+    
+    def _generer_pdf(self, filepath: str, mois_nom: str, donnees: dict):
+        """Génère le PDF à partir des données lues par _lire_mois"""
+        periodes_dates = calculer_periodes_mois(donnees['mois'], donnees['annee'])
+        data_dict = {p['numero_periode']: p for p in donnees['periodes']}
         
         donnees_ordonnees = []
-        for i in range(len(self.periodes_dates)):
+        analyse_ordonnee = []
+        comparaison_ordonnee = []
+        for i in range(len(periodes_dates)):
             donnees_ordonnees.append(data_dict.get(i + 1, {}))
+            analyse_ordonnee.append(donnees['analyse'].get(i + 1, {}))
+            comparaison_ordonnee.append(donnees['comparaison'].get(i + 1, {}))
         
-        exporter = SuivisManagerPDFExporter(self.objectifs)
+        exporter = SuivisManagerPDFExporter(donnees['objectifs'], donnees['objectifs_periodes'])
         success = exporter.generer_pdf(
             filepath,
             mois_nom,
-            annee,
-            self.periodes_dates,
-            donnees_ordonnees
+            donnees['annee'],
+            periodes_dates,
+            donnees_ordonnees,
+            analyse_ordonnee,
+            comparaison_ordonnee if self.btn_comparer_n1.isChecked() else None,
+            list(donnees['rapprochement'].values())
         )
         
         if success:
@@ -580,12 +1184,31 @@ class SuivisManagerWidget(QWidget):
                 "Une erreur est survenue lors de la génération du PDF."
             )
     
+    def fermer(self):
+        """
+        Enregistre les saisies en attente et attend la fin des écritures
+        
+        Appelé à la fermeture de l'écran et par la fenêtre principale avant
+        la sauvegarde de sortie, pour que celle-ci contienne les dernières saisies.
+        """
+        self.autosauvegarde.vider()
+        self.executeur.attendre()
+        # Livre le résultat de la dernière sauvegarde (efface le fichier de récupération)
+        QCoreApplication.processEvents()
+    
     def closeEvent(self, event):
         """Sauvegarde automatique à la fermeture"""
-        if self.donnees_modifiees:
-            self._sauvegarder_donnees_silencieuse()
+        self.fermer()
         event.accept()
     
     def recharger_objectifs(self):
         """Recharge les objectifs et rafraîchit l'affichage"""
+        self.autosauvegarde.vider()
+        self.cache.vider()
+        self._charger_donnees()
+    
+    def invalider_cache(self):
+        """Oublie les mois déjà lus et relit le mois affiché (périodes importées de la caisse)"""
+        self.autosauvegarde.vider()
+        self.cache.vider()
         self._charger_donnees()
\ No newline at end of file
@@ -3,7 +3,7 @@ Fonctions utilitaires pour le module Suivis Manager
 """
 
 from datetime import datetime, timedelta
-from typing import List, Tuple, Optional, Dict
+from typing import List, Tuple, Optional, Dict, Iterable, Set
 import calendar
 
 
@@ -91,6 +91,78 @@ def calculer_periodes_mois(mois: int, annee: int) -> List[Tuple[datetime, dateti
     return periodes
 
 
+def mois_voisins(mois: int, annee: int) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """
+    Calcule le mois précédent et le mois suivant
+    
+    Args:
+        mois: Numéro du mois (1-12)
+        annee: Année (ex: 2025)
+    
+    Returns:
+        ((mois, annee) précédent, (mois, annee) suivant)
+    """
+    precedent = (12, annee - 1) if mois == 1 else (mois - 1, annee)
+    suivant = (1, annee + 1) if mois == 12 else (mois + 1, annee)
+    return precedent, suivant
+
+
+def bornes_mois(mois: int, annee: int) -> Tuple[str, str]:
+    """
+    Calcule le premier et le dernier jour d'un mois
+    
+    Args:
+        mois: Numéro du mois (1-12)
+        annee: Année (ex: 2025)
+    
+    Returns:
+        (premier jour, dernier jour) au format YYYY-MM-DD
+    """
+    return (f"{annee:04d}-{mois:02d}-01",
+            f"{annee:04d}-{mois:02d}-{calendar.monthrange(annee, mois)[1]:02d}")
+
+
+def date_annee_precedente(texte: str) -> str:
+    """
+    Calcule la même date un an plus tôt
+    
+    Args:
+        texte: Date au format YYYY-MM-DD
+    
+    Returns:
+        Date de l'année précédente au format YYYY-MM-DD (29 février -> 28 février)
+    """
+    date = datetime.strptime(texte, "%Y-%m-%d")
+    jour = min(date.day, calendar.monthrange(date.year - 1, date.month)[1])
+    return date.replace(year=date.year - 1, day=jour).strftime("%Y-%m-%d")
+
+
+def grouper_dates_par_periode(dates: Iterable[str]) -> Dict[Tuple[int, int], Set[int]]:
+    """
+    Regroupe des dates par mois et numéro de période
+    
+    Args:
+        dates: Dates au format YYYY-MM-DD
+    
+    Returns:
+        {(mois, annee): {numéros des périodes contenant au moins une date}}
+        (une date hors période, ex: dimanche 1er, est ignorée)
+    """
+    periodes_mois = {}
+    resultat: Dict[Tuple[int, int], Set[int]] = {}
+    for texte in dates:
+        date = datetime.strptime(texte, "%Y-%m-%d")
+        cle = (date.month, date.year)
+        if cle not in periodes_mois:
+            periodes_mois[cle] = calculer_periodes_mois(*cle)
+        
+        for numero, (debut, fin) in enumerate(periodes_mois[cle], start=1):
+            if debut <= date <= fin:
+                resultat.setdefault(cle, set()).add(numero)
+                break
+    return resultat
+
+
 def formater_periode(date_debut: datetime, date_fin: datetime, premier_jour_travaille: datetime) -> str:
     """
     Formate une période pour l'affichage (cumulatif depuis le début du mois)
@@ -142,6 +214,37 @@ def formater_pourcentage(valeur: float) -> str:
     return f"{valeur:.2f} %"
 
 
+def formater_evolution(valeur: float) -> str:
+    """
+    Formate un écart de montant, toujours signé
+    
+    Args:
+        valeur: Écart à formater
+        
+    Returns:
+        Chaîne formatée avec signe et € (ex: "+120.00 €")
+    """
+    if valeur is None:
+        return ""
+    return f"{valeur:+,.2f} €".replace(",", " ")
+
+
+def formater_rang(rang: int, nb_classes: int) -> str:
+    """
+    Formate un rang sur un effectif
+    
+    Args:
+        rang: Rang (1 = meilleur)
+        nb_classes: Nombre d'éléments classés
+        
+    Returns:
+        Chaîne formatée "rang / effectif"
+    """
+    if rang is None:
+        return ""
+    return f"{rang} / {nb_classes}"
+
+
 def parser_montant(texte: str) -> Optional[float]:
     """
     Parse un montant depuis une chaîne